@@ -0,0 +1,40 @@
+"""
+elke27_lib/bench
+
+Micro/pipeline benchmarks with a committed baseline.
+
+Run:
+    python -m elke27_lib.bench                     # run all, compare to baseline.json
+    python -m elke27_lib.bench --filter framing    # subset
+    python -m elke27_lib.bench --json out.json     # machine-readable results
+    python -m elke27_lib.bench --update-baseline   # rewrite the committed baseline
+
+Every case reports operations per second (best of several rounds). A case fails
+when its throughput drops more than --threshold (fraction) below the baseline;
+the process then exits with status 1. Baselines are machine-specific: refresh
+baseline.json on the reference machine when a change is expected to move it.
+"""
+
+from __future__ import annotations
+
+from .runner import (
+    BASELINE_PATH,
+    BenchCase,
+    BenchResult,
+    Regression,
+    compare_to_baseline,
+    load_baseline,
+    results_to_json,
+    run_benchmarks,
+)
+
+__all__ = [
+    "BASELINE_PATH",
+    "BenchCase",
+    "BenchResult",
+    "Regression",
+    "compare_to_baseline",
+    "load_baseline",
+    "results_to_json",
+    "run_benchmarks",
+]
@@ -0,0 +1,85 @@
+"""
+python -m elke27_lib.bench: run the benchmark cases and compare to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from .runner import (
+    BASELINE_PATH,
+    DEFAULT_THRESHOLD,
+    BenchResult,
+    compare_to_baseline,
+    load_baseline,
+    results_to_json,
+    run_benchmarks,
+)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m elke27_lib.bench")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed fractional slowdown vs baseline (default %(default)s)",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="write results to the baseline file"
+    )
+    args = parser.parse_args(argv)
+    # Handler log lines would dominate both the output and the timings.
+    logging.disable(logging.WARNING)
+
+    baseline = load_baseline(args.baseline)
+    quiet = args.json == "-"
+
+    def _report(result: BenchResult) -> None:
+        if quiet:
+            return
+        base = baseline.get(result.name)
+        delta = f"{result.ops_per_s / base - 1.0:+7.1%}" if base else "    new"
+        print(f"{result.name:40s} {result.ops_per_s:14,.0f} {result.unit}/s  {delta}")
+
+    results = run_benchmarks(
+        name_filter=args.filter,
+        rounds=args.rounds,
+        min_time_s=args.min_time,
+        on_result=_report,
+    )
+    payload = results_to_json(results)
+    if args.json == "-":
+        json.dump(payload, sys.stdout, indent=2, sort_keys=True)
+        print()
+    elif args.json:
+        Path(args.json).write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+    if args.update_baseline:
+        merged = json.loads(args.baseline.read_text()) if args.baseline.exists() else payload
+        merged["results"].update(payload["results"])
+        args.baseline.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, threshold=args.threshold)
+    for reg in regressions:
+        print(
+            f"REGRESSION {reg.name}: {reg.ops_per_s:,.0f}/s vs baseline "
+            f"{reg.baseline_ops_per_s:,.0f}/s ({reg.change:+.1%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
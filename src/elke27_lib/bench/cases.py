@@ -0,0 +1,216 @@
+"""
+elke27_lib/bench/cases.py
+
+Benchmark cases for the receive pipeline: framing, schema-0 crypto, dispatch,
+handler apply and client snapshot rebuild. Case names are stable identifiers
+used as baseline keys; rename only together with baseline.json.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from ..dispatcher import DispatchContext, MessageKind
+from ..framing import DeframeState, deframe_feed, frame_build
+from ..handlers.zone import make_zone_get_all_zones_status_handler
+from ..kernel import E27Kernel
+from ..presentation import decrypt_schema0_envelope, encrypt_schema0_envelope
+from ..states import PanelState
+from .runner import BenchCase
+
+_SESSION_KEY = bytes(range(16))
+_FRAMES_PER_STREAM = 100
+_SNAPSHOT_ZONE_COUNTS = (16, 208, 1000)
+
+
+def _zone_status_payload(zone_id: int) -> dict[str, Any]:
+    return {
+        "seq": 0,
+        "session_id": 1,
+        "zone": {
+            "get_status": {
+                "zone_id": zone_id,
+                "enabled": True,
+                "violated": False,
+                "bypassed": False,
+                "trouble": False,
+                "error_code": 0,
+            }
+        },
+    }
+
+
+def _json_bytes(obj: Mapping[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _encrypted(payload: bytes) -> tuple[int, bytes]:
+    return encrypt_schema0_envelope(payload=payload, session_key=_SESSION_KEY, src=0, dest=1)
+
+
+# --------------------------
+# Framing and crypto
+# --------------------------
+
+
+def _setup_frame_build() -> Callable[[], object]:
+    proto, ciphertext = _encrypted(_json_bytes(_zone_status_payload(1)))
+    return lambda: frame_build(protocol_byte=proto, data_frame=ciphertext)
+
+
+def _setup_deframe_feed() -> Callable[[], object]:
+    proto, ciphertext = _encrypted(_json_bytes(_zone_status_payload(1)))
+    stream = frame_build(protocol_byte=proto, data_frame=ciphertext) * _FRAMES_PER_STREAM
+    chunks = [stream[i : i + 4096] for i in range(0, len(stream), 4096)]
+
+    def run() -> object:
+        state = DeframeState()
+        frames = 0
+        for chunk in chunks:
+            frames += len(deframe_feed(state, chunk))
+        return frames
+
+    return run
+
+
+def _setup_encrypt() -> Callable[[], object]:
+    payload = _json_bytes(_zone_status_payload(1))
+    return lambda: _encrypted(payload)
+
+
+def _setup_decrypt() -> Callable[[], object]:
+    proto, ciphertext = _encrypted(_json_bytes(_zone_status_payload(1)))
+    return lambda: decrypt_schema0_envelope(
+        protocol_byte=proto, ciphertext=ciphertext, session_key=_SESSION_KEY
+    )
+
+
+# --------------------------
+# Dispatch (registered feature handlers)
+# --------------------------
+
+
+def _bench_kernel(zones: int) -> E27Kernel:
+    kernel = E27Kernel(event_queue_maxlen=1024)
+    kernel.load_features_blocking()
+    kernel.state.panel.session_id = 1
+    for zone_id in range(1, zones + 1):
+        kernel.state.get_or_create_zone(zone_id).name = f"Zone {zone_id}"
+    return kernel
+
+
+def _setup_dispatch(messages: list[dict[str, Any]]) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        kernel = _bench_kernel(208)
+        dispatch = kernel.dispatcher.dispatch
+
+        def run() -> object:
+            for msg in messages:
+                dispatch(msg)
+            return None
+
+        return run
+
+    return setup
+
+
+_DISPATCH_SHAPES: Mapping[str, list[dict[str, Any]]] = {
+    "zone_status_broadcast": [_zone_status_payload(1 + i % 208) for i in range(10)],
+    "area_status_broadcast": [
+        {
+            "seq": 0,
+            "session_id": 1,
+            "area": {"get_status": {"area_id": 1, "arm_state": "DISARMED", "ready": i % 2 == 0}},
+        }
+        for i in range(10)
+    ],
+    "zone_bulk_status_208": [
+        {
+            "seq": 0,
+            "session_id": 1,
+            "zone": {"get_all_zones_status": {"status": ("1" if i % 2 else "9") * 208}},
+        }
+        for i in range(2)
+    ],
+    "zone_attribs_response": [
+        {
+            "seq": 0,
+            "session_id": 1,
+            "zone": {"get_attribs": {"zone_id": 1 + i, "name": f"Zone {i}", "error_code": 0}},
+        }
+        for i in range(10)
+    ],
+}
+
+
+# --------------------------
+# Handler apply and snapshot rebuild
+# --------------------------
+
+
+def _setup_bulk_apply() -> Callable[[], object]:
+    state = PanelState()
+    for zone_id in range(1, 209):
+        state.get_or_create_zone(zone_id)
+    handler = make_zone_get_all_zones_status_handler(state, lambda _evt, _ctx: None, lambda: 0.0)
+    ctx = DispatchContext(
+        kind=MessageKind.BROADCAST,
+        seq=0,
+        session_id=1,
+        route=("zone", "get_all_zones_status"),
+        classification="BROADCAST",
+    )
+    messages = [
+        {"zone": {"get_all_zones_status": {"status": ch * 208}}} for ch in ("1", "9", "D", "1")
+    ]
+
+    def run() -> object:
+        for msg in messages:
+            handler(msg, ctx)
+        return None
+
+    return run
+
+
+def _setup_snapshot_rebuild(zones: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        from ..client import Elke27Client
+
+        client = Elke27Client()
+        state = client._kernel.state
+        for zone_id in range(1, zones + 1):
+            state.get_or_create_zone(zone_id).name = f"Zone {zone_id}"
+        return lambda: client._rebuild_domain_snapshot("zone")
+
+    return setup
+
+
+def all_cases() -> list[BenchCase]:
+    cases = [
+        BenchCase("framing.frame_build", "frames", _setup_frame_build),
+        BenchCase(
+            "framing.deframe_feed",
+            "frames",
+            _setup_deframe_feed,
+            ops_per_call=_FRAMES_PER_STREAM,
+        ),
+        BenchCase("crypto.schema0_encrypt", "messages", _setup_encrypt),
+        BenchCase("crypto.schema0_decrypt", "messages", _setup_decrypt),
+    ]
+    for shape, messages in _DISPATCH_SHAPES.items():
+        cases.append(
+            BenchCase(
+                f"dispatch.{shape}",
+                "messages",
+                _setup_dispatch(messages),
+                ops_per_call=len(messages),
+            )
+        )
+    cases.append(BenchCase("handler.zone_bulk_apply_208", "messages", _setup_bulk_apply, 4))
+    for zones in _SNAPSHOT_ZONE_COUNTS:
+        cases.append(
+            BenchCase(f"snapshot.rebuild_zones_{zones}", "rebuilds", _setup_snapshot_rebuild(zones))
+        )
+    return cases
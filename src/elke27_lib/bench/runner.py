@@ -0,0 +1,146 @@
+"""
+elke27_lib/bench/runner.py
+
+Timing loop, result format and baseline comparison for the benchmark cases.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class BenchCase:
+    """
+    A named benchmark. setup() builds the workload and returns a callable that
+    performs ops_per_call operations of the given unit when called.
+    """
+
+    name: str
+    unit: str
+    setup: Callable[[], Callable[[], object]]
+    ops_per_call: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    name: str
+    unit: str
+    ops_per_s: float
+    calls: int
+    rounds: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "unit": self.unit,
+            "ops_per_s": round(self.ops_per_s, 1),
+            "calls": self.calls,
+            "rounds": self.rounds,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    name: str
+    baseline_ops_per_s: float
+    ops_per_s: float
+
+    @property
+    def change(self) -> float:
+        """Fractional change vs baseline (negative = slower)."""
+        return self.ops_per_s / self.baseline_ops_per_s - 1.0
+
+
+def _calibrate(fn: Callable[[], object], min_time_s: float) -> int:
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time_s or calls >= 1 << 24:
+            return calls
+        calls = max(calls * 2, int(calls * min_time_s / max(elapsed, 1e-9)))
+
+
+def run_case(case: BenchCase, *, rounds: int = 3, min_time_s: float = 0.2) -> BenchResult:
+    fn = case.setup()
+    fn()  # warm caches and lazy imports
+    calls = _calibrate(fn, min_time_s)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    ops_per_s = calls * case.ops_per_call / max(best, 1e-12)
+    return BenchResult(case.name, case.unit, ops_per_s, calls, rounds)
+
+
+def run_benchmarks(
+    cases: Iterable[BenchCase] | None = None,
+    *,
+    name_filter: str | None = None,
+    rounds: int = 3,
+    min_time_s: float = 0.2,
+    on_result: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    if cases is None:
+        from .cases import all_cases
+
+        cases = all_cases()
+    results: list[BenchResult] = []
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        result = run_case(case, rounds=rounds, min_time_s=min_time_s)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+def results_to_json(results: Iterable[BenchResult]) -> dict[str, Any]:
+    return {
+        "version": RESULTS_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def load_baseline(path: str | Path = BASELINE_PATH) -> dict[str, float]:
+    """Return {case name: ops_per_s} from a results/baseline file ({} if missing)."""
+    try:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    results = cast(Mapping[str, Mapping[str, Any]], raw.get("results", {}))
+    return {name: float(entry["ops_per_s"]) for name, entry in results.items()}
+
+
+def compare_to_baseline(
+    results: Iterable[BenchResult],
+    baseline: Mapping[str, float],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Cases slower than baseline by more than threshold; cases without a baseline pass."""
+    regressions: list[Regression] = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None or base <= 0:
+            continue
+        if result.ops_per_s < base * (1.0 - threshold):
+            regressions.append(Regression(result.name, base, result.ops_per_s))
+    return regressions
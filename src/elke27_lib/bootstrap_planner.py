@@ -0,0 +1,182 @@
+"""
+elke27_lib/bootstrap_planner.py
+
+Bootstrap request planning: which requests bring a domain to "ready" once its
+configured inventory is known.
+
+Status comes first (readiness depends on it), using a bulk route whenever one is
+available and covers the fields readiness needs; per-entity get_status is only
+planned for domains without a usable bulk route. Entities a bulk reply does not
+cover are filled in per entity after the reply (see status_gap_steps). Fields
+the bulk route cannot carry (BulkStatusRoute.backfill) are then fetched per
+entity at background priority for covered entities still missing them (see
+status_backfill_steps). Attribs have no bulk route and are always per entity.
+
+The resulting BootstrapPlan is immutable and exposed for inspection/diagnostics.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+RouteKey = tuple[str, str]
+
+StepKind = Literal["status", "attribs"]
+
+
+@dataclass(frozen=True, slots=True)
+class BulkStatusRoute:
+    """
+    A route returning status for every entity of a domain, and the fields it sets.
+
+    backfill: per-entity status fields the bulk reply does not carry; they are
+    not needed for readiness but are fetched afterwards so the snapshot is full.
+    """
+
+    route: RouteKey
+    fields: frozenset[str]
+    backfill: frozenset[str] = frozenset()
+
+
+BULK_STATUS_ROUTES: Mapping[str, BulkStatusRoute] = {
+    # One status char per zone (see handlers.zone._apply_zone_status_char).
+    "zone": BulkStatusRoute(
+        ("zone", "get_all_zones_status"),
+        frozenset({"enabled", "trouble", "violated", "bypassed"}),
+        backfill=frozenset({"tamper", "low_battery", "alarm"}),
+    ),
+    # One status char per output (see handlers.output._apply_output_status_char).
+    "output": BulkStatusRoute(
+        ("output", "get_all_outputs_status"),
+        frozenset({"on", "status"}),
+    ),
+}
+
+# Status fields that must be known before a domain counts as status-ready.
+# Zone tamper/low_battery/alarm are not required: after the bulk read they are
+# backfilled per zone in the background, and the panel broadcasts them on change.
+REQUIRED_STATUS_FIELDS: Mapping[str, frozenset[str]] = {
+    "area": frozenset({"arm_state", "ready"}),
+    "zone": frozenset({"enabled", "trouble", "violated", "bypassed"}),
+    "output": frozenset({"on"}),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BootstrapStep:
+    """
+    One planned request (treat as immutable).
+
+    covers: entity ids whose status/attribs this request provides.
+    background: sent at background priority; readiness does not wait for it.
+    """
+
+    domain: str
+    kind: StepKind
+    route: RouteKey
+    params: tuple[tuple[str, int], ...] = ()
+    covers: tuple[int, ...] = ()
+    bulk: bool = False
+    background: bool = False
+
+    def kwargs(self) -> dict[str, int]:
+        return dict(self.params)
+
+
+@dataclass(frozen=True, slots=True)
+class BootstrapPlan:
+    """
+    Ordered bootstrap plan across domains (treat as immutable).
+    """
+
+    steps: tuple[BootstrapStep, ...] = ()
+
+    @property
+    def request_count(self) -> int:
+        return len(self.steps)
+
+    def for_domain(self, domain: str) -> tuple[BootstrapStep, ...]:
+        return tuple(step for step in self.steps if step.domain == domain)
+
+    def extend(self, steps: Collection[BootstrapStep]) -> BootstrapPlan:
+        return BootstrapPlan(steps=(*self.steps, *steps))
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """Return {domain: {"status": n, "attribs": n, "bulk": n}} request counts."""
+        out: dict[str, dict[str, int]] = {}
+        for step in self.steps:
+            counts = out.setdefault(step.domain, {"status": 0, "attribs": 0, "bulk": 0})
+            counts[step.kind] += 1
+            if step.bulk:
+                counts["bulk"] += 1
+        return out
+
+
+def _bulk_route_for(
+    domain: str,
+    available_routes: Collection[RouteKey],
+    required_fields: Mapping[str, frozenset[str]],
+) -> BulkStatusRoute | None:
+    bulk = BULK_STATUS_ROUTES.get(domain)
+    if bulk is None or bulk.route not in available_routes:
+        return None
+    if not required_fields.get(domain, frozenset()) <= bulk.fields:
+        return None
+    return bulk
+
+
+def plan_domain_bootstrap(
+    domain: str,
+    status_ids: Collection[int],
+    attribs_ids: Collection[int],
+    *,
+    available_routes: Collection[RouteKey],
+    required_fields: Mapping[str, frozenset[str]] = REQUIRED_STATUS_FIELDS,
+) -> tuple[BootstrapStep, ...]:
+    """
+    Plan status (bulk when possible) then attribs requests for one domain.
+    """
+    id_key = f"{domain}_id"
+    steps: list[BootstrapStep] = []
+    status_sorted = tuple(sorted(status_ids))
+    if status_sorted:
+        bulk = _bulk_route_for(domain, available_routes, required_fields)
+        if bulk is not None:
+            steps.append(
+                BootstrapStep(domain, "status", bulk.route, covers=status_sorted, bulk=True)
+            )
+        else:
+            steps.extend(status_gap_steps(domain, status_sorted))
+    for entity_id in sorted(attribs_ids):
+        steps.append(
+            BootstrapStep(
+                domain,
+                "attribs",
+                (domain, "get_attribs"),
+                ((id_key, entity_id),),
+                (entity_id,),
+            )
+        )
+    return tuple(steps)
+
+
+def status_gap_steps(domain: str, ids: Collection[int]) -> tuple[BootstrapStep, ...]:
+    """Per-entity get_status steps for ids still missing status."""
+    id_key = f"{domain}_id"
+    return tuple(
+        BootstrapStep(domain, "status", (domain, "get_status"), ((id_key, i),), (i,))
+        for i in sorted(ids)
+    )
+
+
+def status_backfill_steps(domain: str, ids: Collection[int]) -> tuple[BootstrapStep, ...]:
+    """Background per-entity get_status steps for fields a bulk reply did not carry."""
+    id_key = f"{domain}_id"
+    return tuple(
+        BootstrapStep(
+            domain, "status", (domain, "get_status"), ((id_key, i),), (i,), background=True
+        )
+        for i in sorted(ids)
+    )
@@ -0,0 +1,194 @@
+"""
+elke27_lib/bootstrap_timeline.py
+
+Connect-to-ready timeline: monotonic start/end times and request counts per
+bootstrap phase (TCP connect, HELLO, table_info per domain, configured paging,
+zone defs, status, attribs), plus readiness milestones.
+
+The kernel owns one BootstrapTimeline per connect() and feeds it from the request
+scheduler; the client adds milestones and exposes the result as a BootstrapReport
+(Elke27Client.bootstrap_report()).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+RouteKey = tuple[str, str]
+
+PHASE_TCP_CONNECT = "tcp_connect"
+PHASE_HELLO = "hello"
+PHASE_ZONE_DEFS = "zone_defs"
+PHASE_STATUS = "status"
+PHASE_ATTRIBS = "attribs"
+
+MILESTONE_STATUS_READY = "status_ready"
+MILESTONE_ATTRIBS_READY = "attribs_ready"
+
+
+def phase_for_route(route: RouteKey | None) -> str | None:
+    """Return the bootstrap phase a request belongs to, or None if it is not bootstrap."""
+    if route is None:
+        return None
+    domain, name = route
+    if name == "get_table_info":
+        return f"table_info.{domain}"
+    if name == "get_configured":
+        return f"configured.{domain}"
+    if route == ("zone", "get_defs"):
+        return PHASE_ZONE_DEFS
+    if name == "get_status" or (name.startswith("get_all_") and name.endswith("_status")):
+        return PHASE_STATUS
+    if name == "get_attribs":
+        return PHASE_ATTRIBS
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class BootstrapPhase:
+    """
+    One phase of the timeline (treat as immutable).
+
+    started_at/ended_at are monotonic seconds; ended_at is None while requests are
+    still outstanding. requests counts sends, completed counts replies/timeouts/failures.
+    """
+
+    name: str
+    started_at: float
+    ended_at: float | None
+    requests: int
+    completed: int
+
+    @property
+    def duration_s(self) -> float | None:
+        if self.ended_at is None:
+            return None
+        return self.ended_at - self.started_at
+
+
+@dataclass(frozen=True, slots=True)
+class BootstrapReport:
+    """
+    Snapshot of a bootstrap timeline (treat as immutable).
+
+    Times are monotonic seconds; offsets in to_dict() are relative to started_at.
+    """
+
+    started_at: float
+    phases: tuple[BootstrapPhase, ...]
+    milestones: Mapping[str, float] = field(default_factory=dict)
+
+    @property
+    def request_count(self) -> int:
+        return sum(phase.requests for phase in self.phases)
+
+    def phase(self, name: str) -> BootstrapPhase | None:
+        for item in self.phases:
+            if item.name == name:
+                return item
+        return None
+
+    def elapsed_to(self, milestone: str) -> float | None:
+        at = self.milestones.get(milestone)
+        return None if at is None else at - self.started_at
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly form: offsets/durations in milliseconds, rounded to 0.1 ms."""
+
+        def _ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000.0, 1)
+
+        return {
+            "requests": self.request_count,
+            "milestones_ms": {
+                name: _ms(at - self.started_at) for name, at in self.milestones.items()
+            },
+            "phases": [
+                {
+                    "name": phase.name,
+                    "start_ms": _ms(phase.started_at - self.started_at),
+                    "duration_ms": _ms(phase.duration_s),
+                    "requests": phase.requests,
+                    "completed": phase.completed,
+                }
+                for phase in self.phases
+            ],
+        }
+
+
+@dataclass(slots=True)
+class _PhaseRecord:
+    started_at: float
+    ended_at: float | None = None
+    requests: int = 0
+    completed: int = 0
+
+
+class BootstrapTimeline:
+    """
+    Mutable phase recorder. Not thread-safe: call from the kernel's event loop.
+
+    Recording stops at stop(); later requests (steady-state traffic) are ignored.
+    """
+
+    def __init__(self, started_at: float) -> None:
+        self._started_at = started_at
+        self._phases: dict[str, _PhaseRecord] = {}
+        self._milestones: dict[str, float] = {}
+        self._stopped = False
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def record_phase(self, name: str, started_at: float, ended_at: float) -> None:
+        """Record a phase measured elsewhere (e.g., TCP connect / HELLO)."""
+        if self._stopped:
+            return
+        self._phases[name] = _PhaseRecord(started_at=started_at, ended_at=ended_at)
+
+    def note_request(self, route: RouteKey | None, at: float) -> None:
+        name = phase_for_route(route)
+        if name is None or self._stopped:
+            return
+        record = self._phases.get(name)
+        if record is None:
+            record = self._phases[name] = _PhaseRecord(started_at=at)
+        record.requests += 1
+        record.ended_at = None
+
+    def note_complete(self, route: RouteKey | None, at: float) -> None:
+        name = phase_for_route(route)
+        if name is None or self._stopped:
+            return
+        record = self._phases.get(name)
+        if record is None:
+            return
+        record.completed += 1
+        if record.completed >= record.requests:
+            record.ended_at = at
+
+    def mark(self, milestone: str, at: float) -> None:
+        if self._stopped:
+            return
+        self._milestones.setdefault(milestone, at)
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    def report(self) -> BootstrapReport:
+        phases = tuple(
+            BootstrapPhase(
+                name=name,
+                started_at=record.started_at,
+                ended_at=record.ended_at,
+                requests=record.requests,
+                completed=record.completed,
+            )
+            for name, record in sorted(self._phases.items(), key=lambda item: item[1].started_at)
+        )
+        return BootstrapReport(
+            started_at=self._started_at, phases=phases, milestones=dict(self._milestones)
+        )
@@ -0,0 +1,359 @@
+"""
+elke27_lib/capture.py
+
+Wire-level session capture and deterministic replay.
+
+WireRecorder writes every raw RX chunk and TX frame a Session exchanges with the
+panel, with its monotonic timestamp and direction, plus the session keys from
+HELLO so the capture can be decrypted offline. Attach one through
+SessionConfig.capture (or ClientConfig.wire_capture_path).
+
+File format (little-endian):
+    header:  b"E27W" + version(u8)
+    record:  kind(u8) + at(f64, monotonic seconds) + length(u32) + data
+    kinds:   0 = keys (JSON session_id/session_key_hex/session_hmac_hex),
+             1 = RX (raw socket bytes), 2 = TX (framed bytes as sent)
+
+HELLO itself is cleartext and not recorded; the keys record that follows it is.
+
+Ring mode (max_bytes set) keeps only the newest records within max_bytes in
+memory and writes them on flush()/close(), always preceded by the session keys
+they need. Otherwise records are appended to the file as they happen.
+
+Captures contain session keys: treat them like credentials.
+
+ReplaySession plays a capture back through the normal Session receive path
+(deframe -> decrypt -> JSON -> on_message), so an E27Kernel driven by it runs
+the full dispatch/handler pipeline; replay_capture() wires that up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from . import session as session_mod
+from .framing import DeframeState
+from .kernel import E27Kernel
+from .linking import E27Identity, E27LinkKeys
+
+CAPTURE_MAGIC = b"E27W"
+CAPTURE_VERSION = 1
+
+RECORD_KEYS = 0
+RECORD_RX = 1
+RECORD_TX = 2
+
+_HEADER = CAPTURE_MAGIC + bytes([CAPTURE_VERSION])
+_RECORD = struct.Struct("<BdI")
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    kind: int
+    at: float
+    data: bytes
+
+    @property
+    def size(self) -> int:
+        return _RECORD.size + len(self.data)
+
+    def session_info(self) -> session_mod.SessionInfo:
+        """Decode a keys record."""
+        if self.kind != RECORD_KEYS:
+            raise ValueError("Not a keys record.")
+        obj = json.loads(self.data.decode("utf-8"))
+        return session_mod.SessionInfo(
+            session_id=int(obj["session_id"]),
+            session_key_hex=str(obj["session_key_hex"]),
+            session_hmac_hex=str(obj["session_hmac_hex"]),
+        )
+
+
+def _encode(record: CaptureRecord) -> bytes:
+    return _RECORD.pack(record.kind, record.at, len(record.data)) + record.data
+
+
+class WireRecorder:
+    """
+    Records a Session's wire traffic. Thread-safe: RX is recorded from the session's
+    receive thread and TX from the event loop.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, max_bytes: int | None = None) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._ring: deque[CaptureRecord] = deque()
+        self._ring_bytes = 0
+        # Latest keys record evicted from the ring; written ahead of the ring on flush.
+        self._ring_keys: CaptureRecord | None = None
+        self._file: BinaryIO | None = None
+        self.records_total = 0
+        self.records_dropped = 0
+        if max_bytes is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = _open_private(self.path, os.O_APPEND, "ab")
+            if self._file.tell() == 0:
+                self._file.write(_HEADER)
+
+    @property
+    def ring(self) -> bool:
+        return self.max_bytes is not None
+
+    def record_keys(self, info: session_mod.SessionInfo, *, at: float | None = None) -> None:
+        data = json.dumps(
+            {
+                "session_id": info.session_id,
+                "session_key_hex": info.session_key_hex,
+                "session_hmac_hex": info.session_hmac_hex,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self._append(RECORD_KEYS, data, at)
+
+    def record_rx(self, data: bytes, *, at: float | None = None) -> None:
+        self._append(RECORD_RX, data, at)
+
+    def record_tx(self, data: bytes, *, at: float | None = None) -> None:
+        self._append(RECORD_TX, data, at)
+
+    def _append(self, kind: int, data: bytes, at: float | None) -> None:
+        record = CaptureRecord(kind, time.monotonic() if at is None else at, bytes(data))
+        with self._lock:
+            self.records_total += 1
+            if self._file is not None:
+                self._file.write(_encode(record))
+                return
+            if self.max_bytes is None:
+                return  # closed
+            self._ring.append(record)
+            self._ring_bytes += record.size
+            while self._ring_bytes > self.max_bytes and len(self._ring) > 1:
+                old = self._ring.popleft()
+                self._ring_bytes -= old.size
+                if old.kind == RECORD_KEYS:
+                    self._ring_keys = old
+                else:
+                    self.records_dropped += 1
+
+    def records(self) -> list[CaptureRecord]:
+        """Records currently held in the ring (keys first), or [] in append mode."""
+        with self._lock:
+            head = [self._ring_keys] if self._ring_keys is not None else []
+            return head + list(self._ring)
+
+    def flush(self) -> None:
+        """Append mode: flush the file. Ring mode: rewrite the file with the ring."""
+        if self._file is not None:
+            with self._lock:
+                self._file.flush()
+            return
+        if self.max_bytes is None:
+            return
+        write_capture(self.path, self.records())
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.max_bytes = None
+
+
+def _open_private(path: Path, flags: int, mode: str) -> BinaryIO:
+    """Open path for writing, creating it owner-only (0o600): captures hold session keys."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | flags, 0o600)
+    return os.fdopen(fd, mode)
+
+
+def write_capture(path: str | os.PathLike[str], records: Iterable[CaptureRecord]) -> None:
+    """Write records to path atomically (replacing any existing file)."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    # A stale temp file would keep its old mode through os.replace.
+    tmp.unlink(missing_ok=True)
+    with _open_private(tmp, os.O_TRUNC, "wb") as fh:
+        fh.write(_HEADER)
+        for record in records:
+            fh.write(_encode(record))
+    os.replace(tmp, target)
+
+
+def read_capture(path: str | os.PathLike[str]) -> list[CaptureRecord]:
+    """Read a capture file. A truncated trailing record (crash mid-write) is ignored."""
+    data = Path(path).read_bytes()
+    if data[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+        raise ValueError(f"{path}: not an E27 wire capture")
+    if len(data) <= len(CAPTURE_MAGIC) or data[len(CAPTURE_MAGIC)] != CAPTURE_VERSION:
+        raise ValueError(f"{path}: unsupported capture version")
+    records: list[CaptureRecord] = []
+    off = len(_HEADER)
+    while off + _RECORD.size <= len(data):
+        kind, at, length = _RECORD.unpack_from(data, off)
+        off += _RECORD.size
+        if off + length > len(data):
+            break
+        records.append(CaptureRecord(kind, at, data[off : off + length]))
+        off += length
+    return records
+
+
+class ReplaySession(session_mod.Session):
+    """
+    Session that receives a capture's RX bytes instead of reading a socket.
+
+    speed=1.0 reproduces the original inter-chunk timing, 2.0 plays twice as fast,
+    None plays as fast as possible. Sent frames are discarded (counted in
+    frames_sent). A keys record mid-capture (reconnect) switches session keys.
+    When the capture is exhausted the session disconnects like a closed socket,
+    `finished` is set and on_finished (if any) is called from the receive thread.
+    """
+
+    def __init__(
+        self,
+        cfg: session_mod.SessionConfig,
+        *,
+        client_identity: E27Identity,
+        link_key_hex: str,
+        records: Sequence[CaptureRecord],
+        speed: float | None = None,
+    ) -> None:
+        super().__init__(cfg, client_identity=client_identity, link_key_hex=link_key_hex)
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be > 0 or None")
+        self._records = list(records)
+        self._pos = 0
+        self._speed = speed
+        self._clock_origin: tuple[float, float] | None = None
+        self.frames_sent = 0
+        self.bytes_replayed = 0
+        self.finished = threading.Event()
+        self.on_finished: Callable[[], None] | None = None
+
+    def connect(self) -> session_mod.SessionInfo:
+        info = self._next_keys()
+        if info is None:
+            raise session_mod.SessionProtocolError("Capture has no session keys record.")
+        now = time.monotonic()
+        self.connect_started_at = self.tcp_connected_at = self.hello_completed_at = now
+        self.info = info
+        self._deframe_state = DeframeState()
+        self.state = session_mod.SessionState.ACTIVE
+        if self.on_connected:
+            self.on_connected(info)
+        if self.cfg.auto_receive and self.on_message is not None:
+            self._start_receiver()
+        return info
+
+    def _next_keys(self) -> session_mod.SessionInfo | None:
+        while self._pos < len(self._records):
+            record = self._records[self._pos]
+            self._pos += 1
+            if record.kind == RECORD_KEYS:
+                return record.session_info()
+        return None
+
+    def _require_ready(self) -> None:
+        if self.state is not session_mod.SessionState.ACTIVE or self.info is None:
+            raise session_mod.SessionNotReadyError("Replay session is not ACTIVE.")
+
+    def _recv_some(self, *, max_bytes: int) -> bytes:
+        self._require_ready()
+        while self._pos < len(self._records):
+            record = self._records[self._pos]
+            self._pos += 1
+            if record.kind == RECORD_KEYS:
+                self.info = record.session_info()
+                self._deframe_state = DeframeState()
+                self._pending_frames.clear()
+                continue
+            if record.kind != RECORD_RX:
+                continue
+            self._pace(record.at)
+            self.bytes_replayed += len(record.data)
+            return record.data
+        self.finished.set()
+        if self.on_finished:
+            self.on_finished()
+        raise session_mod.SessionIOError("Replay capture exhausted.")
+
+    def _pace(self, at: float) -> None:
+        if self._speed is None:
+            return
+        now = time.monotonic()
+        if self._clock_origin is None:
+            self._clock_origin = (at, now)
+            return
+        capture_t0, wall_t0 = self._clock_origin
+        delay = wall_t0 + (at - capture_t0) / self._speed - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def _send_all(self, data: bytes) -> None:
+        self._require_ready()
+        self.frames_sent += 1
+        now = time.monotonic()
+        self._last_tx_at = now
+        self._last_exchange_at = now
+
+
+async def replay_capture(
+    records: Sequence[CaptureRecord] | str | os.PathLike[str],
+    *,
+    speed: float | None = None,
+    kernel: E27Kernel | None = None,
+    timeout_s: float | None = None,
+) -> ReplaySession:
+    """
+    Replay a capture through an E27Kernel (a new one unless given) and return the
+    finished ReplaySession. The kernel's PanelState holds the replayed result.
+    """
+    if not isinstance(records, Sequence):
+        records = read_capture(records)
+    target = kernel if kernel is not None else E27Kernel()
+    sessions: list[ReplaySession] = []
+    loop = asyncio.get_running_loop()
+    done = asyncio.Event()
+
+    def _factory(
+        cfg: session_mod.SessionConfig, *, client_identity: E27Identity, link_key_hex: str
+    ) -> ReplaySession:
+        sess = ReplaySession(
+            cfg,
+            client_identity=client_identity,
+            link_key_hex=link_key_hex,
+            records=records,
+            speed=speed,
+        )
+        sess.on_finished = lambda: loop.call_soon_threadsafe(done.set)
+        sessions.append(sess)
+        return sess
+
+    await target.connect(
+        E27LinkKeys(tempkey_hex="00" * 16, linkkey_hex="00" * 16, linkhmac_hex="00" * 32),
+        client_identity=E27Identity(mn="222", sn="replay", fwver="0", hwver="0", osver="0"),
+        session_config=session_mod.SessionConfig(host="replay", port=0, keepalive_enabled=False),
+        session_factory=_factory,
+    )
+    replay = sessions[-1]
+    try:
+        await asyncio.wait_for(done.wait(), timeout=timeout_s)
+    except TimeoutError:
+        raise TimeoutError("Replay did not finish within timeout_s.") from None
+    finally:
+        await target.close()
+    return replay
@@ -15,6 +15,7 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import inspect
+import json
 import logging
 import queue
 import threading
@@ -23,6 +24,7 @@ import types
 import types as types_mod
 from collections.abc import (
     AsyncIterator,
+    Awaitable,
     Callable,
     Collection,
     Iterable,
@@ -30,7 +32,7 @@ from collections.abc import (
     Mapping,
     Sequence,
 )
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from datetime import UTC, datetime
 from typing import (
     TYPE_CHECKING,
@@ -50,6 +52,21 @@ else:
 
 from . import discovery as discovery_mod
 from . import linking as linking_mod
+from .bootstrap_planner import (
+    BULK_STATUS_ROUTES,
+    BootstrapPlan,
+    BootstrapStep,
+    plan_domain_bootstrap,
+    status_backfill_steps,
+    status_gap_steps,
+)
+from .bootstrap_timeline import (
+    MILESTONE_ATTRIBS_READY,
+    MILESTONE_STATUS_READY,
+    BootstrapReport,
+)
+from .capture import WireRecorder
+from .config_cache import ConfigCache, PanelConfig, capture_panel_config, open_config_cache
 from .dispatcher import PagedBlock, RouteKey
 from .errors import (
     AuthorizationRequired,
@@ -90,24 +107,32 @@ from .errors import (
     Elke27ProtocolError as Elke27ProtocolErrorV2,
 )
 from .events import (
+    ApiError,
     AreaAttribsUpdated,
     AreaConfiguredInventoryReady,
+    AreaConfiguredUpdated,
     AreaStatusUpdated,
     AreaTableInfoUpdated,
     AreaTroublesUpdated,
+    ChangedFieldsMixin,
     ConnectionStateChanged,
     CsmSnapshotUpdated,
+    DomainCsmChanged,
     Event,
     KeypadConfiguredInventoryReady,
+    OutputAttribsUpdated,
     OutputConfiguredInventoryReady,
+    OutputConfiguredUpdated,
     OutputsStatusBulkUpdated,
     OutputStatusUpdated,
     OutputTableInfoUpdated,
     PanelVersionInfoUpdated,
+    TableCsmChanged,
     TstatTableInfoUpdated,
     UserConfiguredInventoryReady,
     ZoneAttribsUpdated,
     ZoneConfiguredInventoryReady,
+    ZoneConfiguredUpdated,
     ZoneDefFlagsUpdated,
     ZoneDefsUpdated,
     ZonesStatusBulkUpdated,
@@ -124,8 +149,16 @@ from .kernel import (
     KernelInvalidPanelError,
     KernelMissingContextError,
     KernelNotLinkedError,
+    SessionFactory,
 )
 from .linking import E27Identity, E27LinkKeys
+from .optimistic import (
+    DEFAULT_OPTIMISTIC_TIMEOUT_S,
+    OPTIMISTIC_CORRECTION,
+    OptimisticEntry,
+    OptimisticOutcome,
+    OptimisticTracker,
+)
 from .outbound import OutboundPriority
 from .permissions import (
     PermissionLevel,
@@ -135,6 +168,22 @@ from .permissions import (
     requires_pin,
 )
 from .redact import redact_for_diagnostics
+from .refresh_planner import (
+    RefreshRequest,
+    diff_csm_snapshots,
+    plan_config_refresh,
+    plan_new_entity_requests,
+    planned_inventory_domains,
+)
+from .request_metrics import RequestMetricsSnapshot
+from .request_scheduler import REQUEST_CLASS_BACKGROUND
+from .response_cache import (
+    CacheKey,
+    ResponseCache,
+    is_cacheable_command,
+    is_config_write,
+    make_cache_key,
+)
 from .session import (
     SessionConfig,
     SessionIOError,
@@ -148,6 +197,7 @@ from .types import (
 from .types import (
     ArmMode,
     ClientConfig,
+    CsmDiff,
     CsmSnapshot,
     DiscoveredPanel,
     Elke27Event,
@@ -168,6 +218,13 @@ from .types import (
 
 T = TypeVar("T")
 
+_AREA_NUM_BYPASSED_BIT = AreaStatusUpdated.FIELD_BITS["num_bypassed_zones"]
+_OPTIMISTIC_EVENT_TYPES: Mapping[str, EventType] = {
+    "area": EventType.AREA,
+    "zone": EventType.ZONE,
+    "output": EventType.OUTPUT,
+}
+
 
 @dataclass(frozen=True, slots=True)
 class Result(Generic[T]):
@@ -219,6 +276,21 @@ _CLIENT_EXCEPTIONS = (
 )
 
 
+@dataclass(slots=True)
+class _BatchItem:
+    """A validated async_execute_many item, ready to submit."""
+
+    index: int
+    command_key: str
+    spec: CommandSpec
+    params: dict[str, Any]
+    payload: Any
+    expected_route: RouteKey
+    cache_key: CacheKey | None
+    cache_generation: tuple[int, int]
+    needs_auth: bool
+
+
 def _iter_causes(exc: BaseException) -> Iterable[BaseException]:
     current: BaseException | None = exc
     seen: set[int] = set()
@@ -260,6 +332,18 @@ def _configured_ids_from_table(state: PanelState, domain: str) -> Collection[int
     return range(1, table_elements + 1)
 
 
+def _event_data(evt: Event) -> dict[str, Any]:
+    data = asdict(evt)
+    if isinstance(evt, ChangedFieldsMixin):
+        del data["_changed_keys"], data["_changed_names"]
+        data["changed_fields"] = evt.changed_fields
+    return data
+
+
+def _has_name(entity: object | None) -> bool:
+    return entity is not None and getattr(entity, "name", None) is not None
+
+
 def _table_elements_for_domain(state: PanelState, domain: str) -> int | None:
     info = state.table_info_by_domain.get(domain)
     if not isinstance(info, Mapping):
@@ -287,6 +371,8 @@ class Elke27Client:
         features: Sequence[str] | None = None,
         logger: logging.Logger | None = None,
         filter_attribs_to_configured: bool = True,
+        config_cache: ConfigCache | None = None,
+        session_factory: SessionFactory | None = None,
     ) -> None:
         self._log: logging.Logger = logger or logging.getLogger(__name__)
         self._feature_modules: Sequence[str] | None = features
@@ -308,9 +394,38 @@ class Elke27Client:
         self._snapshot_version: int = 0
         self._last_auth_pin: int | None = None
         self._pending_bypass_by_area: dict[int, float] = {}
+        self._optimistic: OptimisticTracker | None = (
+            OptimisticTracker(
+                timeout_s=config.optimistic_timeout_s
+                if config is not None
+                else DEFAULT_OPTIMISTIC_TIMEOUT_S
+            )
+            if config is not None and config.optimistic_updates
+            else None
+        )
         self._last_disconnect_at: float | None = None
         self._reconnect_csm_snapshot: CsmSnapshot | None = None
         self._awaiting_reconnect_csm_check: bool = False
+        # Configured ids per domain captured before a CSM-driven refresh.
+        self._refresh_baselines: dict[str, frozenset[int]] = {}
+        self._bootstrap_plan: BootstrapPlan = BootstrapPlan()
+        self._bootstrap_tasks: set[asyncio.Task[None]] = set()
+        self._bootstrap_generation = 0
+        if config_cache is None and config is not None and config.config_cache_path:
+            config_cache = open_config_cache(config.config_cache_path)
+        self._config_cache: ConfigCache | None = config_cache
+        self._config_cache_key: str | None = None
+        self._warm_config: PanelConfig | None = None
+        self._warm_pending: set[str] = set()
+        self._config_save_task: asyncio.Task[None] | None = None
+        self._wire_capture_path = config.wire_capture_path if config is not None else None
+        self._wire_capture_max_bytes = config.wire_capture_max_bytes if config is not None else None
+        self._loop_io = config.loop_io if config is not None else False
+        self._wire_recorder: WireRecorder | None = None
+        response_cache_size = config.response_cache_size if config is not None else 256
+        self._response_cache: ResponseCache | None = (
+            ResponseCache(response_cache_size) if response_cache_size > 0 else None
+        )
         if event_queue_maxlen is None:
             event_queue_maxlen = config.event_queue_maxlen if config is not None else 0
         request_timeout_s = config.request_timeout_s if config is not None else 5.0
@@ -319,6 +434,18 @@ class Elke27Client:
         if kernel is None:
             outbound_min_interval_s = config.outbound_min_interval_s if config is not None else 0.05
             outbound_max_burst = config.outbound_max_burst if config is not None else 1
+            adaptive_timeouts = config.adaptive_request_timeout if config is not None else True
+            request_timeout_min_s = config.request_timeout_min_s if config is not None else 0.5
+            request_timeout_max_s = config.request_timeout_max_s if config is not None else 15.0
+            adaptive_pacing = config.outbound_adaptive_pacing if config is not None else False
+            min_interval_floor_s = (
+                config.outbound_min_interval_floor_s if config is not None else 0.01
+            )
+            max_interval_s = config.outbound_max_interval_s if config is not None else 1.0
+            class_weights = config.request_class_weights if config is not None else None
+            background_deadline_s = (
+                config.background_request_deadline_s if config is not None else None
+            )
             self._kernel: E27Kernel = E27Kernel(
                 now_monotonic=self._now_monotonic,
                 event_queue_maxlen=event_queue_maxlen,
@@ -328,6 +455,19 @@ class Elke27Client:
                 outbound_min_interval_s=outbound_min_interval_s,
                 outbound_max_burst=outbound_max_burst,
                 filter_attribs_to_configured=filter_attribs_to_configured,
+                adaptive_timeouts=adaptive_timeouts,
+                request_timeout_min_s=request_timeout_min_s,
+                request_timeout_max_s=request_timeout_max_s,
+                adaptive_pacing=adaptive_pacing,
+                outbound_min_interval_floor_s=min_interval_floor_s,
+                outbound_max_interval_s=max_interval_s,
+                request_class_weights=class_weights,
+                request_class_deadlines_s=(
+                    {REQUEST_CLASS_BACKGROUND: background_deadline_s}
+                    if background_deadline_s is not None
+                    else None
+                ),
+                session_factory=session_factory,
             )
         else:
             self._kernel = kernel
@@ -348,6 +488,12 @@ class Elke27Client:
             "zone": False,
             "output": False,
         }
+        self._attribs_pending: dict[str, set[int]] = {
+            "area": set(),
+            "zone": set(),
+            "output": set(),
+        }
+        self._attribs_ready_event: asyncio.Event = asyncio.Event()
         self._ensure_kernel_subscription()
 
     def _ensure_kernel_subscription(self) -> None:
@@ -387,6 +533,10 @@ class Elke27Client:
         return False
 
     async def wait_ready(self, timeout_s: float) -> bool:
+        """
+        Wait until status-ready: inventory and status are known for areas, zones and
+        outputs. Names/attribs may still be loading (see wait_attribs_ready).
+        """
         if self.ready:
             return True
         try:
@@ -395,6 +545,26 @@ class Elke27Client:
             return False
         return True
 
+    @property
+    def attribs_ready(self) -> bool:
+        """True once status-ready and every bootstrap attribs request has completed."""
+        return self.ready and not any(self._attribs_pending.values())
+
+    async def wait_attribs_ready(self, timeout_s: float) -> bool:
+        """
+        Wait until names/attribs requested during bootstrap have loaded.
+
+        Attribs are fetched at background priority after status; each entity's
+        arrival is reported by its *_attribs_updated event.
+        """
+        if self.attribs_ready:
+            return True
+        try:
+            await asyncio.wait_for(self._attribs_ready_event.wait(), timeout=timeout_s)
+        except TimeoutError:
+            return False
+        return True
+
     def subscribe(
         self,
         callback: Callable[[Elke27Event], None],
@@ -571,6 +741,7 @@ class Elke27Client:
                 and str(area.alarm_state).lower() != "no_alarm_active",
                 chime=area.chime,
             )
+        self._overlay_optimistic("area", out)
         return types_mod.MappingProxyType(out)
 
     def _build_zone_map(self) -> Mapping[int, V2ZoneState]:
@@ -586,6 +757,7 @@ class Elke27Client:
                 tamper=zone.tamper,
                 low_battery=zone.low_battery,
             )
+        self._overlay_optimistic("zone", out)
         return types_mod.MappingProxyType(out)
 
     def _build_zone_definitions(self) -> Mapping[int, ZoneDefinition]:
@@ -618,6 +790,7 @@ class Elke27Client:
                 name=output.name,
                 state=output.on,
             )
+        self._overlay_optimistic("output", out)
         return types_mod.MappingProxyType(out)
 
     def _build_output_definitions(self) -> Mapping[int, OutputDefinition]:
@@ -629,6 +802,137 @@ class Elke27Client:
             )
         return types_mod.MappingProxyType(out)
 
+    def _overlay_optimistic(self, domain: str, states: dict[int, Any]) -> None:
+        tracker = self._optimistic
+        if tracker is None or not tracker:
+            return
+        for entity_id, state in states.items():
+            entry = tracker.get(domain, entity_id)
+            if entry is not None:
+                states[entity_id] = replace(state, **{entry.field: entry.expected, "pending": True})
+
+    def _optimistic_target(
+        self, command_key: str, params: Mapping[str, Any]
+    ) -> tuple[str, int, str, object] | None:
+        """(domain, entity_id, snapshot field, expected value) for a control command."""
+        if command_key == "output_set_status":
+            output_id = params.get("output_id")
+            status = params.get("status")
+            if isinstance(output_id, int) and status in ("ON", "OFF"):
+                return ("output", output_id, "state", status == "ON")
+        elif command_key == "area_set_arm_state":
+            area_id = params.get("area_id")
+            arm_mode = self._arm_mode_from_string(params.get("arm_state"))
+            if isinstance(area_id, int) and arm_mode is not None:
+                return ("area", area_id, "arm_mode", arm_mode)
+        elif command_key == "zone_set_status":
+            zone_id = params.get("zone_id")
+            bypassed = params.get("bypassed")
+            if isinstance(zone_id, int) and isinstance(bypassed, bool):
+                return ("zone", zone_id, "bypassed", bypassed)
+        return None
+
+    def _panel_value(self, domain: str, entity_id: int) -> object:
+        """Authoritative (kernel state) value of the field optimistic updates overlay."""
+        state = self._kernel.state
+        if domain == "area":
+            area = state.areas.get(entity_id)
+            if area is None:
+                return None
+            return self._arm_mode_from_string(area.arm_state or area.armed_state)
+        if domain == "zone":
+            zone = state.zones.get(entity_id)
+            return zone.bypassed if zone is not None else None
+        output = state.outputs.get(entity_id)
+        return output.on if output is not None else None
+
+    def _begin_optimistic(
+        self, command_key: str, params: Mapping[str, Any]
+    ) -> OptimisticEntry | None:
+        tracker = self._optimistic
+        if tracker is None:
+            return None
+        target = self._optimistic_target(command_key, params)
+        if target is None:
+            return None
+        domain, entity_id, field_name, expected = target
+        entry = tracker.begin(domain, entity_id, field_name, expected, now=self._kernel.now())
+        self._rebuild_domain_snapshot(domain)
+        return entry
+
+    def _finish_optimistic(self, entry: OptimisticEntry, *, ok: bool) -> None:
+        tracker = self._optimistic
+        if tracker is None:
+            return
+        if ok:
+            tracker.acknowledge(entry, now=self._kernel.now())
+            if tracker.is_current(entry):
+                with contextlib.suppress(RuntimeError):
+                    asyncio.get_running_loop().call_later(
+                        tracker.timeout_s, self._expire_optimistic
+                    )
+            return
+        outcome = tracker.fail(entry, self._panel_value(entry.domain, entry.entity_id))
+        if outcome is not None:
+            self._apply_optimistic_outcomes([outcome])
+
+    def _reconcile_optimistic(self, domain: str, ids: Iterable[int]) -> None:
+        tracker = self._optimistic
+        if tracker is None or not tracker:
+            return
+        outcomes: list[OptimisticOutcome] = []
+        for entity_id in ids:
+            outcome = tracker.reconcile(domain, entity_id, self._panel_value(domain, entity_id))
+            if outcome is not None:
+                outcomes.append(outcome)
+        # The triggering status event rebuilds the snapshot itself.
+        self._apply_optimistic_outcomes(outcomes, rebuild=False)
+
+    def _expire_optimistic(self) -> None:
+        tracker = self._optimistic
+        if tracker is None or not tracker:
+            return
+        self._apply_optimistic_outcomes(tracker.expire(self._kernel.now(), self._panel_value))
+
+    def _apply_optimistic_outcomes(
+        self, outcomes: Iterable[OptimisticOutcome], *, rebuild: bool = True
+    ) -> None:
+        domains: set[str] = set()
+        for outcome in outcomes:
+            domains.add(outcome.domain)
+            if not outcome.corrected:
+                continue
+            self._log.info(
+                "Optimistic %s %s.%s corrected: expected=%s actual=%s (%s)",
+                outcome.domain,
+                outcome.entity_id,
+                outcome.field,
+                outcome.expected,
+                outcome.actual,
+                outcome.reason,
+            )
+            self._event_seq_counter += 1
+            self._enqueue_event(
+                Elke27Event(
+                    event_type=_OPTIMISTIC_EVENT_TYPES[outcome.domain],
+                    data=outcome.to_dict(),
+                    seq=self._event_seq_counter,
+                    timestamp=datetime.now(UTC),
+                    raw_type=OPTIMISTIC_CORRECTION,
+                )
+            )
+        if rebuild:
+            for domain in domains:
+                self._rebuild_domain_snapshot(domain)
+
+    def _rebuild_domain_snapshot(self, domain: str) -> None:
+        if domain == "area":
+            self._replace_snapshot(areas=self._build_area_map())
+        elif domain == "zone":
+            self._replace_snapshot(zones=self._build_zone_map())
+        elif domain == "output":
+            self._replace_snapshot(outputs=self._build_output_map())
+
     def _replace_snapshot(
         self,
         *,
@@ -661,17 +965,70 @@ class Elke27Client:
     def _maybe_set_ready(self) -> None:
         if self.is_ready and not self._ready_event.is_set():
             self._ready_event.set()
+            self._note_bootstrap_milestone(MILESTONE_STATUS_READY)
+        if self.attribs_ready and not self._attribs_ready_event.is_set():
+            self._attribs_ready_event.set()
+            self._note_bootstrap_milestone(MILESTONE_ATTRIBS_READY)
+            # Save only once names are in; a status-ready save would cache nameless
+            # entities and make the next warm start refetch every attribs record.
+            self._schedule_config_save()
+
+    def request_metrics(self) -> RequestMetricsSnapshot:
+        """
+        Read-only snapshot of per-route request latency histograms (queue wait, wire
+        RTT, total), reply/timeout/send-failure counters, the adaptive reply timeout
+        (SRTT/RTTVAR/RTO) per route class, and the AIMD send rate when adaptive
+        pacing is on. Cheap to call; the counters are cumulative for the lifetime of
+        the client.
+        """
+        return self._kernel.metrics_snapshot()
+
+    def bootstrap_report(self) -> BootstrapReport | None:
+        """
+        Connect-to-ready timeline of the current (or last) connection.
+
+        Phases carry monotonic start/end times and request counts; milestones mark
+        status-ready and attribs-ready. None before the first connect.
+        """
+        timeline = self._kernel.bootstrap_timeline
+        if timeline is None:
+            return None
+        return timeline.report()
+
+    def _note_bootstrap_milestone(self, milestone: str) -> None:
+        timeline = self._kernel.bootstrap_timeline
+        if timeline is None or timeline.stopped:
+            return
+        timeline.mark(milestone, self._kernel.now())
+        if milestone == MILESTONE_ATTRIBS_READY:
+            timeline.stop()
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info(
+                "Bootstrap timeline (%s): %s",
+                milestone,
+                json.dumps(timeline.report().to_dict(), sort_keys=True, separators=(",", ":")),
+            )
 
     def _reset_ready_event(self) -> None:
         self._ready_event = asyncio.Event()
+        self._attribs_ready_event = asyncio.Event()
 
     def _reset_bootstrap_state(self) -> None:
         self._inventory_ready = {"area": False, "zone": False, "output": False}
         self._status_pending = {"area": set(), "zone": set(), "output": set()}
         self._status_ready = {"area": False, "zone": False, "output": False}
+        self._attribs_pending = {"area": set(), "zone": set(), "output": set()}
+        self._bootstrap_generation += 1
+        self._warm_config = None
+        self._warm_pending = set()
+        self._refresh_baselines = {}
+        self._bootstrap_plan = BootstrapPlan()
+        for task in self._bootstrap_tasks:
+            task.cancel()
+        self._bootstrap_tasks.clear()
         self._reset_ready_event()
 
-    def _mark_inventory_ready(self, domain: str) -> None:
+    def _mark_inventory_ready(self, domain: str, *, warm: bool = False) -> None:
         if self._inventory_ready.get(domain):
             return
         self._inventory_ready[domain] = True
@@ -690,64 +1047,241 @@ class Elke27Client:
             self._maybe_set_ready()
             return
         self._status_ready[domain] = False
-        self._queue_bootstrap_attribs(domain)
-        self._request_initial_statuses(domain, pending)
+        attribs_ids = self._bootstrap_attribs_ids(domain, missing_only=warm)
+        self._attribs_pending[domain].update(attribs_ids)
+        self._run_bootstrap_steps(
+            plan_domain_bootstrap(
+                domain,
+                pending,
+                attribs_ids,
+                available_routes=self._available_bulk_status_routes(),
+            )
+        )
 
-    def _request_initial_statuses(self, domain: str, ids: set[int]) -> None:
-        if domain == "area":
-            for area_id in sorted(ids):
-                try:
-                    self._kernel.request(("area", "get_status"), area_id=area_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
+    def _queue_bootstrap_attribs(self, domain: str, *, missing_only: bool = False) -> None:
+        attribs_ids = self._bootstrap_attribs_ids(domain, missing_only=missing_only)
+        self._run_bootstrap_steps(
+            plan_domain_bootstrap(domain, (), attribs_ids, available_routes=())
+        )
+
+    def _bootstrap_attribs_ids(self, domain: str, *, missing_only: bool) -> list[int]:
+        state = self._kernel.state
+        entities: Mapping[int, object] | None = {
+            "area": state.areas,
+            "zone": state.zones,
+            "output": state.outputs,
+        }.get(domain)
+        ids = sorted(self._configured_ids(domain))
+        if missing_only and entities is not None:
+            ids = [i for i in ids if not _has_name(entities.get(i))]
+        return ids
+
+    def _available_bulk_status_routes(self) -> set[RouteKey]:
+        registry = self._kernel.requests
+        return {
+            bulk.route
+            for bulk in BULK_STATUS_ROUTES.values()
+            if registry.get(bulk.route) is not None
+        }
+
+    @property
+    def bootstrap_plan(self) -> BootstrapPlan:
+        """Requests planned for the current bootstrap, in submission order."""
+        return self._bootstrap_plan
+
+    def _run_bootstrap_steps(self, steps: Sequence[BootstrapStep]) -> None:
+        self._bootstrap_plan = self._bootstrap_plan.extend(steps)
+        for step in steps:
+            if step.bulk:
+                self._start_bulk_status(step)
+                continue
+            if step.kind == "attribs":
+                self._submit_bootstrap_attribs(step)
+                continue
+            try:
+                if step.background:
+                    self._kernel.request(step.route, priority=OutboundPriority.LOW, **step.kwargs())
+                else:
+                    self._kernel.request(step.route, **step.kwargs())
+            except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
+                continue
+
+    def _submit_bootstrap_attribs(self, step: BootstrapStep) -> None:
+        """
+        Request attribs at background priority so status and user commands go first.
+
+        Completion (reply, error or timeout) clears the entity from _attribs_pending;
+        without a running loop there is no future to watch, so it is cleared on send.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        domain, name = step.route
+        try:
+            if loop is None:
+                self._kernel.request(step.route, priority=OutboundPriority.LOW, **step.kwargs())
+                self._mark_attribs_seen(step.domain, step.covers)
+                return
+            payload = self._kernel.requests.require(step.route)(**step.kwargs())
+            _seq, future, _sent = self._kernel.submit_for_response(
+                domain,
+                name,
+                payload,
+                command_key=f"{domain}_{name}",
+                expected_route=step.route,
+                timeout_s=None,
+                loop=loop,
+                priority=OutboundPriority.LOW,
+            )
+        except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
+            self._mark_attribs_seen(step.domain, step.covers)
             return
-        if domain == "zone":
-            for zone_id in sorted(ids):
-                try:
-                    self._kernel.request(("zone", "get_status"), zone_id=zone_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
+        generation = self._bootstrap_generation
+
+        def _done(fut: asyncio.Future[Any]) -> None:
+            if not fut.cancelled():
+                fut.exception()
+            if generation == self._bootstrap_generation:
+                self._mark_attribs_seen(step.domain, step.covers)
+
+        future.add_done_callback(_done)
+
+    def _mark_attribs_seen(self, domain: str, ids: Iterable[int]) -> None:
+        pending = self._attribs_pending.get(domain)
+        if not pending:
             return
-        if domain == "output":
-            for output_id in sorted(ids):
-                try:
-                    self._kernel.request(("output", "get_status"), output_id=output_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
+        pending.difference_update(ids)
+        if not pending:
+            self._maybe_set_ready()
+
+    def _start_bulk_status(self, step: BootstrapStep) -> None:
+        """
+        Submit a bulk status request now (so it is queued ahead of attribs), then
+        fill any gaps per entity once it completes.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._fill_status_gaps(step.domain)
             return
+        domain, name = step.route
+        try:
+            payload = self._kernel.requests.require(step.route)(**step.kwargs())
+            _seq, future, _sent = self._kernel.submit_for_response(
+                domain,
+                name,
+                payload,
+                command_key=f"{domain}_{name}",
+                expected_route=step.route,
+                timeout_s=None,
+                loop=loop,
+            )
+        except (E27Error, KeyError, RuntimeError, TypeError, ValueError) as exc:
+            self._log.debug("Bulk status %s.%s failed: %s", domain, name, exc)
+            self._fill_status_gaps(domain)
+            return
+        task = loop.create_task(self._async_bulk_status(domain, future))
+        self._bootstrap_tasks.add(task)
+        task.add_done_callback(self._bootstrap_tasks.discard)
 
-    def _queue_bootstrap_attribs(self, domain: str) -> None:
-        inv = self._kernel.state.inventory
-        if domain == "area" and inv.configured_areas:
-            for area_id in sorted(inv.configured_areas):
-                try:
-                    self._kernel.request(("area", "get_attribs"), area_id=area_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
-        elif domain == "zone" and inv.configured_zones:
-            for zone_id in sorted(inv.configured_zones):
-                try:
-                    self._kernel.request(("zone", "get_attribs"), zone_id=zone_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
-        elif domain == "output" and inv.configured_outputs:
-            for output_id in sorted(inv.configured_outputs):
-                try:
-                    self._kernel.request(("output", "get_attribs"), output_id=output_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
-        elif domain == "user" and inv.configured_users:
-            for user_id in sorted(inv.configured_users):
-                try:
-                    self._kernel.request(("user", "get_attribs"), user_id=user_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
-        elif domain == "keypad" and inv.configured_keypads:
-            for keypad_id in sorted(inv.configured_keypads):
-                try:
-                    self._kernel.request(("keypad", "get_attribs"), keypad_id=keypad_id)
-                except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                    continue
+    async def _async_bulk_status(self, domain: str, future: asyncio.Future[Any]) -> None:
+        """
+        Wait for a bulk status reply, then fill any gaps per entity.
+
+        Gaps: ids the reply did not cover (e.g., a later output block), or all ids
+        if the bulk request failed or timed out. Covered ids still missing a
+        field the bulk route cannot carry are then backfilled in the background.
+        """
+        try:
+            await future
+        except (E27Error, RuntimeError, ValueError) as exc:
+            self._log.debug("Bulk status for %s failed: %s", domain, exc)
+            self._fill_status_gaps(domain)
+            return
+        covered = self._configured_ids(domain) - self._status_pending.get(domain, set())
+        self._fill_status_gaps(domain)
+        self._backfill_status(domain, covered)
+
+    def _backfill_status(self, domain: str, ids: Iterable[int]) -> None:
+        bulk = BULK_STATUS_ROUTES.get(domain)
+        entities: Mapping[int, object] | None = {
+            "zone": self._kernel.state.zones,
+            "output": self._kernel.state.outputs,
+        }.get(domain)
+        if bulk is None or not bulk.backfill or entities is None:
+            return
+        missing = [
+            entity_id
+            for entity_id in ids
+            if any(getattr(entities.get(entity_id), name, None) is None for name in bulk.backfill)
+        ]
+        if missing:
+            self._run_bootstrap_steps(status_backfill_steps(domain, missing))
+
+    def _fill_status_gaps(self, domain: str) -> None:
+        pending = self._status_pending.get(domain)
+        if not pending or self._status_ready.get(domain):
+            return
+        self._run_bootstrap_steps(status_gap_steps(domain, pending))
+
+    def _resolve_warm_domain(self, domain: str, table_csm: int | None) -> None:
+        """
+        Decide whether a warm-started domain can be trusted, once its table_csm is known.
+        """
+        warm = self._warm_config
+        if warm is None or domain not in self._warm_pending:
+            return
+        self._warm_pending.discard(domain)
+        if warm.is_fresh(domain, table_csm):
+            if self._log.isEnabledFor(logging.DEBUG):
+                self._log.debug("Using cached %s configuration (table_csm=%s)", domain, table_csm)
+            self._mark_inventory_ready(domain, warm=True)
+            return
+        cached = warm.domains.get(domain)
+        self._log.info(
+            "Cached %s configuration is stale (table_csm %s -> %s); refetching",
+            domain,
+            cached.table_csm if cached is not None else None,
+            table_csm,
+        )
+        try:
+            self._kernel.bootstrap_domain(domain)
+        except (E27Error, KernelError, KeyError, RuntimeError, TypeError, ValueError) as exc:
+            self._log.warning("Failed to refetch %s configuration: %s", domain, exc)
+
+    async def _load_warm_config(self, panel_key: str) -> PanelConfig | None:
+        cache = self._config_cache
+        if cache is None:
+            return None
+        try:
+            return await asyncio.to_thread(cache.load, panel_key)
+        except Exception as exc:  # noqa: BLE001
+            self._log.warning("Ignoring unreadable config cache entry for %s: %s", panel_key, exc)
+            return None
+
+    async def _save_config_cache(self) -> None:
+        cache = self._config_cache
+        panel_key = self._config_cache_key
+        if cache is None or panel_key is None:
+            return
+        config = capture_panel_config(self._kernel.state, panel_key)
+        if not config.domains:
+            return
+        try:
+            await asyncio.to_thread(cache.save, config)
+        except Exception as exc:  # noqa: BLE001
+            self._log.warning("Failed to save config cache for %s: %s", panel_key, exc)
+
+    def _schedule_config_save(self) -> None:
+        if self._config_cache is None or self._config_cache_key is None:
+            return
+        if self._config_save_task is not None and not self._config_save_task.done():
+            return
+        loop = self._event_loop
+        if loop is None or loop.is_closed():
+            return
+        self._config_save_task = loop.create_task(self._save_config_cache())
 
     def _refresh_bypassed_zones_for_area(self, area_id: int) -> None:
         if area_id < 1:
@@ -849,7 +1383,7 @@ class Elke27Client:
 
     def _handle_kernel_event(self, evt: Event) -> None:
         event_type = self._map_event_type(evt)
-        data = redact_for_diagnostics(asdict(evt))
+        data = redact_for_diagnostics(_event_data(evt))
         seq = self._next_event_seq(evt)
         timestamp = datetime.now(UTC)
         reconnect_window_s = 600.0
@@ -898,6 +1432,10 @@ class Elke27Client:
                     evt.error_type,
                 )
                 self._last_disconnect_at = self._now_monotonic()
+                if self._response_cache is not None:
+                    self._response_cache.clear()
+                if self._optimistic is not None:
+                    self._optimistic.clear()
                 self._reconnect_csm_snapshot = self._kernel.state.csm_snapshot
                 self._awaiting_reconnect_csm_check = False
                 disconnected_evt = Elke27Event(
@@ -928,15 +1466,23 @@ class Elke27Client:
         elif isinstance(evt, OutputConfiguredInventoryReady):
             self._mark_inventory_ready("output")
         elif isinstance(evt, UserConfiguredInventoryReady):
-            self._queue_bootstrap_attribs("user")
+            if not self._refresh_new_entities("user"):
+                self._queue_bootstrap_attribs("user")
         elif isinstance(evt, KeypadConfiguredInventoryReady):
-            self._queue_bootstrap_attribs("keypad")
+            if not self._refresh_new_entities("keypad"):
+                self._queue_bootstrap_attribs("keypad")
+        elif isinstance(evt, AreaConfiguredUpdated):
+            self._refresh_new_entities("area")
+        elif isinstance(evt, ZoneConfiguredUpdated):
+            self._refresh_new_entities("zone")
+        elif isinstance(evt, OutputConfiguredUpdated):
+            self._refresh_new_entities("output")
         elif isinstance(evt, AreaStatusUpdated):
             self._mark_status_seen("area", [evt.area_id])
-            if not evt.changed_fields:
+            if not evt.changed_mask:
                 self._refresh_all_zone_statuses_for_bypass_change(evt.area_id)
                 skip_snapshot_update = True
-            if "num_bypassed_zones" in evt.changed_fields:
+            if evt.changed_mask & _AREA_NUM_BYPASSED_BIT:
                 suppress_refresh = self._should_suppress_area_bypass_refresh(evt.area_id)
                 area = self._kernel.state.areas.get(evt.area_id)
                 if (
@@ -962,20 +1508,43 @@ class Elke27Client:
             self._mark_status_seen("output", [evt.output_id])
         elif isinstance(evt, OutputsStatusBulkUpdated):
             self._mark_status_seen("output", evt.updated_ids)
+        elif isinstance(evt, AreaAttribsUpdated):
+            self._mark_attribs_seen("area", [evt.area_id])
+        elif isinstance(evt, ZoneAttribsUpdated):
+            self._mark_attribs_seen("zone", [evt.zone_id])
+        elif isinstance(evt, OutputAttribsUpdated):
+            self._mark_attribs_seen("output", [evt.output_id])
+        elif isinstance(evt, AreaTableInfoUpdated):
+            self._resolve_warm_domain("area", evt.table_csm)
+        elif isinstance(evt, ZoneTableInfoUpdated):
+            self._resolve_warm_domain("zone", evt.table_csm)
+        elif isinstance(evt, OutputTableInfoUpdated):
+            self._resolve_warm_domain("output", evt.table_csm)
+        elif isinstance(evt, ApiError) and evt.route[1] == "get_table_info":
+            # No table_csm to compare against; treat any warm-started domain as stale.
+            if evt.scope is not None:
+                self._resolve_warm_domain(evt.scope, None)
+        elif isinstance(evt, (DomainCsmChanged, TableCsmChanged)):
+            if self._response_cache is not None:
+                self._response_cache.invalidate_domain(evt.csm_domain)
         elif isinstance(evt, CsmSnapshotUpdated):
             if self._awaiting_reconnect_csm_check:
-                baseline = self._reconnect_csm_snapshot
-                snapshot = evt.snapshot
-                changed = True
-                if baseline is not None:
-                    changed = dict(baseline.domain_csms) != dict(snapshot.domain_csms) or dict(
-                        baseline.table_csms
-                    ) != dict(snapshot.table_csms)
-                if changed:
-                    self._safe_request(("zone", "get_all_zones_status"))
+                diff = diff_csm_snapshots(self._reconnect_csm_snapshot, evt.snapshot)
+                self._submit_csm_refresh(diff)
                 self._awaiting_reconnect_csm_check = False
                 self._reconnect_csm_snapshot = None
 
+        if isinstance(evt, AreaStatusUpdated):
+            self._reconcile_optimistic("area", [evt.area_id])
+        elif isinstance(evt, ZoneStatusUpdated):
+            self._reconcile_optimistic("zone", [evt.zone_id])
+        elif isinstance(evt, ZonesStatusBulkUpdated):
+            self._reconcile_optimistic("zone", evt.updated_ids)
+        elif isinstance(evt, OutputStatusUpdated):
+            self._reconcile_optimistic("output", [evt.output_id])
+        elif isinstance(evt, OutputsStatusBulkUpdated):
+            self._reconcile_optimistic("output", evt.updated_ids)
+
         if evt.kind in {
             PanelVersionInfoUpdated.KIND,
             AreaTableInfoUpdated.KIND,
@@ -985,6 +1554,7 @@ class Elke27Client:
             AreaStatusUpdated.KIND,
             AreaAttribsUpdated.KIND,
             ZoneAttribsUpdated.KIND,
+            OutputAttribsUpdated.KIND,
             ZoneDefsUpdated.KIND,
             ZoneDefFlagsUpdated.KIND,
             ZonesStatusBulkUpdated.KIND,
@@ -1121,15 +1691,36 @@ class Elke27Client:
         self._event_loop = asyncio.get_running_loop()
         self._ensure_kernel_subscription()
         identity = self._v2_client_identity or self._default_identity()
-        session_cfg = SessionConfig(host=host, port=port, wire_log=True)
+        if self._wire_capture_path and self._wire_recorder is None:
+            self._wire_recorder = WireRecorder(
+                self._wire_capture_path, max_bytes=self._wire_capture_max_bytes
+            )
+        session_cfg = SessionConfig(
+            host=host,
+            port=port,
+            wire_log=True,
+            capture=self._wire_recorder,
+            loop_io=self._loop_io,
+        )
+        connect_kwargs: dict[str, Any] = {}
+        if self._config_cache is not None:
+            self._config_cache_key = f"{host}:{port}"
+            warm_config = await self._load_warm_config(self._config_cache_key)
+            if warm_config is not None and warm_config.domains:
+                connect_kwargs["warm_start"] = warm_config
         connect_exc: BaseException | None = None
         for attempt in range(2):
+            warm_config = connect_kwargs.get("warm_start")
+            if warm_config is not None:
+                self._warm_config = warm_config
+                self._warm_pending = set(warm_config.domains)
             try:
                 await self._kernel.connect(
                     self._coerce_link_keys(link_keys),
                     panel={"host": host, "port": port},
                     client_identity=identity,
                     session_config=session_cfg,
+                    **connect_kwargs,
                 )
                 connect_exc = None
                 break
@@ -1158,10 +1749,16 @@ class Elke27Client:
 
     async def async_disconnect(self) -> None:
         """Disconnect the current session (v2 public API)."""
+        if self._connected:
+            await self._save_config_cache()
         try:
             await self._kernel.close()
         except BaseException as exc:  # noqa: BLE001
             self._raise_v2_error(exc, phase="disconnect")
+        finally:
+            if self._wire_recorder is not None:
+                recorder, self._wire_recorder = self._wire_recorder, None
+                await asyncio.to_thread(recorder.close)
         self._connected = False
         self._reset_bootstrap_state()
         self._signal_event_stream_end()
@@ -1244,6 +1841,62 @@ class Elke27Client:
         else:
             raise Elke27InvalidArgument(f"Unsupported domain for refresh: {domain}")
 
+    async def async_refresh_csm_diff(self, diff: CsmDiff) -> tuple[RefreshRequest, ...]:
+        """
+        Refresh only the domains changed in diff, at background priority (v2 public API).
+
+        Returns the submitted plan; requests already queued or in flight are not resent.
+        """
+        if not self._connected or not self._kernel.state.panel.connected:
+            raise Elke27DisconnectedError("Client is not connected.")
+        return self._submit_csm_refresh(diff)
+
+    def _submit_csm_refresh(self, diff: CsmDiff) -> tuple[RefreshRequest, ...]:
+        plan = plan_config_refresh(diff)
+        for domain in planned_inventory_domains(plan):
+            self._refresh_baselines.setdefault(domain, frozenset(self._configured_ids(domain)))
+        if plan and self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug(
+                "CSM refresh plan: %s", ", ".join(f"{d}.{n}" for d, n in (r.route for r in plan))
+            )
+        self._submit_refresh_requests(plan)
+        return plan
+
+    def _refresh_new_entities(self, domain: str) -> bool:
+        """
+        Request attribs/status for ids added since a CSM-driven refresh began.
+
+        Returns False if no refresh was pending for domain.
+        """
+        before = self._refresh_baselines.pop(domain, None)
+        if before is None:
+            return False
+        after = self._configured_ids(domain)
+        self._submit_refresh_requests(plan_new_entity_requests(domain, before, after))
+        return True
+
+    def _submit_refresh_requests(self, plan: Iterable[RefreshRequest]) -> None:
+        for req in plan:
+            if self._kernel.requests.get(req.route) is None:
+                continue
+            try:
+                self._kernel.request_unless_pending(
+                    req.route, priority=OutboundPriority.LOW, **req.kwargs()
+                )
+            except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
+                continue
+
+    def _configured_ids(self, domain: str) -> set[int]:
+        inv = self._kernel.state.inventory
+        ids = {
+            "area": inv.configured_areas,
+            "zone": inv.configured_zones,
+            "output": inv.configured_outputs,
+            "user": inv.configured_users,
+            "keypad": inv.configured_keypads,
+        }.get(domain)
+        return set(ids) if ids is not None else set()
+
     def _refresh_area_config(self) -> None:
         self._safe_request(("area", "get_table_info"))
         self._safe_request(("area", "get_configured"), block_id=1)
@@ -1416,6 +2069,231 @@ class Elke27Client:
         *,
         timeout_s: float | None = None,
         **params: Any,
+    ) -> Result[Mapping[str, Any]]:
+        optimistic = self._begin_optimistic(command_key, params)
+        if optimistic is None:
+            return await self._async_execute(command_key, timeout_s=timeout_s, **params)
+        ok = False
+        try:
+            result = await self._async_execute(command_key, timeout_s=timeout_s, **params)
+            ok = result.ok
+        finally:
+            self._finish_optimistic(optimistic, ok=ok)
+        return result
+
+    async def async_execute_many(
+        self,
+        commands: Iterable[tuple[str, Mapping[str, Any]]],
+        /,
+        *,
+        pin: int | str | None = None,
+        timeout_s: float | None = None,
+    ) -> list[Result[Mapping[str, Any]]]:
+        """
+        Execute a batch of (command_key, params) and return one Result per item, in order.
+
+        Every item is validated (command key, session, disarmed gate, PIN) and built
+        before anything is sent. pin is filled in for any item that requires a PIN,
+        or takes one (e.g., zone bypass), and has none of its own. If an item
+        requires user authority but its request carries no pin field, the panel
+        checks the session instead: the batch then authenticates once before
+        submitting, using that item's PIN. Such items must all carry the same PIN;
+        if they do not, each of them gets an InvalidPinError and none is sent.
+        The valid items are then queued together, back to back, and their replies
+        are awaited concurrently. The panel still answers one request at a time.
+
+        Partial failure: items succeed or fail independently, and nothing is rolled
+        back.
+        - An item that fails validation gets an error Result and is not sent; the
+          rest of the batch still runs.
+        - A timeout or error reply for one item does not cancel the others.
+        - If authentication fails, every item that needed it gets that error.
+        - If the connection drops, the items still queued fail with the kernel's
+          error.
+
+        Paged commands, *_get_attribs (which may first fetch the configured list)
+        and control_authenticate run one by one via async_execute after the batch.
+        """
+        entries = [(command_key, dict(params)) for command_key, params in commands]
+        results: list[Result[Mapping[str, Any]] | None] = [None] * len(entries)
+        permission_levels: dict[str, PermissionLevel] = {}
+        disarmed: list[bool] = []
+
+        def _all_disarmed() -> bool:
+            if not disarmed:
+                disarmed.append(self._all_areas_disarmed())
+            return disarmed[0]
+
+        prepared: list[_BatchItem] = []
+        sequential: list[int] = []
+        cache = self._response_cache
+        for index, (command_key, params) in enumerate(entries):
+            missing_pin = pin is not None and params.get("pin") in (None, "")
+            spec = COMMANDS.get(command_key)
+            if command_key == "control_authenticate" or (
+                spec is not None
+                and (spec.response_mode != "single" or spec.command == "get_attribs")
+            ):
+                if missing_pin:
+                    params["pin"] = pin
+                sequential.append(index)
+                continue
+            if spec is None:
+                results[index] = _err(ProtocolError(f"Unknown command_key={command_key!r}"))
+                continue
+            level = permission_levels.get(spec.key)
+            if level is None:
+                try:
+                    level = permission_levels[spec.key] = self._permission_level(spec)
+                except Elke27ProtocolErrorV2 as exc:
+                    results[index] = _err(exc)
+                    continue
+            if missing_pin and (requires_pin(level) or self._generator_takes_pin(spec)):
+                params["pin"] = pin
+            precheck_error = self._precheck_command(
+                command_key, level, params, all_disarmed=_all_disarmed
+            )
+            if precheck_error is not None:
+                results[index] = _err(precheck_error)
+                continue
+
+            cache_key = (
+                make_cache_key(command_key, params)
+                if cache is not None and is_cacheable_command(spec)
+                else None
+            )
+            cache_generation = (0, 0)
+            if cache is not None and cache_key is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    results[index] = _ok(cached)
+                    continue
+                cache_generation = cache.generation(spec.domain)
+
+            params_for_generator = self._coerce_pin_for_generator(spec, params)
+            try:
+                payload, expected_route = spec.generator(**params_for_generator)
+            except NotImplementedError as exc:
+                results[index] = _err(exc)
+                continue
+            except _CLIENT_EXCEPTIONS as exc:
+                detail = f"command_key={command_key}"
+                results[index] = _err(self._normalize_error(exc, phase="execute", detail=detail))
+                continue
+            prepared.append(
+                _BatchItem(
+                    index=index,
+                    command_key=command_key,
+                    spec=spec,
+                    params=params,
+                    payload=payload,
+                    expected_route=expected_route,
+                    cache_key=cache_key,
+                    cache_generation=cache_generation,
+                    needs_auth=requires_pin(level) and "pin" not in params_for_generator,
+                )
+            )
+
+        auth_items = [item for item in prepared if item.needs_auth]
+        auth_pins = {int(item.params["pin"]) for item in auth_items}
+        if len(auth_pins) > 1:
+            # One session holds one user's authority; never run an item under another PIN.
+            conflict = InvalidPinError(
+                "Batch items that need session authority must share one PIN."
+            )
+            for item in auth_items:
+                results[item.index] = _err(conflict)
+            prepared = [item for item in prepared if not item.needs_auth]
+        elif auth_pins:
+            auth_pin = auth_pins.pop()
+            auth = await self._async_authenticate(pin=auth_pin, timeout_s=timeout_s)
+            if auth.ok:
+                self._last_auth_pin = auth_pin
+            else:
+                auth_error = auth.error or E27Error("Authenticate failed.")
+                for item in auth_items:
+                    results[item.index] = _err(auth_error)
+                prepared = [item for item in prepared if not item.needs_auth]
+
+        loop = asyncio.get_running_loop()
+        waits: list[Awaitable[Result[Mapping[str, Any]]]] = []
+        waiting: list[int] = []
+        # Submit everything before awaiting anything, so the batch is queued back to back.
+        for item in prepared:
+            optimistic = self._begin_optimistic(item.command_key, item.params)
+            if item.spec.key == "zone_set_status":
+                zone_id = item.params.get("zone_id")
+                if isinstance(zone_id, int) and zone_id > 0:
+                    self._record_local_zone_bypass(zone_id)
+            try:
+                seq, future, sent_event = self._kernel.submit_for_response(
+                    item.spec.domain,
+                    item.spec.command,
+                    item.payload,
+                    command_key=item.command_key,
+                    expected_route=item.expected_route,
+                    timeout_s=timeout_s,
+                    loop=loop,
+                )
+            except _CLIENT_EXCEPTIONS as exc:
+                if optimistic is not None:
+                    self._finish_optimistic(optimistic, ok=False)
+                detail = f"command_key={item.command_key}"
+                results[item.index] = _err(
+                    self._normalize_error(exc, phase="execute", detail=detail)
+                )
+                continue
+            waits.append(
+                self._await_batch_reply(item, seq, future, sent_event, timeout_s, optimistic)
+            )
+            waiting.append(item.index)
+        for index, result in zip(waiting, await asyncio.gather(*waits), strict=True):
+            results[index] = result
+
+        for index in sequential:
+            command_key, params = entries[index]
+            results[index] = await self.async_execute(command_key, timeout_s=timeout_s, **params)
+        return [
+            result if result is not None else _err(E27Error("Batch item was not executed."))
+            for result in results
+        ]
+
+    async def _await_batch_reply(
+        self,
+        item: _BatchItem,
+        seq: int,
+        future: asyncio.Future[Mapping[str, Any]],
+        sent_event: asyncio.Event,
+        timeout_s: float | None,
+        optimistic: OptimisticEntry | None,
+    ) -> Result[Mapping[str, Any]]:
+        try:
+            result = await self._await_single_reply(
+                item.spec,
+                item.command_key,
+                seq,
+                future,
+                sent_event,
+                timeout_s,
+                item.expected_route,
+                item.cache_key,
+                item.cache_generation,
+            )
+        except BaseException:
+            if optimistic is not None:
+                self._finish_optimistic(optimistic, ok=False)
+            raise
+        if optimistic is not None:
+            self._finish_optimistic(optimistic, ok=result.ok)
+        return result
+
+    async def _async_execute(
+        self,
+        command_key: str,
+        /,
+        *,
+        timeout_s: float | None = None,
+        **params: Any,
     ) -> Result[Mapping[str, Any]]:
         if command_key == "control_authenticate":
             try:
@@ -1448,31 +2326,28 @@ class Elke27Client:
         if spec is None:
             return _err(ProtocolError(f"Unknown command_key={command_key!r}"))
 
-        canonical_key = canonical_generator_key(spec.generator.__name__)
         try:
-            permission_level = permission_for_generator(canonical_key)
+            permission_level = self._permission_level(spec)
         except Elke27ProtocolErrorV2 as exc:
             return _err(exc)
-
-        permission_error = self._enforce_permissions(command_key, permission_level)
-        if permission_error is not None:
-            return _err(permission_error)
-
-        if requires_disarmed(permission_level) and not self._all_areas_disarmed():
-            return _err(Elke27PermissionError("This action requires all areas to be disarmed."))
-
-        if requires_pin(permission_level):
-            pin_value = params.get("pin")
-            if pin_value is None or (isinstance(pin_value, str) and not pin_value):
-                return _err(Elke27PinRequiredError())
-            if isinstance(pin_value, str):
-                if not pin_value.isdigit():
-                    return _err(InvalidPinError("PIN must be a non-empty digit string."))
-            elif isinstance(pin_value, int):
-                if pin_value <= 0:
-                    return _err(InvalidPinError("PIN must be a positive integer."))
-            else:
-                return _err(InvalidPinError("PIN must be a non-empty digit string."))
+        precheck_error = self._precheck_command(
+            command_key, permission_level, params, all_disarmed=self._all_areas_disarmed
+        )
+        if precheck_error is not None:
+            return _err(precheck_error)
+
+        cache = self._response_cache
+        cache_key = (
+            make_cache_key(command_key, params)
+            if cache is not None and is_cacheable_command(spec)
+            else None
+        )
+        cache_generation = (0, 0)
+        if cache is not None and cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return _ok(cached)
+            cache_generation = cache.generation(spec.domain)
 
         if spec.response_mode == "single":
             if spec.key == "area_get_attribs":
@@ -1557,70 +2432,31 @@ class Elke27Client:
                     self._record_local_zone_bypass(zone_id)
 
             loop = asyncio.get_running_loop()
-            seq = self._kernel.next_seq()
-            future = self._kernel.pending_responses.create(
-                seq,
-                command_key=command_key,
-                expected_route=expected_route,
-                loop=loop,
-            )
-            sent_event = asyncio.Event()
-            self._kernel.register_sent_event(seq, sent_event)
-            timeout_value = (
-                timeout_s
-                if timeout_s is not None
-                else getattr(self._kernel, "_request_timeout_s", 5.0)
-            )
-
             try:
-                self._kernel.send_request_with_seq(
-                    seq,
+                seq, future, sent_event = self._kernel.submit_for_response(
                     spec.domain,
                     spec.command,
                     payload,
-                    pending=False,
-                    opaque=None,
+                    command_key=command_key,
                     expected_route=expected_route,
-                    timeout_s=timeout_value,
-                )
-            except _CLIENT_EXCEPTIONS as exc:
-                self._kernel.pending_responses.drop(seq)
-                detail = f"command_key={command_key} seq={seq}"
-                return _err(self._normalize_error(exc, phase="execute", detail=detail))
-
-            try:
-                await sent_event.wait()
-                msg = await asyncio.wait_for(future, timeout=timeout_value)
-            except TimeoutError:
-                self._kernel.pending_responses.drop(seq)
-                return _err(
-                    E27Timeout(f"async_execute timeout waiting for {command_key} seq={seq}")
+                    timeout_s=timeout_s,
+                    loop=loop,
                 )
-            except asyncio.CancelledError:
-                self._kernel.pending_responses.drop(seq)
-                raise
             except _CLIENT_EXCEPTIONS as exc:
-                self._kernel.pending_responses.drop(seq)
-                detail = f"command_key={command_key} seq={seq}"
+                detail = f"command_key={command_key}"
                 return _err(self._normalize_error(exc, phase="execute", detail=detail))
 
-            if not self._has_expected_payload(msg, expected_route):
-                return _err(
-                    ProtocolError(
-                        f"{command_key} missing response payload for {expected_route[0]}.{expected_route[1]}"
-                    )
-                )
-
-            error_code = self._extract_error_code(msg, expected_route)
-            if error_code is not None:
-                if error_code == 11008:
-                    return _err(
-                        AuthorizationRequired("Authorization is required for this operation.")
-                    )
-                return _err(E27Error(f"{command_key} failed with error_code={error_code}"))
-
-            response_payload = self._extract_response_payload(msg, expected_route)
-            return _ok(response_payload)
+            return await self._await_single_reply(
+                spec,
+                command_key,
+                seq,
+                future,
+                sent_event,
+                timeout_s,
+                expected_route,
+                cache_key,
+                cache_generation,
+            )
 
         if spec.response_mode != "paged_blocks":
             return _err(ProtocolError(f"Command {command_key!r} has unsupported response_mode."))
@@ -1653,49 +2489,36 @@ class Elke27Client:
                 return _err(self._normalize_error(exc, phase="execute", detail=detail))
 
             loop = asyncio.get_running_loop()
-            seq = self._kernel.next_seq()
-            future = self._kernel.pending_responses.create(
-                seq,
-                command_key=command_key,
-                expected_route=expected_route,
-                loop=loop,
-            )
-            sent_event = asyncio.Event()
-            self._kernel.register_sent_event(seq, sent_event)
             timeout_value = (
-                timeout_s
-                if timeout_s is not None
-                else getattr(self._kernel, "_request_timeout_s", 5.0)
+                timeout_s if timeout_s is not None else self._kernel.max_request_timeout_s
             )
             try:
-                self._kernel.send_request_with_seq(
-                    seq,
+                seq, future, sent_event = self._kernel.submit_for_response(
                     spec.domain,
                     spec.command,
                     payload,
-                    pending=False,
-                    opaque=None,
+                    command_key=command_key,
                     expected_route=expected_route,
-                    timeout_s=timeout_value,
+                    timeout_s=timeout_s,
+                    loop=loop,
                 )
             except _CLIENT_EXCEPTIONS as exc:
-                self._kernel.pending_responses.drop(seq)
-                detail = f"command_key={command_key} seq={seq}"
+                detail = f"command_key={command_key}"
                 return _err(self._normalize_error(exc, phase="execute", detail=detail))
 
             try:
                 await sent_event.wait()
                 msg = await asyncio.wait_for(future, timeout=timeout_value)
             except TimeoutError:
-                self._kernel.pending_responses.drop(seq)
+                self._kernel.pending_responses.drop(seq, future)
                 return _err(
                     E27Timeout(f"async_execute timeout waiting for {command_key} seq={seq}")
                 )
             except asyncio.CancelledError:
-                self._kernel.pending_responses.drop(seq)
+                self._kernel.pending_responses.drop(seq, future)
                 raise
             except _CLIENT_EXCEPTIONS as exc:
-                self._kernel.pending_responses.drop(seq)
+                self._kernel.pending_responses.drop(seq, future)
                 detail = f"command_key={command_key} seq={seq}"
                 return _err(self._normalize_error(exc, phase="execute", detail=detail))
 
@@ -1736,8 +2559,116 @@ class Elke27Client:
         except Exception as exc:
             return _err(ProtocolError(f"{command_key} merge failed: {exc}"))
 
+        self._update_response_cache(spec, cache_key, cache_generation, merged_payload)
         return _ok(merged_payload)
 
+    @staticmethod
+    def _permission_level(spec: CommandSpec) -> PermissionLevel:
+        return permission_for_generator(canonical_generator_key(spec.generator.__name__))
+
+    def _precheck_command(
+        self,
+        command_key: str,
+        permission_level: PermissionLevel,
+        params: Mapping[str, Any],
+        *,
+        all_disarmed: Callable[[], bool],
+    ) -> BaseException | None:
+        """Session, disarmed-panel and PIN checks that run before a command is built."""
+        permission_error = self._enforce_permissions(command_key, permission_level)
+        if permission_error is not None:
+            return permission_error
+
+        if requires_disarmed(permission_level) and not all_disarmed():
+            return Elke27PermissionError("This action requires all areas to be disarmed.")
+
+        if requires_pin(permission_level):
+            pin_value = params.get("pin")
+            if pin_value is None or (isinstance(pin_value, str) and not pin_value):
+                return Elke27PinRequiredError()
+            if isinstance(pin_value, str):
+                if not pin_value.isdigit():
+                    return InvalidPinError("PIN must be a non-empty digit string.")
+            elif isinstance(pin_value, int):
+                if pin_value <= 0:
+                    return InvalidPinError("PIN must be a positive integer.")
+            else:
+                return InvalidPinError("PIN must be a non-empty digit string.")
+        return None
+
+    async def _await_single_reply(
+        self,
+        spec: CommandSpec,
+        command_key: str,
+        seq: int,
+        future: asyncio.Future[Mapping[str, Any]],
+        sent_event: asyncio.Event,
+        timeout_s: float | None,
+        expected_route: RouteKey,
+        cache_key: CacheKey | None,
+        cache_generation: tuple[int, int],
+    ) -> Result[Mapping[str, Any]]:
+        # Without an explicit timeout the kernel arms its adaptive reply timeout;
+        # wait no longer than the longest it can be.
+        timeout_value = timeout_s if timeout_s is not None else self._kernel.max_request_timeout_s
+        try:
+            await sent_event.wait()
+            msg = await asyncio.wait_for(future, timeout=timeout_value)
+        except TimeoutError:
+            self._kernel.pending_responses.drop(seq, future)
+            return _err(E27Timeout(f"async_execute timeout waiting for {command_key} seq={seq}"))
+        except asyncio.CancelledError:
+            self._kernel.pending_responses.drop(seq, future)
+            raise
+        except _CLIENT_EXCEPTIONS as exc:
+            self._kernel.pending_responses.drop(seq, future)
+            detail = f"command_key={command_key} seq={seq}"
+            return _err(self._normalize_error(exc, phase="execute", detail=detail))
+        return self._single_reply_result(
+            spec, command_key, msg, expected_route, cache_key, cache_generation
+        )
+
+    def _single_reply_result(
+        self,
+        spec: CommandSpec,
+        command_key: str,
+        msg: Mapping[str, Any],
+        expected_route: RouteKey,
+        cache_key: CacheKey | None,
+        cache_generation: tuple[int, int],
+    ) -> Result[Mapping[str, Any]]:
+        if not self._has_expected_payload(msg, expected_route):
+            return _err(
+                ProtocolError(
+                    f"{command_key} missing response payload for {expected_route[0]}.{expected_route[1]}"
+                )
+            )
+
+        error_code = self._extract_error_code(msg, expected_route)
+        if error_code is not None:
+            if error_code == 11008:
+                return _err(AuthorizationRequired("Authorization is required for this operation."))
+            return _err(E27Error(f"{command_key} failed with error_code={error_code}"))
+
+        response_payload = self._extract_response_payload(msg, expected_route)
+        self._update_response_cache(spec, cache_key, cache_generation, response_payload)
+        return _ok(response_payload)
+
+    def _update_response_cache(
+        self,
+        spec: CommandSpec,
+        cache_key: CacheKey | None,
+        generation: tuple[int, int],
+        payload: Mapping[str, Any],
+    ) -> None:
+        cache = self._response_cache
+        if cache is None:
+            return
+        if cache_key is not None:
+            cache.put(cache_key, spec.domain, payload, generation=generation)
+        elif is_config_write(spec):
+            cache.invalidate_domain(spec.domain)
+
     def _request_authenticate(
         self,
         route: RouteKey,
@@ -2033,6 +2964,13 @@ class Elke27Client:
             return NotAuthenticatedError(f"{command_key}: missing session/encryption key.")
         return None
 
+    @staticmethod
+    def _generator_takes_pin(spec: CommandSpec) -> bool:
+        try:
+            return "pin" in inspect.signature(spec.generator).parameters
+        except (TypeError, ValueError):
+            return False
+
     @staticmethod
     def _coerce_pin_for_generator(spec: CommandSpec, params: Mapping[str, Any]) -> dict[str, Any]:
         coerced = dict(params)
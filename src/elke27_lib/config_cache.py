@@ -0,0 +1,376 @@
+"""
+elke27_lib/config_cache.py
+
+Warm-start cache of panel configuration (opt-in, caller-provided path).
+
+What is cached (per panel, keyed by a caller-chosen panel key such as "host:port"):
+- table_info and table_csm for the area/zone/output domains
+- configured inventory ids
+- per-entity configuration loaded via get_attribs (names, zone area/definition)
+- zone definitions (zone.get_defs)
+
+What is NOT cached:
+- live status (arm state, zone violated/bypassed, output on/off)
+- PINs, link keys, or any other credential material
+
+A cached domain is only trusted when the panel reports the same table_csm on
+connect; otherwise the domain is refetched from the panel (ADR-0114, ADR-0123).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from .states import PanelState
+
+LOG = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# Domains whose configuration can be validated by table_csm at connect time.
+CACHED_DOMAINS: tuple[str, ...] = ("area", "zone", "output")
+
+_ENTITY_FIELDS: dict[str, tuple[str, ...]] = {
+    "area": ("name",),
+    "zone": ("name", "area_id", "definition", "flags", "attribs"),
+    "output": ("name",),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class DomainConfig:
+    """
+    Cached configuration for a single domain (treat as immutable).
+    """
+
+    table_csm: int
+    table_info: Mapping[str, object]
+    configured_ids: tuple[int, ...]
+    entities: Mapping[int, Mapping[str, object]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class PanelConfig:
+    """
+    Cached configuration for one panel (treat as immutable).
+    """
+
+    panel_key: str
+    domains: Mapping[str, DomainConfig]
+    zone_defs: Mapping[int, Mapping[str, object]] = field(default_factory=dict)
+    saved_at: float = 0.0
+
+    def is_fresh(self, domain: str, table_csm: int | None) -> bool:
+        """Return True if the cached domain matches the panel's current table_csm."""
+        cached = self.domains.get(domain)
+        if cached is None or table_csm is None:
+            return False
+        return cached.table_csm == table_csm
+
+    def to_json(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "version": CACHE_FORMAT_VERSION,
+            "panel_key": self.panel_key,
+            "saved_at": self.saved_at,
+            "domains": {
+                domain: {
+                    "table_csm": cfg.table_csm,
+                    "table_info": dict(cfg.table_info),
+                    "configured_ids": list(cfg.configured_ids),
+                    "entities": {str(k): dict(v) for k, v in cfg.entities.items()},
+                }
+                for domain, cfg in self.domains.items()
+            },
+            "zone_defs": {str(k): dict(v) for k, v in self.zone_defs.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> PanelConfig:
+        """Create a PanelConfig from to_json() output; raises ValueError if malformed."""
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported config cache version {data.get('version')!r}")
+        panel_key = data.get("panel_key")
+        if not isinstance(panel_key, str) or not panel_key:
+            raise ValueError("Config cache entry missing panel_key")
+        domains: dict[str, DomainConfig] = {}
+        for domain, raw in _mapping(data.get("domains")).items():
+            entry = _mapping(raw)
+            table_csm = entry.get("table_csm")
+            if domain not in CACHED_DOMAINS or not isinstance(table_csm, int):
+                continue
+            ids = entry.get("configured_ids")
+            domains[domain] = DomainConfig(
+                table_csm=table_csm,
+                table_info=dict(_mapping(entry.get("table_info"))),
+                configured_ids=tuple(
+                    sorted(i for i in cast(list[object], ids or []) if isinstance(i, int))
+                ),
+                entities=_int_keyed(entry.get("entities")),
+            )
+        saved_at = data.get("saved_at")
+        return cls(
+            panel_key=panel_key,
+            domains=domains,
+            zone_defs=_int_keyed(data.get("zone_defs")),
+            saved_at=float(saved_at) if isinstance(saved_at, (int, float)) else 0.0,
+        )
+
+
+def _mapping(obj: object) -> Mapping[str, Any]:
+    if isinstance(obj, Mapping):
+        return cast(Mapping[str, Any], obj)
+    return {}
+
+
+def _int_keyed(obj: object) -> dict[int, Mapping[str, object]]:
+    out: dict[int, Mapping[str, object]] = {}
+    for key, value in _mapping(obj).items():
+        try:
+            entity_id = int(key)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(value, Mapping):
+            out[entity_id] = dict(cast(Mapping[str, object], value))
+    return out
+
+
+# -------------------------
+# PanelState <-> PanelConfig
+# -------------------------
+
+
+def _configured_ids(state: PanelState, domain: str) -> tuple[set[int], bool]:
+    inv = state.inventory
+    if domain == "area":
+        return inv.configured_areas, inv.configured_areas_complete
+    if domain == "zone":
+        return inv.configured_zones, inv.configured_zones_complete
+    return inv.configured_outputs, inv.configured_outputs_complete
+
+
+def _entities(state: PanelState, domain: str) -> Mapping[int, Any]:
+    if domain == "area":
+        return state.areas
+    if domain == "zone":
+        return state.zones
+    return state.outputs
+
+
+def capture_panel_config(
+    state: PanelState, panel_key: str, *, saved_at: float | None = None
+) -> PanelConfig:
+    """
+    Capture the cacheable configuration from state.
+
+    Only domains with a known table_csm and a completed configured inventory are
+    captured; anything else could not be validated on the next connect.
+    """
+    domains: dict[str, DomainConfig] = {}
+    for domain in CACHED_DOMAINS:
+        table_csm = state.table_csm_by_domain.get(domain)
+        ids, complete = _configured_ids(state, domain)
+        if table_csm is None or not complete:
+            continue
+        entities: dict[int, Mapping[str, object]] = {}
+        source = _entities(state, domain)
+        for entity_id in sorted(ids):
+            entity = source.get(entity_id)
+            if entity is None:
+                continue
+            values: dict[str, object] = {}
+            for name in _ENTITY_FIELDS[domain]:
+                value = getattr(entity, name)
+                if value is None or value == {}:
+                    continue
+                values[name] = value
+            entities[entity_id] = values
+        domains[domain] = DomainConfig(
+            table_csm=table_csm,
+            table_info=dict(state.table_info_by_domain.get(domain) or {}),
+            configured_ids=tuple(sorted(ids)),
+            entities=entities,
+        )
+    zone_defs = dict(state.zone_defs_by_id) if "zone" in domains else {}
+    return PanelConfig(
+        panel_key=panel_key,
+        domains=domains,
+        zone_defs=zone_defs,
+        saved_at=time.time() if saved_at is None else saved_at,
+    )
+
+
+def restore_panel_config(state: PanelState, config: PanelConfig) -> None:
+    """
+    Restore cached configuration into state.
+
+    table_csm values are restored too, so a later get_table_info that reports a
+    different CSM surfaces as a normal TableCsmChanged event.
+    """
+    inv = state.inventory
+    for domain, cfg in config.domains.items():
+        state.table_info_by_domain[domain] = dict(cfg.table_info)
+        state.table_csm_by_domain[domain] = cfg.table_csm
+        ids = set(cfg.configured_ids)
+        if domain == "area":
+            inv.configured_areas = ids
+            inv.configured_areas_complete = True
+        elif domain == "zone":
+            inv.configured_zones = ids
+            inv.configured_zones_complete = True
+            state.zone_defs_by_id.update(
+                {def_id: dict(entry) for def_id, entry in config.zone_defs.items()}
+            )
+        elif domain == "output":
+            inv.configured_outputs = ids
+            inv.configured_outputs_complete = True
+        for entity_id in cfg.configured_ids:
+            if domain == "area":
+                entity: Any = state.get_or_create_area(entity_id)
+            elif domain == "zone":
+                entity = state.get_or_create_zone(entity_id)
+            else:
+                entity = state.get_or_create_output(entity_id)
+            for name, value in cfg.entities.get(entity_id, {}).items():
+                if name in _ENTITY_FIELDS[domain]:
+                    setattr(entity, name, value)
+
+
+# -------------------------
+# Storage backends
+# -------------------------
+
+
+class ConfigCache(ABC):
+    """
+    Pluggable storage for PanelConfig entries.
+
+    Implementations are blocking; the client calls them via asyncio.to_thread().
+    """
+
+    @abstractmethod
+    def load(self, panel_key: str) -> PanelConfig | None: ...
+
+    @abstractmethod
+    def save(self, config: PanelConfig) -> None: ...
+
+    @abstractmethod
+    def discard(self, panel_key: str) -> None: ...
+
+
+class JsonConfigCache(ConfigCache):
+    """
+    Single JSON file holding one entry per panel key (atomic replace on save).
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _read_all(self) -> dict[str, Any]:
+        try:
+            text = self._path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return {}
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("Config cache file is not a JSON object")
+        return cast(dict[str, Any], data)
+
+    def _write_all(self, data: Mapping[str, Any]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self._path)
+
+    def load(self, panel_key: str) -> PanelConfig | None:
+        with self._lock:
+            entry = self._read_all().get(panel_key)
+        if entry is None:
+            return None
+        return PanelConfig.from_json(_mapping(entry))
+
+    def save(self, config: PanelConfig) -> None:
+        with self._lock:
+            try:
+                data = self._read_all()
+            except ValueError:
+                data = {}
+            data[config.panel_key] = config.to_json()
+            self._write_all(data)
+
+    def discard(self, panel_key: str) -> None:
+        with self._lock:
+            data = self._read_all()
+            if data.pop(panel_key, None) is not None:
+                self._write_all(data)
+
+
+class SqliteConfigCache(ConfigCache):
+    """
+    SQLite-backed cache (one row per panel key, JSON payload column).
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _connect(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS panel_config ("
+            "panel_key TEXT PRIMARY KEY, saved_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        return conn
+
+    def load(self, panel_key: str) -> PanelConfig | None:
+        with self._lock, contextlib.closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT payload FROM panel_config WHERE panel_key = ?", (panel_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return PanelConfig.from_json(_mapping(json.loads(row[0])))
+
+    def save(self, config: PanelConfig) -> None:
+        payload = json.dumps(config.to_json(), sort_keys=True, separators=(",", ":"))
+        with self._lock, contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO panel_config (panel_key, saved_at, payload) "
+                "VALUES (?, ?, ?)",
+                (config.panel_key, config.saved_at, payload),
+            )
+
+    def discard(self, panel_key: str) -> None:
+        with self._lock, contextlib.closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM panel_config WHERE panel_key = ?", (panel_key,))
+
+
+def open_config_cache(path: str | os.PathLike[str]) -> ConfigCache:
+    """
+    Open a cache at path: SQLite for .db/.sqlite/.sqlite3 suffixes, JSON otherwise.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in {".db", ".sqlite", ".sqlite3"}:
+        return SqliteConfigCache(path)
+    return JsonConfigCache(path)
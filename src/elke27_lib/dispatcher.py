@@ -498,6 +498,12 @@ class Dispatcher:
         for key in expired:
             self._paged_transfers.pop(key, None)
 
+    def has_paged_transfer(self, route: RouteKey) -> bool:
+        """
+        Return True if a paged transfer for route is currently being reassembled.
+        """
+        return any(key.route == route for key in self._paged_transfers)
+
     def abort_paged_transfers(self) -> None:
         """
         Abort all in-progress paged transfers (e.g., on disconnect).
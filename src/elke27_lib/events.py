@@ -11,8 +11,8 @@ Rules:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
-from typing import TYPE_CHECKING, ClassVar
+from dataclasses import InitVar, dataclass, field, replace
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:
     from typing_extensions import override
@@ -22,6 +22,15 @@ else:
         return func
 
 
+from elke27_lib.states import (
+    AreaState,
+    FieldBits,
+    OutputState,
+    PanelMetaState,
+    TroubleState,
+    TstatState,
+    ZoneState,
+)
 from elke27_lib.types import CsmSnapshot
 
 RouteKey = tuple[str, str]
@@ -47,6 +56,68 @@ class Event:
         return self.route[0]
 
 
+class _ChangedFieldsAttr:
+    """
+    changed_fields on changed-field events: the InitVar default () on the class,
+    the lazily expanded name tuple on instances.
+    """
+
+    __slots__ = ()
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> tuple[str, ...]:
+        if obj is None:
+            return ()
+        return obj._expand_changed_fields()
+
+
+_CHANGED_FIELDS: Any = _ChangedFieldsAttr()
+
+
+class ChangedFieldsMixin:
+    """
+    Mixin for events that report changed state fields.
+
+    changed_mask uses the owning state class's FIELD_BITS. Handlers may also
+    pass changed_fields= with the keys of a free-form attribs/fields dict (they
+    have no bits of their own); __post_init__ folds every name into the mask and
+    keeps only those keys. changed_fields expands the mask plus keys into the
+    sorted name tuple on first access and caches it.
+    """
+
+    __slots__ = ()
+
+    FIELD_BITS: ClassVar[FieldBits]
+    changed_mask: int
+    _changed_keys: tuple[str, ...]
+    _changed_names: tuple[str, ...] | None
+
+    def __post_init__(self, changed_fields: tuple[str, ...]) -> None:
+        if not changed_fields:
+            return
+        bits = self.FIELD_BITS
+        mask = self.changed_mask
+        keys: list[str] = []
+        for name in changed_fields:
+            bit = bits.get(name)
+            if not bit:
+                bit = bits.dynamic_bit
+                keys.append(name)
+            mask |= bit
+        object.__setattr__(self, "changed_mask", mask)
+        object.__setattr__(self, "_changed_keys", tuple(keys))
+
+    def _expand_changed_fields(self) -> tuple[str, ...]:
+        names = self._changed_names
+        if names is None:
+            names = self.FIELD_BITS.names(self.changed_mask, self._changed_keys)
+            object.__setattr__(self, "_changed_names", names)
+        return names
+
+    def has_changed(self, name: str) -> bool:
+        bit = self.FIELD_BITS.get(name)
+        return bool(self.changed_mask & bit) if bit else name in self._changed_keys
+
+
 # Placeholder header values for handlers (optional convenience constants)
 UNSET_ROUTE: RouteKey = ("__unset__", "__unset__")
 UNSET_AT: float = 0.0
@@ -75,19 +146,31 @@ class ConnectionStateChanged(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class AreaStatusUpdated(Event):
+class AreaStatusUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "area_status_updated"
+    FIELD_BITS: ClassVar[FieldBits] = AreaState.FIELD_BITS
 
     area_id: int
-    changed_fields: tuple[str, ...]  # sorted tuple for deterministic tests/logs
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass(frozen=True, slots=True)
-class AreaAttribsUpdated(Event):
+class AreaAttribsUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "area_attribs_updated"
+    FIELD_BITS: ClassVar[FieldBits] = AreaState.FIELD_BITS
 
     area_id: int
-    changed_fields: tuple[str, ...]
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass(frozen=True, slots=True)
@@ -120,11 +203,17 @@ class ZoneConfiguredInventoryReady(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class ZoneStatusUpdated(Event):
+class ZoneStatusUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "zone_status_updated"
+    FIELD_BITS: ClassVar[FieldBits] = ZoneState.FIELD_BITS
 
     zone_id: int
-    changed_fields: tuple[str, ...]
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass(frozen=True, slots=True)
@@ -161,11 +250,17 @@ class ZoneDefFlagsUpdated(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class ZoneAttribsUpdated(Event):
+class ZoneAttribsUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "zone_attribs_updated"
+    FIELD_BITS: ClassVar[FieldBits] = ZoneState.FIELD_BITS
 
     zone_id: int
-    changed_fields: tuple[str, ...]
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 # -------------------------
@@ -209,12 +304,33 @@ class KeypadConfiguredInventoryReady(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class OutputStatusUpdated(Event):
+class OutputAttribsUpdated(Event, ChangedFieldsMixin):
+    KIND: ClassVar[str] = "output_attribs_updated"
+    FIELD_BITS: ClassVar[FieldBits] = OutputState.FIELD_BITS
+
+    output_id: int
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class OutputStatusUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "output_status_updated"
+    FIELD_BITS: ClassVar[FieldBits] = OutputState.FIELD_BITS
 
     output_id: int
     status: str | None
     on: bool | None
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass(frozen=True, slots=True)
@@ -231,13 +347,20 @@ class OutputsStatusBulkUpdated(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class TstatStatusUpdated(Event):
+class TstatStatusUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "tstat_status_updated"
+    FIELD_BITS: ClassVar[FieldBits] = TstatState.FIELD_BITS
 
     tstat_id: int
     mode: str | None
     fan_mode: str | None
     temperature: int | None
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 # -------------------------
@@ -347,11 +470,17 @@ class TableCsmChanged(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class TroubleStatusUpdated(Event):
+class TroubleStatusUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "trouble_status_updated"
+    FIELD_BITS: ClassVar[FieldBits] = TroubleState.FIELD_BITS
 
     active: bool | None
-    changed_fields: tuple[str, ...]
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 # -------------------------
@@ -360,10 +489,16 @@ class TroubleStatusUpdated(Event):
 
 
 @dataclass(frozen=True, slots=True)
-class PanelVersionInfoUpdated(Event):
+class PanelVersionInfoUpdated(Event, ChangedFieldsMixin):
     KIND: ClassVar[str] = "panel_version_info_updated"
+    FIELD_BITS: ClassVar[FieldBits] = PanelMetaState.FIELD_BITS
 
-    changed_fields: tuple[str, ...]
+    changed_mask: int = 0
+    changed_fields: InitVar[tuple[str, ...]] = _CHANGED_FIELDS
+    _changed_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    _changed_names: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 # -------------------------
@@ -445,6 +580,11 @@ def stamp_event(
     Replace the common header fields on an event.
     kernel.emit() uses this to make headers authoritative and consistent.
     """
+    # replace() rebuilds the event through __init__, which would drop the
+    # changed dynamic keys unless they are passed back in.
+    extra: dict[str, Any] = (
+        {"changed_fields": evt._changed_keys} if isinstance(evt, ChangedFieldsMixin) else {}
+    )
     return replace(
         evt,
         at=at,
@@ -452,4 +592,5 @@ def stamp_event(
         classification=classification,
         route=route,
         session_id=session_id,
+        **extra,
     )
@@ -164,11 +164,8 @@ def deframe_feed(state: DeframeState, chunk: bytes) -> list[DeframeResult]:
 
         if state.escaping and b != 0:
             # STARTCHAR followed by non-zero => new frame start; b is protocol.
-            if (
-                not state.warned_resync
-                and (state.rcv_state is not FrameStates.WAIT_START or state.input_buffer)
-                and LOG.isEnabledFor(logging.ERROR)
-            ):
+            mid_frame = state.rcv_state is not FrameStates.WAIT_START or bool(state.input_buffer)
+            if not state.warned_resync and mid_frame and LOG.isEnabledFor(logging.ERROR):
                 LOG.error(
                     "deframe resync: startchar mid-frame; discarded_buffer=%s",
                     len(state.input_buffer),
@@ -178,7 +175,9 @@ def deframe_feed(state: DeframeState, chunk: bytes) -> list[DeframeResult]:
             state.msglength = 0
             state.rcv_state = FrameStates.WAIT_LENGTH
             state.escaping = False
-            state.just_resynced = True
+            # Only a resync that cut a frame short can be followed by a spliced duplicate
+            # protocol byte; at a normal frame start that byte is the real length.
+            state.just_resynced = mid_frame
             continue
 
         if state.escaping:
@@ -55,6 +55,8 @@ NowFn = Callable[[], float]
 
 LOG = logging.getLogger(__name__)
 
+_AREA_BITS = AreaState.FIELD_BITS
+
 
 # -------------------------
 # Module-private reconcile
@@ -64,7 +66,7 @@ LOG = logging.getLogger(__name__)
 @dataclass(frozen=True, slots=True)
 class _AreaOutcome:
     area_id: int
-    changed_fields: tuple[str, ...]
+    changed_mask: int
     error_code: int | None
     warnings: tuple[str, ...]
 
@@ -143,14 +145,14 @@ def _reconcile_area_state(
         - area.last_update_at
     """
     warnings: list[str] = []
-    changed: set[str] = set()
+    changed = 0
 
     area_id_val = payload.get("area_id")
     if not isinstance(area_id_val, int) or area_id_val < 1:
         warnings.append("missing/invalid area_id (expected int >= 1)")
         return _AreaOutcome(
             area_id=-1,
-            changed_fields=(),
+            changed_mask=0,
             error_code=_extract_error_code(payload),
             warnings=tuple(warnings),
         )
@@ -172,7 +174,7 @@ def _reconcile_area_state(
         old = getattr(area, attr)
         if old != value:
             setattr(area, attr, value)
-            changed.add(attr)
+            changed |= _AREA_BITS[attr]
 
     # timestamps (monotonic)
     area.last_update_at = now
@@ -180,7 +182,7 @@ def _reconcile_area_state(
 
     return _AreaOutcome(
         area_id=area_id_val,
-        changed_fields=tuple(sorted(changed)),
+        changed_mask=changed,
         error_code=_extract_error_code(payload),
         warnings=tuple(warnings),
     )
@@ -264,10 +266,10 @@ def make_area_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             )
             return False
 
-        if outcome.changed_fields:
+        if outcome.changed_mask:
             LOG.debug(
                 "area.get_status changed_fields=%s area_id=%s",
-                outcome.changed_fields,
+                _AREA_BITS.names(outcome.changed_mask),
                 outcome.area_id,
             )
         else:
@@ -280,7 +282,7 @@ def make_area_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             route=UNSET_ROUTE,
             session_id=UNSET_SESSION_ID,
             area_id=outcome.area_id,
-            changed_fields=outcome.changed_fields,
+            changed_mask=outcome.changed_mask,
         )
         try:
             emit(evt, ctx)
@@ -369,8 +371,7 @@ def make_area_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         area = state.get_or_create_area(area_id)
-        changed: set[str] = set()
-        _apply_area_attribs(area, payload, changed)
+        changed = _apply_area_attribs(area, payload)
         area.last_update_at = now()
         state.panel.last_message_at = area.last_update_at
 
@@ -384,7 +385,7 @@ def make_area_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn):
                     route=UNSET_ROUTE,
                     session_id=UNSET_SESSION_ID,
                     area_id=area_id,
-                    changed_fields=tuple(sorted(changed)),
+                    changed_mask=changed,
                 ),
                 ctx,
             )
@@ -616,7 +617,7 @@ def make_area_set_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             )
             return False
 
-        if outcome.changed_fields:
+        if outcome.changed_mask:
             emit(
                 AreaStatusUpdated(
                     kind=AreaStatusUpdated.KIND,
@@ -626,7 +627,7 @@ def make_area_set_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                     route=UNSET_ROUTE,
                     session_id=UNSET_SESSION_ID,
                     area_id=outcome.area_id,
-                    changed_fields=outcome.changed_fields,
+                    changed_mask=outcome.changed_mask,
                 ),
                 ctx,
             )
@@ -1163,12 +1164,13 @@ def _normalize_name(value: Any) -> str | None:
     return text if text else None
 
 
-def _apply_area_attribs(area: AreaState, payload: Mapping[str, Any], changed: set[str]) -> None:
+def _apply_area_attribs(area: AreaState, payload: Mapping[str, Any]) -> int:
     if "name" in payload:
         name = _normalize_name(payload.get("name"))
         if area.name != name:
             area.name = name
-            changed.add("name")
+            return _AREA_BITS["name"]
+    return 0
 
 
 def _extract_int(payload: Mapping[str, Any], key: str) -> int | None:
@@ -43,13 +43,15 @@ from elke27_lib.events import (
     Event,
     PanelVersionInfoUpdated,
 )
-from elke27_lib.states import PanelState, update_csm_snapshot
+from elke27_lib.states import PanelMetaState, PanelState, update_csm_snapshot
 
 EmitFn = Callable[[Event, DispatchContext], None]
 NowFn = Callable[[], float]
 
 LOG = logging.getLogger(__name__)
 
+_PANEL_BITS = PanelMetaState.FIELD_BITS
+
 
 def _as_mapping(obj: object) -> Mapping[str, Any] | None:
     if isinstance(obj, Mapping):
@@ -64,7 +66,7 @@ def _as_mapping(obj: object) -> Mapping[str, Any] | None:
 
 @dataclass(frozen=True, slots=True)
 class _VersionInfoOutcome:
-    changed_fields: tuple[str, ...]
+    changed_mask: int
     error_code: int | None
     warnings: tuple[str, ...]
 
@@ -84,7 +86,7 @@ def _reconcile_control_get_version_info(
     - Always updates state.panel.last_message_at
     """
     warnings: list[str] = []
-    changed: set[str] = set()
+    changed = 0
 
     # Always update panel freshness
     state.panel.last_message_at = now
@@ -109,7 +111,7 @@ def _reconcile_control_get_version_info(
         if isinstance(model, str):
             if state.panel.model != model:
                 state.panel.model = model
-                changed.add("model")
+                changed |= _PANEL_BITS["model"]
         else:
             warnings.append(
                 f"field 'model' wrong type (expected str/int, got {type(model).__name__})"
@@ -119,7 +121,7 @@ def _reconcile_control_get_version_info(
         if isinstance(firmware, str):
             if state.panel.firmware != firmware:
                 state.panel.firmware = firmware
-                changed.add("firmware")
+                changed |= _PANEL_BITS["firmware"]
         else:
             warnings.append(
                 f"field 'firmware' wrong type (expected str, got {type(firmware).__name__})"
@@ -129,14 +131,14 @@ def _reconcile_control_get_version_info(
         if isinstance(serial, str):
             if state.panel.serial != serial:
                 state.panel.serial = serial
-                changed.add("serial")
+                changed |= _PANEL_BITS["serial"]
         else:
             warnings.append(
                 f"field 'serial' wrong type (expected str, got {type(serial).__name__})"
             )
 
     return _VersionInfoOutcome(
-        changed_fields=tuple(sorted(changed)),
+        changed_mask=changed,
         error_code=error_code,
         warnings=tuple(warnings),
     )
@@ -448,7 +450,7 @@ def make_control_get_version_info_handler(state: PanelState, emit: EmitFn, now:
 
         outcome = _reconcile_control_get_version_info(state, payload, now=now())
 
-        if outcome.changed_fields:
+        if outcome.changed_mask:
             emit(
                 PanelVersionInfoUpdated(
                     kind=PanelVersionInfoUpdated.KIND,
@@ -457,7 +459,7 @@ def make_control_get_version_info_handler(state: PanelState, emit: EmitFn, now:
                     classification=UNSET_CLASSIFICATION,
                     route=UNSET_ROUTE,
                     session_id=UNSET_SESSION_ID,
-                    changed_fields=outcome.changed_fields,
+                    changed_mask=outcome.changed_mask,
                 ),
                 ctx,
             )
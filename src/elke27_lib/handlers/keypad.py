@@ -31,6 +31,8 @@ NowFn = Callable[[], float]
 
 LOG = logging.getLogger(__name__)
 
+_KEYPAD_BITS = KeypadState.FIELD_BITS
+
 
 def _as_mapping(obj: object) -> Mapping[str, Any] | None:
     if isinstance(obj, Mapping):
@@ -180,8 +182,7 @@ def make_keypad_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn)
             return False
 
         keypad = state.get_or_create_keypad(keypad_id)
-        changed: set[str] = set()
-        _apply_keypad_attribs(keypad, payload, changed)
+        _apply_keypad_attribs(keypad, payload)
         keypad.last_update_at = now()
         state.panel.last_message_at = keypad.last_update_at
         return True
@@ -282,39 +283,38 @@ def _normalize_name(value: Any) -> str | None:
     return text if text else None
 
 
-def _apply_keypad_attribs(
-    keypad: KeypadState, payload: Mapping[str, Any], changed: set[str]
-) -> None:
+def _apply_keypad_attribs(keypad: KeypadState, payload: Mapping[str, Any]) -> int:
+    changed = 0
     if "name" in payload:
         name = _normalize_name(payload.get("name"))
         if keypad.name != name:
             keypad.name = name
-            changed.add("name")
+            changed |= _KEYPAD_BITS["name"]
     if "area" in payload:
         area = payload.get("area")
         if isinstance(area, int) and keypad.area != area:
             keypad.area = area
-            changed.add("area")
+            changed |= _KEYPAD_BITS["area"]
     if "zone_id" in payload:
         zone_id = payload.get("zone_id")
         if isinstance(zone_id, int) and keypad.zone_id != zone_id:
             keypad.zone_id = zone_id
-            changed.add("zone_id")
+            changed |= _KEYPAD_BITS["zone_id"]
     if "source_id" in payload:
         source_id = payload.get("source_id")
         if isinstance(source_id, int) and keypad.source_id != source_id:
             keypad.source_id = source_id
-            changed.add("source_id")
+            changed |= _KEYPAD_BITS["source_id"]
     if "device_id" in payload:
         device_id = payload.get("device_id")
         if isinstance(device_id, str) and keypad.device_id != device_id:
             keypad.device_id = device_id
-            changed.add("device_id")
+            changed |= _KEYPAD_BITS["device_id"]
     if "flags" in payload:
         flags = payload.get("flags")
         if isinstance(flags, list) and keypad.flags != flags:
             keypad.flags = flags
-            changed.add("flags")
+            changed |= _KEYPAD_BITS["flags"]
 
     for key, value in payload.items():
         if key in {
@@ -330,7 +330,8 @@ def _apply_keypad_attribs(
             continue
         if keypad.fields.get(key) != value:
             keypad.fields[key] = value
-            changed.add(key)
+            changed |= _KEYPAD_BITS["fields"]
+    return changed
 
 
 def _extract_table_csm(payload: Mapping[str, Any], *, domain: str) -> int | None:
@@ -23,6 +23,7 @@ from elke27_lib.events import (
     CsmSnapshotUpdated,
     DispatchRoutingError,
     Event,
+    OutputAttribsUpdated,
     OutputConfiguredInventoryReady,
     OutputConfiguredUpdated,
     OutputsStatusBulkUpdated,
@@ -37,6 +38,8 @@ NowFn = Callable[[], float]
 
 LOG = logging.getLogger(__name__)
 
+_OUTPUT_BITS = OutputState.FIELD_BITS
+
 
 def _as_mapping(obj: object) -> Mapping[str, Any] | None:
     if isinstance(obj, Mapping):
@@ -86,8 +89,8 @@ def make_output_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         output = state.get_or_create_output(output_id)
-        changed: set[str] = set()
-        _apply_output_status_fields(output, payload, changed)
+        keys: list[str] = []
+        changed = _apply_output_status_fields(output, payload, keys)
         output.last_update_at = now()
         state.panel.last_message_at = output.last_update_at
 
@@ -102,6 +105,8 @@ def make_output_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                 output_id=output_id,
                 status=output.status,
                 on=output.on,
+                changed_mask=changed,
+                changed_fields=tuple(keys),
             ),
             ctx,
         )
@@ -352,10 +357,24 @@ def make_output_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn)
             return False
 
         output = state.get_or_create_output(output_id)
-        changed: set[str] = set()
-        _apply_output_attribs(output, payload, changed)
+        changed = _apply_output_attribs(output, payload)
         output.last_update_at = now()
         state.panel.last_message_at = output.last_update_at
+
+        if changed:
+            emit(
+                OutputAttribsUpdated(
+                    kind=OutputAttribsUpdated.KIND,
+                    at=UNSET_AT,
+                    seq=UNSET_SEQ,
+                    classification=UNSET_CLASSIFICATION,
+                    route=UNSET_ROUTE,
+                    session_id=UNSET_SESSION_ID,
+                    output_id=output_id,
+                    changed_mask=changed,
+                ),
+                ctx,
+            )
         return True
 
     return handler_output_get_attribs
@@ -492,25 +511,28 @@ def _extract_table_csm(payload: Mapping[str, Any], *, domain: str) -> int | None
 
 
 def _apply_output_status_fields(
-    output: OutputState, payload: Mapping[str, Any], changed: set[str]
-) -> None:
+    output: OutputState, payload: Mapping[str, Any], keys: list[str]
+) -> int:
+    changed = 0
     status = payload.get("status")
     if isinstance(status, str):
         norm = status.strip().upper()
         if output.status != norm:
             output.status = norm
-            changed.add("status")
+            changed |= _OUTPUT_BITS["status"]
         on = norm == "ON"
         if output.on != on:
             output.on = on
-            changed.add("on")
+            changed |= _OUTPUT_BITS["on"]
 
     for key, value in payload.items():
         if key in {"output_id", "error_code", "status"}:
             continue
         if output.fields.get(key) != value:
             output.fields[key] = value
-            changed.add(key)
+            keys.append(key)
+            changed |= _OUTPUT_BITS["fields"]
+    return changed
 
 
 def _extract_configured_output_ids(payload: Mapping[str, Any]) -> list[int]:
@@ -541,14 +563,13 @@ def _normalize_name(value: Any) -> str | None:
     return text if text else None
 
 
-def _apply_output_attribs(
-    output: OutputState, payload: Mapping[str, Any], changed: set[str]
-) -> None:
+def _apply_output_attribs(output: OutputState, payload: Mapping[str, Any]) -> int:
     if "name" in payload:
         name = _normalize_name(payload.get("name"))
         if output.name != name:
             output.name = name
-            changed.add("name")
+            return _OUTPUT_BITS["name"]
+    return 0
 
 
 def _extract_int(payload: Mapping[str, Any], key: str) -> int | None:
@@ -32,6 +32,8 @@ NowFn = Callable[[], float]
 
 LOG = logging.getLogger(__name__)
 
+_TSTAT_BITS = TstatState.FIELD_BITS
+
 
 def _as_mapping(obj: object) -> Mapping[str, Any] | None:
     if isinstance(obj, Mapping):
@@ -81,8 +83,8 @@ def make_tstat_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         tstat = state.get_or_create_tstat(tstat_id)
-        changed: set[str] = set()
-        _apply_tstat_status_fields(tstat, payload, changed)
+        keys: list[str] = []
+        changed = _apply_tstat_status_fields(tstat, payload, keys)
         tstat.last_update_at = now()
         state.panel.last_message_at = tstat.last_update_at
 
@@ -98,6 +100,8 @@ def make_tstat_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                 mode=tstat.mode,
                 fan_mode=tstat.fan_mode,
                 temperature=tstat.temperature,
+                changed_mask=changed,
+                changed_fields=tuple(keys),
             ),
             ctx,
         )
@@ -218,20 +222,20 @@ def make_tstat_get_table_info_handler(state: PanelState, emit: EmitFn, now: NowF
 
 
 def _apply_tstat_status_fields(
-    tstat: TstatState, payload: Mapping[str, Any], changed: set[str]
-) -> None:
-    _maybe_set(tstat, "temperature", payload.get("temperature"), changed)
-    _maybe_set(tstat, "cool_setpoint", payload.get("cool_setpoint"), changed)
-    _maybe_set(tstat, "heat_setpoint", payload.get("heat_setpoint"), changed)
-    _maybe_set(tstat, "mode", payload.get("mode"), changed)
-    _maybe_set(tstat, "fan_mode", payload.get("fan_mode"), changed)
-    _maybe_set(tstat, "humidity", payload.get("humidity"), changed)
-    _maybe_set(tstat, "rssi", payload.get("rssi"), changed)
+    tstat: TstatState, payload: Mapping[str, Any], keys: list[str]
+) -> int:
+    changed = _maybe_set(tstat, "temperature", payload.get("temperature"))
+    changed |= _maybe_set(tstat, "cool_setpoint", payload.get("cool_setpoint"))
+    changed |= _maybe_set(tstat, "heat_setpoint", payload.get("heat_setpoint"))
+    changed |= _maybe_set(tstat, "mode", payload.get("mode"))
+    changed |= _maybe_set(tstat, "fan_mode", payload.get("fan_mode"))
+    changed |= _maybe_set(tstat, "humidity", payload.get("humidity"))
+    changed |= _maybe_set(tstat, "rssi", payload.get("rssi"))
 
     battery = payload.get("battery level")
     if battery is None:
         battery = payload.get("battery_level")
-    _maybe_set(tstat, "battery_level", battery, changed)
+    changed |= _maybe_set(tstat, "battery_level", battery)
 
     prec = payload.get("prec")
     if isinstance(prec, list):
@@ -244,7 +248,7 @@ def _apply_tstat_status_fields(
                 break
             prec_values.append(item)
         if all_ints:
-            _maybe_set(tstat, "prec", prec_values, changed)
+            changed |= _maybe_set(tstat, "prec", prec_values)
 
     for key, value in payload.items():
         if key in {
@@ -264,15 +268,18 @@ def _apply_tstat_status_fields(
             continue
         if tstat.fields.get(key) != value:
             tstat.fields[key] = value
-            changed.add(key)
+            keys.append(key)
+            changed |= _TSTAT_BITS["fields"]
+    return changed
 
 
-def _maybe_set(tstat: TstatState, attr: str, value: Any, changed: set[str]) -> None:
+def _maybe_set(tstat: TstatState, attr: str, value: Any) -> int:
     if value is None:
-        return
+        return 0
     if getattr(tstat, attr) != value:
         setattr(tstat, attr, value)
-        changed.add(attr)
+        return _TSTAT_BITS[attr]
+    return 0
 
 
 def _extract_int(payload: Mapping[str, Any], key: str) -> int | None:
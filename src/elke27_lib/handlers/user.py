@@ -26,6 +26,8 @@ from elke27_lib.states import PanelState, UserState
 EmitFn = Callable[[Event, DispatchContext], None]
 NowFn = Callable[[], float]
 
+_USER_BITS = UserState.FIELD_BITS
+
 
 def _as_mapping(obj: object) -> Mapping[str, Any] | None:
     if isinstance(obj, Mapping):
@@ -173,8 +175,7 @@ def make_user_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         user = state.get_or_create_user(user_id)
-        changed: set[str] = set()
-        _apply_user_attribs(user, payload, changed)
+        _apply_user_attribs(user, payload)
         user.last_update_at = now()
         state.panel.last_message_at = user.last_update_at
 
@@ -203,36 +204,38 @@ def _normalize_name(value: Any) -> str | None:
     return text if text else None
 
 
-def _apply_user_attribs(user: UserState, payload: Mapping[str, Any], changed: set[str]) -> None:
+def _apply_user_attribs(user: UserState, payload: Mapping[str, Any]) -> int:
+    changed = 0
     if "name" in payload:
         name = _normalize_name(payload.get("name"))
         if user.name != name:
             user.name = name
-            changed.add("name")
+            changed |= _USER_BITS["name"]
     if "group_id" in payload:
         group_id = payload.get("group_id")
         if isinstance(group_id, int) and user.group_id != group_id:
             user.group_id = group_id
-            changed.add("group_id")
+            changed |= _USER_BITS["group_id"]
     if "enabled" in payload:
         enabled = payload.get("enabled")
         if isinstance(enabled, bool) and user.enabled != enabled:
             user.enabled = enabled
-            changed.add("enabled")
+            changed |= _USER_BITS["enabled"]
     if "pin" in payload:
         pin = payload.get("pin")
         if isinstance(pin, int) and user.pin != pin:
             user.pin = pin
-            changed.add("pin")
+            changed |= _USER_BITS["pin"]
     if "flags" in payload:
         flags = payload.get("flags")
         if isinstance(flags, list) and user.flags != flags:
             user.flags = flags
-            changed.add("flags")
+            changed |= _USER_BITS["flags"]
 
     for key, value in payload.items():
         if key in {"user_id", "error_code", "name", "group_id", "enabled", "pin", "flags"}:
             continue
         if user.fields.get(key) != value:
             user.fields[key] = value
-            changed.add(key)
+            changed |= _USER_BITS["fields"]
+    return changed
@@ -41,6 +41,8 @@ NowFn = Callable[[], float]
 
 LOG = logging.getLogger(__name__)
 
+_ZONE_BITS = ZoneState.FIELD_BITS
+
 
 def _as_mapping(obj: object) -> Mapping[str, Any] | None:
     if isinstance(obj, Mapping):
@@ -287,8 +289,8 @@ def make_zone_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         zone = state.get_or_create_zone(zone_id)
-        changed: set[str] = set()
-        _apply_zone_attribs(zone, payload, changed)
+        keys: list[str] = []
+        changed = _apply_zone_attribs(zone, payload, keys)
         zone.last_update_at = now()
         state.panel.last_message_at = zone.last_update_at
 
@@ -302,7 +304,8 @@ def make_zone_get_attribs_handler(state: PanelState, emit: EmitFn, now: NowFn):
                     route=UNSET_ROUTE,
                     session_id=UNSET_SESSION_ID,
                     zone_id=zone_id,
-                    changed_fields=tuple(sorted(changed)),
+                    changed_mask=changed,
+                    changed_fields=tuple(keys),
                 ),
                 ctx,
             )
@@ -463,9 +466,8 @@ def make_zone_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         zone = state.get_or_create_zone(zone_id)
-        changed: set[str] = set()
         warnings: list[str] = []
-        _apply_zone_status_payload(zone, payload, changed, warnings)
+        changed = _apply_zone_status_payload(zone, payload, warnings)
         zone.last_update_at = now()
         state.panel.last_message_at = zone.last_update_at
         if LOG.isEnabledFor(logging.DEBUG) and "BYPASSED" in payload:
@@ -473,7 +475,7 @@ def make_zone_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                 "zone.get_status bypassed=%s zone_id=%s changed=%s",
                 payload.get("BYPASSED"),
                 zone_id,
-                sorted(changed),
+                _ZONE_BITS.names(changed),
             )
         if changed:
             emit(
@@ -485,7 +487,7 @@ def make_zone_get_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                     route=UNSET_ROUTE,
                     session_id=UNSET_SESSION_ID,
                     zone_id=zone_id,
-                    changed_fields=tuple(sorted(changed)),
+                    changed_mask=changed,
                 ),
                 ctx,
             )
@@ -532,9 +534,8 @@ def make_zone_set_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
             return False
 
         zone = state.get_or_create_zone(zone_id)
-        changed: set[str] = set()
         warnings: list[str] = []
-        _apply_zone_status_payload(zone, payload, changed, warnings)
+        changed = _apply_zone_status_payload(zone, payload, warnings)
         zone.last_update_at = now()
         state.panel.last_message_at = zone.last_update_at
         if LOG.isEnabledFor(logging.DEBUG) and "BYPASSED" in payload:
@@ -542,7 +543,7 @@ def make_zone_set_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                 "zone.set_status bypassed=%s zone_id=%s changed=%s",
                 payload.get("BYPASSED"),
                 zone_id,
-                sorted(changed),
+                _ZONE_BITS.names(changed),
             )
         if changed:
             emit(
@@ -554,7 +555,7 @@ def make_zone_set_status_handler(state: PanelState, emit: EmitFn, now: NowFn):
                     route=UNSET_ROUTE,
                     session_id=UNSET_SESSION_ID,
                     zone_id=zone_id,
-                    changed_fields=tuple(sorted(changed)),
+                    changed_mask=changed,
                 ),
                 ctx,
             )
@@ -1092,50 +1093,51 @@ def _coerce_bool(value: Any) -> bool | None:
     return None
 
 
-def _update_zone_bool(zone: ZoneState, field: str, value: bool | None, changed: set[str]) -> None:
+def _update_zone_bool(zone: ZoneState, field: str, value: bool | None) -> int:
     if value is None:
-        return
+        return 0
     if getattr(zone, field) != value:
         setattr(zone, field, value)
-        changed.add(field)
+        return _ZONE_BITS[field]
+    return 0
 
 
 def _apply_zone_status_payload(
     zone: ZoneState,
     payload: Mapping[str, Any],
-    changed: set[str],
     warnings: list[str],
-) -> None:
+) -> int:
     bypassed = _coerce_bool(payload.get("BYPASSED", payload.get("bypassed")))
-    _update_zone_bool(zone, "bypassed", bypassed, changed)
+    changed = _update_zone_bool(zone, "bypassed", bypassed)
 
     low_battery = _coerce_bool(payload.get("low_batt", payload.get("low_battery")))
-    _update_zone_bool(zone, "low_battery", low_battery, changed)
+    changed |= _update_zone_bool(zone, "low_battery", low_battery)
 
     for key in ("trouble", "tamper", "alarm", "violated", "enabled"):
         value = _coerce_bool(payload.get(key))
-        _update_zone_bool(zone, key, value, changed)
+        changed |= _update_zone_bool(zone, key, value)
 
     secure_state = payload.get("secure_state")
     if isinstance(secure_state, str):
         state = secure_state.strip().upper()
         if state in {"NORMAL", "SECURE", "RESTORE"}:
-            _update_zone_bool(zone, "violated", False, changed)
-            _update_zone_bool(zone, "trouble", False, changed)
-            _update_zone_bool(zone, "tamper", False, changed)
-            _update_zone_bool(zone, "alarm", False, changed)
+            changed |= _update_zone_bool(zone, "violated", False)
+            changed |= _update_zone_bool(zone, "trouble", False)
+            changed |= _update_zone_bool(zone, "tamper", False)
+            changed |= _update_zone_bool(zone, "alarm", False)
         elif "VIOLATED" in state or state == "OPEN":
-            _update_zone_bool(zone, "violated", True, changed)
+            changed |= _update_zone_bool(zone, "violated", True)
         elif "TROUBLE" in state:
-            _update_zone_bool(zone, "trouble", True, changed)
+            changed |= _update_zone_bool(zone, "trouble", True)
         elif "TAMPER" in state:
-            _update_zone_bool(zone, "tamper", True, changed)
+            changed |= _update_zone_bool(zone, "tamper", True)
         elif "ALARM" in state:
-            _update_zone_bool(zone, "alarm", True, changed)
+            changed |= _update_zone_bool(zone, "alarm", True)
         elif "BYPASS" in state:
-            _update_zone_bool(zone, "bypassed", True, changed)
+            changed |= _update_zone_bool(zone, "bypassed", True)
         else:
             warnings.append(f"unknown secure_state: {secure_state!r}")
+    return changed
 
 
 def _apply_zone_status_char(zone: ZoneState, ch: str, warnings: list[str]) -> bool:
@@ -1229,7 +1231,8 @@ def _apply_zone_fields(zone: ZoneState, item: Mapping[str, Any], warnings: list[
         setattr(zone, attr, value)
 
 
-def _apply_zone_attribs(zone: ZoneState, payload: Mapping[str, Any], changed: set[str]) -> None:
+def _apply_zone_attribs(zone: ZoneState, payload: Mapping[str, Any], keys: list[str]) -> int:
+    changed = 0
     for key, attr in (
         ("name", "name"),
         ("area_id", "area_id"),
@@ -1242,14 +1245,16 @@ def _apply_zone_attribs(zone: ZoneState, payload: Mapping[str, Any], changed: se
                 value = _normalize_name(value)
             if getattr(zone, attr) != value:
                 setattr(zone, attr, value)
-                changed.add(attr)
+                changed |= _ZONE_BITS[attr]
 
     for key, value in payload.items():
         if key in {"zone_id", "error_code", "name", "area_id", "definition", "flags"}:
             continue
         if zone.attribs.get(key) != value:
             zone.attribs[key] = value
-            changed.add(key)
+            keys.append(key)
+            changed |= _ZONE_BITS["attribs"]
+    return changed
 
 
 def _coerce_zone_id(value: Any) -> int | None:
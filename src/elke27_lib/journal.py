@@ -0,0 +1,491 @@
+"""
+elke27_lib/journal.py
+
+Append-only on-disk event journal with replay for late or restarted consumers.
+
+EventJournal.attach(client) appends every Elke27Event the client emits to a
+segmented log in a directory. Each record gets a journal sequence number that
+keeps increasing across reconnects and process restarts, so a consumer that
+remembers the last seq it handled catches up with one sequential read:
+
+    for entry in journal.replay(since_seq=last_seq):
+        handle(entry.event)
+
+Record layout (little-endian):
+    header: payload length, CRC-32 of payload, journal seq, event timestamp in
+        microseconds, entity kind, entity id
+    payload: compact JSON [event type, raw type, event seq, data]
+
+- Segments are named by their first seq and rolled at segment_max_bytes.
+- Per-segment seq/offset/time arrays and an entity index live in memory and
+  are rebuilt from record headers on open; a torn tail is truncated.
+- Compaction drops records past retain_s / max_bytes from the old end,
+  rewriting a partially expired segment. Events are change notices rather than
+  full state, so records are never dropped for being superseded.
+- Writes are buffered and flushed once per loop iteration when attached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from .types import Elke27Event, EventType
+
+LOG = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log"
+
+# payload length, crc32, journal seq, timestamp (us since epoch), entity kind, entity id
+_RECORD_HEADER = struct.Struct("<IIQqBI")
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+ENTITY_KINDS = ("area", "zone", "output", "tstat")
+_ENTITY_CODES = {kind: code for code, kind in enumerate(ENTITY_KINDS, start=1)}
+
+EntityKey = tuple[str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class JournalConfig:
+    directory: str | Path
+    segment_max_bytes: int = 1024 * 1024
+    # Compaction limits; None disables that limit.
+    retain_s: float | None = 7 * 24 * 3600.0
+    max_bytes: int | None = 64 * 1024 * 1024
+    # Run compact() automatically after this many segment rolls (0 = manual only).
+    compact_every: int = 4
+    # fsync after each flush; off by default since the panel remains the source of truth.
+    fsync: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class JournalEntry:
+    seq: int
+    event: Elke27Event
+    entity: EntityKey | None
+
+
+def entity_of(data: Mapping[str, object]) -> EntityKey | None:
+    """The (kind, id) an event is about, if any."""
+    for kind in ENTITY_KINDS:
+        value = data.get(f"{kind}_id")
+        if isinstance(value, int) and not isinstance(value, bool):
+            return kind, value
+    domain = data.get("domain")
+    entity_id = data.get("entity_id")
+    if domain in _ENTITY_CODES and isinstance(entity_id, int) and not isinstance(entity_id, bool):
+        return str(domain), entity_id
+    return None
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def encode_record(seq: int, event: Elke27Event) -> bytes:
+    payload = json.dumps(
+        [event.event_type.value, event.raw_type, event.seq, dict(event.data)],
+        separators=(",", ":"),
+        default=_json_default,
+        ensure_ascii=False,
+    ).encode("utf-8")
+    entity = entity_of(event.data)
+    timestamp = event.timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    header = _RECORD_HEADER.pack(
+        len(payload),
+        zlib.crc32(payload),
+        seq,
+        (timestamp - _EPOCH) // _MICROSECOND,
+        _ENTITY_CODES[entity[0]] if entity is not None else 0,
+        entity[1] if entity is not None else 0,
+    )
+    return header + payload
+
+
+def _decode_entity(code: int, entity_id: int) -> EntityKey | None:
+    return (ENTITY_KINDS[code - 1], entity_id) if 0 < code <= len(ENTITY_KINDS) else None
+
+
+def _decode_payload(
+    seq: int, timestamp_us: int, entity: EntityKey | None, payload: bytes
+) -> JournalEntry:
+    event_type, raw_type, event_seq, data = json.loads(payload)
+    event = Elke27Event(
+        event_type=EventType(event_type),
+        data=data,
+        seq=event_seq,
+        timestamp=_EPOCH + timestamp_us * _MICROSECOND,
+        raw_type=raw_type,
+    )
+    return JournalEntry(seq=seq, event=event, entity=entity)
+
+
+class _Segment:
+    __slots__ = ("entities", "first_seq", "offsets", "path", "seqs", "size", "times")
+
+    def __init__(self, path: Path, first_seq: int) -> None:
+        self.path = path
+        self.first_seq = first_seq
+        self.seqs = array("Q")
+        self.offsets = array("Q")
+        # Running maximum of record timestamps, so bisect works on clock steps.
+        self.times = array("q")
+        self.entities: list[EntityKey | None] = []
+        self.size = 0
+
+    def add(self, seq: int, offset: int, timestamp_us: int, entity: EntityKey | None) -> None:
+        self.seqs.append(seq)
+        self.offsets.append(offset)
+        self.times.append(max(timestamp_us, self.times[-1]) if self.times else timestamp_us)
+        self.entities.append(entity)
+
+    @property
+    def last_seq(self) -> int | None:
+        return self.seqs[-1] if self.seqs else None
+
+
+def _segment_path(directory: Path, first_seq: int) -> Path:
+    return directory / f"{first_seq:020d}{SEGMENT_SUFFIX}"
+
+
+def _scan_segment(path: Path, first_seq: int) -> _Segment:
+    segment = _Segment(path, first_seq)
+    with open(path, "rb") as file:
+        data = file.read()
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(data):
+        length, crc, seq, timestamp_us, code, entity_id = _RECORD_HEADER.unpack_from(data, offset)
+        end = offset + _RECORD_HEADER.size + length
+        if end > len(data) or zlib.crc32(data[offset + _RECORD_HEADER.size : end]) != crc:
+            break
+        segment.add(seq, offset, timestamp_us, _decode_entity(code, entity_id))
+        offset = end
+    if offset != len(data):
+        LOG.warning("Truncating %d torn bytes from journal segment %s", len(data) - offset, path)
+        with open(path, "r+b") as file:
+            file.truncate(offset)
+    segment.size = offset
+    return segment
+
+
+class EventJournal:
+    """
+    Segmented append-only event log. Not thread-safe: append and replay from
+    the event loop thread (attach() appends from the client's callbacks).
+    """
+
+    def __init__(self, config: JournalConfig) -> None:
+        self.config = config
+        self.directory = Path(config.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segments: list[_Segment] = []
+        self._entities: dict[EntityKey, array[int]] = {}
+        self._file: BinaryIO | None = None
+        self._next_seq = 1
+        self._rolls = 0
+        self._flush_scheduled = False
+        self.appended = 0
+        self.compactions = 0
+        self._load()
+
+    # --------------------------
+    # Open / recovery
+    # --------------------------
+
+    def _load(self) -> None:
+        for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")):
+            try:
+                first_seq = int(path.stem)
+            except ValueError:
+                continue
+            segment = _scan_segment(path, first_seq)
+            if not segment.seqs and self._segments:
+                path.unlink()
+                continue
+            self._segments.append(segment)
+            self._index_segment(segment)
+        last_seq = self.last_seq
+        if last_seq is not None:
+            self._next_seq = last_seq + 1
+        elif self._segments:
+            self._next_seq = self._segments[-1].first_seq
+        if not self._segments:
+            self._segments.append(self._new_segment(self._next_seq))
+        self._file = open(self._segments[-1].path, "ab")  # noqa: SIM115
+
+    def _index_segment(self, segment: _Segment) -> None:
+        for seq, entity in zip(segment.seqs, segment.entities, strict=True):
+            if entity is not None:
+                self._entities.setdefault(entity, array("Q")).append(seq)
+
+    def _new_segment(self, first_seq: int) -> _Segment:
+        path = _segment_path(self.directory, first_seq)
+        path.touch()
+        return _Segment(path, first_seq)
+
+    # --------------------------
+    # Properties
+    # --------------------------
+
+    @property
+    def first_seq(self) -> int | None:
+        for segment in self._segments:
+            if segment.seqs:
+                return segment.seqs[0]
+        return None
+
+    @property
+    def last_seq(self) -> int | None:
+        for segment in reversed(self._segments):
+            if segment.seqs:
+                return segment.seqs[-1]
+        return None
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(segment.size for segment in self._segments)
+
+    def entities(self) -> tuple[EntityKey, ...]:
+        return tuple(self._entities)
+
+    def entity_seqs(self, entity: EntityKey) -> tuple[int, ...]:
+        """Journal seqs of every retained record about entity, oldest first."""
+        return tuple(self._entities.get(entity, ()))
+
+    # --------------------------
+    # Writing
+    # --------------------------
+
+    def append(self, event: Elke27Event) -> int:
+        """Append event and return its journal seq. Call flush() to push it to disk."""
+        if self._file is None:
+            raise RuntimeError("Journal is closed.")
+        seq = self._next_seq
+        record = encode_record(seq, event)
+        segment = self._segments[-1]
+        if segment.size and segment.size + len(record) > self.config.segment_max_bytes:
+            segment = self._roll(seq)
+        header = _RECORD_HEADER.unpack_from(record, 0)
+        entity = _decode_entity(header[4], header[5])
+        self._file.write(record)
+        segment.add(seq, segment.size, header[3], entity)
+        segment.size += len(record)
+        if entity is not None:
+            self._entities.setdefault(entity, array("Q")).append(seq)
+        self._next_seq = seq + 1
+        self.appended += 1
+        return seq
+
+    def flush(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.config.fsync:
+            os.fsync(self._file.fileno())
+
+    def _roll(self, first_seq: int) -> _Segment:
+        assert self._file is not None
+        self.flush()
+        self._file.close()
+        segment = self._new_segment(first_seq)
+        self._segments.append(segment)
+        self._file = open(segment.path, "ab")  # noqa: SIM115
+        self._rolls += 1
+        if self.config.compact_every and self._rolls % self.config.compact_every == 0:
+            self.compact()
+        return segment
+
+    def attach(self, client: object) -> Callable[[], bool]:
+        """
+        Journal every event client emits, flushing once per loop iteration.
+        client is an Elke27Client (or anything with .subscribe()).
+        Returns the unsubscribe callable.
+        """
+
+        def flush() -> None:
+            self._flush_scheduled = False
+            self.flush()
+
+        def on_event(event: Elke27Event) -> None:
+            self.append(event)
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                asyncio.get_running_loop().call_soon(flush)
+
+        return client.subscribe(on_event)  # type: ignore[attr-defined,no-any-return]
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> EventJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # --------------------------
+    # Replay
+    # --------------------------
+
+    def replay(
+        self,
+        *,
+        since_seq: int | None = None,
+        since_time: datetime | None = None,
+        entity: EntityKey | None = None,
+    ) -> Iterator[JournalEntry]:
+        """
+        Yield retained entries in seq order. since_seq is exclusive (pass the
+        last seq already handled); since_time is inclusive. With entity, only
+        records about that entity are read, via the index.
+        """
+        self.flush()
+        min_time_us: int | None = None
+        if since_time is not None:
+            if since_time.tzinfo is None:
+                since_time = since_time.replace(tzinfo=UTC)
+            min_time_us = (since_time - _EPOCH) // _MICROSECOND
+        wanted: set[int] | None = None
+        if entity is not None:
+            seqs = self._entities.get(entity)
+            if not seqs:
+                return
+            start = bisect_right(seqs, since_seq) if since_seq is not None else 0
+            wanted = set(seqs[start:])
+            if not wanted:
+                return
+        for segment in list(self._segments):
+            last_seq = segment.last_seq
+            if last_seq is None or (since_seq is not None and last_seq <= since_seq):
+                continue
+            if min_time_us is not None and segment.times[-1] < min_time_us:
+                continue
+            start = bisect_right(segment.seqs, since_seq) if since_seq is not None else 0
+            if min_time_us is not None:
+                start = max(start, bisect_left(segment.times, min_time_us))
+            yield from self._read_segment(segment, start, min_time_us, wanted)
+
+    def _read_segment(
+        self, segment: _Segment, start: int, min_time_us: int | None, wanted: set[int] | None
+    ) -> Iterator[JournalEntry]:
+        if start >= len(segment.seqs):
+            return
+        with open(segment.path, "rb") as file:
+            file.seek(segment.offsets[start])
+            data = file.read(segment.size - segment.offsets[start])
+        offset = 0
+        for _ in range(start, len(segment.seqs)):
+            length, _crc, seq, timestamp_us, code, entity_id = _RECORD_HEADER.unpack_from(
+                data, offset
+            )
+            body = offset + _RECORD_HEADER.size
+            offset = body + length
+            if wanted is not None and seq not in wanted:
+                continue
+            if min_time_us is not None and timestamp_us < min_time_us:
+                continue
+            yield _decode_payload(
+                seq, timestamp_us, _decode_entity(code, entity_id), data[body:offset]
+            )
+
+    # --------------------------
+    # Compaction
+    # --------------------------
+
+    def compact(self, *, now: float | None = None) -> int:
+        """
+        Drop records older than retain_s and, oldest first, beyond max_bytes.
+        The active segment is never touched. Returns the number of records dropped.
+        """
+        closed = self._segments[:-1]
+        if not closed:
+            return 0
+        cutoff_us: int | None = None
+        if self.config.retain_s is not None:
+            wall = time.time() if now is None else now
+            cutoff_us = int((wall - self.config.retain_s) * 1_000_000)
+        excess = self.size_bytes - self.config.max_bytes if self.config.max_bytes else 0
+
+        dropped = 0
+        kept_from = 0
+        for index, segment in enumerate(closed):
+            count = len(segment.seqs)
+            keep = bisect_left(segment.times, cutoff_us) if cutoff_us is not None else 0
+            excess -= segment.offsets[keep] if keep < count else segment.size
+            while excess > 0 and keep < count:
+                end = segment.offsets[keep + 1] if keep + 1 < count else segment.size
+                excess -= end - segment.offsets[keep]
+                keep += 1
+            if keep == 0:
+                break
+            dropped += keep
+            if keep < count:
+                closed[index] = self._rewrite_tail(segment, keep)
+                kept_from = index
+                break
+            segment.path.unlink()
+            kept_from = index + 1
+        if not dropped:
+            return 0
+        self._segments = closed[kept_from:] + self._segments[-1:]
+        first_seq = self.first_seq
+        if first_seq is not None:
+            for key, seqs in list(self._entities.items()):
+                cut = bisect_left(seqs, first_seq)
+                if cut == len(seqs):
+                    del self._entities[key]
+                elif cut:
+                    del seqs[:cut]
+        self.compactions += 1
+        LOG.debug("Journal compaction dropped %d records", dropped)
+        return dropped
+
+    def _rewrite_tail(self, segment: _Segment, keep_from: int) -> _Segment:
+        with open(segment.path, "rb") as file:
+            file.seek(segment.offsets[keep_from])
+            data = file.read(segment.size - segment.offsets[keep_from])
+        first_seq = segment.seqs[keep_from]
+        path = _segment_path(self.directory, first_seq)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+        if path != segment.path:
+            segment.path.unlink()
+        base = segment.offsets[keep_from]
+        rewritten = _Segment(path, first_seq)
+        for index in range(keep_from, len(segment.seqs)):
+            rewritten.seqs.append(segment.seqs[index])
+            rewritten.offsets.append(segment.offsets[index] - base)
+            rewritten.times.append(segment.times[index])
+            rewritten.entities.append(segment.entities[index])
+        rewritten.size = len(data)
+        return rewritten
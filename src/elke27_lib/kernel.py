@@ -30,8 +30,8 @@ import logging
 import socket
 import threading
 import time
-from collections import deque
-from collections.abc import Callable, Iterable, Mapping, Sequence
+from collections import Counter, deque
+from collections.abc import Callable, Collection, Iterable, Mapping, Sequence
 from dataclasses import dataclass, replace
 from enum import Enum
 from typing import (
@@ -42,6 +42,8 @@ from typing import (
 LOG = logging.getLogger(__name__)
 from . import discovery, linking
 from . import session as session_mod
+from .bootstrap_timeline import PHASE_HELLO, PHASE_TCP_CONNECT, BootstrapTimeline
+from .config_cache import PanelConfig, restore_panel_config
 from .const import REDACT_DIAGNOSTICS
 from .dispatcher import (
     DispatchContext,
@@ -66,11 +68,16 @@ from .events import (
     Event,
     stamp_event,
 )
-from .outbound import OutboundPriority
+from .outbound import AimdPacer, OutboundPriority
 from .pending import PendingResponseManager
+from .request_metrics import RequestMetrics, RequestMetricsSnapshot
+from .request_scheduler import RequestScheduler, classify_request
+from .rto import ROUTE_CLASS_KEEPALIVE, RtoTable
 from .states import PanelState
 
 RequestBuilder = Callable[..., Mapping[str, Any] | bool]  # returns payload dict or flag
+# (cfg, *, client_identity, link_key_hex) -> Session
+SessionFactory = Callable[..., session_mod.Session]
 
 
 class RequestRegistry:
@@ -134,6 +141,34 @@ class _QueuedRequest:
     expected_route: RouteKey | None
     priority: OutboundPriority
     timeout_s: float
+    # Monotonic timestamps (kernel clock) for request metrics.
+    enqueued_at: float = 0.0
+    sent_at: float | None = None
+    # True: arm the adaptive RTO for the route class, capped at timeout_s.
+    adaptive_timeout: bool = False
+    reply_error: bool = False
+    # Scheduler class and absolute drop deadline (kernel clock; None = never dropped).
+    request_class: str = ""
+    deadline: float | None = None
+
+
+def _reply_has_error(msg: Mapping[str, Any], domain: str, name: str) -> bool:
+    domain_obj = msg.get(domain)
+    if not isinstance(domain_obj, Mapping):
+        return False
+    domain_map = cast(Mapping[str, Any], domain_obj)
+    body = domain_map.get(name)
+    error_code = (
+        cast(Mapping[str, Any], body).get("error_code")
+        if isinstance(body, Mapping)
+        else domain_map.get("error_code")
+    )
+    return isinstance(error_code, int) and error_code != 0
+
+
+def _is_read_request(name: str) -> bool:
+    # Only reads are safe to share between callers; writes are never coalesced.
+    return name.startswith("get_")
 
 
 @dataclass(frozen=True, slots=True)
@@ -238,6 +273,8 @@ class E27Kernel:
     _last_link_keys: linking.E27LinkKeys | None
     _last_client_identity: linking.E27Identity | None
     _last_session_config: session_mod.SessionConfig | None
+    _last_session_factory: SessionFactory | None
+    _session_factory: SessionFactory | None
     _feature_modules: Sequence[str]
     _features_loaded: bool
     _features_lock: threading.Lock
@@ -246,7 +283,7 @@ class E27Kernel:
     _pending_responses: PendingResponseManager
     _closing: bool
     _closed_explicitly: bool
-    _sent_events: dict[int, asyncio.Event]
+    _sent_events: dict[int, list[asyncio.Event]]
     _sent_event_lock: threading.Lock
     _loop: asyncio.AbstractEventLoop | None
     _request_state: _RequestState
@@ -254,8 +291,9 @@ class E27Kernel:
     _active_timeout_handle: asyncio.TimerHandle | None
     _active_released: bool
     _active_request: _QueuedRequest | None
-    _request_queue_high: deque[_QueuedRequest]
-    _request_queue_normal: deque[_QueuedRequest]
+    _request_scheduler: RequestScheduler[_QueuedRequest]
+    _request_class_deadlines_s: dict[str, float]
+    _duplicates_saved: Counter[RouteKey]
     _keepalive_task: asyncio.Task[None] | None
     _keepalive_enabled: bool
     _keepalive_interval_s: float
@@ -265,6 +303,11 @@ class E27Kernel:
     _last_exchange_at: float
     _last_rx_at: float
     _keepalive_inflight: bool
+    _bootstrap_timeline: BootstrapTimeline | None
+    _request_metrics: RequestMetrics
+    _adaptive_timeouts: bool
+    _rto: RtoTable
+    _pacer: AimdPacer | None
 
     DEFAULT_FEATURES: Sequence[str] = (
         "elke27_lib.features.control",
@@ -295,6 +338,15 @@ class E27Kernel:
         outbound_min_interval_s: float = 0.05,
         outbound_max_burst: int = 1,
         filter_attribs_to_configured: bool = True,
+        adaptive_timeouts: bool = True,
+        request_timeout_min_s: float = 0.5,
+        request_timeout_max_s: float = 15.0,
+        adaptive_pacing: bool = False,
+        outbound_min_interval_floor_s: float = 0.01,
+        outbound_max_interval_s: float = 1.0,
+        request_class_weights: Mapping[str, int] | None = None,
+        request_class_deadlines_s: Mapping[str, float] | None = None,
+        session_factory: SessionFactory | None = None,
     ) -> None:
         self._log = logger or logging.getLogger(__name__)
         self.now = now_monotonic
@@ -302,7 +354,7 @@ class E27Kernel:
         # Kernel-owned components
         self._session = None
         self.state = PanelState()
-        self.dispatcher = Dispatcher()
+        self.dispatcher = Dispatcher(now=self.now)
         self.requests = RequestRegistry()
         self._events = deque(maxlen=(event_queue_maxlen or None))
         self._seq = 1
@@ -319,6 +371,9 @@ class E27Kernel:
         self._last_link_keys = None
         self._last_client_identity = None
         self._last_session_config = None
+        self._last_session_factory = None
+        # Default for connect(session_factory=None); session.Session when unset.
+        self._session_factory = session_factory
         self._feature_modules = features if features is not None else self.DEFAULT_FEATURES
         self._features_loaded = False
         self._features_lock = threading.Lock()
@@ -341,8 +396,11 @@ class E27Kernel:
         self._active_timeout_handle = None
         self._active_released = False
         self._active_request = None
-        self._request_queue_high = deque()
-        self._request_queue_normal = deque()
+        # Queued requests by class: interactive preempts, the rest share by weight.
+        # request_class_deadlines_s gives a per-class default time-to-live in the queue.
+        self._request_scheduler = RequestScheduler(weights=request_class_weights)
+        self._request_class_deadlines_s = dict(request_class_deadlines_s or {})
+        self._duplicates_saved = Counter()
         self._keepalive_task = None
         self._keepalive_enabled = False
         self._keepalive_interval_s = 30.0
@@ -353,6 +411,27 @@ class E27Kernel:
         self._last_exchange_at = now
         self._last_rx_at = now
         self._keepalive_inflight = False
+        self._bootstrap_timeline = None
+        self._request_metrics = RequestMetrics()
+        # Requests without an explicit timeout use a per-route-class RTO estimate
+        # (seeded with request_timeout_s) within [request_timeout_min_s, request_timeout_max_s].
+        self._adaptive_timeouts = adaptive_timeouts
+        self._rto = RtoTable(
+            initial_s=request_timeout_s,
+            floor_s=request_timeout_min_s,
+            ceiling_s=max(request_timeout_min_s, request_timeout_max_s),
+        )
+        # Adaptive pacing: AIMD on the outbound send rate, starting at outbound_min_interval_s.
+        self._pacer = (
+            AimdPacer(
+                initial_interval_s=outbound_min_interval_s,
+                min_interval_s=outbound_min_interval_floor_s,
+                max_interval_s=max(outbound_min_interval_floor_s, outbound_max_interval_s),
+                now=self.now,
+            )
+            if adaptive_pacing
+            else None
+        )
 
         # Always register dispatcher error envelope handler
         self.register_handler(("__error__", "__all__"), self._handle_dispatch_error_envelope)
@@ -479,10 +558,19 @@ class E27Kernel:
         panel: discovery.E27System | dict[str, Any] | None = None,
         client_identity: linking.E27Identity | None = None,
         session_config: session_mod.SessionConfig | None = None,
+        warm_start: PanelConfig | None = None,
+        session_factory: SessionFactory | None = None,
     ) -> session_mod.SessionState:
         """
         E27Kernel.connect accepts E27LinkKeys and client_identity, creates/stores a session.Session, performs HELLO,
         and returns the session state (confirming ACTIVE).
+
+        warm_start restores cached configuration before bootstrap; its domains skip the
+        configured/defs crawl until the caller validates them against table_csm.
+
+        session_factory replaces session.Session (e.g. capture.ReplaySession); it is
+        called with the same arguments. It defaults to the factory given to the
+        constructor.
         """
         await asyncio.to_thread(self.load_features_blocking, None)
         self._loop = asyncio.get_running_loop()
@@ -522,11 +610,13 @@ class E27Kernel:
         self._keepalive_enabled = bool(cfg.keepalive_enabled)
         self._keepalive_interval_s = float(cfg.keepalive_interval_s)
         self._keepalive_timeout_s = float(cfg.keepalive_timeout_s)
+        self._rto.seed(ROUTE_CLASS_KEEPALIVE, self._keepalive_timeout_s)
         self._keepalive_max_missed = int(cfg.keepalive_max_missed)
         cfg = replace(cfg, keepalive_enabled=False)
 
         self._closed_explicitly = False
-        s = session_mod.Session(cfg=cfg, client_identity=client_identity, link_key_hex=link_key_hex)
+        factory = session_factory or self._session_factory or session_mod.Session
+        s = factory(cfg, client_identity=client_identity, link_key_hex=link_key_hex)
 
         # Wire callbacks before connecting so HELLO path can report, if needed.
         s.on_message = self._on_message
@@ -536,10 +626,12 @@ class E27Kernel:
         def _do_connect_sync() -> session_mod.SessionInfo:
             return s.connect()
 
+        connect_started_at = self.now()
         try:
             await asyncio.to_thread(_do_connect_sync)
         except Exception as e:
             raise KernelError(f"Session connect failed for {host}:{port}: {e}") from e
+        self._start_bootstrap_timeline(s, connect_started_at, self.now())
 
         self._session = s
 
@@ -552,6 +644,7 @@ class E27Kernel:
             loop=self._loop,
             min_interval_s=self._outbound_min_interval_s,
             max_burst=self._outbound_max_burst,
+            pacer=self._pacer,
         )
         s.start_auto_receive()
 
@@ -568,11 +661,16 @@ class E27Kernel:
                 domain,
                 {"table_elements": None, "increment_size": None},
             )
+        skip_domains: Collection[str] = ()
+        if warm_start is not None:
+            restore_panel_config(self.state, warm_start)
+            skip_domains = tuple(warm_start.domains)
         self._emit_connection_state(connected=True)
-        self._bootstrap_requests()
+        self._bootstrap_requests(skip_domains=skip_domains)
         self._last_link_keys = link_keys
         self._last_client_identity = client_identity
         self._last_session_config = cfg
+        self._last_session_factory = session_factory
         self._keepalive_missed = 0
         now = self.now()
         self._last_exchange_at = now
@@ -584,7 +682,8 @@ class E27Kernel:
 
     async def reconnect(self) -> session_mod.SessionState:
         """
-        Reconnect using the most recent successful connect() parameters.
+        Reconnect using the most recent successful connect() parameters
+        (including session_factory).
         """
         if (
             self._last_link_keys is None
@@ -597,6 +696,7 @@ class E27Kernel:
             self._last_link_keys,
             client_identity=self._last_client_identity,
             session_config=self._last_session_config,
+            session_factory=self._last_session_factory,
         )
 
     async def close(self) -> None:
@@ -664,11 +764,7 @@ class E27Kernel:
                 except asyncio.CancelledError:
                     return
                 continue
-            if (
-                self._request_state is not _RequestState.IDLE
-                or self._request_queue_high
-                or self._request_queue_normal
-            ):
+            if self._request_state is not _RequestState.IDLE or self._request_scheduler:
                 try:
                     await asyncio.sleep(0.5)
                 except asyncio.CancelledError:
@@ -707,8 +803,7 @@ class E27Kernel:
         if (
             self._keepalive_inflight
             or self._request_state is not _RequestState.IDLE
-            or self._request_queue_high
-            or self._request_queue_normal
+            or self._request_scheduler
         ):
             return True
         self._keepalive_inflight = True
@@ -735,6 +830,7 @@ class E27Kernel:
                     expected_route=("system", "r_u_alive"),
                     priority=OutboundPriority.HIGH,
                     timeout_s=self._keepalive_timeout_s,
+                    timeout_is_cap=True,
                 )
             except Exception:
                 self._pending_responses.drop(seq)
@@ -815,40 +911,77 @@ class E27Kernel:
         )
 
     def _reset_inventory_state(self) -> None:
+        for domain in ("area", "zone", "output", "user", "keypad"):
+            self._reset_domain_inventory(domain)
+
+    def _reset_domain_inventory(self, domain: str) -> None:
         inv = self.state.inventory
-        inv.configured_areas = set()
-        inv.configured_zones = set()
-        inv.configured_outputs = set()
-        inv.configured_users = set()
-        inv.configured_keypads = set()
-        inv.configured_area_blocks_seen = set()
-        inv.configured_zone_blocks_seen = set()
-        inv.configured_area_blocks_requested = set()
-        inv.configured_zone_blocks_requested = set()
-        inv.configured_area_block_count = None
-        inv.configured_zone_block_count = None
-        inv.configured_area_blocks_remaining = None
-        inv.configured_zone_blocks_remaining = None
-        inv.configured_areas_complete = False
-        inv.configured_zones_complete = False
-        inv.configured_outputs_complete = False
-        inv.configured_users_complete = False
-        inv.configured_keypads_complete = False
-        inv.area_names_logged = False
-        inv.zone_names_logged = False
-        inv.area_attribs_requested = set()
-        inv.zone_attribs_requested = set()
-        inv.output_attribs_requested = set()
-        inv.user_attribs_requested = set()
-        inv.keypad_attribs_requested = set()
-        inv.area_invalid_streak = 0
-        inv.zone_invalid_streak = 0
-        inv.area_last_invalid_id = None
-        inv.zone_last_invalid_id = None
-        inv.area_discovery_max_id = None
-        inv.zone_discovery_max_id = None
-
-    def _bootstrap_requests(self) -> None:
+        if domain == "area":
+            inv.configured_areas = set()
+            inv.configured_area_blocks_seen = set()
+            inv.configured_area_blocks_requested = set()
+            inv.configured_area_block_count = None
+            inv.configured_area_blocks_remaining = None
+            inv.configured_areas_complete = False
+            inv.area_names_logged = False
+            inv.area_attribs_requested = set()
+            inv.area_invalid_streak = 0
+            inv.area_last_invalid_id = None
+            inv.area_discovery_max_id = None
+        elif domain == "zone":
+            inv.configured_zones = set()
+            inv.configured_zone_blocks_seen = set()
+            inv.configured_zone_blocks_requested = set()
+            inv.configured_zone_block_count = None
+            inv.configured_zone_blocks_remaining = None
+            inv.configured_zones_complete = False
+            inv.zone_names_logged = False
+            inv.zone_attribs_requested = set()
+            inv.zone_invalid_streak = 0
+            inv.zone_last_invalid_id = None
+            inv.zone_discovery_max_id = None
+        elif domain == "output":
+            inv.configured_outputs = set()
+            inv.configured_outputs_complete = False
+            inv.output_attribs_requested = set()
+        elif domain == "user":
+            inv.configured_users = set()
+            inv.configured_users_complete = False
+            inv.user_attribs_requested = set()
+        elif domain == "keypad":
+            inv.configured_keypads = set()
+            inv.configured_keypads_complete = False
+            inv.keypad_attribs_requested = set()
+
+    def _start_bootstrap_timeline(
+        self, session: session_mod.Session, started_at: float, connected_at: float
+    ) -> None:
+        """
+        Start a new bootstrap timeline with TCP connect and HELLO phases.
+
+        The session measures both with time.monotonic(); only the split point is taken
+        from it so the timeline stays on the kernel clock.
+        """
+        timeline = BootstrapTimeline(started_at)
+        split = connected_at
+        tcp_started = session.connect_started_at
+        tcp_connected = session.tcp_connected_at
+        if tcp_started is not None and tcp_connected is not None:
+            split = min(connected_at, started_at + max(0.0, tcp_connected - tcp_started))
+        timeline.record_phase(PHASE_TCP_CONNECT, started_at, split)
+        timeline.record_phase(PHASE_HELLO, split, connected_at)
+        self._bootstrap_timeline = timeline
+
+    @property
+    def bootstrap_timeline(self) -> BootstrapTimeline | None:
+        """Timeline of the most recent connect(), or None before the first connect."""
+        return self._bootstrap_timeline
+
+    def _bootstrap_requests(self, *, skip_domains: Collection[str] = ()) -> None:
+        """
+        Request table_info for every domain, then configured inventory and zone
+        definitions for every domain not in skip_domains (warm-started domains).
+        """
         if self._session is None:
             return
 
@@ -865,23 +998,46 @@ class E27Kernel:
             except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
                 continue
 
-        for route in (
-            ("area", "get_configured"),
-            ("zone", "get_configured"),
-            ("output", "get_configured"),
-            ("user", "get_configured"),
-        ):
-            if self.requests.get(route) is None:
-                continue
-            try:
-                self.request(route, block_id=1)
-            except (E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                continue
+        for domain in ("area", "zone", "output", "user"):
+            if domain not in skip_domains:
+                self._request_configured(domain)
 
-        zone_defs_route = ("zone", "get_defs")
-        if self.requests.get(zone_defs_route) is not None:
-            with contextlib.suppress(E27Error, KeyError, RuntimeError, TypeError, ValueError):
-                self.request(zone_defs_route, block_id=1)
+        if "zone" not in skip_domains:
+            self._request_zone_defs()
+
+    def _request_configured(self, domain: str) -> None:
+        route = (domain, "get_configured")
+        if self.requests.get(route) is None:
+            return
+        with contextlib.suppress(E27Error, KeyError, RuntimeError, TypeError, ValueError):
+            self.request(route, block_id=1)
+
+    def _request_zone_defs(self) -> None:
+        route = ("zone", "get_defs")
+        if self.requests.get(route) is None:
+            return
+        with contextlib.suppress(E27Error, KeyError, RuntimeError, TypeError, ValueError):
+            self.request(route, block_id=1)
+
+    def bootstrap_domain(self, domain: str) -> None:
+        """
+        Discard cached configuration for a domain and fetch it from the panel.
+
+        Used when a warm-started domain turns out to be stale (table_csm differs).
+        """
+        if self._session is None:
+            raise KernelError("No active Session. Call connect() successfully first.")
+        self._reset_domain_inventory(domain)
+        if domain == "area":
+            self.state.areas.clear()
+        elif domain == "zone":
+            self.state.zones.clear()
+            self.state.zone_defs_by_id.clear()
+        elif domain == "output":
+            self.state.outputs.clear()
+        self._request_configured(domain)
+        if domain == "zone":
+            self._request_zone_defs()
 
     def request_csm_refresh(
         self,
@@ -980,6 +1136,10 @@ class E27Kernel:
         seq_val = msg.get("seq")
         if isinstance(seq_val, int) and seq_val > 0:
             if self._request_state is _RequestState.IN_FLIGHT and seq_val == self._active_seq:
+                if self._active_request is not None:
+                    self._active_request.reply_error = _reply_has_error(
+                        msg, self._active_request.domain, self._active_request.name
+                    )
                 self._cancel_active_timeout()
                 self._complete_active(reason="reply")
             elif self._log.isEnabledFor(logging.DEBUG):
@@ -1053,23 +1213,22 @@ class E27Kernel:
 
     def _register_sent_event(self, seq: int, event: asyncio.Event) -> asyncio.Event:
         with self._sent_event_lock:
-            self._sent_events[seq] = event
+            self._sent_events.setdefault(seq, []).append(event)
         return event
 
     def _signal_sent_event(self, seq: int) -> None:
         with self._sent_event_lock:
-            event = self._sent_events.pop(seq, None)
-        if event is None:
-            return
-        try:
-            loop = getattr(event, "_loop", None)
-            if loop is not None and loop.is_running():
-                loop.call_soon_threadsafe(event.set)
-            else:
+            events = self._sent_events.pop(seq, None)
+        for event in events or ():
+            try:
+                loop = getattr(event, "_loop", None)
+                if loop is not None and loop.is_running():
+                    loop.call_soon_threadsafe(event.set)
+                else:
+                    event.set()
+            except Exception as exc:
+                self._log.warning("Event set failed: %s", exc, exc_info=True)
                 event.set()
-        except Exception as exc:
-            self._log.warning("Event set failed: %s", exc, exc_info=True)
-            event.set()
 
     def _set_loop_if_needed(self) -> None:
         if self._loop is not None:
@@ -1080,10 +1239,17 @@ class E27Kernel:
             return
 
     def _enqueue_request(self, item: _QueuedRequest) -> None:
-        if item.priority is OutboundPriority.HIGH:
-            self._request_queue_high.append(item)
-        else:
-            self._request_queue_normal.append(item)
+        item.enqueued_at = self.now()
+        if self._bootstrap_timeline is not None:
+            self._bootstrap_timeline.note_request(item.expected_route, item.enqueued_at)
+        if not item.request_class:
+            route = item.expected_route or (item.domain, item.name)
+            item.request_class = classify_request(route, item.priority)
+        if item.deadline is None:
+            ttl_s = self._request_class_deadlines_s.get(item.request_class)
+            if ttl_s is not None:
+                item.deadline = item.enqueued_at + ttl_s
+        self._request_scheduler.push(item, item.request_class, deadline=item.deadline)
         self._kick_scheduler()
 
     def _kick_scheduler(self) -> None:
@@ -1105,7 +1271,7 @@ class E27Kernel:
     def _try_send_next(self) -> None:
         if self._request_state is not _RequestState.IDLE:
             return
-        if not self._request_queue_high and not self._request_queue_normal:
+        if not self._request_scheduler:
             return
         if self._session is None:
             return
@@ -1113,11 +1279,11 @@ class E27Kernel:
         if session_state is not session_mod.SessionState.ACTIVE:
             return
 
-        item = (
-            self._request_queue_high.popleft()
-            if self._request_queue_high
-            else self._request_queue_normal.popleft()
-        )
+        for expired in self._request_scheduler.drop_expired(self.now()):
+            self._expire_request(expired)
+        item = self._request_scheduler.pop()
+        if item is None:
+            return
         self._request_state = _RequestState.IN_FLIGHT
         self._active_seq = item.seq
         self._active_released = False
@@ -1165,13 +1331,25 @@ class E27Kernel:
             self.session.send_json(
                 msg,
                 priority=item.priority,
-                on_sent=lambda _: self._on_request_sent(item.seq, item.timeout_s),
+                on_sent=lambda _: self._on_request_sent(item.seq, self._reply_timeout_for(item)),
                 on_fail=lambda exc: self._handle_send_failure(item.seq, exc),
             )
         except Exception as exc:
             self._handle_send_failure(item.seq, exc)
 
+    def _reply_timeout_for(self, item: _QueuedRequest) -> float:
+        if not item.adaptive_timeout:
+            return item.timeout_s
+        route = (item.domain, item.name)
+        return self._rto.timeout_for(route, cap_s=item.timeout_s)
+
     def _on_request_sent(self, seq: int, timeout_s: float) -> None:
+        item = self._active_request
+        if item is not None and item.seq == seq and item.sent_at is None:
+            item.sent_at = self.now()
+            self._request_metrics.record_sent(
+                (item.domain, item.name), item.sent_at - item.enqueued_at
+            )
         self._mark_request_sent(seq)
         self._arm_reply_timeout(seq, timeout_s)
 
@@ -1226,16 +1404,60 @@ class E27Kernel:
         self._complete_active(reason="send_failed")
 
     def _complete_active(self, *, reason: str) -> None:
-        _ = reason
         if self._active_released:
             return
         self._active_released = True
         self._cancel_active_timeout()
+        item = self._active_request
+        if item is not None:
+            now = self.now()
+            self._record_request_outcome(item, reason, now)
+            if self._bootstrap_timeline is not None:
+                self._bootstrap_timeline.note_complete(item.expected_route, now)
         self._active_seq = None
         self._active_request = None
         self._request_state = _RequestState.IDLE
         self._kick_scheduler()
 
+    def _record_request_outcome(self, item: _QueuedRequest, reason: str, now: float) -> None:
+        route = (item.domain, item.name)
+        if reason == "reply":
+            rtt = now - item.sent_at if item.sent_at is not None else None
+            self._request_metrics.record_reply(route, rtt, now - item.enqueued_at)
+            if rtt is not None:
+                self._rto.observe(route, rtt)
+            if self._pacer is not None:
+                self._pacer.on_reply(rtt, error=item.reply_error, route=route)
+        elif reason == "timeout":
+            self._request_metrics.record_timeout(route)
+            if item.adaptive_timeout:
+                self._rto.on_timeout(route)
+            if self._pacer is not None:
+                self._pacer.on_timeout()
+        elif reason == "send_failed":
+            self._request_metrics.record_send_failure(route)
+
+    @property
+    def request_metrics(self) -> RequestMetrics:
+        """Per-route latency histograms and outcome counters for scheduled requests."""
+        return self._request_metrics
+
+    def metrics_snapshot(self) -> RequestMetricsSnapshot:
+        """Request metrics plus adaptive RTO state per route class and pacer state."""
+        return self._request_metrics.snapshot(
+            rto=self._rto.snapshot(),
+            pacing=self._pacer.snapshot() if self._pacer is not None else None,
+        )
+
+    def request_queue_depths(self) -> dict[str, int]:
+        """Number of queued (not yet sent) requests per scheduler class."""
+        return self._request_scheduler.depths()
+
+    @property
+    def max_request_timeout_s(self) -> float:
+        """Longest reply timeout a request without an explicit timeout can be given."""
+        return self._rto.ceiling_s if self._adaptive_timeouts else self._request_timeout_s
+
     def _abort_requests(self, exc: BaseException) -> None:
         active_seq = self._active_seq
         if (
@@ -1250,12 +1472,32 @@ class E27Kernel:
                 self._log.warning("E27 in-flight request aborted: seq=%s error=%s", active_seq, exc)
             self._complete_active(reason="abort")
 
-        for queue in (self._request_queue_high, self._request_queue_normal):
-            while queue:
-                item = queue.popleft()
-                self.dispatcher.drop_pending(item.seq)
-                self._pending_responses.fail(item.seq, exc)
-                self._signal_sent_event(item.seq)
+        for item in self._request_scheduler.clear():
+            self.dispatcher.drop_pending(item.seq)
+            self._pending_responses.fail(item.seq, exc)
+            self._signal_sent_event(item.seq)
+
+    def _expire_request(self, item: _QueuedRequest) -> None:
+        """Drop a queued request whose deadline passed before it could be sent."""
+        now = self.now()
+        self._request_metrics.record_expired((item.domain, item.name))
+        if self._bootstrap_timeline is not None:
+            self._bootstrap_timeline.note_complete(item.expected_route, now)
+        self.dispatcher.drop_pending(item.seq)
+        self._pending_responses.fail(
+            item.seq,
+            E27Timeout(f"Request {item.domain}.{item.name} expired before it was sent."),
+        )
+        self._signal_sent_event(item.seq)
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug(
+                "Dropped expired %s request: route=%s.%s seq=%s queued_for=%.3fs",
+                item.request_class,
+                item.domain,
+                item.name,
+                item.seq,
+                now - item.enqueued_at,
+            )
 
     def _mark_request_sent(self, seq: int) -> None:
         now = self.now()
@@ -1272,20 +1514,173 @@ class E27Kernel:
     # -------------------------
 
     def request(
-        self, route: RouteKey, /, *, pending: bool = True, opaque: Any = None, **kwargs: Any
+        self,
+        route: RouteKey,
+        /,
+        *,
+        pending: bool = True,
+        opaque: Any = None,
+        priority: OutboundPriority = OutboundPriority.NORMAL,
+        request_class: str | None = None,
+        deadline_s: float | None = None,
+        **kwargs: Any,
     ) -> int:
         """
         Public outbound API: build payload via registry and send.
 
         pending=True:
           - Registers a PendingRequest with Dispatcher for seq-first correlation.
+        request_class overrides the scheduler class derived from route and priority;
+        deadline_s drops the request if it is still queued that many seconds from now.
         """
         builder = self.requests.require(route)
         payload = builder(**kwargs)
         domain, name = route
+        if opaque is None and _is_read_request(name):
+            existing = self._find_inflight_seq(domain, name, payload)
+            if existing is not None:
+                self._note_duplicate(route)
+                return existing
         return self._send_request(
-            domain, name, payload, pending=pending, opaque=opaque, expected_route=route
+            domain,
+            name,
+            payload,
+            pending=pending,
+            opaque=opaque,
+            expected_route=route,
+            priority=priority,
+            request_class=request_class,
+            deadline_s=deadline_s,
+        )
+
+    def request_unless_pending(
+        self,
+        route: RouteKey,
+        /,
+        *,
+        priority: OutboundPriority = OutboundPriority.NORMAL,
+        request_class: str | None = None,
+        deadline_s: float | None = None,
+        **kwargs: Any,
+    ) -> int | None:
+        """
+        Like request(), but skip the send if an identical request (same route and
+        payload) is already queued or in flight, or a paged transfer for the route
+        is still being reassembled.
+
+        Returns the new seq, or None if the request was deduplicated.
+        """
+        builder = self.requests.require(route)
+        payload = builder(**kwargs)
+        if self._is_request_pending(route, payload):
+            return None
+        domain, name = route
+        return self._send_request(
+            domain,
+            name,
+            payload,
+            pending=True,
+            opaque=None,
+            expected_route=route,
+            priority=priority,
+            request_class=request_class,
+            deadline_s=deadline_s,
+        )
+
+    def submit_for_response(
+        self,
+        domain: str,
+        name: str,
+        payload: Any,
+        *,
+        command_key: str,
+        expected_route: RouteKey,
+        timeout_s: float | None,
+        loop: asyncio.AbstractEventLoop,
+        priority: OutboundPriority = OutboundPriority.NORMAL,
+        request_class: str | None = None,
+        deadline_s: float | None = None,
+    ) -> tuple[int, asyncio.Future[Mapping[str, Any]], asyncio.Event]:
+        """
+        Send a request whose reply is delivered via a PendingResponse future.
+
+        Singleflight: for read requests (get_*), if an identical request (same route
+        and payload) is already queued or in flight, the caller joins that seq
+        instead of sending again. Returns (seq, reply future, sent event).
+        """
+        sent_event = asyncio.Event()
+        existing = (
+            self._find_inflight_seq(domain, name, payload) if _is_read_request(name) else None
         )
+        if existing is not None:
+            self._note_duplicate((domain, name))
+            future = self._pending_responses.attach(
+                existing, command_key=command_key, expected_route=expected_route, loop=loop
+            )
+            if self._active_seq == existing and not self._active_released:
+                sent_event.set()
+            else:
+                self._register_sent_event(existing, sent_event)
+            return existing, future, sent_event
+
+        seq = self._next_seq()
+        future = self._pending_responses.create(
+            seq, command_key=command_key, expected_route=expected_route, loop=loop
+        )
+        self._register_sent_event(seq, sent_event)
+        try:
+            self._send_request_with_seq(
+                seq,
+                domain,
+                name,
+                payload,
+                pending=False,
+                opaque=None,
+                expected_route=expected_route,
+                priority=priority,
+                timeout_s=timeout_s,
+                request_class=request_class,
+                deadline_s=deadline_s,
+            )
+        except BaseException:
+            self._pending_responses.drop(seq)
+            with self._sent_event_lock:
+                self._sent_events.pop(seq, None)
+            raise
+        return seq, future, sent_event
+
+    @property
+    def duplicates_saved(self) -> dict[RouteKey, int]:
+        """Per-route count of requests answered by joining an in-flight identical request."""
+        return dict(self._duplicates_saved)
+
+    @property
+    def duplicates_saved_total(self) -> int:
+        return sum(self._duplicates_saved.values())
+
+    def _note_duplicate(self, route: RouteKey) -> None:
+        self._duplicates_saved[route] += 1
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Joined in-flight %s.%s request", route[0], route[1])
+
+    def _find_inflight_seq(self, domain: str, name: str, payload: Any) -> int | None:
+        active = self._active_request if not self._active_released else None
+        for queue in ((active,) if active is not None else (), self._request_scheduler):
+            for item in queue:
+                if (
+                    item.opaque is None
+                    and item.domain == domain
+                    and item.name == name
+                    and item.payload == payload
+                ):
+                    return item.seq
+        return None
+
+    def _is_request_pending(self, route: RouteKey, payload: Any) -> bool:
+        domain, name = route
+        if self._find_inflight_seq(domain, name, payload) is not None:
+            return True
+        return self.dispatcher.is_paged(route) and self.dispatcher.has_paged_transfer(route)
 
     def _next_seq(self) -> int:
         max_seq = 2_147_483_647
@@ -1321,6 +1716,9 @@ class E27Kernel:
         priority: OutboundPriority = OutboundPriority.NORMAL,
         timeout_s: float | None = None,
         expects_reply: bool = True,
+        timeout_is_cap: bool = False,
+        request_class: str | None = None,
+        deadline_s: float | None = None,
     ) -> int:
         return self._send_request_with_seq(
             seq,
@@ -1333,6 +1731,9 @@ class E27Kernel:
             priority=priority,
             timeout_s=timeout_s,
             expects_reply=expects_reply,
+            timeout_is_cap=timeout_is_cap,
+            request_class=request_class,
+            deadline_s=deadline_s,
         )
 
     def _send_request(
@@ -1344,6 +1745,9 @@ class E27Kernel:
         pending: bool,
         opaque: Any,
         expected_route: RouteKey | None,
+        priority: OutboundPriority = OutboundPriority.NORMAL,
+        request_class: str | None = None,
+        deadline_s: float | None = None,
     ) -> int:
         """
         Mechanical request sender (no policy enforcement in this phase):
@@ -1361,6 +1765,9 @@ class E27Kernel:
             pending=pending,
             opaque=opaque,
             expected_route=expected_route,
+            priority=priority,
+            request_class=request_class,
+            deadline_s=deadline_s,
         )
 
     def _send_request_with_seq(
@@ -1376,7 +1783,16 @@ class E27Kernel:
         priority: OutboundPriority = OutboundPriority.NORMAL,
         timeout_s: float | None = None,
         expects_reply: bool = True,
+        timeout_is_cap: bool = False,
+        request_class: str | None = None,
+        deadline_s: float | None = None,
     ) -> int:
+        """
+        timeout_s=None uses the adaptive RTO for the route class (or request_timeout_s
+        when adaptive timeouts are off); timeout_is_cap=True uses the adaptive RTO but
+        never longer than timeout_s. request_class=None lets the scheduler classify
+        the request by route and priority; deadline_s bounds its time in the queue.
+        """
         if self._session is None:
             raise KernelError("No active Session. Call connect() successfully first.")
         session_state = getattr(self._session, "state", session_mod.SessionState.ACTIVE)
@@ -1400,9 +1816,13 @@ class E27Kernel:
                 ) from exc
             return seq
 
-        timeout_value = (
-            float(timeout_s) if timeout_s is not None else float(self._request_timeout_s)
-        )
+        adaptive = self._adaptive_timeouts and (timeout_s is None or timeout_is_cap)
+        if timeout_s is not None:
+            timeout_value = float(timeout_s)
+        elif adaptive:
+            timeout_value = self._rto.ceiling_s
+        else:
+            timeout_value = float(self._request_timeout_s)
         queued = _QueuedRequest(
             seq=seq,
             domain=domain,
@@ -1413,6 +1833,9 @@ class E27Kernel:
             expected_route=expected_route,
             priority=priority,
             timeout_s=timeout_value,
+            adaptive_timeout=adaptive,
+            request_class=request_class or "",
+            deadline=self.now() + deadline_s if deadline_s is not None else None,
         )
         self._enqueue_request(queued)
         return seq
@@ -0,0 +1,443 @@
+"""
+elke27_lib/manager.py
+
+Multi-panel connection manager: many Elke27Client instances on one event loop.
+
+- Shared I/O: the default client config sets ClientConfig.loop_io, so every
+  session's socket is watched by the loop's selector and frames are sent on the
+  loop. A fleet of N panels needs no per-panel receive or send threads; only
+  TCP connect and HELLO still run in the default executor.
+- Bounded startup: at most max_concurrent_bootstraps panels are connecting or
+  bootstrapping at once (a slot is held from TCP connect until status-ready),
+  and connect attempts start at least stagger_s apart. Startup of N panels with
+  a per-panel bootstrap time B therefore finishes within
+  PanelManagerConfig.startup_bound_s(N, B).
+- Failed connects and bootstraps that miss bootstrap_timeout_s are retried
+  connect_retries times with exponential backoff, releasing the slot while
+  waiting. A panel that still fails is marked "failed".
+- A panel that loses its connection after becoming ready is brought up again
+  through the same slots (reconnect=True).
+- events() merges the event streams of all clients as PanelEvent(panel_id,
+  event). The merged queue is bounded by event_queue_size; when full the oldest
+  event is dropped and counted in FleetHealth.events_dropped.
+- health() reports per-panel state, attempts, bootstrap time and request
+  counters, plus fleet totals.
+
+Typical usage:
+    manager = PanelManager(PanelManagerConfig(max_concurrent_bootstraps=8))
+    for spec in specs:
+        manager.add_panel(spec)
+    await manager.start()
+    await manager.wait_settled(timeout_s=300.0)
+    async for item in manager.events():
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass, field
+
+from .client import Elke27Client
+from .errors import Elke27Error
+from .types import ClientConfig, Elke27Event, EventType, LinkKeys
+
+LOG = logging.getLogger(__name__)
+
+PANEL_PENDING = "pending"
+PANEL_CONNECTING = "connecting"
+PANEL_BOOTSTRAPPING = "bootstrapping"
+PANEL_READY = "ready"
+PANEL_DISCONNECTED = "disconnected"
+PANEL_FAILED = "failed"
+PANEL_STOPPED = "stopped"
+
+
+@dataclass(frozen=True, slots=True)
+class PanelSpec:
+    """One panel to manage. config overrides PanelManagerConfig.client_config."""
+
+    panel_id: str
+    host: str
+    port: int
+    link_keys: LinkKeys
+    config: ClientConfig | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PanelManagerConfig:
+    max_concurrent_bootstraps: int = 4
+    stagger_s: float = 0.5
+    bootstrap_timeout_s: float = 60.0
+    connect_retries: int = 2
+    retry_backoff_s: float = 5.0
+    reconnect: bool = True
+    reconnect_delay_s: float = 5.0
+    event_queue_size: int = 1024
+    client_config: ClientConfig = field(default_factory=lambda: ClientConfig(loop_io=True))
+
+    def startup_bound_s(self, panel_count: int, bootstrap_s: float) -> float:
+        """
+        Upper bound on the time for panel_count panels to become ready when each
+        bootstrap takes at most bootstrap_s and no attempt fails.
+        """
+        if panel_count <= 0:
+            return 0.0
+        waves = math.ceil(panel_count / max(1, self.max_concurrent_bootstraps))
+        return (panel_count - 1) * self.stagger_s + waves * bootstrap_s
+
+
+ClientFactory = Callable[[PanelSpec, ClientConfig], Elke27Client]
+
+
+def _default_client_factory(spec: PanelSpec, config: ClientConfig) -> Elke27Client:
+    del spec
+    return Elke27Client(config)
+
+
+@dataclass(frozen=True, slots=True)
+class PanelEvent:
+    """A client event tagged with the panel it came from."""
+
+    panel_id: str
+    event: Elke27Event
+
+
+@dataclass(frozen=True, slots=True)
+class PanelHealth:
+    panel_id: str
+    status: str
+    connected: bool
+    connect_attempts: int
+    reconnects: int
+    last_error: str | None
+    # Connect start to status-ready of the latest successful bring-up.
+    bootstrap_s: float | None
+    requests_sent: int
+    replies: int
+    timeouts: int
+    send_failures: int
+
+
+@dataclass(frozen=True, slots=True)
+class FleetHealth:
+    panels: Mapping[str, PanelHealth]
+    bootstraps_in_flight: int
+    peak_bootstraps_in_flight: int
+    events_dropped: int
+    # start() to the moment every panel was first ready or failed.
+    startup_s: float | None
+
+    def count(self, status: str) -> int:
+        return sum(1 for panel in self.panels.values() if panel.status == status)
+
+    @property
+    def ready(self) -> int:
+        return self.count(PANEL_READY)
+
+    @property
+    def failed(self) -> int:
+        return self.count(PANEL_FAILED)
+
+    @property
+    def requests_sent(self) -> int:
+        return sum(panel.requests_sent for panel in self.panels.values())
+
+    @property
+    def timeouts(self) -> int:
+        return sum(panel.timeouts for panel in self.panels.values())
+
+
+class _ManagedPanel:
+    __slots__ = (
+        "spec",
+        "client",
+        "status",
+        "attempts",
+        "reconnects",
+        "last_error",
+        "bootstrap_s",
+        "task",
+        "lost",
+        "settled",
+        "unsubscribe",
+    )
+
+    def __init__(self, spec: PanelSpec, client: Elke27Client) -> None:
+        self.spec = spec
+        self.client = client
+        self.status = PANEL_PENDING
+        self.attempts = 0
+        self.reconnects = 0
+        self.last_error: str | None = None
+        self.bootstrap_s: float | None = None
+        self.task: asyncio.Task[None] | None = None
+        self.lost = asyncio.Event()
+        self.settled = asyncio.Event()
+        self.unsubscribe: Callable[[], bool] | None = None
+
+
+class PanelManager:
+    """
+    Owns one Elke27Client per panel on the running event loop.
+
+    Panels may be added before or after start(); panels added later are brought
+    up through the same concurrency budget.
+    """
+
+    def __init__(
+        self,
+        config: PanelManagerConfig | None = None,
+        *,
+        client_factory: ClientFactory | None = None,
+    ) -> None:
+        self.config = config or PanelManagerConfig()
+        self._client_factory = client_factory or _default_client_factory
+        self._panels: dict[str, _ManagedPanel] = {}
+        self._slots = asyncio.Semaphore(max(1, self.config.max_concurrent_bootstraps))
+        self._stagger_lock = asyncio.Lock()
+        self._next_start_at = 0.0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._events: asyncio.Queue[PanelEvent | None] = asyncio.Queue(
+            maxsize=max(1, self.config.event_queue_size)
+        )
+        self._events_dropped = 0
+        self._started_at: float | None = None
+        self._settled_at: float | None = None
+        self._running = False
+        self._stopping = False
+
+    # Fleet membership
+
+    def add_panel(self, spec: PanelSpec) -> Elke27Client:
+        """Register a panel and build its client; starts it if the manager is running."""
+        if spec.panel_id in self._panels:
+            raise ValueError(f"Panel {spec.panel_id!r} is already managed.")
+        client = self._client_factory(spec, spec.config or self.config.client_config)
+        entry = _ManagedPanel(spec, client)
+        entry.unsubscribe = client.subscribe(lambda event: self._on_client_event(entry, event))
+        self._panels[spec.panel_id] = entry
+        if self._running:
+            self._settled_at = None
+            self._spawn(entry)
+        return client
+
+    async def remove_panel(self, panel_id: str) -> None:
+        """Stop managing a panel and disconnect its client."""
+        entry = self._panels.pop(panel_id)
+        if entry.unsubscribe is not None:
+            entry.unsubscribe()
+        if entry.task is not None:
+            entry.task.cancel()
+            await asyncio.gather(entry.task, return_exceptions=True)
+        await self._disconnect(entry)
+
+    def client(self, panel_id: str) -> Elke27Client:
+        return self._panels[panel_id].client
+
+    @property
+    def panel_ids(self) -> tuple[str, ...]:
+        return tuple(self._panels)
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        """Start bringing up every registered panel; returns immediately."""
+        if self._running:
+            return
+        self._running = True
+        self._stopping = False
+        self._started_at = asyncio.get_running_loop().time()
+        for entry in self._panels.values():
+            self._spawn(entry)
+
+    async def wait_settled(self, timeout_s: float | None = None) -> bool:
+        """Wait until every panel has been ready at least once or has failed."""
+        waits = [entry.settled.wait() for entry in self._panels.values()]
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout=timeout_s)
+        except TimeoutError:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        """Disconnect every panel and end the events() stream."""
+        self._stopping = True
+        self._running = False
+        tasks = [entry.task for entry in self._panels.values() if entry.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(
+            *(self._disconnect(entry) for entry in self._panels.values()),
+            return_exceptions=True,
+        )
+        for entry in self._panels.values():
+            entry.task = None
+            entry.status = PANEL_STOPPED
+        self._put_event(None)
+
+    def events(self) -> AsyncIterator[PanelEvent]:
+        """Async iterator of events from all panels; ends after stop()."""
+
+        async def _iter() -> AsyncIterator[PanelEvent]:
+            while True:
+                item = await self._events.get()
+                if item is None:
+                    break
+                yield item
+
+        return _iter()
+
+    # Health
+
+    def health(self) -> FleetHealth:
+        startup_s = None
+        if self._started_at is not None and self._settled_at is not None:
+            startup_s = self._settled_at - self._started_at
+        return FleetHealth(
+            panels={
+                panel_id: self._panel_health(entry) for panel_id, entry in self._panels.items()
+            },
+            bootstraps_in_flight=self._in_flight,
+            peak_bootstraps_in_flight=self._peak_in_flight,
+            events_dropped=self._events_dropped,
+            startup_s=startup_s,
+        )
+
+    @staticmethod
+    def _panel_health(entry: _ManagedPanel) -> PanelHealth:
+        sent = replies = 0
+        metrics = entry.client.request_metrics()
+        for route in metrics.routes.values():
+            sent += route.sent
+            replies += route.replies
+        timeouts = metrics.timeouts
+        send_failures = metrics.send_failures
+        return PanelHealth(
+            panel_id=entry.spec.panel_id,
+            status=entry.status,
+            connected=entry.client.state.panel.connected,
+            connect_attempts=entry.attempts,
+            reconnects=entry.reconnects,
+            last_error=entry.last_error,
+            bootstrap_s=entry.bootstrap_s,
+            requests_sent=sent,
+            replies=replies,
+            timeouts=timeouts,
+            send_failures=send_failures,
+        )
+
+    # Internals
+
+    def _spawn(self, entry: _ManagedPanel) -> None:
+        if entry.task is None or entry.task.done():
+            entry.task = asyncio.get_running_loop().create_task(
+                self._run_panel(entry), name=f"panel-manager-{entry.spec.panel_id}"
+            )
+
+    async def _run_panel(self, entry: _ManagedPanel) -> None:
+        cfg = self.config
+        while not self._stopping:
+            if not await self._bring_up(entry):
+                entry.status = PANEL_FAILED
+                self._mark_settled(entry)
+                return
+            entry.status = PANEL_READY
+            self._mark_settled(entry)
+            await entry.lost.wait()
+            entry.status = PANEL_DISCONNECTED
+            if not cfg.reconnect:
+                return
+            entry.reconnects += 1
+            await asyncio.sleep(cfg.reconnect_delay_s)
+
+    async def _bring_up(self, entry: _ManagedPanel) -> bool:
+        cfg = self.config
+        for attempt in range(max(0, cfg.connect_retries) + 1):
+            if attempt:
+                entry.status = PANEL_PENDING
+                await asyncio.sleep(cfg.retry_backoff_s * 2 ** (attempt - 1))
+            async with self._slots:
+                await self._wait_stagger()
+                self._in_flight += 1
+                self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+                try:
+                    if await self._connect_once(entry):
+                        return True
+                finally:
+                    self._in_flight -= 1
+        return False
+
+    async def _wait_stagger(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._stagger_lock:
+            delay = self._next_start_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start_at = loop.time() + self.config.stagger_s
+
+    async def _connect_once(self, entry: _ManagedPanel) -> bool:
+        loop = asyncio.get_running_loop()
+        spec = entry.spec
+        client = entry.client
+        entry.attempts += 1
+        entry.lost.clear()
+        entry.status = PANEL_CONNECTING
+        started_at = loop.time()
+        try:
+            await client.async_connect(spec.host, spec.port, spec.link_keys)
+        except Elke27Error as exc:
+            entry.last_error = f"{type(exc).__name__}: {exc}"
+            LOG.warning(
+                "Panel %s connect failed (attempt %s): %s", spec.panel_id, entry.attempts, exc
+            )
+            return False
+
+        entry.status = PANEL_BOOTSTRAPPING
+        ready = loop.create_task(client.wait_ready(timeout_s=self.config.bootstrap_timeout_s))
+        lost = loop.create_task(entry.lost.wait())
+        try:
+            await asyncio.wait((ready, lost), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+            lost.cancel()
+        if ready.done() and not ready.cancelled() and ready.result():
+            entry.bootstrap_s = loop.time() - started_at
+            return True
+
+        entry.last_error = (
+            "connection lost during bootstrap" if entry.lost.is_set() else "bootstrap timed out"
+        )
+        LOG.warning("Panel %s %s (attempt %s)", spec.panel_id, entry.last_error, entry.attempts)
+        await self._disconnect(entry)
+        return False
+
+    async def _disconnect(self, entry: _ManagedPanel) -> None:
+        try:
+            await entry.client.async_disconnect()
+        except Elke27Error as exc:
+            LOG.warning("Panel %s disconnect failed: %s", entry.spec.panel_id, exc)
+
+    def _mark_settled(self, entry: _ManagedPanel) -> None:
+        entry.settled.set()
+        if self._settled_at is None and all(e.settled.is_set() for e in self._panels.values()):
+            self._settled_at = asyncio.get_running_loop().time()
+
+    def _on_client_event(self, entry: _ManagedPanel, event: Elke27Event) -> None:
+        if event.event_type is EventType.CONNECTION and event.data.get("connected") is False:
+            entry.lost.set()
+        self._put_event(PanelEvent(entry.spec.panel_id, event))
+
+    def _put_event(self, item: PanelEvent | None) -> None:
+        if self._events.full():
+            with contextlib.suppress(asyncio.QueueEmpty):
+                self._events.get_nowait()
+                self._events_dropped += 1
+        with contextlib.suppress(asyncio.QueueFull):
+            self._events.put_nowait(item)
@@ -0,0 +1,164 @@
+"""
+elke27_lib/optimistic.py
+
+Optimistic local state for control commands (opt-in via ClientConfig.optimistic_updates).
+
+When a control command is submitted (output on/off, area arm/disarm, zone bypass),
+the client records the state it expects the panel to reach and overlays it on the
+snapshot immediately, marked pending. The overlay is resolved by the panel's
+authoritative status for that entity:
+
+- status matches the expected value            -> confirmed (overlay dropped)
+- status differs, after the command was acked  -> mismatch (rolled back, correction)
+- the command failed                           -> command_failed (rolled back, correction)
+- no status within timeout_s of the ack        -> timeout (overlay dropped; correction
+                                                  only if the panel state still differs)
+
+A mismatching status that arrives before the command's reply is ignored: it may
+have been produced before the panel executed the command. A newer command for the
+same entity replaces the older entry; outcomes for the replaced entry are discarded.
+
+All methods run on the client's event loop; no locking is needed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+OptimisticKey = tuple[str, int]
+
+OUTCOME_CONFIRMED = "confirmed"
+OUTCOME_MISMATCH = "mismatch"
+OUTCOME_COMMAND_FAILED = "command_failed"
+OUTCOME_TIMEOUT = "timeout"
+
+# raw_type of the v2 event emitted when optimistic state is corrected.
+OPTIMISTIC_CORRECTION = "optimistic_correction"
+
+DEFAULT_OPTIMISTIC_TIMEOUT_S = 10.0
+
+
+@dataclass(slots=True)
+class OptimisticEntry:
+    """Expected value of one snapshot field, pending confirmation by the panel."""
+
+    domain: str
+    entity_id: int
+    field: str
+    expected: object
+    created_at: float
+    acknowledged_at: float | None = None
+
+    @property
+    def key(self) -> OptimisticKey:
+        return (self.domain, self.entity_id)
+
+
+@dataclass(frozen=True, slots=True)
+class OptimisticOutcome:
+    """How a pending optimistic value was resolved."""
+
+    domain: str
+    entity_id: int
+    field: str
+    expected: object
+    actual: object
+    reason: str
+
+    @property
+    def corrected(self) -> bool:
+        """True when the optimistic value was wrong and the snapshot was rolled back."""
+        return self.reason != OUTCOME_CONFIRMED and self.actual != self.expected
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "domain": self.domain,
+            "entity_id": self.entity_id,
+            "field": self.field,
+            "expected": self.expected,
+            "actual": self.actual,
+            "reason": self.reason,
+        }
+
+
+class OptimisticTracker:
+    """Pending optimistic values keyed by (domain, entity_id)."""
+
+    def __init__(self, *, timeout_s: float = DEFAULT_OPTIMISTIC_TIMEOUT_S) -> None:
+        self._timeout_s = max(0.0, timeout_s)
+        self._entries: dict[OptimisticKey, OptimisticEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def timeout_s(self) -> float:
+        return self._timeout_s
+
+    def begin(
+        self, domain: str, entity_id: int, field: str, expected: object, *, now: float
+    ) -> OptimisticEntry:
+        entry = OptimisticEntry(
+            domain=domain, entity_id=entity_id, field=field, expected=expected, created_at=now
+        )
+        self._entries[entry.key] = entry
+        return entry
+
+    def get(self, domain: str, entity_id: int) -> OptimisticEntry | None:
+        return self._entries.get((domain, entity_id))
+
+    def is_current(self, entry: OptimisticEntry) -> bool:
+        return self._entries.get(entry.key) is entry
+
+    def acknowledge(self, entry: OptimisticEntry, *, now: float) -> None:
+        if self.is_current(entry):
+            entry.acknowledged_at = now
+
+    def fail(self, entry: OptimisticEntry, actual: object) -> OptimisticOutcome | None:
+        if not self.is_current(entry):
+            return None
+        del self._entries[entry.key]
+        return _outcome(entry, actual, OUTCOME_COMMAND_FAILED)
+
+    def reconcile(self, domain: str, entity_id: int, actual: object) -> OptimisticOutcome | None:
+        """Resolve an entity's pending value against authoritative panel status."""
+        entry = self._entries.get((domain, entity_id))
+        if entry is None:
+            return None
+        if actual == entry.expected:
+            del self._entries[entry.key]
+            return _outcome(entry, actual, OUTCOME_CONFIRMED)
+        if entry.acknowledged_at is None:
+            return None
+        del self._entries[entry.key]
+        return _outcome(entry, actual, OUTCOME_MISMATCH)
+
+    def expire(
+        self, now: float, actual_for: Callable[[str, int], object]
+    ) -> list[OptimisticOutcome]:
+        """Drop acknowledged entries with no authoritative status within timeout_s."""
+        outcomes: list[OptimisticOutcome] = []
+        for key, entry in list(self._entries.items()):
+            acked = entry.acknowledged_at
+            if acked is None or now - acked < self._timeout_s:
+                continue
+            del self._entries[key]
+            actual = actual_for(entry.domain, entry.entity_id)
+            reason = OUTCOME_CONFIRMED if actual == entry.expected else OUTCOME_TIMEOUT
+            outcomes.append(_outcome(entry, actual, reason))
+        return outcomes
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _outcome(entry: OptimisticEntry, actual: object, reason: str) -> OptimisticOutcome:
+    return OptimisticOutcome(
+        domain=entry.domain,
+        entity_id=entry.entity_id,
+        field=entry.field,
+        expected=entry.expected,
+        actual=actual,
+        reason=reason,
+    )
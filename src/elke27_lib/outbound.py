@@ -5,14 +5,19 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
 
+from .rto import RouteKey, route_class
+
 
 class OutboundPriority(str, Enum):
     HIGH = "high"
     NORMAL = "normal"
+    # Background work (e.g., CSM-driven refresh); shares the normal wire queue.
+    LOW = "low"
 
 
 @dataclass(slots=True)
@@ -27,11 +32,142 @@ class OutboundItem:
     label: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class PacingSnapshot:
+    """Immutable AIMD pacer state."""
+
+    interval_s: float
+    rate_per_s: float
+    increases: int
+    decreases: int
+    last_decrease_reason: str | None
+
+
+class AimdPacer:
+    """
+    Additive-increase/multiplicative-decrease send pacing.
+
+    The send rate (1 / interval) grows by increase_per_s for every fast, error-free
+    reply and is multiplied by decrease_factor on a timeout, a burst of error_burst
+    error replies within error_window_s, or a reply whose RTT exceeds
+    rtt_rise_factor times the recent minimum for its route class (rto.route_class),
+    so a bulk read that is normally slow is not compared against a keepalive.
+    Decreases are applied at most once per
+    decrease_cooldown_s so one congestion episode halves the rate once.
+
+    Not thread-safe: fed by the kernel and read by OutboundQueue on the same loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_interval_s: float = 0.05,
+        min_interval_s: float = 0.01,
+        max_interval_s: float = 1.0,
+        increase_per_s: float = 1.0,
+        decrease_factor: float = 0.5,
+        error_burst: int = 3,
+        error_window_s: float = 5.0,
+        rtt_rise_factor: float = 2.0,
+        rtt_rise_min_s: float = 0.05,
+        decrease_cooldown_s: float = 1.0,
+        now: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < min_interval_s <= max_interval_s:
+            raise ValueError("require 0 < min_interval_s <= max_interval_s")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be within (0, 1)")
+        self._min_rate = 1.0 / max_interval_s
+        self._max_rate = 1.0 / min_interval_s
+        initial_rate = 1.0 / initial_interval_s if initial_interval_s > 0 else self._max_rate
+        self._rate = min(self._max_rate, max(self._min_rate, initial_rate))
+        self._increase_per_s = increase_per_s
+        self._decrease_factor = decrease_factor
+        self._error_burst = max(1, error_burst)
+        self._error_window_s = error_window_s
+        self._rtt_rise_factor = rtt_rise_factor
+        self._rtt_rise_min_s = rtt_rise_min_s
+        self._decrease_cooldown_s = decrease_cooldown_s
+        self._now = now
+        self._errors: deque[float] = deque()
+        self._recent_rtts: dict[str, deque[float]] = {}
+        self._last_decrease_at: float | None = None
+        self._last_decrease_reason: str | None = None
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def interval_s(self) -> float:
+        return 1.0 / self._rate
+
+    def on_reply(
+        self, rtt_s: float | None, *, error: bool = False, route: RouteKey | None = None
+    ) -> None:
+        now = self._now()
+        if error:
+            self._errors.append(now)
+            while self._errors and now - self._errors[0] > self._error_window_s:
+                self._errors.popleft()
+            if len(self._errors) >= self._error_burst:
+                self._errors.clear()
+                self._decrease("error_burst", now)
+            return
+        if rtt_s is not None:
+            key = route_class(route) if route is not None else ""
+            recent = self._recent_rtts.get(key)
+            if recent is None:
+                recent = self._recent_rtts[key] = deque(maxlen=64)
+            base = min(recent) if recent else rtt_s
+            recent.append(rtt_s)
+            if rtt_s > base * self._rtt_rise_factor and rtt_s - base > self._rtt_rise_min_s:
+                self._decrease("rtt_rise", now)
+                return
+        if self._rate < self._max_rate:
+            self._rate = min(self._max_rate, self._rate + self._increase_per_s)
+            self.increases += 1
+
+    def on_timeout(self) -> None:
+        self._decrease("timeout", self._now())
+
+    def _decrease(self, reason: str, now: float) -> None:
+        if (
+            self._last_decrease_at is not None
+            and now - self._last_decrease_at < self._decrease_cooldown_s
+        ):
+            return
+        self._last_decrease_at = now
+        self._last_decrease_reason = reason
+        self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+        self.decreases += 1
+
+    def snapshot(self) -> PacingSnapshot:
+        return PacingSnapshot(
+            interval_s=self.interval_s,
+            rate_per_s=self._rate,
+            increases=self.increases,
+            decreases=self.decreases,
+            last_decrease_reason=self._last_decrease_reason,
+        )
+
+
 class OutboundQueue:
     """
     Single outbound send queue with global rate limiting and priority.
 
     Policy: if the queue is stopped, pending items are failed with the provided exception.
+
+    With a pacer, the interval between sends follows pacer.interval_s instead of
+    the static min_interval_s.
+
+    The worker is event-driven: it sleeps on a wakeup event set by enqueue() and
+    never polls, so an idle queue costs no loop wakeups. The priority decision is
+    made after throttling, so a HIGH item that arrives while the worker waits for a
+    send slot still goes first. wait_idle() awaits an idle event set whenever both
+    queues are empty and nothing is being sent.
+
+    send_inline calls send_fn on the loop instead of in a worker thread; use it
+    only when send_fn cannot block for long (small frames on a socket with a
+    short timeout).
     """
 
     _loop: asyncio.AbstractEventLoop
@@ -39,13 +175,17 @@ class OutboundQueue:
     _min_interval_s: float
     _max_burst: int
     _log: logging.Logger
-    _high_q: asyncio.Queue[OutboundItem]
-    _normal_q: asyncio.Queue[OutboundItem]
+    _high_q: deque[OutboundItem]
+    _normal_q: deque[OutboundItem]
+    _wakeup: asyncio.Event
+    _idle_event: asyncio.Event
     _stop_event: asyncio.Event
     _worker: asyncio.Task[None] | None
     _tokens: float
     _last_refill: float
     _sending: bool
+    _pacer: AimdPacer | None
+    _send_inline: bool
 
     def __init__(
         self,
@@ -55,19 +195,31 @@ class OutboundQueue:
         min_interval_s: float = 0.05,
         max_burst: int = 1,
         logger: logging.Logger | None = None,
+        pacer: AimdPacer | None = None,
+        send_inline: bool = False,
     ) -> None:
         self._loop = loop
         self._send_fn = send_fn
+        self._send_inline = send_inline
         self._min_interval_s = max(0.0, float(min_interval_s))
         self._max_burst = max(1, int(max_burst))
         self._log = logger or logging.getLogger(__name__)
-        self._high_q = asyncio.Queue()
-        self._normal_q = asyncio.Queue()
+        self._high_q = deque()
+        self._normal_q = deque()
+        self._wakeup = asyncio.Event()
+        self._idle_event = asyncio.Event()
+        self._idle_event.set()
         self._stop_event = asyncio.Event()
         self._worker = None
         self._tokens = float(self._max_burst)
         self._last_refill = self._loop.time()
         self._sending = False
+        self._pacer = pacer
+
+    @property
+    def send_interval_s(self) -> float:
+        """Current minimum interval between sends."""
+        return self._pacer.interval_s if self._pacer is not None else self._min_interval_s
 
     def start(self) -> None:
         if self._worker is None or self._worker.done():
@@ -79,6 +231,7 @@ class OutboundQueue:
             if not self._stop_event.is_set():
                 self._stop_event.set()
             self._drain_with_failure(fail_exc)
+            self._wakeup.set()
             if self._worker is not None:
                 self._worker.cancel()
 
@@ -90,9 +243,11 @@ class OutboundQueue:
     def enqueue(self, item: OutboundItem) -> None:
         def _put() -> None:
             queue = self._high_q if item.priority is OutboundPriority.HIGH else self._normal_q
-            queue.put_nowait(item)
+            queue.append(item)
+            self._idle_event.clear()
+            self._wakeup.set()
             if self._log.isEnabledFor(logging.DEBUG):
-                depth = self._high_q.qsize() + self._normal_q.qsize()
+                depth = len(self._high_q) + len(self._normal_q)
                 self._log.debug(
                     "Outbound enqueue: seq=%s kind=%s priority=%s depth=%s",
                     item.seq,
@@ -107,28 +262,30 @@ class OutboundQueue:
             _put()
 
     def is_idle(self) -> bool:
-        return self._high_q.empty() and self._normal_q.empty() and not self._sending
+        return not self._high_q and not self._normal_q and not self._sending
 
     async def wait_idle(self, *, timeout_s: float | None = None) -> bool:
-        deadline = None
-        if timeout_s is not None:
-            deadline = self._loop.time() + float(timeout_s)
-        while True:
-            if self._high_q.empty() and self._normal_q.empty() and not self._sending:
-                return True
-            if deadline is not None and self._loop.time() >= deadline:
-                return False
-            await asyncio.sleep(0.01)
+        if self.is_idle():
+            return True
+        try:
+            await asyncio.wait_for(
+                self._idle_event.wait(),
+                timeout=float(timeout_s) if timeout_s is not None else None,
+            )
+        except TimeoutError:
+            return False
+        return True
+
+    def _update_idle(self) -> None:
+        if self.is_idle():
+            self._idle_event.set()
 
     def _drain_with_failure(self, exc: BaseException | None) -> None:
         if exc is None:
             return
         for queue in (self._high_q, self._normal_q):
-            while not queue.empty():
-                try:
-                    item = queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+            while queue:
+                item = queue.popleft()
                 if item.on_fail is not None:
                     try:
                         item.on_fail(exc)
@@ -140,17 +297,25 @@ class OutboundQueue:
                             fail_exc,
                             exc_info=True,
                         )
-                queue.task_done()
+        self._update_idle()
 
     async def _run(self) -> None:
         while not self._stop_event.is_set():
-            item = await self._next_item()
-            if item is None:
+            if not self._high_q and not self._normal_q:
+                self._wakeup.clear()
+                self._update_idle()
+                await self._wakeup.wait()
                 continue
             await self._throttle()
+            item = self._next_item()
+            if item is None:
+                continue
             self._sending = True
             try:
-                await asyncio.to_thread(self._send_fn, item.payload)
+                if self._send_inline:
+                    self._send_fn(item.payload)
+                else:
+                    await asyncio.to_thread(self._send_fn, item.payload)
                 sent_at = time.monotonic()
                 if item.on_sent is not None:
                     item.on_sent(sent_at)
@@ -175,32 +340,30 @@ class OutboundQueue:
                 )
             finally:
                 self._sending = False
-                self._high_q.task_done() if item.priority is OutboundPriority.HIGH else self._normal_q.task_done()
+                self._update_idle()
 
-    async def _next_item(self) -> OutboundItem | None:
+    def _next_item(self) -> OutboundItem | None:
         if self._stop_event.is_set():
             return None
-        if not self._high_q.empty():
-            return await self._high_q.get()
-        try:
-            return await asyncio.wait_for(self._normal_q.get(), timeout=0.05)
-        except TimeoutError:
-            if not self._high_q.empty():
-                return await self._high_q.get()
-            return None
+        if self._high_q:
+            return self._high_q.popleft()
+        if self._normal_q:
+            return self._normal_q.popleft()
+        return None
 
     async def _throttle(self) -> None:
-        if self._min_interval_s <= 0:
+        interval_s = self.send_interval_s
+        if interval_s <= 0:
             return
         now = self._loop.time()
         elapsed = now - self._last_refill
         if elapsed > 0:
-            self._tokens = min(self._max_burst, self._tokens + elapsed / self._min_interval_s)
+            self._tokens = min(self._max_burst, self._tokens + elapsed / interval_s)
             self._last_refill = now
         if self._tokens >= 1:
             self._tokens -= 1
             return
-        wait_time = (1 - self._tokens) * self._min_interval_s
+        wait_time = (1 - self._tokens) * interval_s
         if wait_time > 0:
             await asyncio.sleep(wait_time)
         now = self._loop.time()
@@ -7,7 +7,7 @@ import logging
 import threading
 import time
 from collections.abc import Callable, Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 ResponseKey = tuple[str, str]
@@ -22,6 +22,10 @@ class PendingResponse:
     created_at: float
     future: asyncio.Future[Mapping[str, Any]]
     loop: asyncio.AbstractEventLoop
+    # Additional callers sharing this seq (singleflight); resolved/failed together.
+    followers: list[tuple[asyncio.Future[Mapping[str, Any]], asyncio.AbstractEventLoop]] = field(
+        default_factory=list
+    )
 
 
 class PendingResponseManager:
@@ -55,16 +59,37 @@ class PendingResponseManager:
             self._pending[seq] = entry
         return future
 
+    def attach(
+        self,
+        seq: int,
+        *,
+        command_key: str,
+        expected_route: ResponseKey,
+        loop: asyncio.AbstractEventLoop,
+    ) -> asyncio.Future[Mapping[str, Any]]:
+        """
+        Return a future for seq, joining the existing entry if one is registered.
+        """
+        with self._lock:
+            entry = self._pending.get(seq)
+            if entry is not None:
+                future: asyncio.Future[Mapping[str, Any]] = loop.create_future()
+                entry.followers.append((future, loop))
+                return future
+        return self.create(seq, command_key=command_key, expected_route=expected_route, loop=loop)
+
     def resolve(self, seq: int, msg: Mapping[str, Any]) -> bool:
         entry = self._pop(seq)
         if entry is None:
             return False
 
-        def _set_result() -> None:
-            if not entry.future.done():
-                entry.future.set_result(msg)
+        for future, loop in self._futures(entry):
 
-        self._call_in_loop(entry, _set_result)
+            def _set_result(future: asyncio.Future[Mapping[str, Any]] = future) -> None:
+                if not future.done():
+                    future.set_result(msg)
+
+            self._call_in_loop(loop, _set_result)
         return True
 
     def fail(self, seq: int, exc: BaseException) -> bool:
@@ -72,16 +97,35 @@ class PendingResponseManager:
         if entry is None:
             return False
 
-        def _set_exc() -> None:
-            if not entry.future.done():
-                entry.future.set_exception(exc)
+        for future, loop in self._futures(entry):
+
+            def _set_exc(future: asyncio.Future[Mapping[str, Any]] = future) -> None:
+                if not future.done():
+                    future.set_exception(exc)
 
-        self._call_in_loop(entry, _set_exc)
+            self._call_in_loop(loop, _set_exc)
         return True
 
-    def drop(self, seq: int) -> None:
+    def drop(self, seq: int, future: asyncio.Future[Mapping[str, Any]] | None = None) -> None:
+        """
+        Drop a caller's interest in seq.
+
+        With future=None (or the last remaining caller) the whole entry is removed;
+        otherwise only that caller is detached and the others keep waiting.
+        """
         with self._lock:
-            self._pending.pop(seq, None)
+            entry = self._pending.get(seq)
+            if entry is None:
+                return
+            if future is None or (future is entry.future and not entry.followers):
+                del self._pending[seq]
+            elif future is entry.future:
+                next_future, next_loop = entry.followers[0]
+                self._pending[seq] = replace(
+                    entry, future=next_future, loop=next_loop, followers=entry.followers[1:]
+                )
+            else:
+                entry.followers[:] = [item for item in entry.followers if item[0] is not future]
 
     def pending_count(self) -> int:
         with self._lock:
@@ -92,9 +136,15 @@ class PendingResponseManager:
             return self._pending.pop(seq, None)
 
     @staticmethod
-    def _call_in_loop(entry: PendingResponse, fn: Callable[[], None]) -> None:
+    def _futures(
+        entry: PendingResponse,
+    ) -> list[tuple[asyncio.Future[Mapping[str, Any]], asyncio.AbstractEventLoop]]:
+        return [(entry.future, entry.loop), *entry.followers]
+
+    @staticmethod
+    def _call_in_loop(loop: asyncio.AbstractEventLoop, fn: Callable[[], None]) -> None:
         try:
-            entry.loop.call_soon_threadsafe(fn)
+            loop.call_soon_threadsafe(fn)
         except RuntimeError as exc:
             LOG.warning("PendingResponse loop dispatch failed: %s", exc, exc_info=True)
             fn()
@@ -367,3 +367,31 @@ def decrypt_key_field_with_linkkey(
 
     pt = _aes128_cbc_decrypt(key=key, iv=iv, ciphertext=ct_swapped)
     return pt
+
+
+def encrypt_key_field_with_linkkey(
+    *,
+    linkkey_hex: str,
+    plaintext: bytes,
+    iv: bytes = API_LINK_IV,
+) -> str:
+    """
+    Inverse of decrypt_key_field_with_linkkey (panel side of the hello sk/shm fields).
+
+      ciphertext = swap_endianness( AES_ENC( swap_endianness(linkkey), plaintext ) )
+
+    Returns ciphertext as lowercase hex. Used by the panel simulator and tests.
+    """
+    try:
+        key = bytes.fromhex(linkkey_hex)
+    except ValueError as e:
+        raise E27ProtocolError(
+            "Invalid hex input to encrypt_key_field_with_linkkey.",
+            context=E27ErrorContext(phase="hello_key_encrypt"),
+            cause=e,
+        ) from e
+    _require_key_16(key, context_phase="hello_key_encrypt")
+    _require_len("hello_key_plaintext", plaintext, 16)
+
+    ct = _aes128_cbc_encrypt(key=swap_endianness(key), iv=iv, plaintext=plaintext)
+    return swap_endianness(ct).hex()
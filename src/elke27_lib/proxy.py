@@ -0,0 +1,768 @@
+"""
+elke27_lib/proxy.py
+
+Local multiplexing proxy: many consumers share one panel session.
+
+ProxyServer holds one Elke27Client (one E27 session, one PanelState) per panel
+through a PanelManager and serves local consumers over a Unix socket or a
+localhost TCP port. Consumers get the current snapshot immediately instead of
+running their own bootstrap, receive every panel event, and send commands that
+the proxy schedules onto the panel's single kernel queue.
+
+Fairness: each panel has a round-robin scheduler over consumers. At most
+max_inflight_per_panel commands per panel are handed to the client at once; the
+next one is taken from the next consumer with work queued, so one busy consumer
+cannot starve the others. A consumer with max_pending_per_consumer commands
+queued gets "busy" errors until its queue drains.
+
+Slow consumers: outbound messages are buffered per consumer up to
+consumer_queue_size; beyond that the oldest event is dropped (replies are never
+dropped) and counted in ProxyStats.events_dropped.
+
+Access: consumers can execute commands (outputs, bypass, PIN attempts) on the
+shared session, so they must be trusted. The Unix socket is created owner-only
+(unix_mode, default 0o600). When a token is configured, and always on TCP, a
+consumer's first line must be {"op": "auth", "token": ...}; anything else gets
+an "unauthorized" error and the connection is closed.
+
+Wire protocol: one JSON object per line in each direction.
+    {"id": 0, "op": "auth", "token": "..."}
+    {"id": 1, "op": "panels"}
+    {"id": 2, "op": "snapshot", "panel": "main"}
+    {"id": 3, "op": "subscribe", "panels": ["main"]}        # null/absent = all
+    {"id": 4, "op": "execute", "panel": "main", "command": "output_set_status",
+     "params": {"output_id": 2, "status": "ON"}, "timeout_s": 5.0}
+Replies echo the id: {"id": 2, "ok": true, "result": ...} or
+{"id": 2, "ok": false, "error": {"type": ..., "code": ..., "message": ...}}.
+Events are pushed as {"panel": "main", "event": {...}}.
+
+ProxyClient is the consumer side of the protocol and rebuilds PanelSnapshot,
+Elke27Event and Result objects.
+
+    python -m elke27_lib.proxy --panels panels.json --unix /run/elke27.sock
+    ELKE27_PROXY_TOKEN=... python -m elke27_lib.proxy --panels panels.json --port 2110
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .client import Result
+from .errors import Elke27DisconnectedError, Elke27Error
+from .manager import PanelEvent, PanelManager, PanelManagerConfig, PanelSpec
+from .types import (
+    AreaState,
+    ArmMode,
+    Elke27Event,
+    EventType,
+    LinkKeys,
+    OutputDefinition,
+    OutputState,
+    PanelInfo,
+    PanelSnapshot,
+    TableInfo,
+    ZoneDefinition,
+    ZoneState,
+)
+
+LOG = logging.getLogger(__name__)
+
+_MAX_LINE_BYTES = 1 << 20
+_ENTITY_FIELDS = ("areas", "zones", "zone_definitions", "outputs", "output_definitions")
+
+
+@dataclass(frozen=True, slots=True)
+class ProxyConfig:
+    # Listen on a Unix socket when unix_path is set, else on host:port (0 = any free port).
+    unix_path: str | None = None
+    unix_mode: int = 0o600
+    host: str = "127.0.0.1"
+    port: int = 0
+    # Shared secret consumers must send first; required when listening on TCP.
+    token: str | None = None
+    max_inflight_per_panel: int = 1
+    max_pending_per_consumer: int = 64
+    consumer_queue_size: int = 1024
+    manager: PanelManagerConfig = field(default_factory=PanelManagerConfig)
+
+
+@dataclass(slots=True)
+class ProxyStats:
+    consumers: int = 0
+    consumers_total: int = 0
+    commands: int = 0
+    commands_rejected: int = 0
+    events_forwarded: int = 0
+    events_dropped: int = 0
+
+
+# --------------------------
+# JSON mapping
+# --------------------------
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _dumps(obj: Mapping[str, Any]) -> bytes:
+    return (
+        json.dumps(obj, separators=(",", ":"), default=_json_default, ensure_ascii=False) + "\n"
+    ).encode("utf-8")
+
+
+def snapshot_to_json(snapshot: PanelSnapshot) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "panel": asdict(snapshot.panel),
+        "table_info": asdict(snapshot.table_info),
+        "version": snapshot.version,
+        "updated_at": snapshot.updated_at.isoformat(),
+    }
+    for name in _ENTITY_FIELDS:
+        entities: Mapping[int, Any] = getattr(snapshot, name)
+        data[name] = {str(key): asdict(entity) for key, entity in entities.items()}
+    return data
+
+
+def snapshot_from_json(data: Mapping[str, Any]) -> PanelSnapshot:
+    def entities(name: str, build: Any) -> dict[int, Any]:
+        return {int(key): build(value) for key, value in data.get(name, {}).items()}
+
+    def area(value: Mapping[str, Any]) -> AreaState:
+        fields = dict(value)
+        if fields.get("arm_mode") is not None:
+            fields["arm_mode"] = ArmMode(fields["arm_mode"])
+        return AreaState(**fields)
+
+    return PanelSnapshot(
+        panel=PanelInfo(**data.get("panel", {})),
+        table_info=TableInfo(**data.get("table_info", {})),
+        areas=entities("areas", area),
+        zones=entities("zones", lambda value: ZoneState(**value)),
+        zone_definitions=entities("zone_definitions", lambda value: ZoneDefinition(**value)),
+        outputs=entities("outputs", lambda value: OutputState(**value)),
+        output_definitions=entities("output_definitions", lambda value: OutputDefinition(**value)),
+        version=int(data.get("version", 0)),
+        updated_at=datetime.fromisoformat(data["updated_at"]),
+    )
+
+
+def event_to_json(event: Elke27Event) -> dict[str, Any]:
+    return {
+        "type": event.event_type.value,
+        "raw_type": event.raw_type,
+        "seq": event.seq,
+        "timestamp": event.timestamp.isoformat(),
+        "data": dict(event.data),
+    }
+
+
+def event_from_json(data: Mapping[str, Any]) -> Elke27Event:
+    return Elke27Event(
+        event_type=EventType(data["type"]),
+        data=data.get("data", {}),
+        seq=int(data.get("seq", 0)),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        raw_type=data.get("raw_type"),
+    )
+
+
+def _error_to_json(exc: BaseException) -> dict[str, Any]:
+    return {
+        "type": type(exc).__name__,
+        "code": exc.code if isinstance(exc, Elke27Error) else None,
+        "transient": exc.is_transient if isinstance(exc, Elke27Error) else False,
+        "message": str(exc),
+    }
+
+
+def _error_from_json(data: Mapping[str, Any]) -> Elke27Error:
+    return Elke27Error(
+        str(data.get("message") or data.get("type") or "Proxy error."),
+        code=str(data.get("code") or "proxy_error"),
+        is_transient=bool(data.get("transient")),
+    )
+
+
+# --------------------------
+# Server
+# --------------------------
+
+
+@dataclass(slots=True)
+class _Job:
+    consumer: _Consumer
+    request_id: Any
+    command_key: str
+    params: dict[str, Any]
+    timeout_s: float | None
+
+
+class _FairScheduler:
+    """Round-robin over consumers for one panel, with a cap on commands in flight."""
+
+    def __init__(self, manager: PanelManager, panel_id: str, max_inflight: int) -> None:
+        self._manager = manager
+        self._panel_id = panel_id
+        self._max_inflight = max(1, max_inflight)
+        self._queues: dict[int, deque[_Job]] = {}
+        self._ring: deque[int] = deque()
+        self._inflight = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def pending(self, consumer: _Consumer) -> int:
+        queue = self._queues.get(consumer.consumer_id)
+        return len(queue) if queue is not None else 0
+
+    def submit(self, job: _Job) -> None:
+        consumer_id = job.consumer.consumer_id
+        queue = self._queues.get(consumer_id)
+        if queue is None:
+            queue = self._queues[consumer_id] = deque()
+            self._ring.append(consumer_id)
+        queue.append(job)
+        self._pump()
+
+    def drop_consumer(self, consumer: _Consumer) -> None:
+        if self._queues.pop(consumer.consumer_id, None) is not None:
+            with contextlib.suppress(ValueError):
+                self._ring.remove(consumer.consumer_id)
+
+    def _pump(self) -> None:
+        while self._inflight < self._max_inflight and self._ring:
+            consumer_id = self._ring.popleft()
+            queue = self._queues[consumer_id]
+            job = queue.popleft()
+            if queue:
+                self._ring.append(consumer_id)
+            else:
+                del self._queues[consumer_id]
+            self._inflight += 1
+            task = asyncio.get_running_loop().create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _Job) -> None:
+        try:
+            client = self._manager.client(self._panel_id)
+            result = await client.async_execute(
+                job.command_key, timeout_s=job.timeout_s, **job.params
+            )
+        except Exception as exc:  # noqa: BLE001
+            job.consumer.reply_error(job.request_id, exc)
+        else:
+            if result.ok:
+                job.consumer.reply(job.request_id, dict(result.data or {}))
+            else:
+                job.consumer.reply_error(
+                    job.request_id,
+                    result.error or Elke27Error("failed", code="failed", is_transient=False),
+                )
+        finally:
+            self._inflight -= 1
+            self._pump()
+
+    def cancel(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+
+
+class _Consumer:
+    def __init__(
+        self,
+        server: ProxyServer,
+        consumer_id: int,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.server = server
+        self.consumer_id = consumer_id
+        self.reader = reader
+        self.writer = writer
+        # None = all panels; empty until the consumer subscribes.
+        self.subscribed: set[str] | None = set()
+        self.authenticated = server.config.token is None
+        self._out: deque[tuple[bool, bytes]] = deque()
+        self._events_queued = 0
+        self._wakeup = asyncio.Event()
+        self._closed = False
+
+    def wants(self, panel_id: str) -> bool:
+        return self.subscribed is None or panel_id in self.subscribed
+
+    def reply(self, request_id: Any, result: Any) -> None:
+        self._push(False, _dumps({"id": request_id, "ok": True, "result": result}))
+
+    def reply_error(self, request_id: Any, exc: BaseException) -> None:
+        self._push(False, _dumps({"id": request_id, "ok": False, "error": _error_to_json(exc)}))
+
+    def push_event(self, line: bytes) -> None:
+        if self._events_queued >= self.server.config.consumer_queue_size:
+            self._drop_oldest_event()
+        self._events_queued += 1
+        self._push(True, line)
+
+    def _drop_oldest_event(self) -> None:
+        for index, (is_event, _line) in enumerate(self._out):
+            if is_event:
+                del self._out[index]
+                self._events_queued -= 1
+                self.server.stats.events_dropped += 1
+                return
+
+    def _push(self, is_event: bool, line: bytes) -> None:
+        if self._closed:
+            return
+        self._out.append((is_event, line))
+        self._wakeup.set()
+
+    async def write_loop(self) -> None:
+        while not self._closed:
+            if not self._out:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            is_event, line = self._out.popleft()
+            if is_event:
+                self._events_queued -= 1
+            self.writer.write(line)
+            await self.writer.drain()
+
+    async def flush(self) -> None:
+        """Write out queued lines now (before closing a rejected consumer)."""
+        while self._out:
+            _is_event, line = self._out.popleft()
+            self.writer.write(line)
+        with contextlib.suppress(ConnectionError):
+            await self.writer.drain()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+        with contextlib.suppress(Exception):
+            self.writer.close()
+
+
+class ProxyServer:
+    """One session per panel, shared by every local consumer."""
+
+    def __init__(
+        self,
+        panels: Iterable[PanelSpec],
+        config: ProxyConfig | None = None,
+        *,
+        manager: PanelManager | None = None,
+    ) -> None:
+        self.config = config or ProxyConfig()
+        self.manager = manager or PanelManager(self.config.manager)
+        for spec in panels:
+            self.manager.add_panel(spec)
+        self.stats = ProxyStats()
+        self._schedulers = {
+            panel_id: _FairScheduler(self.manager, panel_id, self.config.max_inflight_per_panel)
+            for panel_id in self.manager.panel_ids
+        }
+        self._consumers: dict[int, _Consumer] = {}
+        self._next_consumer_id = 1
+        self._server: asyncio.AbstractServer | None = None
+        self._fanout: asyncio.Task[None] | None = None
+        self.host: str | None = None
+        self.port: int | None = None
+
+    async def __aenter__(self) -> ProxyServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start the panel sessions and begin accepting consumers."""
+        if self._server is not None:
+            return
+        cfg = self.config
+        if cfg.unix_path is None and cfg.token is None:
+            raise ValueError("A TCP proxy needs a token; use unix_path for an owner-only socket.")
+        await self.manager.start()
+        self._fanout = asyncio.get_running_loop().create_task(self._fanout_events())
+        if cfg.unix_path is not None:
+            # Bind under a umask that leaves only owner bits, then apply unix_mode,
+            # so the socket is never reachable by other users in between.
+            old_umask = os.umask(0o177)
+            try:
+                self._server = await asyncio.start_unix_server(
+                    self._serve, cfg.unix_path, limit=_MAX_LINE_BYTES
+                )
+            finally:
+                os.umask(old_umask)
+            os.chmod(cfg.unix_path, cfg.unix_mode)
+        else:
+            self._server = await asyncio.start_server(
+                self._serve, cfg.host, cfg.port, limit=_MAX_LINE_BYTES
+            )
+            sockname = self._server.sockets[0].getsockname()
+            self.host, self.port = sockname[0], sockname[1]
+        LOG.info("Panel proxy listening on %s", cfg.unix_path or f"{self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        for consumer in list(self._consumers.values()):
+            consumer.close()
+        for scheduler in self._schedulers.values():
+            scheduler.cancel()
+        await self.manager.stop()
+        if self._fanout is not None:
+            await self._fanout
+            self._fanout = None
+        if server is not None:
+            await server.wait_closed()
+        if self.config.unix_path is not None:
+            with contextlib.suppress(OSError):
+                Path(self.config.unix_path).unlink()
+
+    async def _fanout_events(self) -> None:
+        async for item in self.manager.events():
+            line = _dumps({"panel": item.panel_id, "event": event_to_json(item.event)})
+            for consumer in self._consumers.values():
+                if consumer.wants(item.panel_id):
+                    consumer.push_event(line)
+                    self.stats.events_forwarded += 1
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        consumer = _Consumer(self, self._next_consumer_id, reader, writer)
+        self._next_consumer_id += 1
+        self._consumers[consumer.consumer_id] = consumer
+        self.stats.consumers = len(self._consumers)
+        self.stats.consumers_total += 1
+        writer_task = asyncio.get_running_loop().create_task(consumer.write_loop())
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                if not self._handle_line(consumer, line):
+                    await consumer.flush()
+                    break
+        finally:
+            del self._consumers[consumer.consumer_id]
+            self.stats.consumers = len(self._consumers)
+            for scheduler in self._schedulers.values():
+                scheduler.drop_consumer(consumer)
+            consumer.close()
+            writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await writer_task
+
+    def _handle_line(self, consumer: _Consumer, line: bytes) -> bool:
+        """Handle one request line; False means the consumer is rejected."""
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            if not consumer.authenticated:
+                return self._authenticate(consumer, None)
+            consumer.reply_error(None, ValueError("Invalid JSON line."))
+            return True
+        if not consumer.authenticated:
+            return self._authenticate(consumer, msg)
+        if not isinstance(msg, dict):
+            consumer.reply_error(None, ValueError("Expected a JSON object."))
+            return True
+        request_id = msg.get("id")
+        op = msg.get("op")
+        try:
+            if op == "auth":
+                consumer.reply(request_id, True)
+            elif op == "panels":
+                health = self.manager.health()
+                consumer.reply(
+                    request_id,
+                    [
+                        {
+                            "panel_id": panel.panel_id,
+                            "status": panel.status,
+                            "connected": panel.connected,
+                        }
+                        for panel in health.panels.values()
+                    ],
+                )
+            elif op == "snapshot":
+                client = self.manager.client(self._panel_arg(msg))
+                consumer.reply(request_id, snapshot_to_json(client.snapshot))
+            elif op == "subscribe":
+                panels = msg.get("panels")
+                consumer.subscribed = None if panels is None else {str(p) for p in panels}
+                consumer.reply(request_id, True)
+            elif op == "execute":
+                self._submit(consumer, request_id, msg)
+            else:
+                raise ValueError(f"Unknown op {op!r}.")
+        except (KeyError, TypeError, ValueError) as exc:
+            consumer.reply_error(request_id, exc)
+        return True
+
+    def _authenticate(self, consumer: _Consumer, msg: object) -> bool:
+        request_id = msg.get("id") if isinstance(msg, dict) else None
+        token = msg.get("token") if isinstance(msg, dict) and msg.get("op") == "auth" else None
+        expected = self.config.token or ""
+        if isinstance(token, str) and hmac.compare_digest(token.encode(), expected.encode()):
+            consumer.authenticated = True
+            consumer.reply(request_id, True)
+            return True
+        LOG.warning("Proxy consumer %s rejected: missing or wrong token", consumer.consumer_id)
+        consumer.reply_error(
+            request_id,
+            Elke27Error("Proxy authentication required.", code="unauthorized", is_transient=False),
+        )
+        return False
+
+    def _panel_arg(self, msg: Mapping[str, Any]) -> str:
+        panel_id = msg.get("panel")
+        if panel_id is None and len(self._schedulers) == 1:
+            return next(iter(self._schedulers))
+        if panel_id not in self._schedulers:
+            raise KeyError(f"Unknown panel {panel_id!r}.")
+        return str(panel_id)
+
+    def _submit(self, consumer: _Consumer, request_id: Any, msg: Mapping[str, Any]) -> None:
+        scheduler = self._schedulers[self._panel_arg(msg)]
+        command_key = msg.get("command")
+        params = msg.get("params") or {}
+        if not isinstance(command_key, str) or not isinstance(params, dict):
+            raise ValueError("execute needs a command string and a params object.")
+        if scheduler.pending(consumer) >= self.config.max_pending_per_consumer:
+            self.stats.commands_rejected += 1
+            consumer.reply_error(
+                request_id, Elke27Error("Too many queued commands.", code="busy", is_transient=True)
+            )
+            return
+        timeout_s = msg.get("timeout_s")
+        self.stats.commands += 1
+        scheduler.submit(
+            _Job(
+                consumer,
+                request_id,
+                command_key,
+                params,
+                float(timeout_s) if timeout_s is not None else None,
+            )
+        )
+
+
+# --------------------------
+# Consumer side
+# --------------------------
+
+
+class ProxyClient:
+    """Connection from a local consumer to a ProxyServer."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._calls: dict[int, asyncio.Future[Any]] = {}
+        self._events: asyncio.Queue[PanelEvent | None] = asyncio.Queue()
+        self._read_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect(
+        cls,
+        *,
+        path: str | None = None,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+        token: str | None = None,
+    ) -> ProxyClient:
+        """Connect, then authenticate with token if given (raises Elke27Error if refused)."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=_MAX_LINE_BYTES)
+        elif port is not None:
+            reader, writer = await asyncio.open_connection(host, port, limit=_MAX_LINE_BYTES)
+        else:
+            raise ValueError("connect() needs a Unix socket path or a TCP port.")
+        client = cls(reader, writer)
+        if token is not None:
+            try:
+                await client._call({"op": "auth", "token": token})
+            except Elke27Error:
+                await client.close()
+                raise
+        return client
+
+    async def panels(self) -> list[dict[str, Any]]:
+        return await self._call({"op": "panels"})
+
+    async def snapshot(self, panel_id: str | None = None) -> PanelSnapshot:
+        return snapshot_from_json(await self._call({"op": "snapshot", "panel": panel_id}))
+
+    async def subscribe(self, panels: Sequence[str] | None = None) -> None:
+        await self._call({"op": "subscribe", "panels": list(panels) if panels else None})
+
+    def events(self) -> AsyncIterator[PanelEvent]:
+        """Async iterator of pushed events; ends when the connection closes."""
+
+        async def _iter() -> AsyncIterator[PanelEvent]:
+            while True:
+                item = await self._events.get()
+                if item is None:
+                    break
+                yield item
+
+        return _iter()
+
+    async def execute(
+        self,
+        command_key: str,
+        /,
+        *,
+        panel_id: str | None = None,
+        timeout_s: float | None = None,
+        **params: Any,
+    ) -> Result[Mapping[str, Any]]:
+        msg = {
+            "op": "execute",
+            "panel": panel_id,
+            "command": command_key,
+            "params": params,
+            "timeout_s": timeout_s,
+        }
+        try:
+            data = await self._call(msg)
+        except Elke27Error as exc:
+            return Result.failure(exc)
+        return Result.success(data)
+
+    async def close(self) -> None:
+        self._writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self._writer.wait_closed()
+        self._read_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._read_task
+
+    async def _call(self, msg: dict[str, Any]) -> Any:
+        self._next_id += 1
+        request_id = self._next_id
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._calls[request_id] = future
+        self._writer.write(_dumps({"id": request_id, **msg}))
+        await self._writer.drain()
+        return await future
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                if "event" in msg:
+                    self._events.put_nowait(
+                        PanelEvent(str(msg.get("panel")), event_from_json(msg["event"]))
+                    )
+                    continue
+                future = self._calls.pop(msg.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if msg.get("ok"):
+                    future.set_result(msg.get("result"))
+                else:
+                    future.set_exception(_error_from_json(msg.get("error") or {}))
+        except (ConnectionError, ValueError) as exc:
+            LOG.debug("Proxy connection read failed: %s", exc)
+        finally:
+            calls, self._calls = self._calls, {}
+            for future in calls.values():
+                if not future.done():
+                    future.set_exception(Elke27DisconnectedError("Proxy connection closed."))
+            self._events.put_nowait(None)
+
+
+# --------------------------
+# Daemon
+# --------------------------
+
+
+def load_panel_specs(path: str | Path) -> list[PanelSpec]:
+    """
+    Read panels from JSON:
+        {"panels": [{"panel_id": "main", "host": "192.168.1.20", "port": 2101,
+                     "link_keys": {"tempkey_hex": ..., "linkkey_hex": ..., "linkhmac_hex": ...}}]}
+    """
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [
+        PanelSpec(
+            panel_id=str(entry["panel_id"]),
+            host=str(entry["host"]),
+            port=int(entry.get("port", 2101)),
+            link_keys=LinkKeys(**entry["link_keys"]),
+        )
+        for entry in raw.get("panels", [])
+    ]
+
+
+async def _serve_forever(server: ProxyServer) -> None:
+    async with server:
+        await asyncio.Event().wait()
+
+
+def _default_unix_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return str(Path(runtime_dir) / "elke27-proxy.sock")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m elke27_lib.proxy")
+    parser.add_argument("--panels", required=True, help="JSON file listing panels and link keys")
+    parser.add_argument(
+        "--unix", help="Owner-only Unix socket to listen on (default: $XDG_RUNTIME_DIR)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Listen on localhost TCP instead; needs a token in $ELKE27_PROXY_TOKEN",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    token = os.environ.get("ELKE27_PROXY_TOKEN") or None
+    if args.port is not None:
+        if args.unix is not None:
+            parser.error("--unix and --port are mutually exclusive")
+        if token is None:
+            parser.error("--port needs a consumer token in $ELKE27_PROXY_TOKEN")
+        config = ProxyConfig(host=args.host, port=args.port, token=token)
+    else:
+        config = ProxyConfig(unix_path=args.unix or _default_unix_path(), token=token)
+    server = ProxyServer(load_panel_specs(args.panels), config)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve_forever(server))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
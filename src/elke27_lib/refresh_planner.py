@@ -0,0 +1,114 @@
+"""
+elke27_lib/refresh_planner.py
+
+CSM-driven selective refresh planning (ADR-0114, ADR-0123).
+
+Given a CsmDiff, compute the minimal set of requests needed to bring the
+changed domains back in sync:
+- configured inventory (block 1; later blocks are paged by the dispatcher)
+- zone definitions when the zone domain changed
+- table_info when only the domain CSM changed (a table CSM change implies it
+  was just fetched)
+
+Attribs/status are NOT planned up front: they are requested only for ids that
+are new once the refreshed configured inventory arrives (see
+plan_new_entity_requests). Unchanged domains produce no requests, so a change to
+one output never re-polls zones.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+
+from .types import CsmDiff, CsmSnapshot
+
+RouteKey = tuple[str, str]
+
+# Domains with a configured inventory crawl, in the order they are refreshed.
+_CONFIGURED_DOMAINS: tuple[str, ...] = ("area", "zone", "output", "user", "keypad")
+
+# Domains whose entities carry live status worth fetching for new ids.
+_STATUS_DOMAINS: frozenset[str] = frozenset({"area", "zone", "output"})
+
+# Domains that expose get_table_info.
+_TABLE_INFO_DOMAINS: frozenset[str] = frozenset({"area", "zone", "output", "tstat"})
+
+
+@dataclass(frozen=True, slots=True)
+class RefreshRequest:
+    """
+    One planned request (treat as immutable).
+    """
+
+    route: RouteKey
+    params: tuple[tuple[str, int], ...] = ()
+
+    @property
+    def domain(self) -> str:
+        return self.route[0]
+
+    def kwargs(self) -> dict[str, int]:
+        return dict(self.params)
+
+
+def diff_csm_snapshots(old: CsmSnapshot | None, new: CsmSnapshot) -> CsmDiff:
+    """
+    Return the domains whose domain/table CSMs differ between two snapshots.
+
+    With no baseline, every domain present in new is reported as changed.
+    """
+    old_domain: Mapping[str, int] = old.domain_csms if old is not None else {}
+    old_table: Mapping[str, int] = old.table_csms if old is not None else {}
+    return CsmDiff(
+        changed_domain_csms=_changed_keys(old_domain, new.domain_csms),
+        changed_table_csms=_changed_keys(old_table, new.table_csms),
+    )
+
+
+def _changed_keys(old: Mapping[str, int], new: Mapping[str, int]) -> set[str]:
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def changed_domains(diff: CsmDiff) -> set[str]:
+    """Return the union of domains with a changed domain or table CSM."""
+    return set(diff.changed_domain_csms) | set(diff.changed_table_csms)
+
+
+def plan_config_refresh(diff: CsmDiff) -> tuple[RefreshRequest, ...]:
+    """
+    Return the minimal config refresh requests for the changed domains in diff.
+    """
+    domains = changed_domains(diff)
+    plan: list[RefreshRequest] = []
+    for domain in (*_CONFIGURED_DOMAINS, "tstat"):
+        if domain not in domains:
+            continue
+        if domain in _TABLE_INFO_DOMAINS and domain not in diff.changed_table_csms:
+            plan.append(RefreshRequest((domain, "get_table_info")))
+        if domain in _CONFIGURED_DOMAINS:
+            plan.append(RefreshRequest((domain, "get_configured"), (("block_id", 1),)))
+        if domain == "zone":
+            plan.append(RefreshRequest(("zone", "get_defs"), (("block_id", 1),)))
+    return tuple(plan)
+
+
+def planned_inventory_domains(plan: Collection[RefreshRequest]) -> set[str]:
+    """Return the domains whose configured inventory is refreshed by plan."""
+    return {req.domain for req in plan if req.route[1] == "get_configured"}
+
+
+def plan_new_entity_requests(
+    domain: str, before: Collection[int], after: Collection[int]
+) -> tuple[RefreshRequest, ...]:
+    """
+    Return attribs (and status, where applicable) requests for ids in after that
+    were not configured before the refresh.
+    """
+    id_key = f"{domain}_id"
+    plan: list[RefreshRequest] = []
+    for entity_id in sorted(set(after) - set(before)):
+        plan.append(RefreshRequest((domain, "get_attribs"), ((id_key, entity_id),)))
+        if domain in _STATUS_DOMAINS:
+            plan.append(RefreshRequest((domain, "get_status"), ((id_key, entity_id),)))
+    return tuple(plan)
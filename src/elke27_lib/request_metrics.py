@@ -0,0 +1,224 @@
+"""
+elke27_lib/request_metrics.py
+
+Per-route request latency histograms and outcome counters.
+
+The kernel records, for every scheduled request:
+- queue wait: enqueue -> handed to the session for sending
+- wire RTT:   sent -> reply
+- total:      enqueue -> reply
+plus counters for replies, timeouts, send failures and requests dropped by the
+scheduler because their deadline passed while queued.
+
+Histograms use fixed bucket bounds (LATENCY_BUCKETS_S) so recording is a bisect
+plus a few integer increments. All recording happens on the kernel's event loop
+(the request scheduler is single-threaded), so no locks are taken; snapshot()
+copies the counters into immutable objects that are safe to hand to callers.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from .outbound import PacingSnapshot
+from .rto import RtoSnapshot
+
+RouteKey = tuple[str, str]
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is +inf.
+LATENCY_BUCKETS_S: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    """
+    Immutable histogram copy.
+
+    counts[i] is the number of observations <= bounds[i] (and > bounds[i-1]);
+    counts[-1] counts observations above the last bound.
+    """
+
+    bounds: tuple[float, ...]
+    counts: tuple[int, ...]
+    count: int
+    sum_s: float
+    max_s: float
+
+    @property
+    def mean_s(self) -> float | None:
+        return self.sum_s / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bucket bound containing quantile q (max_s for the overflow bucket)."""
+        if not self.count:
+            return None
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be within [0, 1]")
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if bucket_count and seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else self.max_s
+        return self.max_s
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (seconds)."""
+
+    __slots__ = ("_bounds", "_counts", "count", "sum_s", "max_s")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_S) -> None:
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum_s = 0.0
+        self.max_s = 0.0
+
+    def observe(self, value_s: float) -> None:
+        value_s = max(0.0, value_s)
+        self._counts[bisect_left(self._bounds, value_s)] += 1
+        self.count += 1
+        self.sum_s += value_s
+        if value_s > self.max_s:
+            self.max_s = value_s
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            bounds=self._bounds,
+            counts=tuple(self._counts),
+            count=self.count,
+            sum_s=self.sum_s,
+            max_s=self.max_s,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RouteMetricsSnapshot:
+    """Immutable per-route metrics."""
+
+    sent: int
+    replies: int
+    timeouts: int
+    send_failures: int
+    queue_wait: HistogramSnapshot
+    rtt: HistogramSnapshot
+    total: HistogramSnapshot
+    expired: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class RequestMetricsSnapshot:
+    """Immutable metrics for all routes seen so far, plus RTO state per route class."""
+
+    routes: Mapping[RouteKey, RouteMetricsSnapshot]
+    rto: Mapping[str, RtoSnapshot] = field(default_factory=dict)
+    # None unless adaptive pacing is enabled.
+    pacing: PacingSnapshot | None = None
+
+    @property
+    def timeouts(self) -> int:
+        return sum(route.timeouts for route in self.routes.values())
+
+    @property
+    def send_failures(self) -> int:
+        return sum(route.send_failures for route in self.routes.values())
+
+    @property
+    def expired(self) -> int:
+        return sum(route.expired for route in self.routes.values())
+
+
+class _RouteMetrics:
+    __slots__ = (
+        "sent",
+        "replies",
+        "timeouts",
+        "send_failures",
+        "expired",
+        "queue_wait",
+        "rtt",
+        "total",
+    )
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.replies = 0
+        self.timeouts = 0
+        self.send_failures = 0
+        self.expired = 0
+        self.queue_wait = LatencyHistogram()
+        self.rtt = LatencyHistogram()
+        self.total = LatencyHistogram()
+
+    def snapshot(self) -> RouteMetricsSnapshot:
+        return RouteMetricsSnapshot(
+            sent=self.sent,
+            replies=self.replies,
+            timeouts=self.timeouts,
+            send_failures=self.send_failures,
+            queue_wait=self.queue_wait.snapshot(),
+            rtt=self.rtt.snapshot(),
+            total=self.total.snapshot(),
+            expired=self.expired,
+        )
+
+
+class RequestMetrics:
+    """Per-route request metrics, recorded by the kernel scheduler."""
+
+    def __init__(self) -> None:
+        self._routes: dict[RouteKey, _RouteMetrics] = {}
+
+    def _route(self, route: RouteKey) -> _RouteMetrics:
+        metrics = self._routes.get(route)
+        if metrics is None:
+            metrics = self._routes[route] = _RouteMetrics()
+        return metrics
+
+    def record_sent(self, route: RouteKey, queue_wait_s: float) -> None:
+        metrics = self._route(route)
+        metrics.sent += 1
+        metrics.queue_wait.observe(queue_wait_s)
+
+    def record_reply(self, route: RouteKey, rtt_s: float | None, total_s: float) -> None:
+        metrics = self._route(route)
+        metrics.replies += 1
+        if rtt_s is not None:
+            metrics.rtt.observe(rtt_s)
+        metrics.total.observe(total_s)
+
+    def record_timeout(self, route: RouteKey) -> None:
+        self._route(route).timeouts += 1
+
+    def record_send_failure(self, route: RouteKey) -> None:
+        self._route(route).send_failures += 1
+
+    def record_expired(self, route: RouteKey) -> None:
+        self._route(route).expired += 1
+
+    def snapshot(
+        self,
+        *,
+        rto: Mapping[str, RtoSnapshot] | None = None,
+        pacing: PacingSnapshot | None = None,
+    ) -> RequestMetricsSnapshot:
+        return RequestMetricsSnapshot(
+            routes={route: metrics.snapshot() for route, metrics in list(self._routes.items())},
+            rto=dict(rto or {}),
+            pacing=pacing,
+        )
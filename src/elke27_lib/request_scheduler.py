@@ -0,0 +1,205 @@
+"""
+elke27_lib/request_scheduler.py
+
+Deadline-aware multi-class scheduler for the kernel's request queue.
+
+The panel accepts one request at a time, so the order in which queued requests
+are released decides user-visible latency. Requests are grouped into named
+classes:
+
+- interactive: user commands (arm/disarm, bypass, output control, authenticate)
+- keepalive:   r_u_alive probes
+- status:      status refreshes (get_status, get_all_*_status, ...)
+- background:  config crawl (table info, configured inventory, attribs, defs)
+
+Preemptive classes (interactive by default) are always served first, FIFO.
+The remaining classes share the link by smooth weighted round-robin: with the
+default weights, a backlog of background crawl cannot starve status refreshes,
+and vice versa, while neither can delay an arm command by more than the one
+request already on the wire.
+
+Each request may carry an absolute deadline (kernel monotonic clock). Requests
+whose deadline has passed before they are released are dropped via
+drop_expired(); the kernel fails their waiters with E27Timeout. Deadlines are
+tracked in a heap, so checking for expired work costs O(1) when nothing expired.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Generic, TypeVar
+
+from .outbound import OutboundPriority
+
+RouteKey = tuple[str, str]
+
+REQUEST_CLASS_INTERACTIVE = "interactive"
+REQUEST_CLASS_KEEPALIVE = "keepalive"
+REQUEST_CLASS_STATUS = "status"
+REQUEST_CLASS_BACKGROUND = "background"
+
+REQUEST_CLASSES: tuple[str, ...] = (
+    REQUEST_CLASS_INTERACTIVE,
+    REQUEST_CLASS_KEEPALIVE,
+    REQUEST_CLASS_STATUS,
+    REQUEST_CLASS_BACKGROUND,
+)
+
+# Relative share of dispatches for the non-preemptive classes.
+DEFAULT_CLASS_WEIGHTS: Mapping[str, int] = {
+    REQUEST_CLASS_INTERACTIVE: 8,
+    REQUEST_CLASS_KEEPALIVE: 4,
+    REQUEST_CLASS_STATUS: 3,
+    REQUEST_CLASS_BACKGROUND: 1,
+}
+DEFAULT_PREEMPTIVE_CLASSES: tuple[str, ...] = (REQUEST_CLASS_INTERACTIVE,)
+
+
+def classify_request(route: RouteKey, priority: OutboundPriority) -> str:
+    """Default request class for a route sent at the given outbound priority."""
+    domain, name = route
+    if (domain, name) == ("system", "r_u_alive"):
+        return REQUEST_CLASS_KEEPALIVE
+    if priority is OutboundPriority.HIGH or not name.startswith("get_"):
+        return REQUEST_CLASS_INTERACTIVE
+    if priority is OutboundPriority.LOW:
+        return REQUEST_CLASS_BACKGROUND
+    if name.endswith("status") or name == "get_troubles":
+        return REQUEST_CLASS_STATUS
+    return REQUEST_CLASS_BACKGROUND
+
+
+T = TypeVar("T")
+
+
+class _Entry(Generic[T]):
+    __slots__ = ("item", "request_class", "deadline", "live")
+
+    def __init__(self, item: T, request_class: str, deadline: float | None) -> None:
+        self.item = item
+        self.request_class = request_class
+        self.deadline = deadline
+        self.live = True
+
+
+class RequestScheduler(Generic[T]):
+    """Per-class FIFO queues released by preemption, then smooth weighted round-robin."""
+
+    def __init__(
+        self,
+        *,
+        weights: Mapping[str, int] | None = None,
+        preemptive: Sequence[str] = DEFAULT_PREEMPTIVE_CLASSES,
+    ) -> None:
+        merged = dict(DEFAULT_CLASS_WEIGHTS)
+        merged.update(weights or {})
+        if any(weight < 1 for weight in merged.values()):
+            raise ValueError("class weights must be >= 1")
+        self._weights = merged
+        self._preemptive = tuple(preemptive)
+        self._queues: dict[str, deque[_Entry[T]]] = {name: deque() for name in merged}
+        self._credit: dict[str, int] = dict.fromkeys(merged, 0)
+        self._deadlines: list[tuple[float, int, _Entry[T]]] = []
+        self._counter = 0
+        self._size = 0
+        self._expired = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[T]:
+        """Live items, class by class (no dispatch-order guarantee)."""
+        for queue in list(self._queues.values()):
+            for entry in list(queue):
+                if entry.live:
+                    yield entry.item
+
+    @property
+    def expired_total(self) -> int:
+        return self._expired
+
+    def depths(self) -> dict[str, int]:
+        return {
+            name: sum(1 for entry in queue if entry.live) for name, queue in self._queues.items()
+        }
+
+    def push(self, item: T, request_class: str, *, deadline: float | None = None) -> None:
+        queue = self._queues.get(request_class)
+        if queue is None:
+            raise ValueError(f"Unknown request class {request_class!r}")
+        entry = _Entry(item, request_class, deadline)
+        queue.append(entry)
+        self._size += 1
+        if deadline is not None:
+            self._counter += 1
+            heapq.heappush(self._deadlines, (deadline, self._counter, entry))
+
+    def drop_expired(self, now: float) -> list[T]:
+        """Remove and return queued items whose deadline is before now."""
+        expired: list[T] = []
+        while self._deadlines and self._deadlines[0][0] < now:
+            _, _, entry = heapq.heappop(self._deadlines)
+            if not entry.live:
+                continue
+            entry.live = False
+            self._size -= 1
+            self._expired += 1
+            expired.append(entry.item)
+        return expired
+
+    def pop(self) -> T | None:
+        """Release the next item, or None if nothing is queued."""
+        for name in self._preemptive:
+            entry = self._pop_live(name)
+            if entry is not None:
+                return entry.item
+        # Smooth weighted round-robin over the classes that have work queued.
+        chosen: str | None = None
+        total = 0
+        for name, queue in self._queues.items():
+            if name in self._preemptive:
+                continue
+            self._discard_dead(queue)
+            if not queue:
+                self._credit[name] = 0
+                continue
+            weight = self._weights[name]
+            total += weight
+            self._credit[name] += weight
+            if chosen is None or self._credit[name] > self._credit[chosen]:
+                chosen = name
+        if chosen is None:
+            return None
+        self._credit[chosen] -= total
+        entry = self._pop_live(chosen)
+        return entry.item if entry is not None else None
+
+    def clear(self) -> list[T]:
+        """Remove and return every queued item."""
+        items = list(self)
+        for queue in self._queues.values():
+            queue.clear()
+        self._credit = dict.fromkeys(self._weights, 0)
+        self._deadlines.clear()
+        self._size = 0
+        return items
+
+    def _pop_live(self, name: str) -> _Entry[T] | None:
+        queue = self._queues[name]
+        self._discard_dead(queue)
+        if not queue:
+            return None
+        entry = queue.popleft()
+        entry.live = False
+        self._size -= 1
+        return entry
+
+    @staticmethod
+    def _discard_dead(queue: deque[_Entry[T]]) -> None:
+        while queue and not queue[0].live:
+            queue.popleft()
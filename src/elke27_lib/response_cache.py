@@ -0,0 +1,143 @@
+"""
+elke27_lib/response_cache.py
+
+Read-through cache for configuration reads issued via Elke27Client.async_execute.
+
+Only configuration-determined reads are cached (configured lists, attribs,
+defs/def_flags), and only for domains whose configuration changes bump a CSM
+(area, zone, output, keypad, user, tstat). get_table_info is never cached: its
+reply carries the table_csm that drives invalidation. Domains such as log, system,
+timer and network change without a CSM bump and are never cached. Live status
+reads are never cached, and neither is any command whose permission level
+requires a PIN, a disarmed panel, or automation authority (permissions.py /
+CommandSpec).
+
+Entries are tagged by domain and dropped when the panel reports a domain or table
+CSM change for that domain (ADR-0114, ADR-0123), or when a config write for the
+domain succeeds.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from .generators.registry import CommandSpec
+from .permissions import PermissionLevel, requires_disarmed, requires_pin
+
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+
+# Commands whose response is determined by panel configuration. get_table_info is
+# left out: a cached reply would hide the table_csm change that invalidates the cache.
+_CACHEABLE_COMMANDS: frozenset[str] = frozenset(
+    {"get_configured", "get_attribs", "get_defs", "get_def_flags"}
+)
+
+# Domains whose configuration changes are reported through a domain/table CSM.
+_CSM_TRACKED_DOMAINS: frozenset[str] = frozenset(
+    {"area", "zone", "output", "keypad", "user", "tstat"}
+)
+
+# Commands that change configuration for their domain.
+_CONFIG_WRITE_COMMANDS: frozenset[str] = frozenset(
+    {"set_attribs", "del_attribs", "realloc", "change_id", "default", "fill_default"}
+)
+
+CacheKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+def is_cacheable_command(spec: CommandSpec) -> bool:
+    """Return True if responses for spec may be served from the cache."""
+    if spec.command not in _CACHEABLE_COMMANDS or spec.domain not in _CSM_TRACKED_DOMAINS:
+        return False
+    if spec.requires_automation_authority:
+        return False
+    level: PermissionLevel = spec.min_permission
+    return not requires_pin(level) and not requires_disarmed(level)
+
+
+def is_config_write(spec: CommandSpec) -> bool:
+    """Return True if a successful spec invalidates cached config for its domain."""
+    return spec.command in _CONFIG_WRITE_COMMANDS
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    hash(value)
+    return value
+
+
+def make_cache_key(command_key: str, params: Mapping[str, Any]) -> CacheKey | None:
+    """Return a normalized key, or None if params cannot be normalized."""
+    try:
+        return command_key, tuple(sorted((k, _freeze(v)) for k, v in params.items()))
+    except TypeError:
+        return None
+
+
+class ResponseCache:
+    """
+    Bounded LRU of response payloads, tagged by domain.
+
+    get() returns a deep copy so callers cannot mutate cached entries. Each domain
+    carries a generation counter; a put() started before an invalidation of its
+    domain (or a clear()) is discarded, so a reply racing a CSM change is never cached.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_RESPONSE_CACHE_SIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, tuple[str, Mapping[str, Any]]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def generation(self, domain: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(domain, 0)
+
+    def get(self, key: CacheKey) -> Mapping[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(
+        self, key: CacheKey, domain: str, data: Mapping[str, Any], *, generation: tuple[int, int]
+    ) -> None:
+        if generation != self.generation(domain):
+            return
+        self._entries[key] = (domain, copy.deepcopy(data))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_domain(self, domain: str) -> int:
+        """Drop all entries tagged with domain; returns the number dropped."""
+        self._generations[domain] = self._generations.get(domain, 0) + 1
+        stale = [key for key, (tag, _data) in self._entries.items() if tag == domain]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._entries.clear()
@@ -0,0 +1,150 @@
+"""
+elke27_lib/rto.py
+
+Adaptive reply timeouts (retransmission timeout estimation, RFC 6298 style).
+
+One estimator per route class tracks smoothed RTT (SRTT) and RTT variance
+(RTTVAR) from observed reply latencies:
+
+    first sample R:  SRTT = R, RTTVAR = R / 2
+    later samples:   RTTVAR = (1 - beta) * RTTVAR + beta * |SRTT - R|
+                     SRTT   = (1 - alpha) * SRTT + alpha * R
+    RTO = SRTT + K * RTTVAR, clamped to [floor, ceiling]
+
+with alpha = 1/8, beta = 1/4, K = 4. A timeout doubles the RTO (exponential
+backoff, capped at the ceiling) until the next reply is sampled. Before the first
+sample, the configured fixed timeout is used.
+
+Route classes group routes with similar reply cost, so a slow paged transfer does
+not inflate the timeout of a cheap status read.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+RouteKey = tuple[str, str]
+
+RTO_ALPHA = 0.125
+RTO_BETA = 0.25
+RTO_K = 4.0
+
+ROUTE_CLASS_KEEPALIVE = "keepalive"
+ROUTE_CLASS_BULK = "bulk"
+ROUTE_CLASS_READ = "read"
+ROUTE_CLASS_COMMAND = "command"
+
+
+def route_class(route: RouteKey) -> str:
+    """Group a route with others of similar reply latency."""
+    domain, name = route
+    if (domain, name) == ("system", "r_u_alive"):
+        return ROUTE_CLASS_KEEPALIVE
+    if name in ("get_configured", "get_defs") or name.startswith("get_all_"):
+        return ROUTE_CLASS_BULK
+    if name.startswith("get_"):
+        return ROUTE_CLASS_READ
+    return ROUTE_CLASS_COMMAND
+
+
+@dataclass(frozen=True, slots=True)
+class RtoSnapshot:
+    """Immutable estimator state; srtt_s/rttvar_s are None until the first sample."""
+
+    srtt_s: float | None
+    rttvar_s: float | None
+    rto_s: float
+    samples: int
+    backoffs: int
+
+
+class RtoEstimator:
+    """Jacobson/Karels RTO estimator for one route class."""
+
+    __slots__ = ("_floor_s", "_ceiling_s", "srtt_s", "rttvar_s", "rto_s", "samples", "backoffs")
+
+    def __init__(self, *, initial_s: float, floor_s: float, ceiling_s: float) -> None:
+        if floor_s <= 0 or ceiling_s < floor_s:
+            raise ValueError("require 0 < floor_s <= ceiling_s")
+        self._floor_s = floor_s
+        self._ceiling_s = ceiling_s
+        self.srtt_s: float | None = None
+        self.rttvar_s: float | None = None
+        self.rto_s = self._clamp(initial_s)
+        self.samples = 0
+        self.backoffs = 0
+
+    def _clamp(self, value_s: float) -> float:
+        return min(self._ceiling_s, max(self._floor_s, value_s))
+
+    def seed(self, initial_s: float) -> None:
+        """Replace the pre-sample RTO; ignored once a sample or backoff has been taken."""
+        if self.samples == 0 and self.backoffs == 0:
+            self.rto_s = self._clamp(initial_s)
+
+    def observe(self, rtt_s: float) -> None:
+        rtt_s = max(0.0, rtt_s)
+        if self.srtt_s is None or self.rttvar_s is None:
+            self.srtt_s = rtt_s
+            self.rttvar_s = rtt_s / 2.0
+        else:
+            self.rttvar_s = (1.0 - RTO_BETA) * self.rttvar_s + RTO_BETA * abs(self.srtt_s - rtt_s)
+            self.srtt_s = (1.0 - RTO_ALPHA) * self.srtt_s + RTO_ALPHA * rtt_s
+        self.rto_s = self._clamp(self.srtt_s + RTO_K * self.rttvar_s)
+        self.samples += 1
+
+    def backoff(self) -> None:
+        self.rto_s = self._clamp(self.rto_s * 2.0)
+        self.backoffs += 1
+
+    def snapshot(self) -> RtoSnapshot:
+        return RtoSnapshot(
+            srtt_s=self.srtt_s,
+            rttvar_s=self.rttvar_s,
+            rto_s=self.rto_s,
+            samples=self.samples,
+            backoffs=self.backoffs,
+        )
+
+
+class RtoTable:
+    """Estimators keyed by route class, created on first use."""
+
+    def __init__(self, *, initial_s: float, floor_s: float, ceiling_s: float) -> None:
+        self._initial_s = initial_s
+        self._floor_s = floor_s
+        self._ceiling_s = ceiling_s
+        self._estimators: dict[str, RtoEstimator] = {}
+
+    @property
+    def ceiling_s(self) -> float:
+        return self._ceiling_s
+
+    def _estimator(self, route: RouteKey) -> RtoEstimator:
+        return self._class_estimator(route_class(route))
+
+    def _class_estimator(self, key: str) -> RtoEstimator:
+        estimator = self._estimators.get(key)
+        if estimator is None:
+            estimator = self._estimators[key] = RtoEstimator(
+                initial_s=self._initial_s, floor_s=self._floor_s, ceiling_s=self._ceiling_s
+            )
+        return estimator
+
+    def seed(self, key: str, initial_s: float) -> None:
+        """Set the pre-sample RTO of one route class (e.g., the configured keepalive timeout)."""
+        self._class_estimator(key).seed(initial_s)
+
+    def timeout_for(self, route: RouteKey, *, cap_s: float | None = None) -> float:
+        rto_s = self._estimator(route).rto_s
+        return rto_s if cap_s is None else min(rto_s, cap_s)
+
+    def observe(self, route: RouteKey, rtt_s: float) -> None:
+        self._estimator(route).observe(rtt_s)
+
+    def on_timeout(self, route: RouteKey) -> None:
+        self._estimator(route).backoff()
+
+    def snapshot(self) -> Mapping[str, RtoSnapshot]:
+        return {key: est.snapshot() for key, est in list(self._estimators.items())}
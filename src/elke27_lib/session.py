@@ -27,15 +27,18 @@ from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from . import linking
 from .errors import E27Error
 from .framing import DeframeState, deframe_feed, frame_build
 from .hello import perform_hello
-from .outbound import OutboundItem, OutboundPriority, OutboundQueue
+from .outbound import AimdPacer, OutboundItem, OutboundPriority, OutboundQueue
 from .presentation import decrypt_schema0_envelope, encrypt_schema0_envelope
 
+if TYPE_CHECKING:
+    from .capture import WireRecorder
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +58,8 @@ class SessionConfig:
     keepalive_max_missed: int = 2
     auto_receive: bool = True  # start background receive loop when on_message is set
     auto_receive_thread_fallback: bool = False  # allow dedicated thread when no event loop exists
+    loop_io: bool = False  # receive via loop.add_reader and send on the loop (no worker threads)
+    capture: WireRecorder | None = None  # record raw RX/TX bytes and session keys (capture.py)
 
 
 @dataclass(frozen=True)
@@ -146,11 +151,17 @@ class Session:
         self._last_tx_at = now
         self._last_exchange_at = now
         self._rx_count = 0
+        # Monotonic timestamps of the last connect(), for bootstrap timing.
+        self.connect_started_at: float | None = None
+        self.tcp_connected_at: float | None = None
+        self.hello_completed_at: float | None = None
         self._recv_thread: threading.Thread | None = None
         self._recv_stop: threading.Event | None = None
         self._recv_lock = threading.Lock()
         self._recv_task: asyncio.Task[None] | None = None
         self._recv_loop_ref: asyncio.AbstractEventLoop | None = None
+        self._reader_loop: asyncio.AbstractEventLoop | None = None
+        self._reader_fd: int = -1
         self._outbound: OutboundQueue | None = None
 
         # Event hooks (optional)
@@ -173,6 +184,9 @@ class Session:
 
         self.last_error = None
         self.state = SessionState.CONNECTING
+        self.connect_started_at = time.monotonic()
+        self.tcp_connected_at = None
+        self.hello_completed_at = None
 
         logger.info("E27 Session connecting to %s:%s", self.cfg.host, self.cfg.port)
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -188,6 +202,7 @@ class Session:
                 f"Failed to connect to {self.cfg.host}:{self.cfg.port}: {e}"
             ) from e
 
+        self.tcp_connected_at = time.monotonic()
         # After connect, switch to pump cadence timeout.
         s.settimeout(self.cfg.io_timeout_s)
         self.sock = s
@@ -219,6 +234,9 @@ class Session:
         self._last_rx_at = time.monotonic()
         self._last_tx_at = self._last_rx_at
         self._last_exchange_at = self._last_rx_at
+        self.hello_completed_at = self._last_rx_at
+        if self.cfg.capture is not None:
+            self.cfg.capture.record_keys(self.info, at=self.hello_completed_at)
 
         logger.info("E27 HELLO complete; session_id=%s", self.info.session_id)
 
@@ -297,6 +315,8 @@ class Session:
             now = time.monotonic()
             self._last_tx_at = now
             self._last_exchange_at = now
+            if self.cfg.capture is not None:
+                self.cfg.capture.record_tx(data, at=now)
         except OSError as e:
             raise SessionIOError(
                 f"Socket write failed to {self.cfg.host}:{self.cfg.port}: {e}"
@@ -333,20 +353,7 @@ class Session:
                         self.on_idle()
                 continue
 
-            if self.cfg.wire_log and logger.isEnabledFor(logging.DEBUG):
-                logger.debug("RX raw chunk (%d bytes): %s", len(chunk), chunk.hex())
-
-            results = deframe_feed(self._deframe_state, chunk)
-            for r in results:
-                if getattr(r, "ok", False):
-                    if r.frame_no_crc is None:
-                        continue
-                    self._pending_frames.append(r.frame_no_crc)
-                # CRC-bad or malformed frames: ignore and keep scanning.
-                # If the framing layer provides details, emit at debug level.
-                err = getattr(r, "error", None)
-                if err:
-                    logger.warning("Dropping invalid frame while resyncing: %s", err)
+            self._feed_chunk(chunk)
             if self._pending_frames:
                 frame = self._pending_frames.popleft()
                 if self.cfg.wire_log and logger.isEnabledFor(logging.DEBUG):
@@ -357,6 +364,26 @@ class Session:
                     )
                 return frame
 
+    def _feed_chunk(self, chunk: bytes) -> None:
+        """Deframe a received chunk, queueing complete frames on _pending_frames."""
+        assert self._deframe_state is not None
+        if self.cfg.capture is not None:
+            self.cfg.capture.record_rx(chunk)
+        if self.cfg.wire_log and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("RX raw chunk (%d bytes): %s", len(chunk), chunk.hex())
+
+        results = deframe_feed(self._deframe_state, chunk)
+        for r in results:
+            if getattr(r, "ok", False):
+                if r.frame_no_crc is None:
+                    continue
+                self._pending_frames.append(r.frame_no_crc)
+            # CRC-bad or malformed frames: ignore and keep scanning.
+            # If the framing layer provides details, emit at debug level.
+            err = getattr(r, "error", None)
+            if err:
+                logger.warning("Dropping invalid frame while resyncing: %s", err)
+
     # --------------------------
     # Public send/recv API
     # --------------------------
@@ -397,6 +424,7 @@ class Session:
         loop: asyncio.AbstractEventLoop,
         min_interval_s: float,
         max_burst: int,
+        pacer: AimdPacer | None = None,
     ) -> None:
         self._outbound = OutboundQueue(
             loop=loop,
@@ -404,6 +432,8 @@ class Session:
             min_interval_s=min_interval_s,
             max_burst=max_burst,
             logger=logger,
+            pacer=pacer,
+            send_inline=self.cfg.loop_io,
         )
         self._outbound.start()
 
@@ -443,91 +473,96 @@ class Session:
                         self.on_idle()
                     idle_check_at = time.monotonic() + timeout_s
                 frame_no_crc = self._recv_one_frame_no_crc(timeout_s=timeout_s)
-                if len(frame_no_crc) < 3:
-                    logger.warning(
-                        "Dropping short frame (len=%d) from %s:%s",
-                        len(frame_no_crc),
-                        self.cfg.host,
-                        self.cfg.port,
-                    )
-                    raise SessionProtocolError(
-                        f"Received an invalid frame (too short) from {self.cfg.host}:{self.cfg.port}."
-                    )
+                return self._decode_frame(frame_no_crc)
 
-                protocol_byte = frame_no_crc[0]
-                frame_len = frame_no_crc[1] | (frame_no_crc[2] << 8)
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(
-                        "RX frame header: protocol=0x%02x length=%d total=%d",
-                        protocol_byte,
-                        frame_len,
-                        len(frame_no_crc),
-                    )
-                ciphertext = frame_no_crc[3:]  # skip protocol + 2-byte length
+    def _decode_frame(self, frame_no_crc: bytes) -> dict[str, Any]:
+        """Decrypt one schema-0 frame_no_crc and parse its JSON object."""
+        assert self.info is not None
+        if len(frame_no_crc) < 3:
+            logger.warning(
+                "Dropping short frame (len=%d) from %s:%s",
+                len(frame_no_crc),
+                self.cfg.host,
+                self.cfg.port,
+            )
+            raise SessionProtocolError(
+                f"Received an invalid frame (too short) from {self.cfg.host}:{self.cfg.port}."
+            )
 
-                try:
-                    env = decrypt_schema0_envelope(
-                        protocol_byte=protocol_byte,
-                        ciphertext=ciphertext,
-                        session_key=bytes.fromhex(self.info.session_key_hex),
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Dropping frame after decrypt failure: protocol=0x%02x length=%d ciphertext_len=%d error=%s",
-                        protocol_byte,
-                        frame_len,
-                        len(ciphertext),
-                        e,
-                    )
-                    raise SessionProtocolError(
-                        f"Failed to decrypt schema-0 envelope from {self.cfg.host}:{self.cfg.port}: {e}"
-                    ) from e
-                seq_val = getattr(env, "seq", None)
-                if isinstance(seq_val, int):
-                    self._last_rx_envelope_seq = seq_val
-
-                try:
-                    obj = json.loads(env.payload.decode("utf-8"))
-                except Exception as e:
-                    logger.warning(
-                        "Dropping frame after JSON decode failure: protocol=0x%02x length=%d error=%s",
-                        protocol_byte,
-                        frame_len,
-                        e,
-                    )
-                    raise SessionProtocolError(
-                        f"Received invalid JSON payload from {self.cfg.host}:{self.cfg.port}: {e}"
-                    ) from e
-
-                if not isinstance(obj, dict):
-                    logger.warning(
-                        "Dropping non-object JSON payload: protocol=0x%02x length=%d type=%s",
-                        protocol_byte,
-                        frame_len,
-                        type(obj).__name__,
-                    )
-                    raise SessionProtocolError(
-                        "Expected a JSON object (dict) but received "
-                        f"{type(obj).__name__} from {self.cfg.host}:{self.cfg.port}."
-                    )
+        protocol_byte = frame_no_crc[0]
+        frame_len = frame_no_crc[1] | (frame_no_crc[2] << 8)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RX frame header: protocol=0x%02x length=%d total=%d",
+                protocol_byte,
+                frame_len,
+                len(frame_no_crc),
+            )
+        ciphertext = frame_no_crc[3:]  # skip protocol + 2-byte length
 
-                obj = cast(dict[str, Any], obj)
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(
-                        "RX json: session_id=%s seq=%s keys=%s",
-                        obj.get("session_id"),
-                        obj.get("seq"),
-                        tuple(obj.keys()),
-                    )
-                    logger.debug(
-                        "RX json decoded: domain=%s",
-                        self._extract_domain_key(obj),
-                    )
-                self._note_rx_json(obj)
-                self._rx_count += 1
-                self._last_rx_at = time.monotonic()
-                self._last_exchange_at = self._last_rx_at
-                return obj
+        try:
+            env = decrypt_schema0_envelope(
+                protocol_byte=protocol_byte,
+                ciphertext=ciphertext,
+                session_key=bytes.fromhex(self.info.session_key_hex),
+            )
+        except Exception as e:
+            logger.warning(
+                "Dropping frame after decrypt failure: protocol=0x%02x length=%d ciphertext_len=%d error=%s",
+                protocol_byte,
+                frame_len,
+                len(ciphertext),
+                e,
+            )
+            raise SessionProtocolError(
+                f"Failed to decrypt schema-0 envelope from {self.cfg.host}:{self.cfg.port}: {e}"
+            ) from e
+        seq_val = getattr(env, "seq", None)
+        if isinstance(seq_val, int):
+            self._last_rx_envelope_seq = seq_val
+
+        try:
+            obj = json.loads(env.payload.decode("utf-8"))
+        except Exception as e:
+            logger.warning(
+                "Dropping frame after JSON decode failure: protocol=0x%02x length=%d error=%s",
+                protocol_byte,
+                frame_len,
+                e,
+            )
+            raise SessionProtocolError(
+                f"Received invalid JSON payload from {self.cfg.host}:{self.cfg.port}: {e}"
+            ) from e
+
+        if not isinstance(obj, dict):
+            logger.warning(
+                "Dropping non-object JSON payload: protocol=0x%02x length=%d type=%s",
+                protocol_byte,
+                frame_len,
+                type(obj).__name__,
+            )
+            raise SessionProtocolError(
+                "Expected a JSON object (dict) but received "
+                f"{type(obj).__name__} from {self.cfg.host}:{self.cfg.port}."
+            )
+
+        obj = cast(dict[str, Any], obj)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RX json: session_id=%s seq=%s keys=%s",
+                obj.get("session_id"),
+                obj.get("seq"),
+                tuple(obj.keys()),
+            )
+            logger.debug(
+                "RX json decoded: domain=%s",
+                self._extract_domain_key(obj),
+            )
+        self._note_rx_json(obj)
+        self._rx_count += 1
+        self._last_rx_at = time.monotonic()
+        self._last_exchange_at = self._last_rx_at
+        return obj
 
     def pump_once(self, *, timeout_s: float = 0.5) -> dict[str, Any] | None:
         """
@@ -584,6 +619,14 @@ class Session:
         except RuntimeError:
             loop = None
 
+        if loop is not None and self.cfg.loop_io and self.sock is not None:
+            # Shared I/O path: the loop's selector watches the socket, so many
+            # sessions on one loop need no receive threads.
+            self._reader_loop = loop
+            self._reader_fd = self.sock.fileno()
+            loop.add_reader(self._reader_fd, self._on_readable)
+            return
+
         if loop is not None:
             # Prefer asyncio.to_thread when a loop is running (HA async contexts).
             self._recv_loop_ref = loop
@@ -612,6 +655,7 @@ class Session:
         self._start_receiver()
 
     def _stop_receiver(self) -> None:
+        self._remove_reader()
         if self._recv_stop is not None:
             self._recv_stop.set()
         if self._recv_thread is not None and self._recv_thread is not threading.current_thread():
@@ -623,6 +667,57 @@ class Session:
         self._recv_thread = None
         self._recv_stop = None
 
+    def _remove_reader(self) -> None:
+        loop = self._reader_loop
+        if loop is None:
+            return
+        self._reader_loop = None
+        fd = self._reader_fd
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop or not loop.is_running():
+            if not loop.is_closed():
+                loop.remove_reader(fd)
+            return
+        # Called from a worker thread (e.g. kernel close via to_thread): unregister
+        # on the loop before the socket is closed so the fd cannot be reused first.
+        removed = threading.Event()
+
+        def _remove() -> None:
+            try:
+                loop.remove_reader(fd)
+            finally:
+                removed.set()
+
+        loop.call_soon_threadsafe(_remove)
+        removed.wait(timeout=1.0)
+
+    def _on_readable(self) -> None:
+        """Loop reader callback: read what is available and dispatch complete frames."""
+        try:
+            chunk = self._recv_some(max_bytes=self.cfg.recv_max_bytes)
+        except (TimeoutError, BlockingIOError):
+            return
+        except SessionNotReadyError:
+            self._remove_reader()
+            return
+        except Exception as e:
+            self._handle_disconnect(e)
+            return
+
+        self._feed_chunk(chunk)
+        while self._pending_frames and self.state is SessionState.ACTIVE:
+            frame = self._pending_frames.popleft()
+            try:
+                obj = self._decode_frame(frame)
+            except Exception as e:
+                self._handle_disconnect(e)
+                return
+            if self.on_message:
+                self.on_message(obj)
+
     def _recv_loop(self, stop_event: threading.Event) -> None:
         while not stop_event.is_set():
             if self.state is not SessionState.ACTIVE:
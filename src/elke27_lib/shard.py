@@ -0,0 +1,637 @@
+"""
+elke27_lib/shard.py
+
+Process-sharded panel runner for fleets too large for one process.
+
+ShardedPanelRunner assigns panels to worker processes. Each worker runs a
+PanelManager (manager.py) on its own event loop, so crypto, JSON and dispatch
+for its panels use its own core. Workers talk to the parent over a duplex
+multiprocessing pipe that the parent watches with loop.add_reader:
+
+- events: every client event, tagged with its panel id
+- snapshot deltas: after each burst of events the worker diffs each dirty
+  panel's PanelSnapshot against the last one it sent and ships only changed
+  entities (SnapshotDelta); the parent applies them to its mirror snapshot
+- calls: async_execute, health and wait_settled are forwarded to the worker
+  that owns the panel and answered over the same pipe
+
+The parent exposes the single-client query/subscribe surface per panel
+(runner.panel(panel_id).snapshot / subscribe / async_execute) plus a merged
+subscribe() over all panels. Like Elke27Client.async_execute, async_execute
+never raises: when a worker dies its pending calls return a failed Result
+carrying Elke27DisconnectedError, a replacement worker is spawned (respawn=True)
+and the orphaned panels are reassigned to the least-loaded live workers.
+
+Workers are started with the "spawn" method by default, so client_factory
+must be a picklable (module-level) callable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import pickle
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from .client import Result
+from .errors import Elke27DisconnectedError
+from .manager import (
+    ClientFactory,
+    FleetHealth,
+    PanelEvent,
+    PanelManager,
+    PanelManagerConfig,
+    PanelSpec,
+)
+from .types import (
+    AreaState,
+    Elke27Event,
+    OutputDefinition,
+    OutputState,
+    PanelInfo,
+    PanelSnapshot,
+    TableInfo,
+    ZoneDefinition,
+    ZoneState,
+)
+
+LOG = logging.getLogger(__name__)
+
+_ENTITY_FIELDS = ("areas", "zones", "zone_definitions", "outputs", "output_definitions")
+
+
+@dataclass(frozen=True, slots=True)
+class ShardConfig:
+    workers: int = field(default_factory=lambda: max(1, (os.cpu_count() or 2) - 1))
+    manager: PanelManagerConfig = field(default_factory=PanelManagerConfig)
+    # None uses the manager default (Elke27Client(config)); must be picklable.
+    client_factory: ClientFactory | None = None
+    start_method: str = "spawn"
+    respawn: bool = True
+    stop_timeout_s: float = 10.0
+
+
+# --------------------------
+# Snapshot deltas
+# --------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotDelta:
+    """
+    Changes between two PanelSnapshots of one panel. changes maps an entity
+    field ("zones", "outputs", ...) to the added or changed entities; removed
+    lists ids that disappeared. A full delta replaces the snapshot.
+    """
+
+    version: int
+    updated_at: datetime
+    full: bool
+    panel: PanelInfo | None = None
+    table_info: TableInfo | None = None
+    changes: Mapping[str, Mapping[int, Any]] = field(default_factory=dict)
+    removed: Mapping[str, tuple[int, ...]] = field(default_factory=dict)
+
+    @property
+    def entity_count(self) -> int:
+        return sum(len(entities) for entities in self.changes.values())
+
+
+def snapshot_delta(old: PanelSnapshot | None, new: PanelSnapshot) -> SnapshotDelta:
+    if old is None:
+        return SnapshotDelta(
+            version=new.version,
+            updated_at=new.updated_at,
+            full=True,
+            panel=new.panel,
+            table_info=new.table_info,
+            changes={name: dict(getattr(new, name)) for name in _ENTITY_FIELDS},
+        )
+    changes: dict[str, Mapping[int, Any]] = {}
+    removed: dict[str, tuple[int, ...]] = {}
+    for name in _ENTITY_FIELDS:
+        before: Mapping[int, Any] = getattr(old, name)
+        after: Mapping[int, Any] = getattr(new, name)
+        if before is after:
+            continue
+        changed = {key: value for key, value in after.items() if before.get(key) != value}
+        if changed:
+            changes[name] = changed
+        gone = tuple(key for key in before if key not in after)
+        if gone:
+            removed[name] = gone
+    return SnapshotDelta(
+        version=new.version,
+        updated_at=new.updated_at,
+        full=False,
+        panel=new.panel if new.panel != old.panel else None,
+        table_info=new.table_info if new.table_info != old.table_info else None,
+        changes=changes,
+        removed=removed,
+    )
+
+
+def apply_snapshot_delta(snapshot: PanelSnapshot, delta: SnapshotDelta) -> PanelSnapshot:
+    base = PanelSnapshot.empty() if delta.full else snapshot
+
+    def merged(name: str) -> dict[int, Any]:
+        current: Mapping[int, Any] = getattr(base, name)
+        changed = delta.changes.get(name)
+        gone = delta.removed.get(name, ())
+        result = dict(current)
+        if changed:
+            result.update(changed)
+        for key in gone:
+            result.pop(key, None)
+        return result
+
+    areas: dict[int, AreaState] = merged("areas")
+    zones: dict[int, ZoneState] = merged("zones")
+    zone_definitions: dict[int, ZoneDefinition] = merged("zone_definitions")
+    outputs: dict[int, OutputState] = merged("outputs")
+    output_definitions: dict[int, OutputDefinition] = merged("output_definitions")
+    return PanelSnapshot(
+        panel=delta.panel or base.panel,
+        table_info=delta.table_info or base.table_info,
+        areas=areas,
+        zones=zones,
+        zone_definitions=zone_definitions,
+        outputs=outputs,
+        output_definitions=output_definitions,
+        version=delta.version,
+        updated_at=delta.updated_at,
+    )
+
+
+def _portable_error(exc: BaseException) -> BaseException:
+    """exc if it survives a pickle round trip, else a RuntimeError carrying its text."""
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:  # noqa: BLE001
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+# --------------------------
+# Worker process
+# --------------------------
+
+
+def _worker_main(
+    conn: Connection,
+    index: int,
+    manager_config: PanelManagerConfig,
+    client_factory: ClientFactory | None,
+) -> None:
+    worker = _ShardWorker(conn, index, manager_config, client_factory)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(worker.run())
+
+
+class _ShardWorker:
+    def __init__(
+        self,
+        conn: Connection,
+        index: int,
+        manager_config: PanelManagerConfig,
+        client_factory: ClientFactory | None,
+    ) -> None:
+        self._conn = conn
+        self._index = index
+        self._manager_config = manager_config
+        self._client_factory = client_factory
+        self._sent: dict[str, PanelSnapshot] = {}
+        self._dirty: set[str] = set()
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._done = asyncio.Event()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._manager = PanelManager(self._manager_config, client_factory=self._client_factory)
+        await self._manager.start()
+        pump = loop.create_task(self._pump_events())
+        loop.add_reader(self._conn.fileno(), self._on_readable)
+        try:
+            await self._done.wait()
+        finally:
+            loop.remove_reader(self._conn.fileno())
+            await self._manager.stop()
+            await pump
+            for task in list(self._tasks):
+                task.cancel()
+            self._conn.close()
+
+    def _on_readable(self) -> None:
+        try:
+            while self._conn.poll():
+                self._handle(self._conn.recv())
+        except (EOFError, OSError):
+            # Parent went away.
+            self._done.set()
+
+    def _handle(self, msg: tuple[Any, ...]) -> None:
+        op = msg[0]
+        if op == "add":
+            spec: PanelSpec = msg[1]
+            self._sent.pop(spec.panel_id, None)
+            self._manager.add_panel(spec)
+            self._mark_dirty(spec.panel_id)
+        elif op == "remove":
+            self._sent.pop(msg[1], None)
+            self._spawn(self._manager.remove_panel(msg[1]))
+        elif op == "call":
+            self._spawn(self._serve_call(msg[1], msg[2], msg[3]))
+        elif op == "stop":
+            self._done.set()
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _serve_call(self, call_id: int, op: str, args: tuple[Any, ...]) -> None:
+        try:
+            if op == "execute":
+                panel_id, command_key, timeout_s, params = args
+                client = self._manager.client(panel_id)
+                result = await client.async_execute(command_key, timeout_s=timeout_s, **params)
+                if result.error is not None:
+                    result = Result(result.ok, result.data, _portable_error(result.error))
+                value: Any = result
+            elif op == "health":
+                value = self._manager.health()
+            elif op == "wait_settled":
+                value = await self._manager.wait_settled(timeout_s=args[0])
+            else:
+                raise ValueError(f"Unknown shard call {op!r}.")
+        except Exception as exc:  # noqa: BLE001
+            self._send(("reply", call_id, False, _portable_error(exc)))
+            return
+        self._send(("reply", call_id, True, value))
+
+    async def _pump_events(self) -> None:
+        async for item in self._manager.events():
+            self._send(("event", item.panel_id, item.event))
+            self._mark_dirty(item.panel_id)
+
+    def _mark_dirty(self, panel_id: str) -> None:
+        self._dirty.add(panel_id)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        """Send one delta per panel changed since the last flush (coalesces bursts)."""
+        self._flush_scheduled = False
+        dirty, self._dirty = self._dirty, set()
+        panel_ids = set(self._manager.panel_ids)
+        for panel_id in dirty:
+            if panel_id not in panel_ids:
+                continue
+            snapshot = self._manager.client(panel_id).snapshot
+            previous = self._sent.get(panel_id)
+            if previous is not None and previous.version == snapshot.version:
+                continue
+            self._sent[panel_id] = snapshot
+            self._send(("delta", panel_id, snapshot_delta(previous, snapshot)))
+
+    def _send(self, msg: tuple[Any, ...]) -> None:
+        try:
+            self._conn.send(msg)
+        except (OSError, EOFError, ValueError):
+            self._done.set()
+
+
+# --------------------------
+# Parent side
+# --------------------------
+
+
+class _WorkerHandle:
+    __slots__ = ("index", "process", "conn", "panels", "calls")
+
+    def __init__(self, index: int, process: BaseProcess, conn: Connection) -> None:
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.panels: set[str] = set()
+        self.calls: dict[int, asyncio.Future[Any]] = {}
+
+
+class ShardedPanel:
+    """Single-client style view of one panel owned by a worker process."""
+
+    def __init__(self, runner: ShardedPanelRunner, panel_id: str) -> None:
+        self._runner = runner
+        self.panel_id = panel_id
+
+    @property
+    def snapshot(self) -> PanelSnapshot:
+        return self._runner.snapshot(self.panel_id)
+
+    def subscribe(self, callback: Callable[[Elke27Event], None]) -> Callable[[], bool]:
+        return self._runner.subscribe_panel(self.panel_id, callback)
+
+    async def async_execute(
+        self, command_key: str, /, *, timeout_s: float | None = None, **params: Any
+    ) -> Result[Mapping[str, Any]]:
+        return await self._runner.async_execute(
+            self.panel_id, command_key, timeout_s=timeout_s, **params
+        )
+
+
+class ShardedPanelRunner:
+    """
+    Runs PanelManagers in worker processes and mirrors their panels.
+
+    Must be started and used on one event loop in the parent process.
+    """
+
+    def __init__(self, config: ShardConfig | None = None) -> None:
+        self.config = config or ShardConfig()
+        self._ctx = multiprocessing.get_context(self.config.start_method)
+        self._workers: dict[int, _WorkerHandle] = {}
+        self._specs: dict[str, PanelSpec] = {}
+        self._owner: dict[str, int] = {}
+        self._snapshots: dict[str, PanelSnapshot] = {}
+        self._subscribers: list[Callable[[PanelEvent], None]] = []
+        self._panel_subscribers: dict[str, list[Callable[[Elke27Event], None]]] = {}
+        self._next_call_id = 0
+        self._running = False
+        self._reapers: set[asyncio.Task[None]] = set()
+        self.worker_deaths = 0
+
+    # Fleet membership
+
+    def add_panel(self, spec: PanelSpec) -> ShardedPanel:
+        if spec.panel_id in self._specs:
+            raise ValueError(f"Panel {spec.panel_id!r} is already managed.")
+        self._specs[spec.panel_id] = spec
+        self._snapshots[spec.panel_id] = PanelSnapshot.empty()
+        if self._running:
+            self._assign(spec.panel_id)
+        return ShardedPanel(self, spec.panel_id)
+
+    def remove_panel(self, panel_id: str) -> None:
+        del self._specs[panel_id]
+        self._snapshots.pop(panel_id, None)
+        self._panel_subscribers.pop(panel_id, None)
+        index = self._owner.pop(panel_id, None)
+        worker = self._workers.get(index) if index is not None else None
+        if worker is not None:
+            worker.panels.discard(panel_id)
+            self._send(worker, ("remove", panel_id))
+
+    def panel(self, panel_id: str) -> ShardedPanel:
+        if panel_id not in self._specs:
+            raise KeyError(panel_id)
+        return ShardedPanel(self, panel_id)
+
+    @property
+    def panel_ids(self) -> tuple[str, ...]:
+        return tuple(self._specs)
+
+    def worker_of(self, panel_id: str) -> int | None:
+        return self._owner.get(panel_id)
+
+    @property
+    def worker_pids(self) -> dict[int, int | None]:
+        return {index: worker.process.pid for index, worker in self._workers.items()}
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        for index in range(max(1, self.config.workers)):
+            self._spawn_worker(index)
+        for panel_id in self._specs:
+            self._assign(panel_id)
+
+    async def stop(self) -> None:
+        """Stop every worker (disconnecting its panels) and wait for it to exit."""
+        self._running = False
+        workers = list(self._workers.values())
+        self._workers.clear()
+        self._owner.clear()
+        loop = asyncio.get_running_loop()
+        for worker in workers:
+            loop.remove_reader(worker.conn.fileno())
+            self._send(worker, ("stop",))
+            self._fail_calls(worker)
+        for worker in workers:
+            await asyncio.to_thread(worker.process.join, self.config.stop_timeout_s)
+            if worker.process.is_alive():
+                LOG.warning("Shard worker %s did not stop; terminating", worker.index)
+                worker.process.terminate()
+                await asyncio.to_thread(worker.process.join, 1.0)
+            worker.conn.close()
+        if self._reapers:
+            await asyncio.gather(*self._reapers, return_exceptions=True)
+
+    async def wait_settled(self, timeout_s: float | None = None) -> bool:
+        """Wait until every worker's panels have been ready once or have failed."""
+        results = await asyncio.gather(
+            *(self._call(worker, "wait_settled", timeout_s) for worker in self._workers.values()),
+            return_exceptions=True,
+        )
+        return all(result is True for result in results)
+
+    # Queries and commands
+
+    def snapshot(self, panel_id: str) -> PanelSnapshot:
+        return self._snapshots[panel_id]
+
+    def subscribe(self, callback: Callable[[PanelEvent], None]) -> Callable[[], bool]:
+        """Receive every panel's events as PanelEvent on the parent loop."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+        def _unsubscribe() -> bool:
+            if callback not in self._subscribers:
+                return False
+            self._subscribers.remove(callback)
+            return True
+
+        return _unsubscribe
+
+    def subscribe_panel(
+        self, panel_id: str, callback: Callable[[Elke27Event], None]
+    ) -> Callable[[], bool]:
+        callbacks = self._panel_subscribers.setdefault(panel_id, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+        def _unsubscribe() -> bool:
+            if callback not in callbacks:
+                return False
+            callbacks.remove(callback)
+            return True
+
+        return _unsubscribe
+
+    async def async_execute(
+        self,
+        panel_id: str,
+        command_key: str,
+        /,
+        *,
+        timeout_s: float | None = None,
+        **params: Any,
+    ) -> Result[Mapping[str, Any]]:
+        index = self._owner.get(panel_id)
+        worker = self._workers.get(index) if index is not None else None
+        if worker is None:
+            return Result.failure(
+                Elke27DisconnectedError(f"Panel {panel_id} has no live shard worker.")
+            )
+        try:
+            return await self._call(worker, "execute", panel_id, command_key, timeout_s, params)
+        except Exception as exc:  # noqa: BLE001
+            return Result.failure(exc)
+
+    async def health(self) -> FleetHealth:
+        """Fleet health merged across workers."""
+        reports: list[FleetHealth] = [
+            report
+            for report in await asyncio.gather(
+                *(self._call(worker, "health") for worker in self._workers.values()),
+                return_exceptions=True,
+            )
+            if isinstance(report, FleetHealth)
+        ]
+        startup_s = None
+        if reports and all(report.startup_s is not None for report in reports):
+            startup_s = max(report.startup_s or 0.0 for report in reports)
+        return FleetHealth(
+            panels={
+                panel_id: panel for report in reports for panel_id, panel in report.panels.items()
+            },
+            bootstraps_in_flight=sum(report.bootstraps_in_flight for report in reports),
+            peak_bootstraps_in_flight=sum(report.peak_bootstraps_in_flight for report in reports),
+            events_dropped=sum(report.events_dropped for report in reports),
+            startup_s=startup_s,
+        )
+
+    # Internals
+
+    def _spawn_worker(self, index: int) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, index, self.config.manager, self.config.client_factory),
+            name=f"elke27-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker = _WorkerHandle(index, process, parent_conn)
+        self._workers[index] = worker
+        asyncio.get_running_loop().add_reader(
+            parent_conn.fileno(), self._on_worker_readable, worker
+        )
+        LOG.debug("Shard worker %s started (pid=%s)", index, process.pid)
+
+    def _assign(self, panel_id: str) -> None:
+        if not self._workers:
+            return
+        worker = min(self._workers.values(), key=lambda w: (len(w.panels), w.index))
+        worker.panels.add(panel_id)
+        self._owner[panel_id] = worker.index
+        self._send(worker, ("add", self._specs[panel_id]))
+
+    def _send(self, worker: _WorkerHandle, msg: tuple[Any, ...]) -> None:
+        try:
+            worker.conn.send(msg)
+        except (OSError, ValueError) as exc:
+            LOG.debug("Shard worker %s send failed: %s", worker.index, exc)
+
+    def _call(self, worker: _WorkerHandle, op: str, *args: Any) -> asyncio.Future[Any]:
+        self._next_call_id += 1
+        call_id = self._next_call_id
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        worker.calls[call_id] = future
+        self._send(worker, ("call", call_id, op, args))
+        return future
+
+    def _fail_calls(self, worker: _WorkerHandle) -> None:
+        calls, worker.calls = worker.calls, {}
+        for future in calls.values():
+            if not future.done():
+                future.set_exception(Elke27DisconnectedError("Shard worker exited."))
+
+    def _on_worker_readable(self, worker: _WorkerHandle) -> None:
+        try:
+            while worker.conn.poll():
+                self._handle(worker, worker.conn.recv())
+        except (EOFError, OSError):
+            self._on_worker_exit(worker)
+
+    def _handle(self, worker: _WorkerHandle, msg: tuple[Any, ...]) -> None:
+        op = msg[0]
+        if op == "event":
+            panel_id, event = msg[1], msg[2]
+            if panel_id not in self._specs:
+                return
+            for callback in list(self._panel_subscribers.get(panel_id, ())):
+                self._invoke(callback, event)
+            tagged = PanelEvent(panel_id, event)
+            for callback in list(self._subscribers):
+                self._invoke(callback, tagged)
+        elif op == "delta":
+            panel_id, delta = msg[1], msg[2]
+            snapshot = self._snapshots.get(panel_id)
+            if snapshot is not None:
+                self._snapshots[panel_id] = apply_snapshot_delta(snapshot, delta)
+        elif op == "reply":
+            future = worker.calls.pop(msg[1], None)
+            if future is None or future.done():
+                return
+            if msg[2]:
+                future.set_result(msg[3])
+            else:
+                future.set_exception(msg[3])
+
+    @staticmethod
+    async def _reap(worker: _WorkerHandle) -> None:
+        await asyncio.to_thread(worker.process.join, 1.0)
+        LOG.debug("Shard worker %s reaped (exitcode=%s)", worker.index, worker.process.exitcode)
+
+    @staticmethod
+    def _invoke(callback: Callable[[Any], None], arg: Any) -> None:
+        try:
+            callback(arg)
+        except Exception as exc:  # noqa: BLE001
+            LOG.warning("Shard subscriber callback failed: %s", type(exc).__name__)
+
+    def _on_worker_exit(self, worker: _WorkerHandle) -> None:
+        asyncio.get_running_loop().remove_reader(worker.conn.fileno())
+        worker.conn.close()
+        self._fail_calls(worker)
+        if self._workers.get(worker.index) is not worker:
+            return
+        del self._workers[worker.index]
+        self.worker_deaths += 1
+        orphans = sorted(worker.panels)
+        LOG.warning("Shard worker %s exited; reassigning %s panels", worker.index, len(orphans))
+        # Reap off the loop: join() blocks, and every other shard's events wait on this loop.
+        reaper = asyncio.get_running_loop().create_task(self._reap(worker))
+        self._reapers.add(reaper)
+        reaper.add_done_callback(self._reapers.discard)
+        if not self._running:
+            return
+        if self.config.respawn:
+            self._spawn_worker(worker.index)
+        for panel_id in orphans:
+            if panel_id in self._specs:
+                self._assign(panel_id)
@@ -0,0 +1,464 @@
+"""
+elke27_lib/shared_snapshot.py
+
+Publish PanelSnapshot into a memory-mapped file for readers in other processes.
+
+SnapshotPublisher.attach(client) re-encodes the client's snapshot after each
+version bump (coalesced to once per loop iteration) and writes it into the file;
+SnapshotReader maps the same file read-only and decodes it. Readers never talk
+to the client or the panel, so dashboards and exporters add no panel load.
+
+File layout (little-endian):
+    header (64 bytes): magic, layout version, flags, capacity, seq, payload
+        length, snapshot version, publish time
+    payload: compact binary encoding of the snapshot (encode_snapshot)
+
+Consistency uses a seqlock: the writer makes seq odd, writes the payload and
+length, then makes seq even again. A reader copies the payload between two
+reads of seq and retries unless both are the same even value. Readers take no
+locks and never block the writer. When a snapshot outgrows the capacity, the
+publisher writes a larger file, renames it over the path and flags the old file
+as retired; readers then reopen the path.
+
+Python cannot issue memory barriers; this relies on the in-order stores of
+mmap slice assignment, which holds on x86-64 and in practice on arm64.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import mmap
+import os
+import struct
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from .types import (
+    AreaState,
+    ArmMode,
+    Elke27Event,
+    OutputDefinition,
+    OutputState,
+    PanelInfo,
+    PanelSnapshot,
+    TableInfo,
+    ZoneDefinition,
+    ZoneState,
+)
+
+MAGIC = b"E27SNAP\x00"
+LAYOUT_VERSION = 1
+HEADER_SIZE = 64
+DEFAULT_CAPACITY = 64 * 1024
+FLAG_RETIRED = 1
+
+# magic, layout version, flags, capacity, seq, payload length, snapshot version, published_at
+_HEADER = struct.Struct("<8sHHIQIxxxxQd")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 16
+_FLAGS_OFFSET = 10
+
+
+class SnapshotReadError(RuntimeError):
+    """Raised when a shared snapshot file is invalid or cannot be read consistently."""
+
+
+# --------------------------
+# Compact encoding
+# --------------------------
+
+_NONE_INT = -(2**31)
+_NONE_STR = 0xFFFF
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_U16 = struct.Struct("<H")
+_SNAPSHOT_HEAD = struct.Struct("<Qq")  # version, updated_at in microseconds
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+_ENTITY_HEAD = struct.Struct("<IH")  # entity id, packed tri-state flags
+
+
+def _tri(value: bool | None) -> int:
+    return 0 if value is None else (2 if value else 1)
+
+
+def _untri(bits: int) -> bool | None:
+    return None if bits == 0 else bits == 2
+
+
+def _pack_flags(*values: bool | None) -> int:
+    packed = 0
+    for index, value in enumerate(values):
+        packed |= _tri(value) << (2 * index)
+    return packed
+
+
+def _unpack_flags(packed: int, count: int) -> list[bool | None]:
+    return [_untri((packed >> (2 * index)) & 3) for index in range(count)]
+
+
+class _Writer:
+    __slots__ = ("parts",)
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+
+    def text(self, value: str | None) -> None:
+        if value is None:
+            self.parts.append(_U16.pack(_NONE_STR))
+            return
+        raw = value.encode("utf-8")[: _NONE_STR - 1]
+        self.parts.append(_U16.pack(len(raw)))
+        self.parts.append(raw)
+
+    def number(self, value: int | None) -> None:
+        self.parts.append(_I32.pack(_NONE_INT if value is None else value))
+
+    def count(self, value: int) -> None:
+        self.parts.append(_U32.pack(value))
+
+    def entity(self, entity_id: int, flags: int) -> None:
+        self.parts.append(_ENTITY_HEAD.pack(entity_id, flags))
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple[int, ...]:
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def text(self) -> str | None:
+        (length,) = self.unpack(_U16)
+        if length == _NONE_STR:
+            return None
+        raw = self.data[self.pos : self.pos + length]
+        self.pos += length
+        return raw.decode("utf-8")
+
+    def number(self) -> int | None:
+        (value,) = self.unpack(_I32)
+        return None if value == _NONE_INT else value
+
+    def count(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def entity(self) -> tuple[int, int]:
+        entity_id, flags = self.unpack(_ENTITY_HEAD)
+        return entity_id, flags
+
+
+def encode_snapshot(snapshot: PanelSnapshot) -> bytes:
+    w = _Writer()
+    updated_at = snapshot.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=UTC)
+    w.parts.append(_SNAPSHOT_HEAD.pack(snapshot.version, (updated_at - _EPOCH) // _MICROSECOND))
+    panel = snapshot.panel
+    for text in (panel.mac, panel.model, panel.firmware, panel.serial):
+        w.text(text)
+    table = snapshot.table_info
+    for number in (table.areas, table.zones, table.outputs, table.tstats):
+        w.number(number)
+
+    w.count(len(snapshot.areas))
+    for area in snapshot.areas.values():
+        w.entity(area.area_id, _pack_flags(area.ready, area.alarm_active, area.chime, area.pending))
+        w.text(area.name)
+        w.text(area.arm_mode.value if area.arm_mode is not None else None)
+    w.count(len(snapshot.zones))
+    for zone in snapshot.zones.values():
+        flags = _pack_flags(
+            zone.open,
+            zone.bypassed,
+            zone.trouble,
+            zone.alarm,
+            zone.tamper,
+            zone.low_battery,
+            zone.pending,
+        )
+        w.entity(zone.zone_id, flags)
+        w.text(zone.name)
+    w.count(len(snapshot.zone_definitions))
+    for definition in snapshot.zone_definitions.values():
+        w.entity(definition.zone_id, 0)
+        for text in (definition.name, definition.definition, definition.zone_type, definition.kind):
+            w.text(text)
+    w.count(len(snapshot.outputs))
+    for output in snapshot.outputs.values():
+        w.entity(output.output_id, _pack_flags(output.state, output.pending))
+        w.text(output.name)
+    w.count(len(snapshot.output_definitions))
+    for output_definition in snapshot.output_definitions.values():
+        w.entity(output_definition.output_id, 0)
+        w.text(output_definition.name)
+    return b"".join(w.parts)
+
+
+def decode_snapshot(data: bytes) -> PanelSnapshot:
+    r = _Reader(data)
+    version, updated_us = r.unpack(_SNAPSHOT_HEAD)
+    panel = PanelInfo(mac=r.text(), model=r.text(), firmware=r.text(), serial=r.text())
+    table_info = TableInfo(
+        areas=r.number(), zones=r.number(), outputs=r.number(), tstats=r.number()
+    )
+
+    areas: dict[int, AreaState] = {}
+    for _ in range(r.count()):
+        area_id, flags = r.entity()
+        ready, alarm_active, chime, pending = _unpack_flags(flags, 4)
+        name = r.text()
+        arm_mode = r.text()
+        areas[area_id] = AreaState(
+            area_id=area_id,
+            name=name,
+            arm_mode=ArmMode(arm_mode) if arm_mode is not None else None,
+            ready=ready,
+            alarm_active=alarm_active,
+            chime=chime,
+            pending=bool(pending),
+        )
+    zones: dict[int, ZoneState] = {}
+    for _ in range(r.count()):
+        zone_id, flags = r.entity()
+        is_open, bypassed, trouble, alarm, tamper, low_battery, pending = _unpack_flags(flags, 7)
+        zones[zone_id] = ZoneState(
+            zone_id=zone_id,
+            name=r.text(),
+            open=is_open,
+            bypassed=bypassed,
+            trouble=trouble,
+            alarm=alarm,
+            tamper=tamper,
+            low_battery=low_battery,
+            pending=bool(pending),
+        )
+    zone_definitions: dict[int, ZoneDefinition] = {}
+    for _ in range(r.count()):
+        zone_id, _flags = r.entity()
+        zone_definitions[zone_id] = ZoneDefinition(
+            zone_id=zone_id, name=r.text(), definition=r.text(), zone_type=r.text(), kind=r.text()
+        )
+    outputs: dict[int, OutputState] = {}
+    for _ in range(r.count()):
+        output_id, flags = r.entity()
+        state, pending = _unpack_flags(flags, 2)
+        outputs[output_id] = OutputState(
+            output_id=output_id, name=r.text(), state=state, pending=bool(pending)
+        )
+    output_definitions: dict[int, OutputDefinition] = {}
+    for _ in range(r.count()):
+        output_id, _flags = r.entity()
+        output_definitions[output_id] = OutputDefinition(output_id=output_id, name=r.text())
+    return PanelSnapshot(
+        panel=panel,
+        table_info=table_info,
+        areas=areas,
+        zones=zones,
+        zone_definitions=zone_definitions,
+        outputs=outputs,
+        output_definitions=output_definitions,
+        version=version,
+        updated_at=_EPOCH + updated_us * _MICROSECOND,
+    )
+
+
+# --------------------------
+# Publisher
+# --------------------------
+
+
+def _create_file(path: Path, capacity: int, mode: int) -> tuple[int, mmap.mmap]:
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        # An existing file keeps its old mode through O_CREAT; set it explicitly.
+        os.fchmod(fd, mode)
+        os.ftruncate(fd, HEADER_SIZE + capacity)
+        mm = mmap.mmap(fd, HEADER_SIZE + capacity, access=mmap.ACCESS_WRITE)
+    except OSError:
+        os.close(fd)
+        raise
+    mm[: _HEADER.size] = _HEADER.pack(MAGIC, LAYOUT_VERSION, 0, capacity, 0, 0, 0, 0.0)
+    return fd, mm
+
+
+class SnapshotPublisher:
+    """
+    Single writer for a shared snapshot file. Not thread-safe: call publish()
+    from one thread (attach() publishes on the client's event loop).
+
+    The file exposes arm mode and zone state, so it is owner-only (0o600) by
+    default; pass mode=0o640 to let a reader group open it.
+    """
+
+    def __init__(
+        self, path: str | Path, *, capacity: int = DEFAULT_CAPACITY, mode: int = 0o600
+    ) -> None:
+        self.path = Path(path)
+        self.mode = mode
+        self._capacity = max(1024, capacity)
+        self._fd, self._mm = _create_file(self.path, self._capacity, mode)
+        self._seq = 0
+        self.published_version: int | None = None
+        self.publishes = 0
+        self.resizes = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def publish(self, snapshot: PanelSnapshot) -> None:
+        payload = encode_snapshot(snapshot)
+        if len(payload) > self._capacity:
+            self._grow(len(payload))
+        mm = self._mm
+        self._seq += 1  # odd: write in progress
+        mm[_SEQ_OFFSET : _SEQ_OFFSET + 8] = _SEQ.pack(self._seq)
+        mm[HEADER_SIZE : HEADER_SIZE + len(payload)] = payload
+        mm[_SEQ_OFFSET + 8 : _HEADER.size] = struct.pack(
+            "<IxxxxQd", len(payload), snapshot.version, time.time()
+        )
+        self._seq += 1
+        mm[_SEQ_OFFSET : _SEQ_OFFSET + 8] = _SEQ.pack(self._seq)
+        self.published_version = snapshot.version
+        self.publishes += 1
+
+    def attach(self, client: object) -> Callable[[], bool]:
+        """
+        Publish client.snapshot now and after every event that bumps its version.
+        client is an Elke27Client (or anything with .snapshot and .subscribe()).
+        Returns the unsubscribe callable.
+        """
+        scheduled = False
+
+        def flush() -> None:
+            nonlocal scheduled
+            scheduled = False
+            snapshot: PanelSnapshot = client.snapshot  # type: ignore[attr-defined]
+            if snapshot.version != self.published_version:
+                self.publish(snapshot)
+
+        def on_event(_event: Elke27Event) -> None:
+            nonlocal scheduled
+            if scheduled:
+                return
+            scheduled = True
+            asyncio.get_running_loop().call_soon(flush)
+
+        flush()
+        return client.subscribe(on_event)  # type: ignore[attr-defined,no-any-return]
+
+    def close(self, *, unlink: bool = False) -> None:
+        self._mm.close()
+        os.close(self._fd)
+        if unlink:
+            with contextlib.suppress(OSError):
+                self.path.unlink()
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        fd, mm = _create_file(tmp_path, capacity, self.mode)
+        os.replace(tmp_path, self.path)
+        old_fd, old_mm = self._fd, self._mm
+        old_mm[_FLAGS_OFFSET : _FLAGS_OFFSET + 2] = struct.pack("<H", FLAG_RETIRED)
+        old_mm.close()
+        os.close(old_fd)
+        self._fd, self._mm, self._capacity = fd, mm, capacity
+        self._seq = 0
+        self.resizes += 1
+
+
+# --------------------------
+# Reader
+# --------------------------
+
+
+class SnapshotReader:
+    """
+    Read-only view of a file written by SnapshotPublisher. Safe to use from any
+    process; each reader is single-threaded.
+    """
+
+    def __init__(self, path: str | Path, *, max_retries: int = 1000) -> None:
+        self.path = Path(path)
+        self._max_retries = max_retries
+        self._mm: mmap.mmap | None = None
+        self._open()
+
+    def _open(self) -> None:
+        self.close()
+        with open(self.path, "rb") as file:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, layout, _flags, capacity, *_rest = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or layout != LAYOUT_VERSION or len(mm) < HEADER_SIZE + capacity:
+            mm.close()
+            raise SnapshotReadError(f"{self.path} is not a shared snapshot file.")
+        self._mm = mm
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self) -> SnapshotReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _mapping(self) -> mmap.mmap:
+        assert self._mm is not None
+        if _U16.unpack_from(self._mm, _FLAGS_OFFSET)[0] & FLAG_RETIRED:
+            self._open()
+        assert self._mm is not None
+        return self._mm
+
+    @property
+    def version(self) -> int | None:
+        """Snapshot version last published (cheap; does not decode)."""
+        payload = self.read_payload()
+        return None if payload is None else payload[0]
+
+    def read_payload(self) -> tuple[int, bytes] | None:
+        """(snapshot version, encoded payload) from a consistent read, or None if unpublished."""
+        for attempt in range(self._max_retries):
+            if attempt:
+                # Yield to a writer caught mid-publish, then back off a little.
+                time.sleep(0 if attempt < 16 else 0.0005)
+            mm = self._mapping()
+            (seq_before,) = _SEQ.unpack_from(mm, _SEQ_OFFSET)
+            if seq_before & 1:
+                continue
+            _magic, _layout, flags, capacity, _seq, length, version, _at = _HEADER.unpack_from(
+                mm, 0
+            )
+            if flags & FLAG_RETIRED or length > capacity:
+                continue
+            payload = mm[HEADER_SIZE : HEADER_SIZE + length]
+            (seq_after,) = _SEQ.unpack_from(mm, _SEQ_OFFSET)
+            if seq_before == seq_after:
+                return (version, payload) if seq_before else None
+        raise SnapshotReadError(f"No consistent snapshot after {self._max_retries} attempts.")
+
+    def read(self) -> PanelSnapshot | None:
+        """The latest published snapshot, or None before the first publish."""
+        payload = self.read_payload()
+        return None if payload is None else decode_snapshot(payload[1])
+
+    def read_if_newer(self, version: int | None) -> PanelSnapshot | None:
+        """Decode only when the published version differs from version."""
+        payload = self.read_payload()
+        if payload is None or payload[0] == version:
+            return None
+        return decode_snapshot(payload[1])
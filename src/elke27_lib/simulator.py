@@ -0,0 +1,543 @@
+"""
+elke27_lib/simulator.py
+
+In-process E27 panel simulator: an asyncio TCP server speaking the E27 wire
+protocol end to end, for load, latency and reconnect testing without a panel.
+
+Implemented:
+- HELLO (cleartext, unframed): session_id plus sk/shm encrypted with the link key
+- Schema-0 framing and AES envelope for every message after HELLO
+- system.r_u_alive, control.authenticate / authenticate
+- <domain>.get_table_info, paged <domain>.get_configured, <domain>.get_attribs
+- zone.get_defs, zone/area/output get_status, get_all_zones_status,
+  get_all_outputs_status
+- area.set_arm_state, zone.set_status (bypass), output.set_status, each followed
+  by a status broadcast (seq 0) to every connected session
+- Optional periodic zone violated/normal broadcasts
+
+The panel is modelled as serial: each session's requests are answered one at a
+time after latency_s + uniform(0, jitter_s). A dropped reply (drop_rate) still
+applies the command, as when a reply is lost on the wire. Unknown routes are
+answered with error_code 0 and an empty payload.
+
+The simulator runs on the caller's event loop. Session and E27Kernel do their
+blocking socket I/O in worker threads (or through the loop's selector with
+loop_io), so a client can connect to a simulator on the same loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+from collections import Counter
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from .const import E27ErrorCode
+from .framing import DeframeState, deframe_feed, frame_build
+from .linking import recv_cleartext_json_objects_from_bytes
+from .presentation import (
+    decrypt_schema0_envelope,
+    encrypt_key_field_with_linkkey,
+    encrypt_schema0_envelope,
+)
+from .types import LinkKeys
+
+LOG = logging.getLogger(__name__)
+
+# Link key the simulator expects by default (pass SIMULATOR_LINK_KEYS to async_connect).
+SIMULATOR_LINK_KEY_HEX = "00112233445566778899aabbccddeeff"
+SIMULATOR_LINK_KEYS = LinkKeys(
+    tempkey_hex="00" * 16,
+    linkkey_hex=SIMULATOR_LINK_KEY_HEX,
+    linkhmac_hex="00" * 32,
+)
+
+_ZONE_DEFINITIONS: tuple[str, ...] = (
+    "BURGLAR_PERIMETER_INSTANT",
+    "BURGLAR_ENTRY_EXIT_1",
+    "BURGLAR_INTERIOR",
+    "FIRE",
+)
+_HELLO_MAX_BYTES = 4096
+
+Reply = dict[str, Any]
+RouteHandler = Callable[[int, str, str, Mapping[str, Any]], Reply]
+
+
+@dataclass(frozen=True, slots=True)
+class PanelSimulatorConfig:
+    """Simulated panel size and link behaviour."""
+
+    link_key_hex: str = SIMULATOR_LINK_KEY_HEX
+    areas: int = 2
+    zones: int = 16
+    outputs: int = 4
+    users: int = 4
+    keypads: int = 1
+    # Entity ids per get_configured page.
+    configured_block_size: int = 16
+    latency_s: float = 0.0
+    jitter_s: float = 0.0
+    # Probability that a reply is not sent (the request is still applied).
+    drop_rate: float = 0.0
+    # Interval between simulated zone activity broadcasts; None disables them.
+    broadcast_interval_s: float | None = None
+    table_csm: int = 1
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class PanelSimulatorStats:
+    """Counters since the simulator started."""
+
+    connections: int = 0
+    requests: int = 0
+    replies: int = 0
+    dropped: int = 0
+    broadcasts: int = 0
+    by_route: Counter[str] = field(default_factory=lambda: Counter[str]())
+
+
+class _SimSession:
+    """One connected client: HELLO state, envelope keys and the serial request queue."""
+
+    def __init__(self, writer: asyncio.StreamWriter, session_id: int) -> None:
+        self.writer = writer
+        self.session_id = session_id
+        self.session_key = b""
+        self.envelope_seq = 1
+        self.requests: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+
+class PanelSimulator:
+    """
+    Local E27 panel stand-in.
+
+    Typical usage:
+        async with PanelSimulator(PanelSimulatorConfig(zones=208)) as sim:
+            await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+
+    Panel size is fixed at construction. Link behaviour (latency, jitter, drop rate)
+    is read per request, so tests may swap .config with dataclasses.replace() while
+    sessions are connected.
+    """
+
+    def __init__(self, config: PanelSimulatorConfig | None = None) -> None:
+        self.config = config or PanelSimulatorConfig()
+        self.stats = PanelSimulatorStats()
+        self._rng = random.Random(self.config.seed)
+        self._server: asyncio.Server | None = None
+        self._sessions: set[_SimSession] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._next_session_id = 1
+        self.host = "127.0.0.1"
+        self.port = 0
+
+        cfg = self.config
+        self.counts: dict[str, int] = {
+            "area": cfg.areas,
+            "zone": cfg.zones,
+            "output": cfg.outputs,
+            "user": cfg.users,
+            "keypad": cfg.keypads,
+            "tstat": 0,
+        }
+        self.arm_states: dict[int, str] = dict.fromkeys(range(1, cfg.areas + 1), "DISARMED")
+        self.zone_violated: dict[int, bool] = dict.fromkeys(range(1, cfg.zones + 1), False)
+        self.zone_bypassed: dict[int, bool] = dict.fromkeys(range(1, cfg.zones + 1), False)
+        self.outputs_on: dict[int, bool] = dict.fromkeys(range(1, cfg.outputs + 1), False)
+
+        self._routes: dict[tuple[str, str], RouteHandler] = {
+            ("system", "r_u_alive"): _reply_ok,
+            ("control", "authenticate"): _reply_ok,
+            ("zone", "get_defs"): self._zone_get_defs,
+            ("area", "get_status"): self._area_get_status,
+            ("zone", "get_status"): self._zone_get_status,
+            ("output", "get_status"): self._output_get_status,
+            ("zone", "get_all_zones_status"): self._zone_get_all_status,
+            ("output", "get_all_outputs_status"): self._output_get_all_status,
+            ("area", "set_arm_state"): self._area_set_arm_state,
+            ("zone", "set_status"): self._zone_set_status,
+            ("output", "set_status"): self._output_set_status,
+        }
+
+    async def __aenter__(self) -> PanelSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening; port 0 picks a free port (see .port)."""
+        if self._server is not None:
+            return
+        self._server = await asyncio.start_server(self._serve, host, port)
+        sockname = self._server.sockets[0].getsockname()
+        self.host, self.port = sockname[0], sockname[1]
+        if self.config.broadcast_interval_s is not None:
+            self._spawn(self._broadcast_loop(self.config.broadcast_interval_s))
+        LOG.debug("Panel simulator listening on %s:%s", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Close every session and stop listening."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        self.disconnect_all()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if server is not None:
+            await server.wait_closed()
+
+    def disconnect_all(self) -> None:
+        """Drop every connected session (TCP close), as a panel reboot would."""
+        for sess in list(self._sessions):
+            sess.writer.close()
+
+    def broadcast_zone(self, zone_id: int, *, violated: bool) -> None:
+        """Change a zone's violated state and broadcast its status to every session."""
+        self.zone_violated[zone_id] = violated
+        self._broadcast({"zone": {"get_status": self._zone_status(zone_id)}})
+
+    # --------------------------
+    # Connection handling
+    # --------------------------
+
+    def _spawn(self, coro: Any) -> asyncio.Task[None]:
+        task = cast(asyncio.Task[None], asyncio.get_running_loop().create_task(coro))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats.connections += 1
+        sess = _SimSession(writer, self._next_session_id)
+        self._next_session_id += 1
+        responder: asyncio.Task[None] | None = None
+        try:
+            if not await self._hello(reader, sess):
+                return
+            self._sessions.add(sess)
+            responder = self._spawn(self._respond_loop(sess))
+            deframe = DeframeState()
+            while True:
+                chunk = await reader.read(4096)
+                if not chunk:
+                    return
+                for result in deframe_feed(deframe, chunk):
+                    if result.ok and result.frame_no_crc is not None:
+                        self._accept_frame(sess, result.frame_no_crc)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            self._sessions.discard(sess)
+            if responder is not None:
+                responder.cancel()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _hello(self, reader: asyncio.StreamReader, sess: _SimSession) -> bool:
+        buf = b""
+        while True:
+            chunk = await reader.read(_HELLO_MAX_BYTES)
+            if not chunk:
+                return False
+            buf += chunk
+            try:
+                objs = recv_cleartext_json_objects_from_bytes(buf)
+            except ValueError:
+                if len(buf) > _HELLO_MAX_BYTES:
+                    return False
+                continue
+            if any("hello" in obj for obj in objs):
+                break
+        session_key = self._randbytes(16)
+        link_key = self.config.link_key_hex
+        reply = {
+            "hello": {
+                "session_id": sess.session_id,
+                "sk": encrypt_key_field_with_linkkey(linkkey_hex=link_key, plaintext=session_key),
+                "shm": encrypt_key_field_with_linkkey(
+                    linkkey_hex=link_key, plaintext=self._randbytes(32)
+                ),
+                "error_code": E27ErrorCode.ELKERR_NONE,
+            }
+        }
+        sess.session_key = session_key
+        sess.writer.write(json.dumps(reply, separators=(",", ":")).encode("utf-8"))
+        await sess.writer.drain()
+        return True
+
+    def _accept_frame(self, sess: _SimSession, frame_no_crc: bytes) -> None:
+        try:
+            env = decrypt_schema0_envelope(
+                protocol_byte=frame_no_crc[0],
+                ciphertext=frame_no_crc[3:],
+                session_key=sess.session_key,
+            )
+            obj = json.loads(env.payload.decode("utf-8"))
+        except Exception as e:  # noqa: BLE001
+            LOG.warning("Simulator dropping undecodable frame: %s", e)
+            return
+        if isinstance(obj, dict):
+            sess.requests.put_nowait(cast(dict[str, Any], obj))
+
+    async def _respond_loop(self, sess: _SimSession) -> None:
+        while True:
+            msg = await sess.requests.get()
+            cfg = self.config
+            delay = cfg.latency_s + (self._rng.uniform(0.0, cfg.jitter_s) if cfg.jitter_s else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            reply = self.handle_request(msg, session_id=sess.session_id)
+            if reply is None:
+                continue
+            if cfg.drop_rate and self._rng.random() < cfg.drop_rate:
+                self.stats.dropped += 1
+                continue
+            self._send(sess, reply)
+            self.stats.replies += 1
+
+    def _send(self, sess: _SimSession, obj: Mapping[str, Any]) -> None:
+        if sess.writer.is_closing():
+            return
+        payload = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        proto, ciphertext = encrypt_schema0_envelope(
+            payload=payload,
+            session_key=sess.session_key,
+            src=0,
+            dest=1,
+            envelope_seq=sess.envelope_seq,
+        )
+        sess.envelope_seq = sess.envelope_seq + 1 if sess.envelope_seq < 0x7FFFFFFF else 1
+        sess.writer.write(frame_build(protocol_byte=proto, data_frame=ciphertext))
+
+    def _broadcast(self, body: Mapping[str, Any]) -> None:
+        for sess in list(self._sessions):
+            self._send(sess, {"seq": 0, "session_id": sess.session_id, **body})
+            self.stats.broadcasts += 1
+
+    async def _broadcast_loop(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            if not self.zone_violated:
+                continue
+            zone_id = self._rng.randint(1, len(self.zone_violated))
+            self.broadcast_zone(zone_id, violated=not self.zone_violated[zone_id])
+
+    def _randbytes(self, n: int) -> bytes:
+        if self.config.seed is None:
+            return os.urandom(n)
+        return self._rng.randbytes(n)
+
+    # --------------------------
+    # Request handling
+    # --------------------------
+
+    def handle_request(self, msg: Mapping[str, Any], *, session_id: int = 1) -> Reply | None:
+        """
+        Apply one decoded request to the panel model and return the reply object,
+        without any transport (used by elke27_lib.virtual_time). Broadcasts from
+        set commands still go to connected sessions only.
+        """
+        domain = next((key for key in msg if key not in ("seq", "session_id")), None)
+        if domain is None:
+            return None
+        body = msg[domain]
+        reply: Reply = {"seq": msg.get("seq"), "session_id": session_id}
+        if domain == "authenticate" or not isinstance(body, dict) or not body:
+            # Root-level command: the payload is the domain object itself.
+            self._count(domain, "__root__")
+            reply[domain] = {"error_code": E27ErrorCode.ELKERR_NONE}
+            return reply
+        name, params = next(iter(cast(dict[str, Any], body).items()))
+        self._count(domain, name)
+        params_map = cast(Mapping[str, Any], params) if isinstance(params, dict) else {}
+        handler = self._routes.get((domain, name))
+        if handler is None:
+            handler = self._generic_handler(name)
+        reply[domain] = {name: handler(session_id, domain, name, params_map)}
+        return reply
+
+    def _count(self, domain: str, name: str) -> None:
+        self.stats.requests += 1
+        self.stats.by_route[f"{domain}.{name}"] += 1
+
+    def _generic_handler(self, name: str) -> RouteHandler:
+        if name == "get_table_info":
+            return self._get_table_info
+        if name == "get_configured":
+            return self._get_configured
+        if name == "get_attribs":
+            return self._get_attribs
+        return _reply_ok
+
+    def _get_table_info(
+        self, _session_id: int, domain: str, _name: str, _params: Mapping[str, Any]
+    ) -> Reply:
+        return {
+            "table_elements": self.counts.get(domain, 0),
+            "increment_size": 1,
+            "table_csm": self.config.table_csm,
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _get_configured(
+        self, _session_id: int, domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        block_id, block_count, ids = self._page(
+            list(range(1, self.counts.get(domain, 0) + 1)), params
+        )
+        return {
+            "block_id": block_id,
+            "block_count": block_count,
+            f"{domain}s": ids,
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _get_attribs(
+        self, _session_id: int, domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        key = f"{domain}_id"
+        entity_id = params.get(key)
+        if not isinstance(entity_id, int) or not 1 <= entity_id <= self.counts.get(domain, 0):
+            return {key: entity_id, "error_code": E27ErrorCode.ELKERR_INVALID_PARAM}
+        return {
+            key: entity_id,
+            "name": f"{domain.capitalize()} {entity_id}",
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _zone_get_defs(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        block_id, block_count, defs = self._page(list(_ZONE_DEFINITIONS), params)
+        return {
+            "block_id": block_id,
+            "block_count": block_count,
+            "definitions": defs,
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _page(self, items: list[Any], params: Mapping[str, Any]) -> tuple[int, int, list[Any]]:
+        size = max(1, self.config.configured_block_size)
+        block_count = max(1, -(-len(items) // size))
+        block_id = params.get("block_id")
+        if not isinstance(block_id, int) or not 1 <= block_id <= block_count:
+            block_id = 1
+        start = (block_id - 1) * size
+        return block_id, block_count, items[start : start + size]
+
+    def _area_status(self, area_id: int) -> Reply:
+        return {
+            "area_id": area_id,
+            "arm_state": self.arm_states.get(area_id, "DISARMED"),
+            "ready": not any(self.zone_violated.values()),
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _zone_status(self, zone_id: int) -> Reply:
+        return {
+            "zone_id": zone_id,
+            "enabled": True,
+            "violated": self.zone_violated.get(zone_id, False),
+            "bypassed": self.zone_bypassed.get(zone_id, False),
+            "trouble": False,
+            "tamper": False,
+            "alarm": False,
+            "low_batt": False,
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _output_status(self, output_id: int) -> Reply:
+        return {
+            "output_id": output_id,
+            "status": "ON" if self.outputs_on.get(output_id, False) else "OFF",
+            "error_code": E27ErrorCode.ELKERR_NONE,
+        }
+
+    def _area_get_status(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        return self._area_status(_int_param(params, "area_id"))
+
+    def _zone_get_status(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        return self._zone_status(_int_param(params, "zone_id"))
+
+    def _output_get_status(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        return self._output_status(_int_param(params, "output_id"))
+
+    def _zone_get_all_status(
+        self, _session_id: int, _domain: str, _name: str, _params: Mapping[str, Any]
+    ) -> Reply:
+        chars = [
+            "D" if self.zone_bypassed[zone_id] else "9" if self.zone_violated[zone_id] else "1"
+            for zone_id in sorted(self.zone_violated)
+        ]
+        return {"status": "".join(chars), "error_code": E27ErrorCode.ELKERR_NONE}
+
+    def _output_get_all_status(
+        self, _session_id: int, _domain: str, _name: str, _params: Mapping[str, Any]
+    ) -> Reply:
+        chars = ["1" if self.outputs_on[i] else "0" for i in sorted(self.outputs_on)]
+        return {"status": "".join(chars), "error_code": E27ErrorCode.ELKERR_NONE}
+
+    def _area_set_arm_state(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        area_id = _int_param(params, "area_id")
+        arm_state = params.get("arm_state")
+        if area_id not in self.arm_states or not isinstance(arm_state, str):
+            return {"area_id": area_id, "error_code": E27ErrorCode.ELKERR_INVALID_PARAM}
+        self.arm_states[area_id] = arm_state
+        self._broadcast({"area": {"get_status": self._area_status(area_id)}})
+        return {"area_id": area_id, "error_code": E27ErrorCode.ELKERR_NONE}
+
+    def _zone_set_status(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        zone_id = _int_param(params, "zone_id")
+        bypassed = params.get("BYPASSED", params.get("bypassed"))
+        if zone_id not in self.zone_bypassed or not isinstance(bypassed, bool):
+            return {"zone_id": zone_id, "error_code": E27ErrorCode.ELKERR_INVALID_PARAM}
+        self.zone_bypassed[zone_id] = bypassed
+        self._broadcast({"zone": {"get_status": self._zone_status(zone_id)}})
+        return {"zone_id": zone_id, "error_code": E27ErrorCode.ELKERR_NONE}
+
+    def _output_set_status(
+        self, _session_id: int, _domain: str, _name: str, params: Mapping[str, Any]
+    ) -> Reply:
+        output_id = _int_param(params, "output_id")
+        status = params.get("status")
+        if output_id not in self.outputs_on or status not in ("ON", "OFF"):
+            return {"output_id": output_id, "error_code": E27ErrorCode.ELKERR_INVALID_PARAM}
+        self.outputs_on[output_id] = status == "ON"
+        self._broadcast({"output": {"get_status": self._output_status(output_id)}})
+        return {"output_id": output_id, "error_code": E27ErrorCode.ELKERR_NONE}
+
+
+def _reply_ok(_session_id: int, _domain: str, _name: str, _params: Mapping[str, Any]) -> Reply:
+    return {"error_code": E27ErrorCode.ELKERR_NONE}
+
+
+def _int_param(params: Mapping[str, Any], key: str) -> int:
+    value = params.get(key)
+    return value if isinstance(value, int) else 0
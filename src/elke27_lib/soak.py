@@ -0,0 +1,454 @@
+"""
+elke27_lib/soak.py
+
+Compressed-time soak harness.
+
+Runs an Elke27Client on a VirtualTimeLoop against a VirtualPanel for a simulated
+day (or any duration) of traffic, in minutes of wall time:
+
+- background zone activity broadcasts, plus periodic broadcast storms
+- user commands (output toggles, zone status reads) with measured latency
+- dropped replies (reply timeouts, keepalive misses)
+- TCP resets, after which the harness reconnects the client like an
+  integration would
+
+Every sample_interval_s the harness samples process RSS, the kernel event
+deque (_events), in-progress paged transfers, PendingResponseManager and
+dispatcher pending counts, live asyncio tasks and the command latency of the
+window. At the end it disconnects the client and lists tasks still alive.
+
+SoakReport.violations lists every bound that was exceeded:
+- RSS growth since the first sample above max_rss_growth_bytes
+- any sampled count above its max_* bound
+- late command latency (p90 of the last quarter of the run) more than
+  max_latency_drift times the early latency (first quarter)
+- tasks left running after disconnect
+
+    python -m elke27_lib.soak --hours 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from .client import Elke27Client
+from .errors import Elke27Error
+from .simulator import PanelSimulatorConfig
+from .types import ClientConfig
+from .virtual_time import (
+    VIRTUAL_LINK_KEYS,
+    LatencySummary,
+    VirtualPanel,
+    run_virtual,
+)
+
+LOG = logging.getLogger(__name__)
+
+_PANEL_HOST = "virtual"
+_PANEL_PORT = 2101
+
+
+@dataclass(frozen=True, slots=True)
+class SoakConfig:
+    """Simulated traffic and the bounds a soak run is checked against."""
+
+    duration_s: float = 86_400.0
+    sample_interval_s: float = 600.0
+    panel: PanelSimulatorConfig = field(
+        default_factory=lambda: PanelSimulatorConfig(areas=2, zones=64, outputs=8)
+    )
+    client_config: ClientConfig = field(default_factory=ClientConfig)
+    # Panel link behaviour.
+    latency_s: float = 0.03
+    jitter_s: float = 0.02
+    drop_rate: float = 0.002
+    # Mean gap between single zone broadcasts.
+    broadcast_interval_s: float = 10.0
+    # Mean gap between broadcast storms (None disables them) and their shape.
+    storm_interval_s: float | None = 3_600.0
+    storm_broadcasts: int = 500
+    storm_spacing_s: float = 0.002
+    # Mean gap between TCP resets (None disables them).
+    reset_interval_s: float | None = 14_400.0
+    reconnect_delay_s: float = 5.0
+    # Mean gap between user commands.
+    command_interval_s: float = 60.0
+    # Bounds.
+    max_rss_growth_bytes: int = 64 * 1024 * 1024
+    max_kernel_events: int = 10_000
+    max_paged_transfers: int = 8
+    max_pending_responses: int = 64
+    max_tasks: int = 64
+    max_latency_drift: float = 3.0
+    seed: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class SoakSample:
+    at: float
+    rss_bytes: int | None
+    kernel_events: int
+    paged_transfers: int
+    pending_responses: int
+    dispatcher_pending: int
+    tasks: int
+    connected: bool
+    commands_ok: int
+    commands_failed: int
+    # Command latency in the window since the previous sample.
+    latency: LatencySummary | None
+
+
+@dataclass(frozen=True, slots=True)
+class SoakReport:
+    config: SoakConfig
+    samples: tuple[SoakSample, ...]
+    violations: tuple[str, ...]
+    leaked_tasks: tuple[str, ...]
+    simulated_s: float
+    wall_s: float
+    commands_ok: int
+    commands_failed: int
+    reconnects: int
+    resets: int
+    storms: int
+    broadcasts: int
+    replies_dropped: int
+    early_latency: LatencySummary | None
+    late_latency: LatencySummary | None
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    @property
+    def latency_drift(self) -> float | None:
+        """Late p90 command latency over early p90 (None without both windows)."""
+        if self.early_latency is None or self.late_latency is None:
+            return None
+        if self.early_latency.p90_s <= 0:
+            return None
+        return self.late_latency.p90_s / self.early_latency.p90_s
+
+    def format(self) -> str:
+        """Human-readable summary."""
+
+        def peak(attr: str) -> int:
+            return max((getattr(sample, attr) for sample in self.samples), default=0)
+
+        rss = [sample.rss_bytes for sample in self.samples if sample.rss_bytes is not None]
+        drift = self.latency_drift
+        lines = [
+            f"simulated {self.simulated_s / 3600.0:.1f} h in {self.wall_s:.1f} s wall "
+            f"({len(self.samples)} samples)",
+            f"commands ok={self.commands_ok} failed={self.commands_failed} "
+            f"reconnects={self.reconnects} resets={self.resets} storms={self.storms} "
+            f"broadcasts={self.broadcasts} replies_dropped={self.replies_dropped}",
+            f"peak kernel_events={peak('kernel_events')} paged_transfers={peak('paged_transfers')} "
+            f"pending_responses={peak('pending_responses')} tasks={peak('tasks')}",
+        ]
+        if rss:
+            lines.append(
+                f"rss first={rss[0] / 2**20:.1f} MiB max={max(rss) / 2**20:.1f} MiB "
+                f"last={rss[-1] / 2**20:.1f} MiB"
+            )
+        if drift is not None and self.early_latency and self.late_latency:
+            lines.append(
+                f"command p90 early={self.early_latency.p90_s * 1000:.1f} ms "
+                f"late={self.late_latency.p90_s * 1000:.1f} ms drift={drift:.2f}x"
+            )
+        lines.extend(f"VIOLATION {violation}" for violation in self.violations)
+        lines.append("OK" if self.ok else "FAILED")
+        return "\n".join(lines)
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SoakHarness:
+    """One soak run of SoakConfig."""
+
+    def __init__(self, config: SoakConfig | None = None) -> None:
+        self.config = config or SoakConfig()
+        cfg = self.config
+        self.panel = VirtualPanel(
+            cfg.panel,
+            latency_s=cfg.latency_s,
+            jitter_s=cfg.jitter_s,
+            drop_rate=cfg.drop_rate,
+            seed=cfg.seed,
+        )
+        self._rng = random.Random(cfg.seed + 1)
+        self._client: Elke27Client | None = None
+        self._samples: list[SoakSample] = []
+        self._latencies: list[tuple[float, float]] = []
+        self._window_latencies: list[float] = []
+        self._window_ok = 0
+        self._window_failed = 0
+        self._commands_ok = 0
+        self._commands_failed = 0
+        self._reconnects = 0
+        self._storms = 0
+
+    @property
+    def client(self) -> Elke27Client:
+        if self._client is None:
+            raise RuntimeError("Soak run has not started.")
+        return self._client
+
+    def run(self) -> SoakReport:
+        """Run on a fresh VirtualTimeLoop and return the report."""
+        return run_virtual(self.run_async())
+
+    async def run_async(self) -> SoakReport:
+        loop = asyncio.get_running_loop()
+        cfg = self.config
+        wall_start = time.perf_counter()
+        started_at = loop.time()
+        client = Elke27Client(
+            cfg.client_config,
+            now_monotonic=loop.time,
+            session_factory=self.panel.session_factory,
+        )
+        self._client = client
+        await client.async_connect(_PANEL_HOST, _PANEL_PORT, VIRTUAL_LINK_KEYS)
+        await client.wait_ready(timeout_s=60.0)
+
+        workers = [
+            loop.create_task(self._broadcast_loop(), name="soak-broadcasts"),
+            loop.create_task(self._command_loop(), name="soak-commands"),
+            loop.create_task(self._reconnect_loop(), name="soak-reconnect"),
+        ]
+        if cfg.storm_interval_s is not None:
+            workers.append(loop.create_task(self._storm_loop(cfg.storm_interval_s)))
+        if cfg.reset_interval_s is not None:
+            workers.append(loop.create_task(self._reset_loop(cfg.reset_interval_s)))
+        own_tasks = {*workers, asyncio.current_task()}
+
+        self._sample(own_tasks)
+        deadline = started_at + cfg.duration_s
+        while loop.time() < deadline:
+            await asyncio.sleep(min(cfg.sample_interval_s, deadline - loop.time()))
+            self._sample(own_tasks)
+
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        try:
+            await client.async_disconnect()
+        except Elke27Error as exc:
+            LOG.warning("Soak disconnect failed: %s", exc)
+        # Give cancelled kernel/session workers a chance to finish.
+        await asyncio.sleep(1.0)
+        leaked = tuple(
+            sorted(task.get_name() for task in asyncio.all_tasks() if task not in own_tasks)
+        )
+        return self._report(loop.time() - started_at, time.perf_counter() - wall_start, leaked)
+
+    # Traffic
+
+    async def _broadcast_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._rng.expovariate(1.0 / self.config.broadcast_interval_s))
+            self.panel.broadcast_zone()
+
+    async def _storm_loop(self, interval_s: float) -> None:
+        cfg = self.config
+        while True:
+            await asyncio.sleep(self._rng.expovariate(1.0 / interval_s))
+            self._storms += 1
+            for _ in range(cfg.storm_broadcasts):
+                self.panel.broadcast_zone()
+                await asyncio.sleep(cfg.storm_spacing_s)
+
+    async def _reset_loop(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(self._rng.expovariate(1.0 / interval_s))
+            self.panel.reset()
+
+    async def _reconnect_loop(self) -> None:
+        client = self.client
+        while True:
+            await asyncio.sleep(self.config.reconnect_delay_s)
+            if client.state.panel.connected:
+                continue
+            try:
+                await client.async_connect(_PANEL_HOST, _PANEL_PORT, VIRTUAL_LINK_KEYS)
+            except Elke27Error as exc:
+                LOG.warning("Soak reconnect failed: %s", exc)
+                continue
+            self._reconnects += 1
+
+    async def _command_loop(self) -> None:
+        cfg = self.config
+        loop = asyncio.get_running_loop()
+        client = self.client
+        while True:
+            await asyncio.sleep(self._rng.expovariate(1.0 / cfg.command_interval_s))
+            if not client.state.panel.connected:
+                continue
+            started = loop.time()
+            try:
+                if self._rng.random() < 0.5:
+                    output_id = self._rng.randint(1, max(1, cfg.panel.outputs))
+                    await client.async_set_output(output_id, on=self._rng.random() < 0.5)
+                    ok = True
+                else:
+                    zone_id = self._rng.randint(1, max(1, cfg.panel.zones))
+                    result = await client.async_execute("zone_get_status", zone_id=zone_id)
+                    ok = result.ok
+            except Elke27Error:
+                ok = False
+            if ok:
+                elapsed = loop.time() - started
+                self._commands_ok += 1
+                self._window_ok += 1
+                self._window_latencies.append(elapsed)
+                self._latencies.append((started, elapsed))
+            else:
+                self._commands_failed += 1
+                self._window_failed += 1
+
+    # Sampling and checks
+
+    def _sample(self, own_tasks: set[asyncio.Task[object] | None]) -> None:
+        kernel = self.client._kernel
+        self._samples.append(
+            SoakSample(
+                at=kernel.now(),
+                rss_bytes=_rss_bytes(),
+                kernel_events=len(kernel._events),
+                paged_transfers=len(kernel.dispatcher._paged_transfers),
+                pending_responses=kernel.pending_responses.pending_count(),
+                dispatcher_pending=kernel.dispatcher.pending_count(),
+                tasks=sum(1 for task in asyncio.all_tasks() if task not in own_tasks),
+                connected=kernel.state.panel.connected,
+                commands_ok=self._window_ok,
+                commands_failed=self._window_failed,
+                latency=(
+                    LatencySummary.from_samples(self._window_latencies)
+                    if self._window_latencies
+                    else None
+                ),
+            )
+        )
+        self._window_latencies = []
+        self._window_ok = 0
+        self._window_failed = 0
+
+    def _latency_between(self, start: float, end: float) -> LatencySummary | None:
+        window = [elapsed for at, elapsed in self._latencies if start <= at < end]
+        return LatencySummary.from_samples(window) if window else None
+
+    def _report(self, simulated_s: float, wall_s: float, leaked: tuple[str, ...]) -> SoakReport:
+        cfg = self.config
+        samples = tuple(self._samples)
+        violations: list[str] = []
+
+        rss = [sample.rss_bytes for sample in samples if sample.rss_bytes is not None]
+        if rss and max(rss) - rss[0] > cfg.max_rss_growth_bytes:
+            violations.append(
+                f"rss grew {(max(rss) - rss[0]) / 2**20:.1f} MiB "
+                f"(limit {cfg.max_rss_growth_bytes / 2**20:.1f} MiB)"
+            )
+        for attr, limit in (
+            ("kernel_events", cfg.max_kernel_events),
+            ("paged_transfers", cfg.max_paged_transfers),
+            ("pending_responses", cfg.max_pending_responses),
+            ("tasks", cfg.max_tasks),
+        ):
+            worst = max(samples, key=lambda sample: getattr(sample, attr), default=None)
+            if worst is not None and getattr(worst, attr) > limit:
+                violations.append(
+                    f"{attr}={getattr(worst, attr)} at t={worst.at - samples[0].at:.0f}s "
+                    f"(limit {limit})"
+                )
+
+        start = samples[0].at if samples else 0.0
+        quarter = simulated_s / 4.0
+        early = self._latency_between(start, start + quarter)
+        late = self._latency_between(start + simulated_s - quarter, math.inf)
+        if early is not None and late is not None and early.p90_s > 0:
+            drift = late.p90_s / early.p90_s
+            if drift > cfg.max_latency_drift:
+                violations.append(
+                    f"command latency drift {drift:.2f}x (limit {cfg.max_latency_drift:.2f}x)"
+                )
+        if leaked:
+            violations.append(f"tasks left after disconnect: {', '.join(leaked)}")
+
+        return SoakReport(
+            config=cfg,
+            samples=samples,
+            violations=tuple(violations),
+            leaked_tasks=leaked,
+            simulated_s=simulated_s,
+            wall_s=wall_s,
+            commands_ok=self._commands_ok,
+            commands_failed=self._commands_failed,
+            reconnects=self._reconnects,
+            resets=self.panel.resets,
+            storms=self._storms,
+            broadcasts=self.panel.broadcasts,
+            replies_dropped=self.panel.replies_dropped,
+            early_latency=early,
+            late_latency=late,
+        )
+
+
+def run_soak(config: SoakConfig | None = None) -> SoakReport:
+    """Run one soak scenario on a fresh VirtualTimeLoop."""
+    return SoakHarness(config).run()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m elke27_lib.soak")
+    parser.add_argument("--hours", type=float, default=24.0, help="simulated duration")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zones", type=int, default=64)
+    parser.add_argument("--drop-rate", type=float, default=0.002)
+    parser.add_argument(
+        "--event-queue-maxlen",
+        type=int,
+        default=0,
+        help="ClientConfig.event_queue_maxlen (0 = unbounded, the library default)",
+    )
+    args = parser.parse_args(argv)
+    # Expected warnings (timeouts, resets) would flood the output.
+    logging.basicConfig(level=logging.CRITICAL)
+    config = SoakConfig(
+        duration_s=args.hours * 3600.0,
+        panel=PanelSimulatorConfig(areas=2, zones=args.zones, outputs=8),
+        client_config=ClientConfig(event_queue_maxlen=args.event_queue_maxlen),
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    report = run_soak(config)
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
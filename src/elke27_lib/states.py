@@ -12,11 +12,78 @@ Principles:
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from typing import ClassVar
 
 from elke27_lib.types import CsmSnapshot
 
+# -------------------------
+# Change tracking
+# -------------------------
+
+
+class FieldBits:
+    """
+    Bit assignments for the change-tracked fields of a state class.
+
+    Handlers accumulate an int mask while reconciling; events carry the mask and
+    expand it to field names only when a consumer asks for them.
+    """
+
+    __slots__ = ("_bits", "_names_by_mask", "dynamic", "dynamic_bit")
+
+    _MAX_CACHED_MASKS: ClassVar[int] = 4096
+
+    def __init__(self, *names: str, dynamic: str | None = None) -> None:
+        """
+        dynamic names the free-form dict (attribs/fields) whose keys cannot have
+        bits of their own; any change to it sets that one bit, and the changed
+        key names travel separately (see names()).
+        """
+        if dynamic is not None:
+            names = (*names, dynamic)
+        self._bits: dict[str, int] = {name: 1 << idx for idx, name in enumerate(names)}
+        self._names_by_mask: dict[int, tuple[str, ...]] = {0: ()}
+        self.dynamic = dynamic
+        self.dynamic_bit = self._bits[dynamic] if dynamic is not None else 0
+
+    def __getitem__(self, name: str) -> int:
+        return self._bits[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._bits
+
+    def get(self, name: str, default: int = 0) -> int:
+        return self._bits.get(name, default)
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Return the mask for the given field names (unknown names are ignored)."""
+        out = 0
+        for name in names:
+            out |= self._bits.get(name, 0)
+        return out
+
+    def names(self, mask: int, keys: Iterable[str] = ()) -> tuple[str, ...]:
+        """
+        Return the sorted field names set in mask (memoized per mask value).
+
+        keys are changed dynamic-dict keys; when given they replace the
+        dynamic field's own name in the result.
+        """
+        if keys:
+            fixed = self.names(mask & ~self.dynamic_bit)
+            return tuple(sorted({*fixed, *keys}))
+        cached = self._names_by_mask.get(mask)
+        if cached is not None:
+            return cached
+        names = tuple(sorted(name for name, bit in self._bits.items() if mask & bit))
+        if len(self._names_by_mask) < self._MAX_CACHED_MASKS:
+            self._names_by_mask[mask] = names
+        return names
+
+
 # -------------------------
 # Panel-level state
 # -------------------------
@@ -28,6 +95,8 @@ class PanelMetaState:
     Small "panel header" state owned by the kernel and updated by handlers.
     """
 
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits("model", "firmware", "serial")
+
     session_id: int | None = None
     connected: bool = False
 
@@ -47,6 +116,27 @@ class PanelMetaState:
 
 @dataclass(slots=True)
 class AreaState:
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits(
+        "name",
+        "armed_state",
+        "alarm_state",
+        "alarm_event",
+        "arm_state",
+        "ready_status",
+        "ready",
+        "stay",
+        "away",
+        "bypass",
+        "chime",
+        "entry_delay_active",
+        "exit_delay_active",
+        "trouble",
+        "num_not_ready_zones",
+        "num_bypassed_zones",
+        "last_error_code",
+        "troubles",
+    )
+
     area_id: int
 
     # Identity/config
@@ -90,6 +180,23 @@ class AreaState:
 
 @dataclass(slots=True)
 class ZoneState:
+    # Keys of the free-form attribs dict share the "attribs" bit; events list the keys.
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits(
+        "name",
+        "area_id",
+        "definition",
+        "flags",
+        "enabled",
+        "bypassed",
+        "violated",
+        "trouble",
+        "tamper",
+        "alarm",
+        "low_battery",
+        "status_code",
+        dynamic="attribs",
+    )
+
     zone_id: int
 
     name: str | None = None
@@ -119,6 +226,11 @@ class ZoneState:
 
 @dataclass(slots=True)
 class UserState:
+    # Keys of the free-form fields dict share the "fields" bit.
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits(
+        "name", "group_id", "enabled", "flags", "pin", dynamic="fields"
+    )
+
     user_id: int
 
     name: str | None = None
@@ -137,6 +249,11 @@ class UserState:
 
 @dataclass(slots=True)
 class KeypadState:
+    # Keys of the free-form fields dict share the "fields" bit.
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits(
+        "name", "area", "zone_id", "source_id", "device_id", "flags", dynamic="fields"
+    )
+
     keypad_id: int
 
     name: str | None = None
@@ -156,6 +273,8 @@ class KeypadState:
 
 @dataclass(slots=True)
 class TroubleState:
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits("active")
+
     active: bool | None = None
     last_update_at: float | None = None
 
@@ -177,6 +296,11 @@ class NetworkState:
 
 @dataclass(slots=True)
 class OutputState:
+    # Keys of the free-form fields dict share the "fields" bit; events list the keys.
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits(
+        "name", "status", "on", "status_code", dynamic="fields"
+    )
+
     output_id: int
 
     name: str | None = None
@@ -189,6 +313,21 @@ class OutputState:
 
 @dataclass(slots=True)
 class TstatState:
+    # Keys of the free-form fields dict share the "fields" bit; events list the keys.
+    FIELD_BITS: ClassVar[FieldBits] = FieldBits(
+        "name",
+        "temperature",
+        "cool_setpoint",
+        "heat_setpoint",
+        "mode",
+        "fan_mode",
+        "humidity",
+        "rssi",
+        "battery_level",
+        "prec",
+        dynamic="fields",
+    )
+
     tstat_id: int
 
     name: str | None = None
@@ -20,10 +20,45 @@ class ClientConfig:
     event_queue_maxlen: int = 0
     event_queue_size: int = 256
     request_timeout_s: float = 5.0
+    # Adaptive reply timeouts: request_timeout_s seeds a per-route-class RTO estimate
+    # kept within [request_timeout_min_s, request_timeout_max_s]. A class keeps the
+    # fixed request_timeout_s until its first reply is timed; only then can its
+    # timeout drop toward request_timeout_min_s (set adaptive_request_timeout=False
+    # for the old fixed behaviour).
+    adaptive_request_timeout: bool = True
+    request_timeout_min_s: float = 0.5
+    request_timeout_max_s: float = 15.0
     outbound_min_interval_s: float = 0.05
     outbound_max_burst: int = 1
+    # Adaptive (AIMD) outbound pacing: outbound_min_interval_s is the starting interval,
+    # kept within [outbound_min_interval_floor_s, outbound_max_interval_s].
+    outbound_adaptive_pacing: bool = False
+    outbound_min_interval_floor_s: float = 0.01
+    outbound_max_interval_s: float = 1.0
+    # Request scheduler: interactive commands preempt queued work; keepalive, status and
+    # background classes share the link by weight. Background requests still queued
+    # background_request_deadline_s after submission are dropped (None keeps them).
+    request_class_weights: Mapping[str, int] | None = None
+    background_request_deadline_s: float | None = None
+    # Optimistic updates: control commands update the snapshot immediately (pending=True)
+    # until the panel's status confirms or corrects them, or optimistic_timeout_s
+    # passes after the command reply.
+    optimistic_updates: bool = False
+    optimistic_timeout_s: float = 10.0
     logger_name: str | None = None
     session_wire_log: bool = False
+    # Optional warm-start cache file (JSON, or SQLite for .db/.sqlite suffixes).
+    config_cache_path: str | None = None
+    # Max cached read-only config responses for async_execute (0 disables).
+    response_cache_size: int = 256
+    # Optional wire capture (capture.py): raw RX/TX bytes plus session keys. With
+    # wire_capture_max_bytes set, only the newest records are kept and written on
+    # disconnect. Captures contain session keys.
+    wire_capture_path: str | None = None
+    wire_capture_max_bytes: int | None = None
+    # Receive and send on the event loop (selector reader, inline send) instead of
+    # worker threads. Recommended when many clients share one loop (manager.py).
+    loop_io: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -190,6 +225,8 @@ class AreaState:
     ready: bool | None = None
     alarm_active: bool | None = None
     chime: bool | None = None
+    # True while arm_mode is an optimistic value awaiting panel confirmation.
+    pending: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -206,6 +243,8 @@ class ZoneState:
     alarm: bool | None = None
     tamper: bool | None = None
     low_battery: bool | None = None
+    # True while bypassed is an optimistic value awaiting panel confirmation.
+    pending: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -217,6 +256,8 @@ class OutputState:
     output_id: int
     name: str | None = None
     state: bool | None = None
+    # True while state is an optimistic value awaiting panel confirmation.
+    pending: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -0,0 +1,571 @@
+"""
+elke27_lib/virtual_time.py
+
+Deterministic virtual-time harness for the kernel request scheduler.
+
+VirtualTimeLoop is an asyncio event loop whose clock only moves when the loop
+would otherwise sleep: instead of blocking in select() until the next timer, it
+jumps the clock to that timer. asyncio.sleep(), loop.call_later() (reply
+timeouts), the OutboundQueue token bucket (loop.time()) and the kernel clock
+(now_monotonic=loop.time) all follow the same virtual clock, so hours of
+simulated traffic run in however long the CPU work takes. run_in_executor()
+(and so asyncio.to_thread) runs inline, which keeps runs single-threaded and
+reproducible.
+
+run_virtual(main) runs a coroutine on a fresh VirtualTimeLoop (like asyncio.run).
+
+VirtualPanel puts the PanelSimulator panel model behind VirtualPanelSession, a
+Session that hands requests to the panel instead of a socket; pass
+VirtualPanel.session_factory to E27Kernel or Elke27Client.
+
+VirtualLoadHarness drives a real E27Kernel on such a loop against a VirtualPanel:
+
+- a Poisson stream of status reads (zone.get_status) and interactive commands
+  (output.set_status) submitted with submit_for_response()
+- reply latency and jitter, dropped replies (the kernel's reply timeout fires)
+- optional unsolicited zone status broadcasts
+- optional forced disconnects followed by kernel.reconnect() (full bootstrap)
+
+The report gives virtual throughput, per-class latency distributions measured
+from submission to reply, outcome counts and the kernel's RequestMetricsSnapshot.
+
+    report = run_virtual_load(VirtualLoadConfig(requests=20_000, drop_rate=0.01))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import random
+import selectors
+import time
+from collections.abc import Callable, Coroutine, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from . import session as session_mod
+from .errors import E27Timeout
+from .generators.output import generator_output_set_status
+from .generators.zone import generator_zone_get_status
+from .kernel import E27Kernel, KernelError
+from .linking import E27Identity, E27LinkKeys
+from .outbound import OutboundPriority
+from .request_metrics import RequestMetricsSnapshot
+from .request_scheduler import classify_request
+from .simulator import PanelSimulator, PanelSimulatorConfig
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# --------------------------
+# Virtual clock event loop
+# --------------------------
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances the loop clock instead of blocking on a timeout."""
+
+    def __init__(self, advance: Callable[[float], None]) -> None:
+        super().__init__()
+        self._advance = advance
+
+    def select(self, timeout: float | None = None) -> list[tuple[selectors.SelectorKey, int]]:
+        # Real fds (the loop's self-pipe) are still polled, without waiting.
+        ready = super().select(0)
+        if ready or timeout is None:
+            if not ready:
+                # Nothing scheduled: only another thread can make progress.
+                ready = super().select(None)
+            self._advance(0.0)
+            return ready
+        self._advance(timeout)
+        return []
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on a virtual clock starting at start_time. loop.time() is the
+    virtual clock; pass it as E27Kernel(now_monotonic=loop.time).
+
+    Each loop iteration also costs tick_s of virtual time, as real iterations
+    cost CPU time. Without it, code that sleeps for a float rounding remainder
+    (deadline - now still > 0 once now has reached the deadline) would spin
+    with the clock standing still.
+    """
+
+    def __init__(self, *, start_time: float = 0.0, tick_s: float = 1e-6) -> None:
+        self._virtual_now = float(start_time)
+        self._tick_s = max(0.0, float(tick_s))
+        super().__init__(selector=_VirtualSelector(self._advance))
+
+    def time(self) -> float:
+        return self._virtual_now
+
+    def _advance(self, delta_s: float) -> None:
+        self._virtual_now += max(delta_s, self._tick_s)
+
+    def run_in_executor(  # type: ignore[override]
+        self, executor: Any, func: Callable[..., Any], *args: Any
+    ) -> asyncio.Future[Any]:
+        future: asyncio.Future[Any] = self.create_future()
+        try:
+            future.set_result(func(*args))
+        except BaseException as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        return future
+
+
+def run_virtual(main: Coroutine[Any, Any, T], *, start_time: float = 0.0) -> T:
+    """
+    Run main on a fresh VirtualTimeLoop (like asyncio.run), cancelling and
+    awaiting leftover tasks before the loop is closed.
+    """
+    loop = VirtualTimeLoop(start_time=start_time)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+# --------------------------
+# Simulated session and panel
+# --------------------------
+
+
+class VirtualPanelSession(session_mod.Session):
+    """
+    Session without a socket or receive thread. Requests still pass through the
+    OutboundQueue; _send_all hands the decoded request to on_request and replies
+    arrive through deliver() on the event loop. JSON is not encrypted or framed.
+    """
+
+    def __init__(
+        self,
+        cfg: session_mod.SessionConfig,
+        *,
+        client_identity: E27Identity,
+        link_key_hex: str,
+        session_id: int,
+        on_request: Callable[[VirtualPanelSession, dict[str, Any]], None],
+    ) -> None:
+        super().__init__(cfg, client_identity=client_identity, link_key_hex=link_key_hex)
+        self._session_id = session_id
+        self._on_request = on_request
+
+    def connect(self) -> session_mod.SessionInfo:
+        self.info = session_mod.SessionInfo(
+            session_id=self._session_id, session_key_hex="00" * 16, session_hmac_hex="00" * 32
+        )
+        self.state = session_mod.SessionState.ACTIVE
+        if self.on_connected:
+            self.on_connected(self.info)
+        return self.info
+
+    def _start_receiver(self) -> None:
+        return
+
+    def _require_ready(self) -> None:
+        if self.state is not session_mod.SessionState.ACTIVE or self.info is None:
+            raise session_mod.SessionNotReadyError("Virtual session is not ACTIVE.")
+
+    def _encode_json(self, obj: dict[str, Any]) -> bytes:
+        self._require_ready()
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _send_all(self, data: bytes) -> None:
+        self._require_ready()
+        self._on_request(self, json.loads(data))
+
+    def deliver(self, msg: dict[str, Any]) -> bool:
+        """Hand a panel message to the kernel; False if this session is gone."""
+        if self.state is not session_mod.SessionState.ACTIVE or self.on_message is None:
+            return False
+        self.on_message(msg)
+        return True
+
+
+class VirtualPanel:
+    """
+    PanelSimulator panel model behind VirtualPanelSession.
+
+    Pass session_factory to E27Kernel (constructor or connect()). Requests are
+    answered serially after latency_s + uniform(0, jitter_s) on the loop clock;
+    drop_rate loses replies (the command is still applied). The link attributes
+    may be changed between requests.
+    """
+
+    def __init__(
+        self,
+        config: PanelSimulatorConfig | None = None,
+        *,
+        latency_s: float = 0.02,
+        jitter_s: float = 0.0,
+        drop_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.model = PanelSimulator(config)
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.drop_rate = drop_rate
+        self._rng = random.Random(seed)
+        self._session: VirtualPanelSession | None = None
+        self._next_session_id = 1
+        self._busy_until = 0.0
+        self.sessions = 0
+        self.requests = 0
+        self.replies_dropped = 0
+        self.broadcasts = 0
+        self.resets = 0
+
+    def session_factory(
+        self,
+        cfg: session_mod.SessionConfig,
+        *,
+        client_identity: E27Identity,
+        link_key_hex: str,
+    ) -> VirtualPanelSession:
+        session_id = self._next_session_id
+        self._next_session_id += 1
+        self.sessions += 1
+        self._session = VirtualPanelSession(
+            cfg,
+            client_identity=client_identity,
+            link_key_hex=link_key_hex,
+            session_id=session_id,
+            on_request=self._on_request,
+        )
+        return self._session
+
+    @property
+    def session(self) -> VirtualPanelSession | None:
+        """The latest session, if it is still ACTIVE."""
+        session = self._session
+        if session is None or session.state is not session_mod.SessionState.ACTIVE:
+            return None
+        return session
+
+    def broadcast_zone(self, zone_id: int | None = None) -> bool:
+        """Toggle a zone (random if None) and push its status as a broadcast."""
+        session = self.session
+        zones = len(self.model.zone_violated)
+        if session is None or zones == 0:
+            return False
+        if zone_id is None:
+            zone_id = self._rng.randint(1, zones)
+        self.model.zone_violated[zone_id] = not self.model.zone_violated.get(zone_id, False)
+        reply = self.model.handle_request(
+            {"zone": {"get_status": {"zone_id": zone_id}}}, session_id=_session_id_of(session)
+        )
+        if reply is None:
+            return False
+        reply["seq"] = 0
+        if not session.deliver(reply):
+            return False
+        self.broadcasts += 1
+        return True
+
+    def reset(self) -> bool:
+        """Drop the active session as a TCP reset would."""
+        session = self.session
+        if session is None:
+            return False
+        self.resets += 1
+        session.handle_disconnect(session_mod.SessionIOError("Connection reset by peer."))
+        return True
+
+    def _on_request(self, session: VirtualPanelSession, msg: dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        self.requests += 1
+        reply = self.model.handle_request(msg, session_id=_session_id_of(session))
+        # The panel answers serially: service starts once the previous reply is out.
+        service_s = self.latency_s + (
+            self._rng.uniform(0.0, self.jitter_s) if self.jitter_s else 0.0
+        )
+        self._busy_until = max(loop.time(), self._busy_until) + service_s
+        if reply is None:
+            return
+        if self.drop_rate and self._rng.random() < self.drop_rate:
+            self.replies_dropped += 1
+            return
+        loop.call_at(self._busy_until, session.deliver, reply)
+
+
+def _session_id_of(session: VirtualPanelSession) -> int:
+    return session.info.session_id if session.info is not None else 0
+
+
+VIRTUAL_LINK_KEYS = E27LinkKeys(
+    tempkey_hex="00" * 16, linkkey_hex="00" * 16, linkhmac_hex="00" * 32
+)
+VIRTUAL_IDENTITY = E27Identity(mn="222", sn="virtual", fwver="0", hwver="0", osver="0")
+
+
+# --------------------------
+# Load harness
+# --------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class VirtualLoadConfig:
+    """Workload and adversarial link behaviour for one virtual-time run."""
+
+    # Requests submitted by the workload (bootstrap and keepalive traffic is extra).
+    requests: int = 10_000
+    # Mean gap between submissions (exponentially distributed).
+    mean_interarrival_s: float = 0.05
+    # Fraction of submissions that are interactive commands (output.set_status).
+    interactive_fraction: float = 0.1
+    # Panel service time per request: latency_s + uniform(0, jitter_s).
+    latency_s: float = 0.02
+    jitter_s: float = 0.0
+    # Probability a reply is never sent.
+    drop_rate: float = 0.0
+    # Mean gap between unsolicited zone status broadcasts; None disables them.
+    broadcast_interval_s: float | None = None
+    # Mean gap between forced disconnects; None disables them.
+    disconnect_interval_s: float | None = None
+    reconnect_delay_s: float = 1.0
+    # None disables the kernel keepalive loop.
+    keepalive_interval_s: float | None = None
+    panel: PanelSimulatorConfig = field(default_factory=PanelSimulatorConfig)
+    # Extra E27Kernel constructor arguments (timeouts, pacing, class weights, ...).
+    kernel_options: Mapping[str, Any] = field(default_factory=lambda: dict[str, Any]())
+    seed: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class LatencySummary:
+    """Exact latency distribution (seconds) of a set of samples."""
+
+    count: int
+    mean_s: float
+    p50_s: float
+    p90_s: float
+    p99_s: float
+    max_s: float
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[float]) -> LatencySummary:
+        ordered = sorted(samples)
+        count = len(ordered)
+        if not count:
+            raise ValueError("samples must not be empty")
+
+        def pct(q: float) -> float:
+            return ordered[max(0, math.ceil(q * count) - 1)]
+
+        return cls(
+            count=count,
+            mean_s=sum(ordered) / count,
+            p50_s=pct(0.5),
+            p90_s=pct(0.9),
+            p99_s=pct(0.99),
+            max_s=ordered[-1],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class VirtualLoadReport:
+    submitted: int
+    replied: int
+    # Reply timeout, or the request's queue deadline passed before it was sent.
+    timed_out: int
+    # Failed because the connection dropped.
+    aborted: int
+    # submit_for_response refused the request (session down).
+    rejected: int
+    replies_dropped: int
+    broadcasts: int
+    reconnects: int
+    panel_requests: int
+    virtual_time_s: float
+    wall_time_s: float
+    latency: Mapping[str, LatencySummary]
+    metrics: RequestMetricsSnapshot
+
+    @property
+    def throughput_per_s(self) -> float:
+        """Workload replies per virtual second."""
+        return self.replied / self.virtual_time_s if self.virtual_time_s > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Virtual seconds simulated per wall-clock second."""
+        return self.virtual_time_s / self.wall_time_s if self.wall_time_s > 0 else math.inf
+
+
+class VirtualLoadHarness:
+    """One virtual-time run of VirtualLoadConfig against a real E27Kernel."""
+
+    def __init__(self, config: VirtualLoadConfig | None = None) -> None:
+        self.config = config or VirtualLoadConfig()
+        cfg = self.config
+        self.panel = VirtualPanel(
+            cfg.panel,
+            latency_s=cfg.latency_s,
+            jitter_s=cfg.jitter_s,
+            drop_rate=cfg.drop_rate,
+            seed=cfg.seed,
+        )
+        self._rng = random.Random(cfg.seed + 1)
+        self._kernel: E27Kernel | None = None
+        self._latencies: dict[str, list[float]] = {}
+        self._outcomes: dict[str, int] = dict.fromkeys(
+            ("replied", "timed_out", "aborted", "rejected"), 0
+        )
+        self._submitted = 0
+        self._reconnects = 0
+
+    @property
+    def kernel(self) -> E27Kernel:
+        if self._kernel is None:
+            raise RuntimeError("Harness is not running.")
+        return self._kernel
+
+    def run(self) -> VirtualLoadReport:
+        """Run on a fresh VirtualTimeLoop and return the report."""
+        return run_virtual(self.run_async())
+
+    async def run_async(self) -> VirtualLoadReport:
+        """Run on the current loop (which should be a VirtualTimeLoop)."""
+        loop = asyncio.get_running_loop()
+        cfg = self.config
+        wall_start = time.perf_counter()
+        virtual_start = loop.time()
+        options = dict(cfg.kernel_options)
+        options.setdefault("now_monotonic", loop.time)
+        kernel = E27Kernel(session_factory=self.panel.session_factory, **options)
+        self._kernel = kernel
+        await kernel.connect(
+            VIRTUAL_LINK_KEYS,
+            client_identity=VIRTUAL_IDENTITY,
+            session_config=session_mod.SessionConfig(
+                host="virtual",
+                port=0,
+                keepalive_enabled=cfg.keepalive_interval_s is not None,
+                keepalive_interval_s=cfg.keepalive_interval_s or 30.0,
+            ),
+        )
+
+        background: list[asyncio.Task[None]] = []
+        if cfg.broadcast_interval_s is not None:
+            background.append(loop.create_task(self._broadcast_loop(cfg.broadcast_interval_s)))
+        if cfg.disconnect_interval_s is not None:
+            background.append(loop.create_task(self._disconnect_loop(cfg.disconnect_interval_s)))
+
+        futures = await self._submit_workload()
+        if futures:
+            await asyncio.wait(futures)
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await kernel.close()
+
+        return VirtualLoadReport(
+            submitted=self._submitted,
+            replied=self._outcomes["replied"],
+            timed_out=self._outcomes["timed_out"],
+            aborted=self._outcomes["aborted"],
+            rejected=self._outcomes["rejected"],
+            replies_dropped=self.panel.replies_dropped,
+            broadcasts=self.panel.broadcasts,
+            reconnects=self._reconnects,
+            panel_requests=self.panel.requests,
+            virtual_time_s=loop.time() - virtual_start,
+            wall_time_s=time.perf_counter() - wall_start,
+            latency={
+                name: LatencySummary.from_samples(samples)
+                for name, samples in sorted(self._latencies.items())
+            },
+            metrics=kernel.metrics_snapshot(),
+        )
+
+    # Workload
+
+    async def _submit_workload(self) -> list[asyncio.Future[Any]]:
+        cfg = self.config
+        loop = asyncio.get_running_loop()
+        zones = max(1, cfg.panel.zones)
+        outputs = max(1, cfg.panel.outputs)
+        futures: list[asyncio.Future[Any]] = []
+        for _ in range(cfg.requests):
+            await asyncio.sleep(self._rng.expovariate(1.0 / cfg.mean_interarrival_s))
+            if self._rng.random() < cfg.interactive_fraction:
+                payload, route = generator_output_set_status(
+                    output_id=self._rng.randint(1, outputs),
+                    status=self._rng.choice(("ON", "OFF")),
+                )
+                priority = OutboundPriority.HIGH
+            else:
+                payload, route = generator_zone_get_status(zone_id=self._rng.randint(1, zones))
+                priority = OutboundPriority.NORMAL
+            request_class = classify_request(route, priority)
+            self._submitted += 1
+            submitted_at = loop.time()
+            try:
+                _seq, future, _sent = self.kernel.submit_for_response(
+                    route[0],
+                    route[1],
+                    payload,
+                    command_key=f"{route[0]}_{route[1]}",
+                    expected_route=route,
+                    timeout_s=None,
+                    loop=loop,
+                    priority=priority,
+                )
+            except KernelError:
+                self._outcomes["rejected"] += 1
+                continue
+            future.add_done_callback(
+                lambda fut, rc=request_class, t0=submitted_at: self._on_done(fut, rc, t0)
+            )
+            futures.append(future)
+        return futures
+
+    def _on_done(
+        self, future: asyncio.Future[Any], request_class: str, submitted_at: float
+    ) -> None:
+        if future.cancelled():
+            self._outcomes["aborted"] += 1
+            return
+        exc = future.exception()
+        if exc is None:
+            self._outcomes["replied"] += 1
+            elapsed = future.get_loop().time() - submitted_at
+            self._latencies.setdefault(request_class, []).append(elapsed)
+        elif isinstance(exc, E27Timeout):
+            self._outcomes["timed_out"] += 1
+        else:
+            self._outcomes["aborted"] += 1
+
+    async def _broadcast_loop(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(self._rng.expovariate(1.0 / interval_s))
+            self.panel.broadcast_zone()
+
+    async def _disconnect_loop(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(self._rng.expovariate(1.0 / interval_s))
+            self.panel.reset()
+            await asyncio.sleep(self.config.reconnect_delay_s)
+            try:
+                await self.kernel.reconnect()
+            except KernelError as exc:
+                LOG.warning("Virtual reconnect failed: %s", exc)
+                continue
+            self._reconnects += 1
+
+
+def run_virtual_load(config: VirtualLoadConfig | None = None) -> VirtualLoadReport:
+    """Run one virtual-time load scenario on a fresh VirtualTimeLoop."""
+    return VirtualLoadHarness(config).run()
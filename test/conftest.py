@@ -57,7 +57,7 @@ async def live_e27_client(request: pytest.FixtureRequest) -> AsyncIterator[Elke2
     if skip_bootstrap:
         kernel = get_kernel(client)
 
-        def _noop_bootstrap_requests() -> None:
+        def _noop_bootstrap_requests(**_kwargs: object) -> None:
             return None
 
         set_private(kernel, "_bootstrap_requests", _noop_bootstrap_requests)
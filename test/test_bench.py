@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from elke27_lib.bench import (
+    BenchCase,
+    BenchResult,
+    compare_to_baseline,
+    load_baseline,
+    results_to_json,
+    run_benchmarks,
+)
+from elke27_lib.bench.cases import all_cases
+from elke27_lib.bench.runner import BASELINE_PATH
+
+
+def test_every_case_runs_and_has_a_baseline() -> None:
+    results = run_benchmarks(rounds=1, min_time_s=0.0)
+    names = [case.name for case in all_cases()]
+    assert [result.name for result in results] == names
+    assert all(result.ops_per_s > 0 for result in results)
+    assert set(load_baseline(BASELINE_PATH)) == set(names)
+
+
+def test_regression_detection_and_filter(tmp_path: Path) -> None:
+    counter = {"calls": 0}
+
+    def setup() -> Callable[[], object]:
+        def run() -> None:
+            counter["calls"] += 1
+
+        return run
+
+    cases = [BenchCase("a.fast", "ops", setup), BenchCase("b.other", "ops", setup)]
+    results = run_benchmarks(cases, name_filter="a.", rounds=1, min_time_s=0.0)
+    assert [result.name for result in results] == ["a.fast"]
+    assert counter["calls"] > 0
+
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(results_to_json(results)))
+    assert load_baseline(path) == {"a.fast": round(results[0].ops_per_s, 1)}
+    assert load_baseline(tmp_path / "missing.json") == {}
+
+    slow = BenchResult("a.fast", "ops", 50.0, 1, 1)
+    regressions = compare_to_baseline([slow], {"a.fast": 100.0}, threshold=0.25)
+    assert [reg.name for reg in regressions] == ["a.fast"]
+    assert regressions[0].change == -0.5
+    assert compare_to_baseline([slow], {"a.fast": 60.0}, threshold=0.25) == []
+    assert compare_to_baseline([slow], {}, threshold=0.25) == []
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.bootstrap_planner import plan_domain_bootstrap
+from elke27_lib.client import Elke27Client
+from elke27_lib.events import (
+    UNSET_AT,
+    UNSET_CLASSIFICATION,
+    UNSET_ROUTE,
+    UNSET_SEQ,
+    UNSET_SESSION_ID,
+    ZoneConfiguredInventoryReady,
+)
+from elke27_lib.session import SessionState
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+from elke27_lib.types import ClientConfig
+from test.helpers.internal import get_kernel, get_private
+
+_ZONE_BULK = ("zone", "get_all_zones_status")
+
+
+def test_zone_status_uses_bulk_route_when_available() -> None:
+    steps = plan_domain_bootstrap("zone", {1, 2, 3}, {1, 2, 3}, available_routes={_ZONE_BULK})
+
+    status = [step for step in steps if step.kind == "status"]
+    assert [(step.route, step.covers, step.bulk) for step in status] == [
+        (_ZONE_BULK, (1, 2, 3), True)
+    ]
+    assert [step.kwargs() for step in steps if step.kind == "attribs"] == [
+        {"zone_id": 1},
+        {"zone_id": 2},
+        {"zone_id": 3},
+    ]
+    assert steps[0].kind == "status"
+
+
+def test_status_falls_back_per_entity_without_covering_bulk_route() -> None:
+    no_bulk = plan_domain_bootstrap("zone", {1, 2}, (), available_routes=())
+    assert [step.route for step in no_bulk] == [("zone", "get_status"), ("zone", "get_status")]
+
+    uncovered = plan_domain_bootstrap(
+        "zone",
+        {1},
+        (),
+        available_routes={_ZONE_BULK},
+        required_fields={"zone": frozenset({"low_battery"})},
+    )
+    assert [step.route for step in uncovered] == [("zone", "get_status")]
+
+    areas = plan_domain_bootstrap("area", {1}, (), available_routes={_ZONE_BULK})
+    assert [step.route for step in areas] == [("area", "get_status")]
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append(msg)
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+@pytest.mark.asyncio
+async def test_bulk_reply_gaps_are_filled_per_entity() -> None:
+    client = Elke27Client(
+        config=ClientConfig(response_cache_size=0), features=["elke27_lib.features.zone"]
+    )
+    kernel = get_kernel(client)
+    kernel.load_features_blocking()
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    # Normally set by async_connect; lets kernel events reach the client.
+    cast(Any, client)._event_loop = asyncio.get_running_loop()
+    kernel.state.panel.session_id = 1
+    kernel.state.inventory.configured_zones = {1, 2, 3}
+    for zone_id in (1, 2, 3):
+        kernel.state.get_or_create_zone(zone_id)
+
+    handle_event = get_private(client, "_handle_kernel_event")
+    handle_event(
+        ZoneConfiguredInventoryReady(
+            kind=ZoneConfiguredInventoryReady.KIND,
+            at=UNSET_AT,
+            seq=UNSET_SEQ,
+            classification=UNSET_CLASSIFICATION,
+            route=UNSET_ROUTE,
+            session_id=UNSET_SESSION_ID,
+        )
+    )
+    await asyncio.sleep(0)
+
+    assert list(session.sent[0]["zone"]) == ["get_all_zones_status"]
+    assert client.bootstrap_plan.summary()["zone"] == {"status": 1, "attribs": 3, "bulk": 1}
+
+    # The reply only covers zones 1 and 2; zone 3 must be fetched individually.
+    on_message = get_private(kernel, "_on_message")
+    on_message(
+        {
+            "seq": session.sent[0]["seq"],
+            "zone": {"get_all_zones_status": {"status": "19", "error_code": 0}},
+        }
+    )
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    gap_steps = [step for step in client.bootstrap_plan.for_domain("zone") if not step.bulk]
+    status_gaps = [
+        step.kwargs() for step in gap_steps if step.kind == "status" and not step.background
+    ]
+    assert status_gaps == [{"zone_id": 3}]
+    assert kernel.state.zones[2].violated is True
+
+    # The bulk reply carries no tamper/low_battery/alarm; covered zones get them
+    # from a background per-zone get_status.
+    backfill = [step.kwargs() for step in gap_steps if step.background]
+    assert backfill == [{"zone_id": 1}, {"zone_id": 2}]
+
+
+@pytest.mark.asyncio
+async def test_bulk_bootstrap_backfills_zone_flags_the_bulk_route_lacks() -> None:
+    async with PanelSimulator(PanelSimulatorConfig(zones=6, outputs=1, seed=2)) as sim:
+        client = Elke27Client()
+        try:
+            await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+            assert await client.wait_attribs_ready(timeout_s=10.0)
+            zones = get_kernel(client).state.zones
+            for _ in range(100):
+                if all(zone.tamper is not None for zone in zones.values()):
+                    break
+                await asyncio.sleep(0.01)
+            assert sorted(zones) == list(range(1, 7))
+            for zone in zones.values():
+                assert (zone.tamper, zone.low_battery, zone.alarm) == (False, False, False)
+        finally:
+            await client.async_disconnect()
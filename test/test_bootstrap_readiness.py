@@ -3,6 +3,7 @@ from typing import cast
 
 import pytest
 
+from elke27_lib.bootstrap_timeline import BootstrapTimeline
 from elke27_lib.client import Elke27Client
 from elke27_lib.events import (
     UNSET_AT,
@@ -18,14 +19,16 @@ from elke27_lib.events import (
     ZoneConfiguredInventoryReady,
     ZoneStatusUpdated,
 )
-from elke27_lib.kernel import E27Kernel
+from elke27_lib.kernel import E27Kernel, RequestRegistry
 from elke27_lib.states import PanelState
 from test.helpers.internal import get_private
 
 
 class _FakeKernel:
     state: PanelState
-    requests: list[tuple[tuple[str, str], dict[str, object]]]
+    requests: RequestRegistry
+    sent: list[tuple[tuple[str, str], dict[str, object]]]
+    bootstrap_timeline: BootstrapTimeline | None = None
 
     def __init__(self) -> None:
         self.state = PanelState()
@@ -36,14 +39,15 @@ class _FakeKernel:
             "output": {"table_elements": 1},
             "tstat": {"table_elements": 1},
         }
-        self.requests = []
+        self.requests = RequestRegistry()
+        self.sent = []
 
     @property
     def ready(self) -> bool:
         return True
 
     def request(self, route: tuple[str, str], **kwargs: object) -> None:
-        self.requests.append((route, dict(kwargs)))
+        self.sent.append((route, dict(kwargs)))
 
     def subscribe(
         self, _callback: Callable[[Event], None], _kinds: Iterable[str] | None = None
@@ -101,7 +105,7 @@ async def test_wait_ready_requires_inventory_and_status():
             route=UNSET_ROUTE,
             session_id=UNSET_SESSION_ID,
             area_id=1,
-            changed_fields=("arm_state",),
+            changed_mask=AreaStatusUpdated.FIELD_BITS["arm_state"],
         )
     )
     handle_event(
@@ -113,7 +117,7 @@ async def test_wait_ready_requires_inventory_and_status():
             route=UNSET_ROUTE,
             session_id=UNSET_SESSION_ID,
             zone_id=1,
-            changed_fields=("violated",),
+            changed_mask=ZoneStatusUpdated.FIELD_BITS["violated"],
         )
     )
     handle_event(
@@ -146,9 +150,9 @@ def test_bootstrap_populates_snapshot_maps():
     handle_event(_inventory_ready_event(ZoneConfiguredInventoryReady))
     handle_event(_inventory_ready_event(OutputConfiguredInventoryReady))
 
-    assert (("area", "get_status"), {"area_id": 1}) in kernel.requests
-    assert (("zone", "get_status"), {"zone_id": 1}) in kernel.requests
-    assert (("output", "get_status"), {"output_id": 1}) in kernel.requests
+    assert (("area", "get_status"), {"area_id": 1}) in kernel.sent
+    assert (("zone", "get_status"), {"zone_id": 1}) in kernel.sent
+    assert (("output", "get_status"), {"output_id": 1}) in kernel.sent
 
     kernel.state.get_or_create_area(1)
     kernel.state.get_or_create_zone(1)
@@ -163,7 +167,7 @@ def test_bootstrap_populates_snapshot_maps():
             route=UNSET_ROUTE,
             session_id=UNSET_SESSION_ID,
             area_id=1,
-            changed_fields=("arm_state",),
+            changed_mask=AreaStatusUpdated.FIELD_BITS["arm_state"],
         )
     )
     handle_event(
@@ -175,7 +179,7 @@ def test_bootstrap_populates_snapshot_maps():
             route=UNSET_ROUTE,
             session_id=UNSET_SESSION_ID,
             zone_id=1,
-            changed_fields=("violated",),
+            changed_mask=ZoneStatusUpdated.FIELD_BITS["violated"],
         )
     )
     handle_event(
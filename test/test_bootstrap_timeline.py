@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, cast
+
+from elke27_lib.bootstrap_timeline import (
+    MILESTONE_STATUS_READY,
+    BootstrapTimeline,
+    phase_for_route,
+)
+from elke27_lib.client import Elke27Client
+from elke27_lib.kernel import E27Kernel
+from elke27_lib.session import SessionState
+from test.helpers.internal import get_kernel, get_private
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 100.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+        self.connect_started_at: float | None = 5.0
+        self.tcp_connected_at: float | None = 5.25
+        self.hello_completed_at: float | None = 5.5
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append(msg)
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+def test_phase_for_route_classifies_bootstrap_requests() -> None:
+    assert phase_for_route(("zone", "get_table_info")) == "table_info.zone"
+    assert phase_for_route(("area", "get_configured")) == "configured.area"
+    assert phase_for_route(("zone", "get_defs")) == "zone_defs"
+    assert phase_for_route(("zone", "get_all_zones_status")) == "status"
+    assert phase_for_route(("output", "get_status")) == "status"
+    assert phase_for_route(("zone", "get_attribs")) == "attribs"
+    assert phase_for_route(("control", "authenticate")) is None
+
+
+def test_timeline_phase_ends_when_all_requests_complete() -> None:
+    timeline = BootstrapTimeline(started_at=10.0)
+    timeline.note_request(("zone", "get_attribs"), 11.0)
+    timeline.note_request(("zone", "get_attribs"), 11.5)
+    timeline.note_complete(("zone", "get_attribs"), 12.0)
+
+    phase = timeline.report().phase("attribs")
+    assert phase is not None and phase.ended_at is None
+
+    timeline.note_complete(("zone", "get_attribs"), 13.0)
+    timeline.mark(MILESTONE_STATUS_READY, 14.0)
+    timeline.stop()
+    timeline.note_request(("zone", "get_attribs"), 20.0)
+
+    report = timeline.report()
+    phase = report.phase("attribs")
+    assert phase is not None
+    assert (phase.requests, phase.completed, phase.duration_s) == (2, 2, 2.0)
+    assert report.elapsed_to(MILESTONE_STATUS_READY) == 4.0
+    assert report.to_dict()["phases"][0]["duration_ms"] == 2000.0
+
+
+def test_kernel_records_connect_and_request_phases() -> None:
+    clock = _Clock()
+    client = Elke27Client(kernel=E27Kernel(now_monotonic=clock))
+    kernel = get_kernel(client)
+    kernel.requests.register(("zone", "get_table_info"), lambda **_kw: {})
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+
+    get_private(kernel, "_start_bootstrap_timeline")(session, 100.0, 101.0)
+    clock.t = 101.0
+    kernel.request(("zone", "get_table_info"))
+    clock.t = 101.5
+    get_private(kernel, "_on_message")(
+        {"seq": session.sent[0]["seq"], "zone": {"get_table_info": {"error_code": 0}}}
+    )
+
+    report = client.bootstrap_report()
+    assert report is not None
+    tcp = report.phase("tcp_connect")
+    hello = report.phase("hello")
+    table_info = report.phase("table_info.zone")
+    assert tcp is not None and tcp.duration_s == 0.25
+    assert hello is not None and hello.duration_s == 0.75
+    assert table_info is not None
+    assert (table_info.requests, table_info.completed, table_info.duration_s) == (1, 1, 0.5)
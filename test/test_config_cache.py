@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.config_cache import (
+    ConfigCache,
+    JsonConfigCache,
+    PanelConfig,
+    SqliteConfigCache,
+    capture_panel_config,
+    open_config_cache,
+    restore_panel_config,
+)
+from elke27_lib.events import (
+    UNSET_AT,
+    UNSET_CLASSIFICATION,
+    UNSET_ROUTE,
+    UNSET_SEQ,
+    UNSET_SESSION_ID,
+    Event,
+    ZoneTableInfoUpdated,
+)
+from elke27_lib.kernel import E27Kernel, RequestRegistry
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+from elke27_lib.states import PanelState
+from test.helpers.internal import get_private
+
+
+def _populated_state() -> PanelState:
+    state = PanelState()
+    state.table_info_by_domain["zone"] = {"table_elements": 4, "table_csm": 77}
+    state.table_csm_by_domain["zone"] = 77
+    state.table_csm_by_domain["area"] = 12
+    state.inventory.configured_zones = {1, 2}
+    state.inventory.configured_zones_complete = True
+    zone = state.get_or_create_zone(1)
+    zone.name = "Front Door"
+    zone.area_id = 1
+    zone.definition = "ENTRY_EXIT"
+    zone.violated = True
+    zone = state.get_or_create_zone(2)
+    zone.name = "Kitchen"
+    state.zone_defs_by_id[3] = {"definition": "ENTRY_EXIT"}
+    # Area inventory is incomplete, so it must not be cached.
+    state.inventory.configured_areas = {1}
+    return state
+
+
+def test_capture_skips_unvalidated_domains_and_live_status() -> None:
+    config = capture_panel_config(_populated_state(), "panel:2101", saved_at=1.0)
+
+    assert set(config.domains) == {"zone"}
+    zone_cfg = config.domains["zone"]
+    assert zone_cfg.table_csm == 77
+    assert zone_cfg.configured_ids == (1, 2)
+    assert zone_cfg.entities[1] == {"name": "Front Door", "area_id": 1, "definition": "ENTRY_EXIT"}
+    assert config.zone_defs == {3: {"definition": "ENTRY_EXIT"}}
+
+
+@pytest.mark.parametrize("filename", ["cache.json", "cache.sqlite"])
+def test_cache_round_trip(tmp_path: Path, filename: str) -> None:
+    cache = open_config_cache(tmp_path / filename)
+    assert isinstance(cache, SqliteConfigCache if filename.endswith(".sqlite") else JsonConfigCache)
+    assert cache.load("panel:2101") is None
+
+    config = capture_panel_config(_populated_state(), "panel:2101", saved_at=1.0)
+    cache.save(config)
+    assert cache.load("panel:2101") == config
+
+    cache.discard("panel:2101")
+    assert cache.load("panel:2101") is None
+
+
+def test_incomplete_cache_backend_fails_at_construction() -> None:
+    class LoadOnlyCache(ConfigCache):
+        def load(self, panel_key: str) -> PanelConfig | None:
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnlyCache()  # type: ignore[abstract]
+
+
+class _RecordingCache(ConfigCache):
+    def __init__(self) -> None:
+        self.saved: list[PanelConfig] = []
+
+    def load(self, panel_key: str) -> PanelConfig | None:
+        return None
+
+    def save(self, config: PanelConfig) -> None:
+        self.saved.append(config)
+
+    def discard(self, panel_key: str) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cache_is_saved_after_attribs_load_with_names() -> None:
+    cache = _RecordingCache()
+    async with PanelSimulator(PanelSimulatorConfig(zones=12, outputs=2, seed=8)) as sim:
+        client = Elke27Client(config_cache=cache)
+        try:
+            await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+            assert await client.wait_attribs_ready(timeout_s=10.0)
+            for _ in range(100):
+                if cache.saved:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await client.async_disconnect()
+
+    first = cache.saved[0]
+    zones = first.domains["zone"].entities
+    assert sorted(zones) == list(range(1, 13))
+    assert all(entity.get("name") for entity in zones.values())
+
+
+def test_restore_populates_inventory_and_names() -> None:
+    config = capture_panel_config(_populated_state(), "panel:2101")
+    state = PanelState()
+    restore_panel_config(state, config)
+
+    assert state.inventory.configured_zones == {1, 2}
+    assert state.inventory.configured_zones_complete is True
+    assert state.table_csm_by_domain == {"zone": 77}
+    assert state.zones[1].name == "Front Door"
+    assert state.zones[1].violated is None
+    assert state.zone_defs_by_id[3] == {"definition": "ENTRY_EXIT"}
+
+
+def test_bootstrap_skips_warm_domains() -> None:
+    kernel = E27Kernel()
+    kernel_any = cast(Any, kernel)
+    kernel_any._session = object()
+    recorded: list[tuple[str, str]] = []
+
+    def _fake_request(route: tuple[str, str], **_kwargs: object) -> None:
+        recorded.append(route)
+
+    kernel_any.request = _fake_request
+    for route in (
+        ("area", "get_table_info"),
+        ("zone", "get_table_info"),
+        ("area", "get_configured"),
+        ("zone", "get_configured"),
+        ("zone", "get_defs"),
+    ):
+
+        def _empty_payload(**_kwargs: object) -> dict[str, Any]:
+            return {}
+
+        kernel.requests.register(route, _empty_payload)
+
+    bootstrap_requests = get_private(kernel, "_bootstrap_requests")
+    bootstrap_requests(skip_domains=("zone",))
+    assert recorded == [
+        ("area", "get_table_info"),
+        ("zone", "get_table_info"),
+        ("area", "get_configured"),
+    ]
+
+
+class _FakeKernel:
+    def __init__(self) -> None:
+        self.state = PanelState()
+        self.state.panel.session_id = 1
+        self.requests = RequestRegistry()
+        self.sent: list[tuple[tuple[str, str], dict[str, object]]] = []
+        self.bootstrapped: list[str] = []
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    def request(self, route: tuple[str, str], *, priority: object = None, **kwargs: object) -> None:
+        del priority
+        self.sent.append((route, dict(kwargs)))
+
+    def bootstrap_domain(self, domain: str) -> None:
+        self.bootstrapped.append(domain)
+
+    def subscribe(
+        self, _callback: Callable[[Event], None], _kinds: Iterable[str] | None = None
+    ) -> int:
+        return 1
+
+
+def _zone_table_info(table_csm: int) -> ZoneTableInfoUpdated:
+    return ZoneTableInfoUpdated(
+        kind=ZoneTableInfoUpdated.KIND,
+        at=UNSET_AT,
+        seq=UNSET_SEQ,
+        classification=UNSET_CLASSIFICATION,
+        route=UNSET_ROUTE,
+        session_id=UNSET_SESSION_ID,
+        table_elements=4,
+        increment_size=None,
+        table_csm=table_csm,
+    )
+
+
+def _warm_client() -> tuple[Elke27Client, _FakeKernel]:
+    config: PanelConfig = capture_panel_config(_populated_state(), "panel:2101")
+    kernel = _FakeKernel()
+    restore_panel_config(kernel.state, config)
+    kernel.state.zones[2].name = None
+    client = Elke27Client(
+        kernel=cast(E27Kernel, cast(object, kernel)),
+        config_cache=cast(ConfigCache, object()),
+    )
+    client_any = cast(Any, client)
+    client_any._warm_config = config
+    client_any._warm_pending = {"zone"}
+    return client, kernel
+
+
+def test_fresh_warm_domain_skips_crawl() -> None:
+    client, kernel = _warm_client()
+    handle_event = get_private(client, "_handle_kernel_event")
+
+    handle_event(_zone_table_info(77))
+
+    assert kernel.bootstrapped == []
+    assert (("zone", "get_status"), {"zone_id": 1}) in kernel.sent
+    attribs = [kwargs for route, kwargs in kernel.sent if route == ("zone", "get_attribs")]
+    assert attribs == [{"zone_id": 2}]
+
+
+def test_stale_warm_domain_refetches() -> None:
+    client, kernel = _warm_client()
+    handle_event = get_private(client, "_handle_kernel_event")
+
+    handle_event(_zone_table_info(78))
+
+    assert kernel.bootstrapped == ["zone"]
+    assert kernel.sent == []
@@ -155,7 +155,8 @@ def test_attribs_request_queue_respects_limit() -> None:
     kernel = get_kernel(client)
     sent: list[tuple[tuple[str, str], dict[str, object]]] = []
 
-    def _request(route: tuple[str, str], **kwargs: object):
+    def _request(route: tuple[str, str], *, priority: object = None, **kwargs: object):
+        del priority
         sent.append((route, dict(kwargs)))
         return 1
 
@@ -196,7 +197,8 @@ def test_client_queues_output_attribs_on_inventory_ready() -> None:
 
     sent: list[tuple[tuple[str, str], dict[str, object]]] = []
 
-    def _request(route: tuple[str, str], **kwargs: object):
+    def _request(route: tuple[str, str], *, priority: object = None, **kwargs: object):
+        del priority
         sent.append((route, dict(kwargs)))
         return 1
 
@@ -213,11 +215,12 @@ def test_client_queues_output_attribs_on_inventory_ready() -> None:
             session_id=UNSET_SESSION_ID,
         )
     )
+    # Status is planned first: readiness waits on it, not on attribs.
     assert sent == [
-        (("output", "get_attribs"), {"output_id": 1}),
-        (("output", "get_attribs"), {"output_id": 2}),
         (("output", "get_status"), {"output_id": 1}),
         (("output", "get_status"), {"output_id": 2}),
+        (("output", "get_attribs"), {"output_id": 1}),
+        (("output", "get_attribs"), {"output_id": 2}),
     ]
 
 
@@ -230,7 +233,8 @@ def test_client_queues_user_keypad_attribs_on_inventory_ready() -> None:
 
     sent: list[tuple[tuple[str, str], dict[str, object]]] = []
 
-    def _request(route: tuple[str, str], **kwargs: object):
+    def _request(route: tuple[str, str], *, priority: object = None, **kwargs: object):
+        del priority
         sent.append((route, dict(kwargs)))
         return 1
 
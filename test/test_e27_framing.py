@@ -187,6 +187,24 @@ def test_escape_sequence_round_trip_contains_startchar_in_payload() -> None:
     assert frame_no_crc[3:] == data_frame
 
 
+def test_length_low_byte_equal_to_protocol_is_not_dropped() -> None:
+    """
+    A frame whose length low byte equals its protocol byte is an ordinary frame;
+    only a mid-frame resync may skip a repeated protocol byte.
+    """
+    state = DeframeState()
+    protocol = 0x85
+    data_frame = b"x" * (protocol - 5)  # message length = data + 5 == protocol
+
+    framed = frame_build(protocol_byte=protocol, data_frame=data_frame)
+    assert framed[2] == protocol
+
+    frames = _collect_ok_frames(deframe_feed(state, framed + framed))
+
+    expected = bytes([protocol, protocol, 0x00]) + data_frame
+    assert frames == [expected, expected]
+
+
 def test_resync_on_startchar_followed_by_nonzero_starts_new_frame() -> None:
     """
     Node-RED rule:
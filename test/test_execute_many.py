@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.errors import Elke27PinRequiredError, InvalidPinError, ProtocolError
+from elke27_lib.session import SessionState
+from test.helpers.internal import get_kernel, get_private
+
+
+class _AutoReplySession:
+    """Replies to each request on the next loop iteration; records the send order."""
+
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self, on_message: Callable[[dict[str, Any]], None]) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[tuple[str, str]] = []
+        self._on_message = on_message
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        domain = next(key for key in msg if key not in ("seq", "session_id"))
+        body = msg[domain]
+        name = next(iter(body)) if domain != "authenticate" else "__root__"
+        self.sent.append((domain, name))
+        if on_sent is not None:
+            on_sent(0.0)
+        reply = {"error_code": 0}
+        payload = reply if name == "__root__" else {name: reply}
+        asyncio.get_running_loop().call_soon(
+            self._on_message, {"seq": msg["seq"], "session_id": 1, domain: payload}
+        )
+
+
+def _client() -> tuple[Elke27Client, _AutoReplySession]:
+    client = Elke27Client()
+    kernel = get_kernel(client)
+    session = _AutoReplySession(get_private(kernel, "_on_message"))
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    return client, session
+
+
+@pytest.mark.asyncio
+async def test_execute_many_returns_results_in_order_with_partial_failures() -> None:
+    client, session = _client()
+
+    results = await client.async_execute_many(
+        [
+            ("output_set_status", {"output_id": 1, "status": "ON"}),
+            ("no_such_command", {}),
+            ("network_param_get_ssid", {}),
+            ("output_set_status", {"output_id": 2, "status": "OFF"}),
+            ("network_param_get_ssid", {"pin": "12a4"}),
+        ]
+    )
+
+    assert [result.ok for result in results] == [True, False, False, True, False]
+    assert isinstance(results[1].error, ProtocolError)
+    assert isinstance(results[2].error, Elke27PinRequiredError)
+    assert isinstance(results[4].error, InvalidPinError)
+    assert session.sent == [("output", "set_status"), ("output", "set_status")]
+
+
+@pytest.mark.asyncio
+async def test_execute_many_shares_pin_and_authenticates_once() -> None:
+    client, session = _client()
+
+    results = await client.async_execute_many(
+        [
+            ("zone_set_status", {"zone_id": 4, "bypassed": True}),
+            ("zone_set_status", {"zone_id": 5, "bypassed": True}),
+            ("network_param_get_ssid", {}),
+            ("system_get_debug_flags", {}),
+        ],
+        pin="1234",
+    )
+
+    assert all(result.ok for result in results)
+    assert session.sent[0] == ("authenticate", "__root__")
+    assert session.sent.count(("authenticate", "__root__")) == 1
+    assert session.sent[1:3] == [("zone", "set_status"), ("zone", "set_status")]
+    assert get_kernel(client).duplicates_saved_total == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_many_rejects_conflicting_session_pins() -> None:
+    client, session = _client()
+
+    results = await client.async_execute_many(
+        [
+            ("network_param_get_ssid", {"pin": "1234"}),
+            ("output_set_status", {"output_id": 1, "status": "ON"}),
+            ("system_get_debug_flags", {"pin": "5678"}),
+        ]
+    )
+
+    assert [result.ok for result in results] == [False, True, False]
+    assert isinstance(results[0].error, InvalidPinError)
+    assert isinstance(results[2].error, InvalidPinError)
+    assert session.sent == [("output", "set_status")]
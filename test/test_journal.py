@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from elke27_lib import Elke27Client
+from elke27_lib.journal import EventJournal, JournalConfig
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+from elke27_lib.types import ClientConfig, Elke27Event, EventType
+
+_START = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def _event(index: int, zone_id: int | None = None) -> Elke27Event:
+    data: dict[str, object] = {"index": index, "changed_fields": ["open"]}
+    if zone_id is not None:
+        data["zone_id"] = zone_id
+    return Elke27Event(
+        event_type=EventType.ZONE if zone_id is not None else EventType.PANEL,
+        data=data,
+        seq=index,
+        timestamp=_START + timedelta(seconds=index),
+        raw_type="zone_status_updated" if zone_id is not None else "heartbeat",
+    )
+
+
+def test_replay_by_seq_time_and_entity_survives_reopen_and_torn_tail(tmp_path: Path) -> None:
+    config = JournalConfig(tmp_path, segment_max_bytes=400, compact_every=0)
+    with EventJournal(config) as journal:
+        seqs = [journal.append(_event(i, zone_id=i % 3 or None)) for i in range(1, 21)]
+        assert seqs == list(range(1, 21))
+        assert journal.segment_count > 2
+
+        assert [e.seq for e in journal.replay(since_seq=17)] == [18, 19, 20]
+        at_ten = list(journal.replay(since_time=_START + timedelta(seconds=10)))
+        assert [e.seq for e in at_ten] == list(range(10, 21))
+        first = at_ten[0].event
+        assert first == _event(10, zone_id=1)
+
+        zone_two = [e.seq for e in journal.replay(entity=("zone", 2))]
+        assert zone_two == [2, 5, 8, 11, 14, 17, 20]
+        assert journal.entity_seqs(("zone", 2)) == tuple(zone_two)
+        assert [e.seq for e in journal.replay(since_seq=14, entity=("zone", 2))] == [17, 20]
+
+    last_segment = sorted(tmp_path.glob("*.log"))[-1]
+    with open(last_segment, "ab") as file:
+        file.write(b"\x10\x00\x00\x00torn")
+
+    with EventJournal(config) as reopened:
+        assert reopened.last_seq == 20
+        assert reopened.append(_event(21, zone_id=2)) == 21
+        assert [e.seq for e in reopened.replay(since_seq=19)] == [20, 21]
+        assert reopened.entity_seqs(("zone", 2))[-2:] == (20, 21)
+
+
+def test_compaction_enforces_size_and_age_limits(tmp_path: Path) -> None:
+    config = JournalConfig(
+        tmp_path, segment_max_bytes=300, retain_s=None, max_bytes=1200, compact_every=1
+    )
+    with EventJournal(config) as journal:
+        for i in range(1, 61):
+            journal.append(_event(i, zone_id=1))
+        assert journal.compactions > 0
+        assert journal.size_bytes <= 1200 + config.segment_max_bytes
+        first = journal.first_seq
+        assert first is not None and first > 1
+        replayed = [e.seq for e in journal.replay()]
+        assert replayed == list(range(first, 61))
+        assert journal.entity_seqs(("zone", 1)) == tuple(replayed)
+        assert int(sorted(tmp_path.glob("*.log"))[0].stem) == first
+
+    aged = JournalConfig(
+        tmp_path / "aged", segment_max_bytes=400, retain_s=30.0, max_bytes=None, compact_every=0
+    )
+    with EventJournal(aged) as journal:
+        for i in range(1, 21):
+            journal.append(_event(i))
+        assert journal.compact(now=(_START + timedelta(seconds=45)).timestamp()) == 14
+        assert journal.first_seq == 15
+        assert [e.seq for e in journal.replay()] == list(range(15, 21))
+
+
+@pytest.mark.asyncio
+async def test_attached_journal_records_client_events(tmp_path: Path) -> None:
+    async with PanelSimulator(PanelSimulatorConfig(zones=4, outputs=2, seed=9)) as sim:
+        client = Elke27Client(ClientConfig())
+        journal = EventJournal(JournalConfig(tmp_path))
+        unsubscribe = journal.attach(client)
+        try:
+            await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+            await client.wait_ready(timeout_s=10.0)
+            mark = journal.last_seq
+            await client.async_set_output(2, on=True)
+            await asyncio.sleep(0.1)
+        finally:
+            unsubscribe()
+            await client.async_disconnect()
+            journal.close()
+
+    with EventJournal(JournalConfig(tmp_path)) as late:
+        assert late.last_seq is not None and mark is not None and late.last_seq > mark
+        output_events = [entry.event for entry in late.replay(since_seq=mark, entity=("output", 2))]
+        assert output_events
+        assert all(event.event_type is EventType.OUTPUT for event in output_events)
+        assert any(entry.event.event_type is EventType.CONNECTION for entry in late.replay())
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib import ArmMode, ClientConfig, Elke27Client
+from elke27_lib.client import Result
+from elke27_lib.errors import E27Timeout
+from elke27_lib.events import AreaStatusUpdated, OutputStatusUpdated
+from elke27_lib.optimistic import OPTIMISTIC_CORRECTION, OptimisticTracker
+from elke27_lib.types import Elke27Event
+from test.helpers.internal import get_kernel
+
+
+def _client() -> Elke27Client:
+    client = Elke27Client(config=ClientConfig(optimistic_updates=True))
+    cast(Any, client)._connected = True
+    kernel = get_kernel(client)
+    kernel.state.panel.connected = True
+    kernel.state.get_or_create_output(1).on = False
+    kernel.state.get_or_create_area(1).arm_state = "DISARMED"
+    return client
+
+
+def _output_status(output_id: int, on: bool) -> OutputStatusUpdated:
+    return OutputStatusUpdated(
+        kind=OutputStatusUpdated.KIND,
+        at=0.0,
+        seq=None,
+        classification="BROADCAST",
+        route=("output", "get_status"),
+        session_id=None,
+        output_id=output_id,
+        status="ON" if on else "OFF",
+        on=on,
+    )
+
+
+def _area_status(area_id: int) -> AreaStatusUpdated:
+    return AreaStatusUpdated(
+        kind=AreaStatusUpdated.KIND,
+        at=0.0,
+        seq=None,
+        classification="BROADCAST",
+        route=("area", "get_status"),
+        session_id=None,
+        area_id=area_id,
+        changed_mask=1,
+    )
+
+
+def _corrections(client: Elke27Client) -> list[Elke27Event]:
+    queue = cast("asyncio.Queue[Elke27Event | None]", cast(Any, client)._event_queue)
+    out: list[Elke27Event] = []
+    while not queue.empty():
+        evt = queue.get_nowait()
+        if evt is not None and evt.raw_type == OPTIMISTIC_CORRECTION:
+            out.append(evt)
+    return out
+
+
+@pytest.mark.asyncio
+async def test_output_command_applies_immediately_and_confirms() -> None:
+    client = _client()
+    seen: list[tuple[bool | None, bool]] = []
+
+    async def _execute(command_key: str, **params: Any) -> Result[dict[str, Any]]:
+        del command_key, params
+        output = client.snapshot.outputs[1]
+        seen.append((output.state, output.pending))
+        return Result(ok=True, data={})
+
+    cast(Any, client)._async_execute = _execute
+    await client.async_set_output(1, on=True)
+    assert seen == [(True, True)]
+    assert client.snapshot.outputs[1].pending
+
+    get_kernel(client).state.outputs[1].on = True
+    cast(Any, client)._handle_kernel_event(_output_status(1, True))
+    output = client.snapshot.outputs[1]
+    assert (output.state, output.pending) == (True, False)
+    assert _corrections(client) == []
+
+
+@pytest.mark.asyncio
+async def test_arm_mismatch_after_ack_rolls_back_with_correction() -> None:
+    client = _client()
+
+    async def _execute(command_key: str, **params: Any) -> Result[dict[str, Any]]:
+        del command_key, params
+        # A stale status produced before the panel ran the command is ignored.
+        cast(Any, client)._handle_kernel_event(_area_status(1))
+        assert client.snapshot.areas[1].arm_mode is ArmMode.ARMED_AWAY
+        return Result(ok=True, data={})
+
+    cast(Any, client)._async_execute = _execute
+    await client.async_arm_area(1, mode=ArmMode.ARMED_AWAY, pin="1234")
+    assert client.snapshot.areas[1].pending
+
+    cast(Any, client)._handle_kernel_event(_area_status(1))
+    area = client.snapshot.areas[1]
+    assert (area.arm_mode, area.pending) == (ArmMode.DISARMED, False)
+    [correction] = _corrections(client)
+    assert correction.data["reason"] == "mismatch"
+    assert correction.data["expected"] is ArmMode.ARMED_AWAY
+
+
+@pytest.mark.asyncio
+async def test_failed_command_rolls_back() -> None:
+    client = _client()
+
+    async def _execute(command_key: str, **params: Any) -> Result[dict[str, Any]]:
+        del command_key, params
+        return Result(ok=False, error=E27Timeout("no reply"))
+
+    cast(Any, client)._async_execute = _execute
+    result = await client.async_execute("output_set_status", output_id=1, status="ON")
+    assert not result.ok
+    output = client.snapshot.outputs[1]
+    assert (output.state, output.pending) == (False, False)
+    [correction] = _corrections(client)
+    assert correction.data["reason"] == "command_failed"
+
+
+def test_tracker_expires_unconfirmed_entries() -> None:
+    tracker = OptimisticTracker(timeout_s=2.0)
+    entry = tracker.begin("zone", 3, "bypassed", True, now=0.0)
+    assert tracker.expire(10.0, lambda _d, _i: False) == []  # not yet acknowledged
+
+    tracker.acknowledge(entry, now=1.0)
+    assert tracker.expire(2.5, lambda _d, _i: False) == []
+    [outcome] = tracker.expire(3.0, lambda _d, _i: False)
+    assert (outcome.reason, outcome.corrected) == ("timeout", True)
+    assert len(tracker) == 0
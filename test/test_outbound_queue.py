@@ -4,7 +4,8 @@ from collections.abc import Callable
 
 import pytest
 
-from elke27_lib.outbound import OutboundItem, OutboundPriority, OutboundQueue
+from elke27_lib.outbound import AimdPacer, OutboundItem, OutboundPriority, OutboundQueue
+from test.helpers.internal import get_private
 
 
 @pytest.mark.asyncio
@@ -135,3 +136,91 @@ async def test_outbound_queue_stop_fails_pending() -> None:
 
     queue.stop(fail_exc=RuntimeError("transport gone"))
     await asyncio.wait_for(failed.wait(), timeout=1.0)
+
+
+@pytest.mark.asyncio
+async def test_outbound_queue_wait_idle_is_event_driven() -> None:
+    loop = asyncio.get_running_loop()
+    sent: list[int | None] = []
+    queue = OutboundQueue(loop=loop, send_fn=lambda _p: None, min_interval_s=0.01, max_burst=1)
+    queue.start()
+    await asyncio.sleep(0.02)
+
+    # Idle: the worker is parked on the wakeup event, not polling.
+    assert queue.is_idle()
+    assert not get_private(queue, "_wakeup").is_set()
+    assert await queue.wait_idle(timeout_s=0.0)
+
+    for seq in range(3):
+        queue.enqueue(
+            OutboundItem(
+                payload=b"x",
+                seq=seq,
+                kind="request",
+                priority=OutboundPriority.NORMAL,
+                enqueued_at=time.monotonic(),
+                on_sent=lambda _ts, seq=seq: sent.append(seq),
+            )
+        )
+    await asyncio.sleep(0)
+    assert not queue.is_idle()
+    assert await queue.wait_idle(timeout_s=1.0)
+    assert sent == [0, 1, 2]
+    queue.stop()
+
+
+def test_aimd_pacer_increases_additively_and_backs_off() -> None:
+    clock = [0.0]
+    pacer = AimdPacer(
+        initial_interval_s=0.1,
+        min_interval_s=0.02,
+        max_interval_s=1.0,
+        increase_per_s=5.0,
+        now=lambda: clock[0],
+    )
+    assert pacer.interval_s == pytest.approx(0.1)
+
+    for _ in range(3):
+        pacer.on_reply(0.03)
+    assert pacer.snapshot().rate_per_s == pytest.approx(25.0)
+
+    pacer.on_timeout()
+    pacer.on_timeout()  # within the cooldown: one episode, one decrease
+    snap = pacer.snapshot()
+    assert snap.rate_per_s == pytest.approx(12.5)
+    assert (snap.decreases, snap.last_decrease_reason) == (1, "timeout")
+
+    clock[0] = 2.0
+    pacer.on_reply(0.5)
+    assert pacer.snapshot().last_decrease_reason == "rtt_rise"
+
+    clock[0] = 4.0
+    for _ in range(3):
+        pacer.on_reply(0.03, error=True)
+    assert pacer.snapshot().last_decrease_reason == "error_burst"
+    assert pacer.interval_s == pytest.approx(1.0 / 3.125)
+
+
+def test_aimd_pacer_compares_rtt_within_route_class() -> None:
+    clock = [0.0]
+    pacer = AimdPacer(initial_interval_s=0.1, now=lambda: clock[0])
+
+    pacer.on_reply(0.02, route=("system", "r_u_alive"))
+    pacer.on_reply(0.6, route=("zone", "get_all_zones_status"))
+    pacer.on_reply(0.04, route=("zone", "get_attribs"))
+    assert pacer.decreases == 0
+
+    pacer.on_reply(0.5, route=("area", "get_attribs"))
+    assert pacer.snapshot().last_decrease_reason == "rtt_rise"
+
+
+def test_outbound_queue_uses_pacer_interval() -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        pacer = AimdPacer(initial_interval_s=0.2, min_interval_s=0.01, max_interval_s=1.0)
+        queue = OutboundQueue(loop=loop, send_fn=lambda _p: None, min_interval_s=0.05, pacer=pacer)
+        assert queue.send_interval_s == pytest.approx(0.2)
+        pacer.on_reply(0.01)
+        assert queue.send_interval_s == pytest.approx(1.0 / 6.0)
+    finally:
+        loop.close()
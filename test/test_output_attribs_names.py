@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from elke27_lib.const import E27ErrorCode
 from elke27_lib.dispatcher import DispatchContext
-from elke27_lib.events import Event
+from elke27_lib.events import Event, OutputAttribsUpdated
 from elke27_lib.handlers.output import make_output_get_attribs_handler
 from elke27_lib.states import PanelState
 from test.helpers.dispatch import make_ctx
@@ -31,3 +31,10 @@ def test_output_get_attribs_sets_name() -> None:
     }
     assert handler(msg, _Ctx()) is True
     assert state.outputs[1].name == "Aux 1"
+    (evt,) = emit.events
+    assert isinstance(evt, OutputAttribsUpdated)
+    assert evt.changed_fields == ("name",)
+
+    emit.events.clear()
+    assert handler(msg, _Ctx()) is True
+    assert emit.events == []
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from elke27_lib import Elke27Client
+from elke27_lib.manager import (
+    PANEL_FAILED,
+    PANEL_READY,
+    PanelEvent,
+    PanelManager,
+    PanelManagerConfig,
+    PanelSpec,
+)
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+from elke27_lib.types import ClientConfig
+from elke27_lib.virtual_time import VIRTUAL_LINK_KEYS, VirtualPanel, run_virtual
+
+
+def _virtual_fleet(panels: dict[str, VirtualPanel], connect_times: list[float]) -> Any:
+    def factory(spec: PanelSpec, config: ClientConfig) -> Elke27Client:
+        loop = asyncio.get_running_loop()
+        panel = panels[spec.panel_id]
+
+        def session_factory(*args: Any, **kwargs: Any) -> Any:
+            if panel.latency_s < 0:
+                raise OSError("connection refused")
+            connect_times.append(loop.time())
+            return panel.session_factory(*args, **kwargs)
+
+        return Elke27Client(config, now_monotonic=loop.time, session_factory=session_factory)
+
+    return factory
+
+
+def test_fleet_startup_is_staggered_and_bounded() -> None:
+    panel_ids = [f"p{i}" for i in range(12)]
+    panels = {pid: VirtualPanel(latency_s=0.2, seed=i) for i, pid in enumerate(panel_ids)}
+    connect_times: list[float] = []
+    config = PanelManagerConfig(max_concurrent_bootstraps=3, stagger_s=0.5, event_queue_size=10_000)
+
+    async def main() -> tuple[Any, list[PanelEvent]]:
+        manager = PanelManager(config, client_factory=_virtual_fleet(panels, connect_times))
+        for pid in panel_ids:
+            manager.add_panel(PanelSpec(pid, "virtual", 2101, VIRTUAL_LINK_KEYS))
+        await manager.start()
+        assert await manager.wait_settled(timeout_s=600.0)
+        panels["p7"].broadcast_zone(3)
+        await asyncio.sleep(1.0)
+        health = manager.health()
+        await manager.stop()
+        return health, [item async for item in manager.events()]
+
+    health, events = run_virtual(main())
+
+    assert health.ready == len(panel_ids)
+    assert health.peak_bootstraps_in_flight == 3
+    assert health.bootstraps_in_flight == 0
+    gaps = [
+        later - earlier for earlier, later in zip(connect_times, connect_times[1:], strict=False)
+    ]
+    assert min(gaps) >= 0.5 - 1e-6
+    slowest = max(panel.bootstrap_s or 0.0 for panel in health.panels.values())
+    assert health.startup_s is not None
+    assert health.startup_s <= config.startup_bound_s(len(panel_ids), slowest)
+    assert all(panel.requests_sent > 0 for panel in health.panels.values())
+
+    assert {item.panel_id for item in events} == set(panel_ids)
+    zone_events = [
+        item
+        for item in events
+        if item.event.raw_type == "zone_status_updated"
+        and item.event.data.get("zone_id") == 3
+        and "violated" in item.event.data.get("changed_fields", ())
+    ]
+    assert zone_events and {item.panel_id for item in zone_events} == {"p7"}
+
+
+def test_failed_panel_releases_its_slot_and_lost_panel_reconnects() -> None:
+    panels = {
+        "good": VirtualPanel(latency_s=0.02),
+        "bad": VirtualPanel(latency_s=-1.0),
+        "other": VirtualPanel(latency_s=0.02),
+    }
+    config = PanelManagerConfig(
+        max_concurrent_bootstraps=1,
+        stagger_s=0.1,
+        connect_retries=2,
+        retry_backoff_s=1.0,
+        reconnect_delay_s=2.0,
+    )
+
+    async def main() -> tuple[Any, Any]:
+        manager = PanelManager(config, client_factory=_virtual_fleet(panels, []))
+        for pid in ("bad", "good", "other"):
+            manager.add_panel(PanelSpec(pid, "virtual", 2101, VIRTUAL_LINK_KEYS))
+        await manager.start()
+        assert await manager.wait_settled(timeout_s=600.0)
+        settled = manager.health()
+        assert panels["good"].reset()
+        await asyncio.sleep(10.0)
+        after_reset = manager.health()
+        await manager.stop()
+        return settled, after_reset
+
+    settled, after_reset = run_virtual(main())
+
+    bad = settled.panels["bad"]
+    assert bad.status == PANEL_FAILED
+    assert bad.connect_attempts == 3
+    assert bad.last_error is not None
+    assert settled.ready == 2
+    assert settled.peak_bootstraps_in_flight == 1
+
+    good = after_reset.panels["good"]
+    assert good.status == PANEL_READY
+    assert good.reconnects == 1
+    assert good.connected
+    assert panels["good"].sessions == 2
+
+
+@pytest.mark.asyncio
+async def test_manager_uses_loop_io_sessions_against_simulator() -> None:
+    async with PanelSimulator(PanelSimulatorConfig(zones=8, outputs=2, seed=3)) as sim:
+        manager = PanelManager(
+            PanelManagerConfig(max_concurrent_bootstraps=2, stagger_s=0.0, reconnect_delay_s=0.05)
+        )
+        for i in range(3):
+            manager.add_panel(PanelSpec(f"sim{i}", sim.host, sim.port, SIMULATOR_LINK_KEYS))
+        await manager.start()
+        try:
+            assert await manager.wait_settled(timeout_s=10.0)
+            assert manager.health().ready == 3
+            loop = asyncio.get_running_loop()
+            for panel_id in manager.panel_ids:
+                session = manager.client(panel_id)._kernel._session
+                assert session is not None
+                assert session._reader_loop is loop
+                assert session._recv_task is None
+
+            await manager.client("sim1").async_set_output(2, on=True)
+            assert sim.outputs_on[2] is True
+
+            sim.disconnect_all()
+            for _ in range(100):
+                health = manager.health()
+                if health.ready == 3 and all(p.reconnects == 1 for p in health.panels.values()):
+                    break
+                await asyncio.sleep(0.05)
+            assert health.ready == 3
+            assert all(panel.reconnects == 1 for panel in health.panels.values())
+        finally:
+            await manager.stop()
+        assert not any(manager.client(pid).state.panel.connected for pid in manager.panel_ids)
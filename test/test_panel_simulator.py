@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from elke27_lib import Elke27Client
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+
+
+@pytest.mark.asyncio
+async def test_client_bootstraps_against_simulator() -> None:
+    config = PanelSimulatorConfig(areas=2, zones=40, outputs=3, configured_block_size=16, seed=1)
+    async with PanelSimulator(config) as sim:
+        client = Elke27Client()
+        await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+        try:
+            assert await client.wait_ready(timeout_s=10.0)
+            assert await client.wait_attribs_ready(timeout_s=10.0)
+            snapshot = client.snapshot
+            assert sorted(snapshot.zones) == list(range(1, 41))
+            assert sorted(snapshot.outputs) == [1, 2, 3]
+            assert snapshot.zones[17].name == "Zone 17"
+            assert sim.stats.by_route["zone.get_configured"] == 3
+
+            await client.async_set_output(2, on=True)
+            assert sim.outputs_on[2] is True
+            assert sim.stats.broadcasts == 1
+        finally:
+            await client.async_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_simulator_drops_replies_but_applies_commands() -> None:
+    async with PanelSimulator(PanelSimulatorConfig(zones=4, seed=2)) as sim:
+        client = Elke27Client()
+        await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+        try:
+            assert await client.wait_attribs_ready(timeout_s=10.0)
+            replies = sim.stats.replies
+            sim.config = replace(sim.config, drop_rate=1.0)
+            result = await client.async_execute(
+                "output_set_status", output_id=2, status="ON", timeout_s=0.3
+            )
+            assert not result.ok
+            assert sim.outputs_on[2] is True
+            assert sim.stats.dropped >= 1
+            assert sim.stats.replies == replies
+        finally:
+            await client.async_disconnect()
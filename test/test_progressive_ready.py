@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.events import (
+    UNSET_AT,
+    UNSET_CLASSIFICATION,
+    UNSET_ROUTE,
+    UNSET_SEQ,
+    UNSET_SESSION_ID,
+    AreaConfiguredInventoryReady,
+    Event,
+    OutputConfiguredInventoryReady,
+    ZoneConfiguredInventoryReady,
+)
+from elke27_lib.outbound import OutboundPriority
+from elke27_lib.session import SessionState
+from elke27_lib.types import ClientConfig
+from test.helpers.internal import get_kernel, get_private
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[tuple[dict[str, Any], object]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del on_fail
+        self.sent.append((msg, priority))
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+def _inventory_ready(cls: type[Event]) -> Event:
+    return cls(
+        kind=cls.KIND,
+        at=UNSET_AT,
+        seq=UNSET_SEQ,
+        classification=UNSET_CLASSIFICATION,
+        route=UNSET_ROUTE,
+        session_id=UNSET_SESSION_ID,
+    )
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_status_ready_precedes_background_attribs() -> None:
+    client = Elke27Client(
+        config=ClientConfig(response_cache_size=0), features=["elke27_lib.features.zone"]
+    )
+    kernel = get_kernel(client)
+    kernel.load_features_blocking()
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    cast(Any, client)._event_loop = asyncio.get_running_loop()
+    kernel.state.panel.session_id = 1
+    kernel.state.table_info_by_domain["zone"] = {"table_elements": 1}
+    kernel.state.inventory.configured_zones = {1}
+    kernel.state.get_or_create_zone(1)
+
+    handle_event = get_private(client, "_handle_kernel_event")
+    handle_event(_inventory_ready(AreaConfiguredInventoryReady))
+    handle_event(_inventory_ready(OutputConfiguredInventoryReady))
+    handle_event(_inventory_ready(ZoneConfiguredInventoryReady))
+    await _settle()
+
+    on_message = get_private(kernel, "_on_message")
+    bulk_msg, bulk_priority = session.sent[0]
+    assert list(bulk_msg["zone"]) == ["get_all_zones_status"]
+    assert bulk_priority is OutboundPriority.NORMAL
+    on_message(
+        {
+            "seq": bulk_msg["seq"],
+            "zone": {"get_all_zones_status": {"status": "1", "error_code": 0}},
+        }
+    )
+    await _settle()
+
+    assert client.ready
+    assert not client.attribs_ready
+
+    attribs_msg, attribs_priority = session.sent[1]
+    assert list(attribs_msg["zone"]) == ["get_attribs"]
+    assert attribs_priority is OutboundPriority.LOW
+    on_message(
+        {
+            "seq": attribs_msg["seq"],
+            "zone": {"get_attribs": {"zone_id": 1, "name": "Front", "error_code": 0}},
+        }
+    )
+
+    assert await client.wait_attribs_ready(timeout_s=1.0)
+    assert kernel.state.zones[1].name == "Front"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from elke27_lib.errors import Elke27Error
+from elke27_lib.manager import PanelManagerConfig, PanelSpec
+from elke27_lib.proxy import ProxyClient, ProxyConfig, ProxyServer
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+
+_MANAGER_CONFIG = PanelManagerConfig(stagger_s=0.0)
+
+
+@pytest.mark.asyncio
+async def test_consumers_share_one_session_and_see_each_others_commands(tmp_path: Path) -> None:
+    async with PanelSimulator(PanelSimulatorConfig(zones=16, outputs=2, seed=5)) as sim:
+        spec = PanelSpec("main", sim.host, sim.port, SIMULATOR_LINK_KEYS)
+        config = ProxyConfig(unix_path=str(tmp_path / "proxy.sock"), manager=_MANAGER_CONFIG)
+        async with ProxyServer([spec], config) as proxy:
+            assert await proxy.manager.wait_settled(timeout_s=10.0)
+            assert os.stat(config.unix_path).st_mode & 0o777 == 0o600
+            first = await ProxyClient.connect(path=config.unix_path)
+            second = await ProxyClient.connect(path=config.unix_path)
+            try:
+                assert [p["panel_id"] for p in await second.panels()] == ["main"]
+                snapshot = await second.snapshot("main")
+                assert sorted(snapshot.zones) == list(range(1, 17))
+                assert snapshot == proxy.manager.client("main").snapshot
+
+                await first.subscribe()
+                await second.subscribe(["main"])
+                result = await first.execute(
+                    "output_set_status", panel_id="main", output_id=2, status="ON"
+                )
+                assert result.ok
+                assert sim.outputs_on[2] is True
+
+                async def first_output_event(consumer: ProxyClient) -> str:
+                    async for item in consumer.events():
+                        if item.event.raw_type == "output_status_updated":
+                            return item.panel_id
+                    raise AssertionError("stream ended")
+
+                panels = await asyncio.wait_for(
+                    asyncio.gather(first_output_event(first), first_output_event(second)), 5.0
+                )
+                assert panels == ["main", "main"]
+                assert sim.session_count == 1
+                assert proxy.stats.consumers == 2
+
+                failed = await second.execute("zone_get_status", panel_id="nope", zone_id=1)
+                assert not failed.ok
+            finally:
+                await first.close()
+                await second.close()
+
+
+@pytest.mark.asyncio
+async def test_commands_are_scheduled_fairly_across_consumers() -> None:
+    config = PanelSimulatorConfig(zones=8, latency_s=0.01, seed=6)
+    async with PanelSimulator(config) as sim:
+        spec = PanelSpec("main", sim.host, sim.port, SIMULATOR_LINK_KEYS)
+        async with ProxyServer(
+            [spec], ProxyConfig(max_inflight_per_panel=1, token="s3cret", manager=_MANAGER_CONFIG)
+        ) as proxy:
+            assert await proxy.manager.wait_settled(timeout_s=10.0)
+            busy = await ProxyClient.connect(port=proxy.port, token="s3cret")
+            quiet = await ProxyClient.connect(port=proxy.port, token="s3cret")
+            order: list[str] = []
+
+            async def run(consumer: ProxyClient, name: str, zone_id: int) -> None:
+                result = await consumer.execute("zone_get_status", zone_id=zone_id)
+                assert result.ok
+                order.append(name)
+
+            try:
+                busy_jobs = [asyncio.create_task(run(busy, "busy", 1 + i % 8)) for i in range(10)]
+                await asyncio.sleep(0)
+                quiet_jobs = [asyncio.create_task(run(quiet, "quiet", 1 + i)) for i in range(2)]
+                await asyncio.gather(*busy_jobs, *quiet_jobs)
+            finally:
+                await busy.close()
+                await quiet.close()
+
+            last_quiet = max(i for i, name in enumerate(order) if name == "quiet")
+            assert last_quiet < 6
+            assert proxy.stats.commands == 12
+
+
+@pytest.mark.asyncio
+async def test_tcp_proxy_requires_a_token_and_rejects_wrong_ones() -> None:
+    with pytest.raises(ValueError):
+        await ProxyServer([], ProxyConfig(manager=_MANAGER_CONFIG)).start()
+
+    config = ProxyConfig(token="s3cret", manager=_MANAGER_CONFIG)
+    async with ProxyServer([], config) as proxy:
+        with pytest.raises(Elke27Error) as excinfo:
+            await ProxyClient.connect(port=proxy.port, token="guess")
+        assert excinfo.value.code == "unauthorized"
+
+        anonymous = await ProxyClient.connect(port=proxy.port)
+        try:
+            with pytest.raises(Elke27Error):
+                await anonymous.panels()
+        finally:
+            await anonymous.close()
+
+        trusted = await ProxyClient.connect(port=proxy.port, token="s3cret")
+        try:
+            assert await trusted.panels() == []
+        finally:
+            await trusted.close()
+        assert proxy.stats.consumers_total == 3
@@ -26,6 +26,7 @@ from elke27_lib import (
     ZoneState,
     redact_for_diagnostics,
 )
+from elke27_lib.bootstrap_timeline import BootstrapTimeline
 from elke27_lib.discovery import E27System
 from elke27_lib.errors import E27ProvisioningTimeout, Elke27AuthError
 from elke27_lib.events import (
@@ -141,6 +142,7 @@ async def test_async_connect_disconnect_and_wait_ready(monkeypatch: MonkeyPatch)
     class _FakeKernel:
         _ready: bool
         state: object
+        bootstrap_timeline: BootstrapTimeline | None = None
 
         def __init__(self) -> None:
             self._ready = False
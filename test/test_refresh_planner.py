@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.events import (
+    UNSET_AT,
+    UNSET_CLASSIFICATION,
+    UNSET_ROUTE,
+    UNSET_SEQ,
+    UNSET_SESSION_ID,
+    CsmSnapshotUpdated,
+    OutputConfiguredUpdated,
+)
+from elke27_lib.outbound import OutboundPriority
+from elke27_lib.refresh_planner import (
+    RefreshRequest,
+    diff_csm_snapshots,
+    plan_config_refresh,
+    plan_new_entity_requests,
+)
+from elke27_lib.types import CsmDiff, CsmSnapshot
+from test.helpers.internal import get_kernel, get_private
+
+
+def _block_payload(**kwargs: Any) -> dict[str, Any]:
+    return dict(kwargs)
+
+
+def _register_output_routes(kernel: Any) -> None:
+    for name in ("get_table_info", "get_configured", "get_attribs", "get_status"):
+        kernel.requests.register(("output", name), _block_payload)
+
+
+def _snapshot(domain_csms: dict[str, int], table_csms: dict[str, int]) -> CsmSnapshot:
+    return CsmSnapshot(
+        domain_csms=domain_csms,
+        table_csms=table_csms,
+        version=1,
+        updated_at=datetime.now(UTC),
+    )
+
+
+def test_diff_reports_only_changed_domains() -> None:
+    old = _snapshot({"zone": 1, "output": 2}, {"zone": 10, "output": 20})
+    new = _snapshot({"zone": 1, "output": 3}, {"zone": 10, "output": 20, "area": 5})
+
+    diff = diff_csm_snapshots(old, new)
+
+    assert diff.changed_domain_csms == {"output"}
+    assert diff.changed_table_csms == {"area"}
+
+
+def test_output_change_plans_no_zone_requests() -> None:
+    plan = plan_config_refresh(CsmDiff(changed_domain_csms={"output"}, changed_table_csms=set()))
+
+    assert [req.route for req in plan] == [
+        ("output", "get_table_info"),
+        ("output", "get_configured"),
+    ]
+
+
+def test_zone_table_change_plans_configured_and_defs() -> None:
+    plan = plan_config_refresh(CsmDiff(changed_domain_csms={"zone"}, changed_table_csms={"zone"}))
+
+    assert plan == (
+        RefreshRequest(("zone", "get_configured"), (("block_id", 1),)),
+        RefreshRequest(("zone", "get_defs"), (("block_id", 1),)),
+    )
+
+
+def test_new_entity_requests_cover_added_ids_only() -> None:
+    plan = plan_new_entity_requests("output", before={1, 2}, after={1, 2, 5})
+
+    assert [(req.route, req.kwargs()) for req in plan] == [
+        (("output", "get_attribs"), {"output_id": 5}),
+        (("output", "get_status"), {"output_id": 5}),
+    ]
+
+
+def test_reconnect_csm_change_refreshes_only_changed_domain() -> None:
+    client = Elke27Client()
+    kernel = get_kernel(client)
+    kernel.state.inventory.configured_outputs = {1, 2}
+    _register_output_routes(kernel)
+    recorded: list[tuple[tuple[str, str], OutboundPriority, dict[str, object]]] = []
+
+    def _fake_request(
+        route: tuple[str, str], *, priority: OutboundPriority, **kwargs: object
+    ) -> int:
+        recorded.append((route, priority, dict(kwargs)))
+        return 1
+
+    cast(Any, kernel).request_unless_pending = _fake_request
+    client_any = cast(Any, client)
+    client_any._awaiting_reconnect_csm_check = True
+    client_any._reconnect_csm_snapshot = _snapshot({"zone": 1, "output": 2}, {})
+
+    handle_event = get_private(client, "_handle_kernel_event")
+    handle_event(
+        CsmSnapshotUpdated(
+            kind=CsmSnapshotUpdated.KIND,
+            at=UNSET_AT,
+            seq=UNSET_SEQ,
+            classification=UNSET_CLASSIFICATION,
+            route=UNSET_ROUTE,
+            session_id=UNSET_SESSION_ID,
+            snapshot=_snapshot({"zone": 1, "output": 3}, {}),
+        )
+    )
+
+    assert {route[0] for route, _priority, _kwargs in recorded} == {"output"}
+    assert all(priority is OutboundPriority.LOW for _route, priority, _kwargs in recorded)
+
+    recorded.clear()
+    kernel.state.inventory.configured_outputs = {1, 2, 3}
+    handle_event(
+        OutputConfiguredUpdated(
+            kind=OutputConfiguredUpdated.KIND,
+            at=UNSET_AT,
+            seq=UNSET_SEQ,
+            classification=UNSET_CLASSIFICATION,
+            route=UNSET_ROUTE,
+            session_id=UNSET_SESSION_ID,
+            configured_ids=(1, 2, 3),
+        )
+    )
+
+    assert [(route, kwargs) for route, _priority, kwargs in recorded] == [
+        (("output", "get_attribs"), {"output_id": 3}),
+        (("output", "get_status"), {"output_id": 3}),
+    ]
+
+
+class _HoldingSession:
+    cfg: object
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_sent, on_fail
+        self.sent.append(msg)
+
+
+@pytest.mark.asyncio
+async def test_request_unless_pending_skips_queued_duplicates() -> None:
+    client = Elke27Client()
+    kernel = get_kernel(client)
+    session = _HoldingSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    _register_output_routes(kernel)
+
+    first = kernel.request_unless_pending(("output", "get_configured"), block_id=1)
+    second = kernel.request_unless_pending(
+        ("output", "get_configured"), priority=OutboundPriority.LOW, block_id=1
+    )
+    other = kernel.request_unless_pending(("output", "get_configured"), block_id=2)
+    await asyncio.sleep(0)
+
+    assert isinstance(first, int)
+    assert second is None
+    assert isinstance(other, int)
+    assert len(session.sent) == 1
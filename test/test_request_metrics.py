@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.kernel import E27Kernel
+from elke27_lib.request_metrics import LatencyHistogram
+from elke27_lib.session import SessionState
+from test.helpers.internal import get_kernel, get_private
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 10.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[tuple[dict[str, Any], Callable[[float], None] | None]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append((msg, on_sent))
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    hist = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 0.5, 3.0):
+        hist.observe(value)
+
+    snap = hist.snapshot()
+    assert snap.counts == (1, 2, 1, 1)
+    assert snap.count == 5
+    assert snap.max_s == 3.0
+    assert snap.quantile(0.5) == 0.1
+    assert snap.quantile(1.0) == 3.0
+    with pytest.raises(ValueError):
+        snap.quantile(1.5)
+
+
+def test_kernel_records_queue_wait_rtt_and_timeouts() -> None:
+    clock = _Clock()
+    client = Elke27Client(kernel=E27Kernel(now_monotonic=clock))
+    kernel = get_kernel(client)
+    kernel.requests.register(("zone", "get_attribs"), lambda **kw: {"zone_id": kw["zone_id"]})
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+
+    kernel.request(("zone", "get_attribs"), zone_id=1)
+    msg, on_sent = session.sent[0]
+    clock.t = 10.02
+    assert on_sent is not None
+    on_sent(0.0)
+    clock.t = 10.32
+    get_private(kernel, "_on_message")(
+        {"seq": msg["seq"], "zone": {"get_attribs": {"zone_id": 1, "error_code": 0}}}
+    )
+
+    kernel.request(("zone", "get_attribs"), zone_id=2)
+    msg, on_sent = session.sent[1]
+    assert on_sent is not None
+    on_sent(0.0)
+    get_private(kernel, "_on_reply_timeout")(msg["seq"])
+
+    snapshot = client.request_metrics()
+    route = snapshot.routes[("zone", "get_attribs")]
+    assert (route.sent, route.replies, route.timeouts, route.send_failures) == (2, 1, 1, 0)
+    assert route.queue_wait.max_s == pytest.approx(0.02)
+    assert route.rtt.count == 1
+    assert route.rtt.sum_s == pytest.approx(0.3)
+    assert route.total.sum_s == pytest.approx(0.32)
+    assert snapshot.timeouts == 1
+
+
+def test_kernel_feeds_adaptive_pacer_and_reports_it() -> None:
+    clock = _Clock()
+    kernel = E27Kernel(now_monotonic=clock, adaptive_pacing=True, outbound_min_interval_s=0.1)
+    kernel.requests.register(("zone", "get_status"), lambda **kw: {"zone_id": kw["zone_id"]})
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    on_message = get_private(kernel, "_on_message")
+
+    for error_code in (0, 11, 11, 11):
+        kernel.request(("zone", "get_status"), zone_id=1)
+        msg, on_sent = session.sent[-1]
+        assert on_sent is not None
+        on_sent(0.0)
+        clock.t += 0.02
+        on_message(
+            {"seq": msg["seq"], "zone": {"get_status": {"zone_id": 1, "error_code": error_code}}}
+        )
+
+    pacing = kernel.metrics_snapshot().pacing
+    assert pacing is not None
+    assert (pacing.increases, pacing.decreases) == (1, 1)
+    assert pacing.last_decrease_reason == "error_burst"
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.errors import E27Timeout
+from elke27_lib.kernel import E27Kernel
+from elke27_lib.outbound import OutboundPriority
+from elke27_lib.request_scheduler import (
+    REQUEST_CLASS_BACKGROUND,
+    REQUEST_CLASS_INTERACTIVE,
+    REQUEST_CLASS_KEEPALIVE,
+    REQUEST_CLASS_STATUS,
+    RequestScheduler,
+    classify_request,
+)
+from elke27_lib.session import SessionState
+from test.helpers.internal import get_private
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append(msg)
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+def _route_of(msg: dict[str, Any]) -> tuple[str, str]:
+    for key, value in msg.items():
+        if key not in ("seq", "session_id") and isinstance(value, dict):
+            return key, next(iter(cast(dict[str, Any], value)))
+    raise AssertionError(msg)
+
+
+def _reply(kernel: E27Kernel, msg: dict[str, Any]) -> None:
+    domain, name = _route_of(msg)
+    get_private(kernel, "_on_message")({"seq": msg["seq"], domain: {name: {"error_code": 0}}})
+
+
+def test_classify_request() -> None:
+    normal = OutboundPriority.NORMAL
+    assert classify_request(("system", "r_u_alive"), normal) == REQUEST_CLASS_KEEPALIVE
+    assert classify_request(("area", "set_arm_state"), normal) == REQUEST_CLASS_INTERACTIVE
+    assert classify_request(("zone", "get_status"), OutboundPriority.HIGH) == "interactive"
+    assert classify_request(("zone", "get_all_zones_status"), normal) == REQUEST_CLASS_STATUS
+    assert classify_request(("zone", "get_status"), OutboundPriority.LOW) == "background"
+    assert classify_request(("zone", "get_configured"), normal) == REQUEST_CLASS_BACKGROUND
+
+
+def test_scheduler_preempts_and_shares_by_weight() -> None:
+    scheduler: RequestScheduler[str] = RequestScheduler(weights={"status": 3, "background": 1})
+    for i in range(8):
+        scheduler.push(f"b{i}", REQUEST_CLASS_BACKGROUND)
+        scheduler.push(f"s{i}", REQUEST_CLASS_STATUS)
+
+    first = [scheduler.pop() for _ in range(8)]
+    assert sum(1 for item in first if item and item.startswith("s")) == 6
+
+    scheduler.push("arm", REQUEST_CLASS_INTERACTIVE)
+    assert scheduler.pop() == "arm"
+    assert len(scheduler) == 8
+
+    with pytest.raises(ValueError):
+        scheduler.push("x", "bogus")
+
+
+def test_scheduler_drops_expired_items() -> None:
+    scheduler: RequestScheduler[str] = RequestScheduler()
+    scheduler.push("old", REQUEST_CLASS_BACKGROUND, deadline=1.0)
+    scheduler.push("keep", REQUEST_CLASS_BACKGROUND)
+    scheduler.push("late", REQUEST_CLASS_BACKGROUND, deadline=5.0)
+
+    assert scheduler.drop_expired(0.5) == []
+    assert scheduler.drop_expired(2.0) == ["old"]
+    assert list(scheduler) == ["keep", "late"]
+    assert scheduler.pop() == "keep"
+    assert scheduler.pop() == "late"
+    assert scheduler.drop_expired(10.0) == []
+    assert scheduler.pop() is None
+    assert scheduler.expired_total == 1
+
+
+def test_kernel_sends_command_ahead_of_queued_crawl() -> None:
+    kernel = E27Kernel(now_monotonic=_Clock())
+    kernel.requests.register(("zone", "get_attribs"), lambda **kw: {"zone_id": kw["zone_id"]})
+    kernel.requests.register(("area", "set_arm_state"), lambda **kw: {"area_id": kw["area_id"]})
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+
+    for zone_id in range(1, 6):
+        kernel.request(("zone", "get_attribs"), priority=OutboundPriority.LOW, zone_id=zone_id)
+    kernel.request(("area", "set_arm_state"), area_id=1)
+    assert kernel.request_queue_depths()["interactive"] == 1
+
+    _reply(kernel, session.sent[0])
+    assert _route_of(session.sent[1]) == ("area", "set_arm_state")
+
+
+@pytest.mark.asyncio
+async def test_kernel_drops_expired_background_request() -> None:
+    clock = _Clock()
+    kernel = E27Kernel(now_monotonic=clock, request_class_deadlines_s={"background": 1.0})
+    kernel.requests.register(("zone", "get_attribs"), lambda **kw: {"zone_id": kw["zone_id"]})
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    loop = asyncio.get_running_loop()
+
+    kernel.request(("zone", "get_attribs"), zone_id=1)
+    _seq, future, _sent = kernel.submit_for_response(
+        "zone",
+        "get_attribs",
+        {"zone_id": 2},
+        command_key="zone_get_attribs",
+        expected_route=("zone", "get_attribs"),
+        timeout_s=None,
+        loop=loop,
+    )
+    clock.t = 2.0
+    _reply(kernel, session.sent[0])
+
+    assert len(session.sent) == 1
+    with pytest.raises(E27Timeout):
+        await future
+    assert kernel.metrics_snapshot().expired == 1
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.events import (
+    UNSET_AT,
+    UNSET_CLASSIFICATION,
+    UNSET_ROUTE,
+    UNSET_SEQ,
+    UNSET_SESSION_ID,
+    TableCsmChanged,
+)
+from elke27_lib.generators.registry import COMMANDS
+from elke27_lib.response_cache import ResponseCache, is_cacheable_command, make_cache_key
+from elke27_lib.session import SessionState
+from elke27_lib.types import ClientConfig
+from test.helpers.internal import get_kernel, get_private
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append(msg)
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+def test_cacheable_commands_exclude_status_and_pin_gated() -> None:
+    assert is_cacheable_command(COMMANDS["zone_get_attribs"])
+    assert is_cacheable_command(COMMANDS["zone_get_defs"])
+    assert is_cacheable_command(COMMANDS["keypad_get_attribs"])
+    assert not is_cacheable_command(COMMANDS["zone_get_status"])
+    assert not is_cacheable_command(COMMANDS["user_get_attribs"])
+    assert not is_cacheable_command(COMMANDS["user_get_def_flags"])
+
+
+def test_cacheable_commands_exclude_domains_without_csm() -> None:
+    assert is_cacheable_command(COMMANDS["output_get_attribs"])
+    for key in (
+        "log_get_attribs",
+        "system_get_attribs",
+        "timer_get_attribs",
+        "network_get_table_info",
+    ):
+        assert not is_cacheable_command(COMMANDS[key])
+    assert not any(
+        is_cacheable_command(spec)
+        for spec in COMMANDS.values()
+        if spec.domain not in {"area", "zone", "output", "keypad", "user", "tstat"}
+    )
+
+
+def test_lru_eviction_and_domain_invalidation() -> None:
+    cache = ResponseCache(maxsize=2)
+    key_a = make_cache_key("zone_get_attribs", {"zone_id": 1})
+    key_b = make_cache_key("zone_get_attribs", {"zone_id": 2})
+    key_c = make_cache_key("area_get_attribs", {"area_id": 1})
+    assert key_a is not None and key_b is not None and key_c is not None
+
+    cache.put(key_a, "zone", {"name": "A"}, generation=cache.generation("zone"))
+    cache.put(key_b, "zone", {"name": "B"}, generation=cache.generation("zone"))
+    assert cache.get(key_a) == {"name": "A"}
+    cache.put(key_c, "area", {"name": "C"}, generation=cache.generation("area"))
+
+    assert cache.get(key_b) is None
+    assert cache.evictions == 1
+
+    stale_generation = cache.generation("zone")
+    assert cache.invalidate_domain("zone") == 1
+    cache.put(key_a, "zone", {"name": "late"}, generation=stale_generation)
+    assert cache.get(key_a) is None
+    assert cache.get(key_c) == {"name": "C"}
+
+
+async def _execute_zone_attribs(
+    client: Elke27Client, session: _FakeSession, *, reply_name: str
+) -> Any:
+    task = asyncio.create_task(client.async_execute("zone_get_attribs", zone_id=1))
+    for _ in range(10):
+        await asyncio.sleep(0)
+        if task.done():
+            return await task
+        if session.sent and "_answered" not in session.sent[-1]:
+            msg = session.sent[-1]
+            msg["_answered"] = True
+            on_message = get_private(get_kernel(client), "_on_message")
+            on_message(
+                {
+                    "seq": msg["seq"],
+                    "zone": {"get_attribs": {"zone_id": 1, "name": reply_name, "error_code": 0}},
+                }
+            )
+    return await task
+
+
+@pytest.mark.asyncio
+async def test_async_execute_serves_cached_attribs_until_csm_changes() -> None:
+    client = Elke27Client(config=ClientConfig(response_cache_size=8))
+    kernel = get_kernel(client)
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    kernel.state.inventory.configured_zones = {1}
+
+    first = await _execute_zone_attribs(client, session, reply_name="Front")
+    second = await _execute_zone_attribs(client, session, reply_name="unused")
+
+    assert first.ok and second.ok
+    assert second.data == first.data
+    assert len(session.sent) == 1
+
+    handle_event = get_private(client, "_handle_kernel_event")
+    handle_event(
+        TableCsmChanged(
+            kind=TableCsmChanged.KIND,
+            at=UNSET_AT,
+            seq=UNSET_SEQ,
+            classification=UNSET_CLASSIFICATION,
+            route=UNSET_ROUTE,
+            session_id=UNSET_SESSION_ID,
+            csm_domain="zone",
+            old=1,
+            new=2,
+        )
+    )
+    third = await _execute_zone_attribs(client, session, reply_name="Back")
+
+    assert third.ok
+    assert len(session.sent) == 2
+    assert third.data is not None and third.data.get("name") == "Back"
+
+
+@pytest.mark.asyncio
+async def test_table_info_is_never_cached_so_table_csm_changes_get_through() -> None:
+    client = Elke27Client(config=ClientConfig(response_cache_size=8))
+    kernel = get_kernel(client)
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    on_message = get_private(kernel, "_on_message")
+    assert not is_cacheable_command(COMMANDS["zone_get_table_info"])
+
+    for table_csm in (1, 2):
+        task = asyncio.create_task(client.async_execute("zone_get_table_info"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+            if len(session.sent) == table_csm:
+                break
+        reply = {"table_elements": 8, "table_csm": table_csm, "error_code": 0}
+        on_message({"seq": session.sent[-1]["seq"], "zone": {"get_table_info": reply}})
+        result = await task
+        assert result.ok
+        assert result.data is not None and result.data["table_csm"] == table_csm
+
+    assert len(session.sent) == 2
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.kernel import E27Kernel
+from elke27_lib.rto import RtoEstimator, route_class
+from elke27_lib.session import SessionState
+from test.helpers.internal import get_private
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append(msg)
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+def test_estimator_follows_jacobson_karels_and_backs_off() -> None:
+    est = RtoEstimator(initial_s=5.0, floor_s=0.2, ceiling_s=8.0)
+    assert est.rto_s == 5.0
+
+    est.observe(0.1)
+    assert (est.srtt_s, est.rttvar_s) == (0.1, 0.05)
+    assert est.rto_s == pytest.approx(0.3)
+
+    est.observe(0.1)
+    assert est.rttvar_s == pytest.approx(0.0375)
+    assert est.rto_s == pytest.approx(0.25)
+
+    for _ in range(50):
+        est.observe(0.01)
+    assert est.rto_s == 0.2
+
+    est.backoff()
+    est.backoff()
+    assert est.rto_s == pytest.approx(0.8)
+    for _ in range(10):
+        est.backoff()
+    assert est.rto_s == 8.0
+
+
+def test_route_classes() -> None:
+    assert route_class(("system", "r_u_alive")) == "keepalive"
+    assert route_class(("zone", "get_all_zones_status")) == "bulk"
+    assert route_class(("zone", "get_configured")) == "bulk"
+    assert route_class(("zone", "get_status")) == "read"
+    assert route_class(("area", "set_status")) == "command"
+
+
+def test_kernel_arms_adaptive_timeout_unless_explicit() -> None:
+    clock = _Clock()
+    kernel = E27Kernel(now_monotonic=clock, request_timeout_s=5.0, request_timeout_min_s=0.25)
+    kernel.requests.register(("zone", "get_status"), lambda **kw: {"zone_id": kw["zone_id"]})
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    armed: list[float] = []
+    cast(Any, kernel)._arm_reply_timeout = lambda _seq, timeout_s: armed.append(timeout_s)
+    on_message = get_private(kernel, "_on_message")
+
+    for zone_id in range(1, 6):
+        kernel.request(("zone", "get_status"), zone_id=zone_id)
+        clock.t += 0.04
+        on_message(
+            {
+                "seq": session.sent[-1]["seq"],
+                "zone": {"get_status": {"zone_id": zone_id, "error_code": 0}},
+            }
+        )
+
+    assert armed[0] == 5.0
+    assert armed[-1] < 0.5
+    assert kernel.metrics_snapshot().rto["read"].samples == 5
+
+    seq = kernel.next_seq()
+    kernel.send_request_with_seq(
+        seq,
+        "zone",
+        "get_status",
+        {"zone_id": 1},
+        pending=False,
+        opaque=None,
+        expected_route=("zone", "get_status"),
+        timeout_s=7.0,
+    )
+    assert armed[-1] == 7.0
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+from collections.abc import Callable
+from dataclasses import replace
+
+import pytest
+
+from elke27_lib.errors import Elke27DisconnectedError
+from elke27_lib.manager import PanelEvent, PanelManagerConfig, PanelSpec
+from elke27_lib.shard import (
+    ShardConfig,
+    ShardedPanelRunner,
+    apply_snapshot_delta,
+    snapshot_delta,
+)
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+from elke27_lib.types import OutputState, PanelSnapshot, TableInfo, ZoneState
+
+
+def test_snapshot_delta_round_trip_ships_only_changes() -> None:
+    empty = PanelSnapshot.empty()
+    first = replace(
+        empty,
+        table_info=TableInfo(zones=3),
+        zones={i: ZoneState(zone_id=i, name=f"Zone {i}") for i in (1, 2, 3)},
+        outputs={1: OutputState(output_id=1, state=False)},
+        version=1,
+    )
+    second = replace(
+        first,
+        zones={**first.zones, 2: ZoneState(zone_id=2, name="Zone 2", open=True)},
+        outputs={},
+        version=2,
+    )
+
+    full = snapshot_delta(None, first)
+    assert full.full
+    mirror = apply_snapshot_delta(empty, full)
+    assert mirror == first
+
+    delta = snapshot_delta(first, second)
+    assert not delta.full
+    assert delta.table_info is None
+    assert delta.entity_count == 1
+    assert delta.changes["zones"] == {2: second.zones[2]}
+    assert delta.removed == {"outputs": (1,)}
+    assert apply_snapshot_delta(mirror, delta) == second
+
+
+@pytest.mark.asyncio
+async def test_execute_without_live_worker_returns_failure() -> None:
+    runner = ShardedPanelRunner()
+    panel = runner.add_panel(PanelSpec("p0", "127.0.0.1", 1, SIMULATOR_LINK_KEYS))
+
+    result = await panel.async_execute("output_set_status", output_id=1, status="ON")
+
+    assert not result.ok
+    assert isinstance(result.error, Elke27DisconnectedError)
+
+
+async def _until(predicate: Callable[[], bool], timeout_s: float = 10.0) -> bool:
+    for _ in range(int(timeout_s / 0.05)):
+        if predicate():
+            return True
+        await asyncio.sleep(0.05)
+    return predicate()
+
+
+@pytest.mark.asyncio
+async def test_sharded_runner_mirrors_panels_and_rebalances_after_worker_death() -> None:
+    config = PanelSimulatorConfig(zones=12, outputs=2, seed=4)
+    async with PanelSimulator(config) as sim:
+        runner = ShardedPanelRunner(
+            ShardConfig(
+                workers=2,
+                manager=PanelManagerConfig(stagger_s=0.0, reconnect_delay_s=0.1),
+            )
+        )
+        panel_ids = [f"p{i}" for i in range(4)]
+        for panel_id in panel_ids:
+            runner.add_panel(PanelSpec(panel_id, sim.host, sim.port, SIMULATOR_LINK_KEYS))
+        events: list[PanelEvent] = []
+        runner.subscribe(events.append)
+        await runner.start()
+        try:
+            assert await runner.wait_settled(timeout_s=30.0)
+            assert {runner.worker_of(pid) for pid in panel_ids} == {0, 1}
+            assert await _until(lambda: all(len(runner.snapshot(p).zones) == 12 for p in panel_ids))
+            assert {item.panel_id for item in events} == set(panel_ids)
+
+            result = await runner.panel("p1").async_execute(
+                "output_set_status", output_id=2, status="ON"
+            )
+            assert result.ok
+            assert sim.outputs_on[2] is True
+            assert await _until(lambda: runner.snapshot("p3").outputs[2].state is True)
+
+            victim = runner.worker_of("p0")
+            assert victim is not None
+            old_pid = runner.worker_pids[victim]
+            assert old_pid is not None
+            os.kill(old_pid, signal.SIGKILL)
+            assert await _until(lambda: runner.worker_deaths == 1)
+            assert runner.worker_pids[victim] not in (None, old_pid)
+            assert await runner.wait_settled(timeout_s=30.0)
+            health = await runner.health()
+            assert health.ready == len(panel_ids)
+            assert sorted(health.panels) == panel_ids
+        finally:
+            await runner.stop()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from dataclasses import replace
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from elke27_lib import Elke27Client
+from elke27_lib.shared_snapshot import (
+    SnapshotPublisher,
+    SnapshotReader,
+    decode_snapshot,
+    encode_snapshot,
+)
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+from elke27_lib.types import (
+    AreaState,
+    ArmMode,
+    ClientConfig,
+    OutputDefinition,
+    OutputState,
+    PanelInfo,
+    PanelSnapshot,
+    TableInfo,
+    ZoneDefinition,
+    ZoneState,
+)
+
+
+def _snapshot(version: int, zones: int = 4) -> PanelSnapshot:
+    # Every zone name carries the version so torn reads are detectable.
+    return replace(
+        PanelSnapshot.empty(),
+        panel=PanelInfo(mac="00:11:22:33:44:55", model="E27", firmware=None, serial="S1"),
+        table_info=TableInfo(areas=1, zones=zones, outputs=1, tstats=None),
+        areas={1: AreaState(area_id=1, name="Main", arm_mode=ArmMode.ARMED_AWAY, chime=False)},
+        zones={
+            i: ZoneState(zone_id=i, name=f"v{version}", open=i % 2 == 0, pending=i == 1)
+            for i in range(1, zones + 1)
+        },
+        zone_definitions={2: ZoneDefinition(zone_id=2, name="Door", zone_type="burglar")},
+        outputs={1: OutputState(output_id=1, name="Siren", state=None, pending=True)},
+        output_definitions={1: OutputDefinition(output_id=1, name="Siren")},
+        version=version,
+        updated_at=datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+    )
+
+
+def test_encoding_round_trips_every_field() -> None:
+    snapshot = _snapshot(7)
+    assert decode_snapshot(encode_snapshot(snapshot)) == snapshot
+    empty = PanelSnapshot.empty()
+    assert decode_snapshot(encode_snapshot(empty)) == empty
+
+
+def test_reader_follows_publishes_and_file_growth(tmp_path: Path) -> None:
+    path = tmp_path / "panel.snap"
+    publisher = SnapshotPublisher(path, capacity=1024)
+    with SnapshotReader(path) as reader:
+        assert reader.read() is None
+        publisher.publish(_snapshot(1))
+        assert reader.read() == _snapshot(1)
+        assert reader.read_if_newer(1) is None
+
+        big = _snapshot(2, zones=200)
+        publisher.publish(big)
+        assert publisher.resizes == 1
+        assert reader.version == 2
+        assert reader.read() == big
+    publisher.close(unlink=True)
+    assert not path.exists()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_published_file_is_owner_only_unless_mode_is_given(tmp_path: Path) -> None:
+    private = SnapshotPublisher(tmp_path / "private.snap", capacity=1024)
+    private.publish(_snapshot(1, zones=200))
+    assert private.resizes == 1
+    assert private.path.stat().st_mode & 0o777 == 0o600
+    private.close()
+
+    shared = SnapshotPublisher(tmp_path / "private.snap", mode=0o640)
+    assert shared.path.stat().st_mode & 0o777 == 0o640
+    shared.close()
+
+
+def _check_reads(path: str, last_version: int, failures: multiprocessing.Queue) -> None:
+    reader = SnapshotReader(path)
+    seen = 0
+    while seen < last_version:
+        snapshot = reader.read()
+        if snapshot is None:
+            continue
+        names = {zone.name for zone in snapshot.zones.values()}
+        if names != {f"v{snapshot.version}"}:
+            failures.put(f"torn read at version {snapshot.version}: {names}")
+            return
+        seen = snapshot.version
+    failures.put(None)
+
+
+def test_reader_in_another_process_never_sees_torn_snapshots(tmp_path: Path) -> None:
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        pytest.skip("fork start method unavailable")
+    path = tmp_path / "panel.snap"
+    publisher = SnapshotPublisher(path, capacity=16 * 1024)
+    last_version = 3000
+    failures = ctx.Queue()
+    process = ctx.Process(target=_check_reads, args=(str(path), last_version, failures))
+    process.start()
+    try:
+        for version in range(1, last_version + 1):
+            publisher.publish(_snapshot(version, zones=64))
+        assert failures.get(timeout=30) is None
+    finally:
+        process.join(timeout=5)
+        publisher.close()
+    assert process.exitcode == 0
+
+
+@pytest.mark.asyncio
+async def test_attach_publishes_client_snapshot_after_updates(tmp_path: Path) -> None:
+    path = tmp_path / "panel.snap"
+    async with PanelSimulator(PanelSimulatorConfig(zones=6, outputs=2, seed=5)) as sim:
+        client = Elke27Client(ClientConfig())
+        publisher = SnapshotPublisher(path)
+        unsubscribe = publisher.attach(client)
+        try:
+            await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+            await client.wait_ready(timeout_s=10.0)
+            await client.async_set_output(2, on=True)
+            await asyncio.sleep(0.1)
+            with SnapshotReader(path) as reader:
+                shared = reader.read()
+            assert shared is not None
+            assert shared == client.snapshot
+            assert shared.outputs[2].state is True
+            assert len(shared.zones) == 6
+        finally:
+            unsubscribe()
+            await client.async_disconnect()
+            publisher.close()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+
+from elke27_lib.client import Elke27Client
+from elke27_lib.pending import PendingResponseManager
+from elke27_lib.session import SessionState
+from elke27_lib.types import ClientConfig
+from test.helpers.internal import get_kernel, get_private
+
+
+class _FakeSession:
+    cfg: object
+    state: SessionState = SessionState.ACTIVE
+
+    def __init__(self) -> None:
+        self.cfg = type("_Cfg", (), {"host": "test-host", "port": 1})()
+        self.sent: list[dict[str, Any]] = []
+
+    def send_json(
+        self,
+        msg: dict[str, Any],
+        *,
+        priority: object = None,
+        on_sent: Callable[[float], None] | None = None,
+        on_fail: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        del priority, on_fail
+        self.sent.append(msg)
+        if on_sent is not None:
+            on_sent(0.0)
+
+
+def _client_with_session() -> tuple[Elke27Client, _FakeSession]:
+    # Disable the response cache so every read reaches the kernel.
+    client = Elke27Client(config=ClientConfig(response_cache_size=0))
+    kernel = get_kernel(client)
+    session = _FakeSession()
+    cast(Any, kernel)._session = session
+    kernel.state.panel.session_id = 1
+    kernel.state.inventory.configured_zones = {1}
+    return client, session
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_request() -> None:
+    client, session = _client_with_session()
+    kernel = get_kernel(client)
+
+    first = asyncio.create_task(client.async_execute("zone_get_attribs", zone_id=1))
+    second = asyncio.create_task(client.async_execute("zone_get_attribs", zone_id=1))
+    await asyncio.sleep(0)
+
+    assert len(session.sent) == 1
+    on_message = get_private(kernel, "_on_message")
+    on_message(
+        {
+            "seq": session.sent[0]["seq"],
+            "zone": {"get_attribs": {"zone_id": 1, "name": "Front", "error_code": 0}},
+        }
+    )
+    results = await asyncio.gather(first, second)
+
+    assert all(result.ok for result in results)
+    assert results[0].data == results[1].data
+    assert kernel.duplicates_saved == {("zone", "get_attribs"): 1}
+    assert kernel.pending_responses.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_are_never_coalesced() -> None:
+    client, session = _client_with_session()
+    kernel = get_kernel(client)
+
+    first = asyncio.create_task(
+        client.async_execute("output_set_status", output_id=1, status="ON", timeout_s=0.01)
+    )
+    second = asyncio.create_task(
+        client.async_execute("output_set_status", output_id=1, status="ON", timeout_s=0.01)
+    )
+    await asyncio.gather(first, second)
+
+    writes = [msg for msg in session.sent if "set_status" in msg.get("output", {})]
+    assert len(writes) == 2
+    assert kernel.duplicates_saved_total == 0
+
+
+@pytest.mark.asyncio
+async def test_dropping_one_follower_keeps_others_waiting() -> None:
+    loop = asyncio.get_running_loop()
+    manager = PendingResponseManager()
+    primary = manager.create(
+        7, command_key="zone_get_attribs", expected_route=("zone", "x"), loop=loop
+    )
+    follower = manager.attach(
+        7, command_key="zone_get_attribs", expected_route=("zone", "x"), loop=loop
+    )
+
+    manager.drop(7, primary)
+    assert manager.pending_count() == 1
+    manager.resolve(7, {"ok": True})
+    await asyncio.sleep(0)
+
+    assert follower.result() == {"ok": True}
+    assert not primary.done()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from elke27_lib import ClientConfig
+from elke27_lib.simulator import PanelSimulatorConfig
+from elke27_lib.soak import SoakConfig, run_soak
+
+_PANEL = PanelSimulatorConfig(areas=1, zones=16, outputs=4)
+
+
+def test_soak_with_resets_and_storms_stays_bounded() -> None:
+    report = run_soak(
+        SoakConfig(
+            duration_s=2 * 3600.0,
+            sample_interval_s=600.0,
+            panel=_PANEL,
+            client_config=ClientConfig(event_queue_maxlen=512),
+            drop_rate=0.01,
+            storm_interval_s=1800.0,
+            storm_broadcasts=200,
+            reset_interval_s=1800.0,
+            command_interval_s=30.0,
+            seed=5,
+        )
+    )
+
+    assert report.ok, report.format()
+    assert report.simulated_s >= 2 * 3600.0
+    assert report.wall_s < report.simulated_s / 100
+    assert len(report.samples) == 13
+    assert report.resets > 0 and report.reconnects == report.resets
+    assert report.storms > 0 and report.commands_ok > 100
+    assert report.leaked_tasks == ()
+    assert max(sample.kernel_events for sample in report.samples) <= 512
+    assert report.latency_drift is not None
+
+
+def test_soak_flags_unbounded_kernel_event_growth() -> None:
+    report = run_soak(
+        SoakConfig(
+            duration_s=3600.0,
+            panel=_PANEL,
+            storm_interval_s=None,
+            reset_interval_s=None,
+            broadcast_interval_s=2.0,
+            max_kernel_events=1000,
+            seed=5,
+        )
+    )
+
+    assert not report.ok
+    assert any(violation.startswith("kernel_events=") for violation in report.violations)
+    assert "VIOLATION kernel_events=" in report.format()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from elke27_lib.request_scheduler import REQUEST_CLASS_INTERACTIVE, REQUEST_CLASS_STATUS
+from elke27_lib.virtual_time import (
+    VirtualLoadConfig,
+    VirtualLoadReport,
+    VirtualTimeLoop,
+    run_virtual_load,
+)
+
+
+def _outcome(report: VirtualLoadReport) -> tuple[object, ...]:
+    return (
+        report.replied,
+        report.timed_out,
+        report.aborted,
+        report.rejected,
+        report.replies_dropped,
+        report.broadcasts,
+        report.reconnects,
+        report.panel_requests,
+        report.virtual_time_s,
+        dict(report.latency),
+    )
+
+
+def test_virtual_loop_sleeps_without_waiting() -> None:
+    loop = VirtualTimeLoop(start_time=100.0)
+    try:
+
+        async def _sleep() -> float:
+            await asyncio.sleep(3600.0)
+            await asyncio.to_thread(lambda: None)
+            return loop.time()
+
+        elapsed = loop.run_until_complete(asyncio.wait_for(_sleep(), timeout=7200.0))
+        assert elapsed == pytest.approx(3700.0, abs=1e-3)
+    finally:
+        loop.close()
+
+
+def test_adversarial_load_is_accounted_and_deterministic() -> None:
+    config = VirtualLoadConfig(
+        requests=1500,
+        mean_interarrival_s=0.05,
+        jitter_s=0.03,
+        drop_rate=0.02,
+        broadcast_interval_s=1.0,
+        disconnect_interval_s=20.0,
+        seed=11,
+    )
+    report = run_virtual_load(config)
+
+    assert report.submitted == 1500
+    assert report.replied + report.timed_out + report.aborted + report.rejected == report.submitted
+    assert report.replies_dropped > 0 and report.timed_out > 0
+    assert report.reconnects > 0 and report.broadcasts > 0
+    assert report.virtual_time_s > 50.0
+    assert report.virtual_time_s > 10 * report.wall_time_s
+    assert (
+        report.latency[REQUEST_CLASS_STATUS].count > report.latency[REQUEST_CLASS_INTERACTIVE].count
+    )
+    interactive = report.latency[REQUEST_CLASS_INTERACTIVE]
+    assert interactive.p50_s <= interactive.p99_s <= interactive.max_s
+    assert report.metrics.timeouts > 0
+
+    again = run_virtual_load(config)
+    assert _outcome(again) == _outcome(report)
+    assert _outcome(run_virtual_load(replace(config, seed=12))) != _outcome(report)
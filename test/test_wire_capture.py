@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from elke27_lib import ClientConfig, Elke27Client
+from elke27_lib.capture import (
+    RECORD_KEYS,
+    RECORD_RX,
+    RECORD_TX,
+    WireRecorder,
+    read_capture,
+    replay_capture,
+)
+from elke27_lib.kernel import E27Kernel
+from elke27_lib.session import SessionInfo
+from elke27_lib.simulator import SIMULATOR_LINK_KEYS, PanelSimulator, PanelSimulatorConfig
+
+
+@pytest.mark.asyncio
+async def test_capture_replays_into_kernel_state(tmp_path: Path) -> None:
+    path = tmp_path / "session.e27w"
+    async with PanelSimulator(PanelSimulatorConfig(zones=24, outputs=2, seed=3)) as sim:
+        client = Elke27Client(config=ClientConfig(wire_capture_path=str(path)))
+        await client.async_connect(sim.host, sim.port, SIMULATOR_LINK_KEYS)
+        assert await client.wait_attribs_ready(timeout_s=10.0)
+        sim.broadcast_zone(5, violated=True)
+        await client.async_set_output(1, on=True)
+        await client.async_disconnect()
+
+    records = read_capture(path)
+    assert records[0].kind == RECORD_KEYS
+    assert {RECORD_RX, RECORD_TX} <= {record.kind for record in records}
+
+    kernel = E27Kernel()
+    replay = await replay_capture(path, kernel=kernel, timeout_s=10.0)
+    assert replay.bytes_replayed == sum(len(r.data) for r in records if r.kind == RECORD_RX)
+    state = kernel.state
+    assert sorted(state.zones) == list(range(1, 25))
+    assert state.zones[5].violated is True
+    assert state.zones[9].name == "Zone 9"
+    assert state.outputs[1].on is True
+
+
+def test_ring_keeps_newest_records_and_session_keys(tmp_path: Path) -> None:
+    path = tmp_path / "ring.e27w"
+    recorder = WireRecorder(path, max_bytes=200)
+    recorder.record_keys(SessionInfo(7, "00" * 16, "11" * 32), at=0.0)
+    for i in range(20):
+        recorder.record_rx(bytes([i]) * 20, at=float(i + 1))
+    recorder.close()
+
+    records = read_capture(path)
+    assert records[0].kind == RECORD_KEYS
+    assert records[0].session_info().session_id == 7
+    assert records[-1].data == bytes([19]) * 20
+    assert sum(record.size for record in records[1:]) <= 200
+    assert recorder.records_dropped == 20 - (len(records) - 1)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_capture_files_are_owner_only(tmp_path: Path) -> None:
+    appended = WireRecorder(tmp_path / "append.e27w")
+    appended.record_keys(SessionInfo(7, "00" * 16, "11" * 32), at=0.0)
+    appended.close()
+
+    ring_path = tmp_path / "ring.e27w"
+    ring_path.with_name(ring_path.name + ".tmp").write_bytes(b"stale")
+    ring = WireRecorder(ring_path, max_bytes=200)
+    ring.record_keys(SessionInfo(7, "00" * 16, "11" * 32), at=0.0)
+    ring.close()
+
+    for path in (tmp_path / "append.e27w", ring_path):
+        assert path.stat().st_mode & 0o777 == 0o600
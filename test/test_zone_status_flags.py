@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
 from elke27_lib.const import E27ErrorCode
 from elke27_lib.dispatcher import DispatchContext, MessageKind
-from elke27_lib.handlers.zone import make_zone_get_status_handler
-from elke27_lib.states import PanelState
+from elke27_lib.events import ZoneAttribsUpdated, ZoneStatusUpdated, stamp_event
+from elke27_lib.handlers.zone import make_zone_get_attribs_handler, make_zone_get_status_handler
+from elke27_lib.states import PanelState, ZoneState
 
 
 class _EmitSpy:
@@ -74,3 +77,46 @@ def test_zone_status_flags_multiple_true() -> None:
     assert zone.tamper is True
     assert zone.alarm is True
     assert zone.low_battery is True
+
+
+def test_zone_status_reports_changed_mask() -> None:
+    state = PanelState()
+    emit = _EmitSpy()
+    handler = make_zone_get_status_handler(state, emit, now=lambda: 123.0)
+
+    msg = {"zone": {"get_status": {"zone_id": 3, "BYPASSED": True, "low_batt": True}}}
+    assert handler(msg, _ctx(("zone", "get_status"))) is True
+    (evt,) = emit.events
+    assert isinstance(evt, ZoneStatusUpdated)
+    bits = ZoneState.FIELD_BITS
+    assert evt.changed_mask == bits["bypassed"] | bits["low_battery"]
+    assert evt.changed_fields == ("bypassed", "low_battery")
+    assert evt.changed_fields is evt.changed_fields
+    assert evt.has_changed("bypassed")
+    assert not evt.has_changed("violated")
+
+    emit.events.clear()
+    assert handler(msg, _ctx(("zone", "get_status"))) is True
+    assert emit.events == []
+
+
+def test_zone_attribs_event_lists_dynamic_keys_and_accepts_changed_fields() -> None:
+    state = PanelState()
+    emit = _EmitSpy()
+    handler = make_zone_get_attribs_handler(state, emit, now=lambda: 123.0)
+
+    msg = {"zone": {"get_attribs": {"zone_id": 2, "name": "Door", "chime_tone": 3}}}
+    assert handler(msg, _ctx(("zone", "get_attribs"))) is True
+    (evt,) = emit.events
+    assert isinstance(evt, ZoneAttribsUpdated)
+    assert evt.has_changed("chime_tone")
+    stamped = stamp_event(
+        evt, at=1.0, seq=7, classification="RESPONSE", route=("zone", "get_attribs"), session_id=1
+    )
+    assert stamped.changed_fields == ("chime_tone", "name")
+    assert evt.changed_fields == ("chime_tone", "name")
+    assert evt.changed_mask & ZoneState.FIELD_BITS["attribs"]
+
+    legacy = replace(evt, changed_mask=0, changed_fields=("name", "sensor_kind"))
+    assert legacy.changed_mask == ZoneState.FIELD_BITS.mask(("name", "attribs"))
+    assert legacy.changed_fields == ("name", "sensor_kind")